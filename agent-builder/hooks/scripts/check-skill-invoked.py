@@ -11,11 +11,49 @@ Exit codes:
   2 - Block with message (component file detected, skill reminder)
 """
 
-import json
+# Only os and sys are imported up front: most writes are not component
+# files, and importing re and json would dominate the hook's runtime.
 import os
-import re
 import sys
 
+# Hook output for non-component files (what json.dumps would produce)
+APPROVE_SILENTLY = '{"decision": "approve", "suppressOutput": true}'
+
+# Lowercased suffixes and directory segments every component path has
+COMPONENT_SUFFIXES = (".md", ".json")
+COMPONENT_SEGMENTS = ("/skills/", "/commands/", "/agents/", "/hooks/", "/.claude/", "/.claude-plugin/")
+
+# All component patterns in one regex, tried in this order; the first
+# alternative that matches names the component type
+COMPONENT_PATTERN = (
+    r"(?:"
+    r"(?P<skill>.*/skills/[^/]+/SKILL\.md)"             # */skills/*/SKILL.md
+    r"|(?P<command>.*/commands/[^/]+\.md)"              # */commands/*.md
+    r"|(?P<agent>.*/agents/[^/]+\.md)"                  # */agents/*.md
+    r"|(?P<hook>.*/(?:hooks|\.claude)/hooks\.json)"     # */hooks/hooks.json, */.claude/hooks.json
+    r"|(?P<plugin>.*/\.claude-plugin/plugin\.json)"     # */.claude-plugin/plugin.json
+    r")$"
+)
+
+SKILLS = {
+    "skill": "building-skills",
+    "command": "building-commands",
+    "agent": "building-agents",
+    "hook": "building-hooks",
+    "plugin": "building-plugins",
+}
+
+_compiled = None
+
+
+def _component_regex():
+    """Compile COMPONENT_PATTERN on first use (re is only imported for candidate paths)."""
+    global _compiled
+    if _compiled is None:
+        import re
+        _compiled = re.compile(COMPONENT_PATTERN, re.IGNORECASE)
+    return _compiled
+
 
 def get_component_type(file_path: str) -> tuple:
     """
@@ -26,36 +64,33 @@ def get_component_type(file_path: str) -> tuple:
     # Normalize path
     path = file_path.replace("\\", "/")
 
-    # Component patterns and their corresponding skills
-    patterns = [
-        # Skills: */skills/*/SKILL.md
-        (r".*/skills/[^/]+/SKILL\.md$", "skill", "building-skills"),
-
-        # Commands: */commands/*.md
-        (r".*/commands/[^/]+\.md$", "command", "building-commands"),
-
-        # Agents: */agents/*.md
-        (r".*/agents/[^/]+\.md$", "agent", "building-agents"),
-
-        # Hooks: */hooks/hooks.json or */.claude/hooks.json
-        (r".*/hooks/hooks\.json$", "hook", "building-hooks"),
-        (r".*/\.claude/hooks\.json$", "hook", "building-hooks"),
-
-        # Plugins: */.claude-plugin/plugin.json
-        (r".*/\.claude-plugin/plugin\.json$", "plugin", "building-plugins"),
-    ]
+    # Cheap rejection: wrong suffix, or no component directory in the path
+    lowered = path.lower()
+    if not lowered.endswith(COMPONENT_SUFFIXES):
+        return None, None
+    if not any(segment in lowered for segment in COMPONENT_SEGMENTS):
+        return None, None
 
-    for pattern, component_type, skill_name in patterns:
-        if re.match(pattern, path, re.IGNORECASE):
-            return component_type, skill_name
-
-    return None, None
+    match = _component_regex().match(path)
+    if not match:
+        return None, None
+    component_type = match.lastgroup
+    return component_type, SKILLS[component_type]
 
 
 def main():
     # Get the file path from environment or stdin
     # The Write tool passes the file_path parameter
     file_path = os.environ.get("TOOL_INPUT_FILE_PATH", "")
+    component_type, skill_name = get_component_type(file_path)
+
+    if file_path and not component_type:
+        # Not a component file - approve silently
+        print(APPROVE_SILENTLY)
+        sys.exit(0)
+
+    # Every other outcome reads or writes JSON
+    import json
 
     if not file_path:
         # Try to get from tool input JSON
@@ -65,6 +100,7 @@ def main():
             file_path = data.get("file_path", "")
         except json.JSONDecodeError:
             pass
+        component_type, skill_name = get_component_type(file_path)
 
     if not file_path:
         # If we still don't have the path, approve and let the prompt hook handle it
@@ -75,9 +111,6 @@ def main():
         print(json.dumps(result))
         sys.exit(0)
 
-    # Check if it's a component file
-    component_type, skill_name = get_component_type(file_path)
-
     if component_type:
         # This is a component file - provide reminder
         result = {
@@ -93,11 +126,7 @@ def main():
         sys.exit(0)
     else:
         # Not a component file - approve silently
-        result = {
-            "decision": "approve",
-            "suppressOutput": True
-        }
-        print(json.dumps(result))
+        print(APPROVE_SILENTLY)
         sys.exit(0)
 
 
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Shared YAML Frontmatter Parsing
+
+Used by the agent, skill and command validators, quality-scorer.py and the
+test suites, so a component file is read and YAML-parsed once per process
+however many checks look at it:
+- parse_text(): split a markdown document into frontmatter and body
+- parse_file(): the same for a file, memoized by (path, mtime, size)
+- read_frontmatter(): the frontmatter fields of a file, or {} when it has
+  none or they don't parse
+
+Parsed frontmatter is shared between callers; treat it as read-only.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+import yaml
+
+# Frontmatter between --- markers at the very start of the document
+FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
+
+
+@dataclass(frozen=True)
+class Frontmatter:
+    """A markdown document split into frontmatter and body.
+
+    `present` is False when the document doesn't start with a frontmatter
+    block (then `body` is the whole document). `error` holds the YAML error
+    when the block doesn't parse; `data` is whatever YAML produced, which
+    need not be a mapping.
+    """
+
+    content: str
+    present: bool
+    text: Optional[str]
+    data: object
+    body: str
+    error: Optional[yaml.YAMLError]
+
+    @property
+    def fields(self) -> dict:
+        """The frontmatter mapping, or {} if missing, invalid or not a mapping."""
+        return self.data if isinstance(self.data, dict) else {}
+
+
+def parse_text(content: str) -> Frontmatter:
+    """Split `content` into frontmatter and body, parsing the YAML."""
+    match = FRONTMATTER_PATTERN.match(content)
+    if not match:
+        return Frontmatter(content, False, None, None, content, None)
+
+    text = match.group(1)
+    data, error = None, None
+    try:
+        data = yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        error = e
+    return Frontmatter(content, True, text, data, content[match.end():], error)
+
+
+# Resolved path -> ((mtime_ns, size), Frontmatter)
+_cache: dict[str, tuple[tuple[int, int], Frontmatter]] = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def parse_file(path: Union[str, Path]) -> Frontmatter:
+    """
+    Parse a markdown file, reusing the result while it is unchanged.
+
+    Raises OSError or UnicodeDecodeError when the file can't be read.
+    """
+    key = os.path.realpath(path)
+    stat = os.stat(key)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(key)
+    if cached and cached[0] == stamp:
+        _stats["hits"] += 1
+        return cached[1]
+
+    _stats["misses"] += 1
+    parsed = parse_text(Path(key).read_text(encoding='utf-8'))
+    _cache[key] = (stamp, parsed)
+    return parsed
+
+
+def read_frontmatter(path: Union[str, Path]) -> dict:
+    """Frontmatter fields of a file; {} when unreadable, missing or invalid."""
+    try:
+        return parse_file(path).fields
+    except (OSError, UnicodeDecodeError):
+        return {}
+
+
+def cache_info() -> dict:
+    """Hits, misses (files parsed) and cached files in this process."""
+    return {**_stats, "files": len(_cache)}
+
+
+def clear_cache():
+    """Forget every parsed file and reset the statistics."""
+    _cache.clear()
+    _stats["hits"] = _stats["misses"] = 0
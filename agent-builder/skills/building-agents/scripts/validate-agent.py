@@ -6,9 +6,11 @@ Validates YAML frontmatter, naming conventions, and schema compliance.
 
 import re
 import sys
-import yaml
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from frontmatter_parser import parse_file
+
 # Ensure UTF-8 output for Unicode characters on Windows
 if sys.stdout.encoding != 'utf-8':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -24,27 +26,21 @@ def validate_agent(file_path: str) -> tuple[bool, list[str]]:
     errors = []
 
     try:
-        content = Path(file_path).read_text(encoding='utf-8')
+        parsed = parse_file(file_path)
     except Exception as e:
         return False, [f"Failed to read file: {e}"]
 
     # Check for YAML frontmatter
-    frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-    match = re.match(frontmatter_pattern, content, re.DOTALL)
-
-    if not match:
+    if not parsed.present:
         errors.append("Missing YAML frontmatter (must start with --- and end with ---)")
         return False, errors
 
-    frontmatter_text = match.group(1)
-
-    # Parse YAML
-    try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-    except yaml.YAMLError as e:
-        errors.append(f"Invalid YAML syntax: {e}")
+    if parsed.error:
+        errors.append(f"Invalid YAML syntax: {parsed.error}")
         return False, errors
 
+    frontmatter = parsed.data
+
     # Validate required fields
     if 'name' not in frontmatter:
         errors.append("Missing required field: 'name'")
@@ -145,7 +141,7 @@ def validate_agent(file_path: str) -> tuple[bool, list[str]]:
         errors.append("Recommendation: Add 'color' field for visual identification in terminal (e.g., color: \"#3498DB\")")
 
     # Check for body content
-    body = content[match.end():]
+    body = parsed.body
     if len(body.strip()) < 100:
         errors.append("Warning: Agent body is very short. Consider adding more detailed instructions, examples, and guidelines.")
 
@@ -6,9 +6,11 @@ Validates YAML frontmatter, naming conventions, and schema compliance.
 
 import re
 import sys
-import yaml
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'building-agents' / 'scripts'))
+from frontmatter_parser import parse_file
+
 # Ensure UTF-8 output for Unicode characters on Windows
 if sys.stdout.encoding != 'utf-8':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -48,27 +50,21 @@ def validate_command(file_path: str) -> tuple[bool, list[str]]:
 
     # Read file
     try:
-        content = path.read_text(encoding='utf-8')
+        parsed = parse_file(path)
     except Exception as e:
         return False, [f"Failed to read file: {e}"]
 
     # Check for YAML frontmatter
-    frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-    match = re.match(frontmatter_pattern, content, re.DOTALL)
-
-    if not match:
+    if not parsed.present:
         errors.append("Missing YAML frontmatter (must start with --- and end with ---)")
         return False, errors
 
-    frontmatter_text = match.group(1)
-
-    # Parse YAML
-    try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-    except yaml.YAMLError as e:
-        errors.append(f"Invalid YAML syntax: {e}")
+    if parsed.error:
+        errors.append(f"Invalid YAML syntax: {parsed.error}")
         return False, errors
 
+    frontmatter = parsed.data
+
     # Check for recommended fields
     if 'description' not in frontmatter:
         errors.append("Recommendation: Add 'description' field to help users understand what the command does")
@@ -138,7 +134,7 @@ def validate_command(file_path: str) -> tuple[bool, list[str]]:
             errors.append(f"Warning: argument-hint typically uses brackets: '{arg_hint}' → '[{arg_hint}]'")
 
     # Check body content
-    body = content[match.end():]
+    body = parsed.body
 
     # Check for argument usage
     uses_positional = bool(re.search(r'\$\d+', body))
@@ -6,9 +6,11 @@ Validates SKILL.md format, directory structure, naming conventions, and schema c
 
 import re
 import sys
-import yaml
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'building-agents' / 'scripts'))
+from frontmatter_parser import parse_file
+
 # Ensure UTF-8 output for Unicode characters on Windows
 if sys.stdout.encoding != 'utf-8':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -39,27 +41,21 @@ def validate_skill(skill_dir: str) -> tuple[bool, list[str]]:
 
     # Read SKILL.md
     try:
-        content = skill_md.read_text(encoding='utf-8')
+        parsed = parse_file(skill_md)
     except Exception as e:
         return False, [f"Failed to read SKILL.md: {e}"]
 
     # Check for YAML frontmatter
-    frontmatter_pattern = r'^---\s*\n(.*?)\n---\s*\n'
-    match = re.match(frontmatter_pattern, content, re.DOTALL)
-
-    if not match:
+    if not parsed.present:
         errors.append("SKILL.md missing YAML frontmatter (must start with --- and end with ---)")
         return False, errors
 
-    frontmatter_text = match.group(1)
-
-    # Parse YAML
-    try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-    except yaml.YAMLError as e:
-        errors.append(f"Invalid YAML syntax in SKILL.md: {e}")
+    if parsed.error:
+        errors.append(f"Invalid YAML syntax in SKILL.md: {parsed.error}")
         return False, errors
 
+    frontmatter = parsed.data
+
     # Validate required fields
     if 'name' not in frontmatter:
         errors.append("Missing required field: 'name'")
@@ -146,7 +142,7 @@ def validate_skill(skill_dir: str) -> tuple[bool, list[str]]:
         errors.append("Invalid field 'model': Skills do not support model specification. Only agents can specify a model. Remove this field.")
 
     # Check body content
-    body = content[match.end():]
+    body = parsed.body
     if len(body.strip()) < 100:
         errors.append("Warning: Skill body is very short. Consider adding detailed instructions and examples.")
 
@@ -5,16 +5,20 @@ Logseq Backend Detection Script
 Detects available Logseq integration backends and returns the best option.
 Priority order: MCP -> HTTP API -> CLI
 
+The backend found is recorded in .claude/logseq-expert/detection.json
+for a few minutes, so LogseqClient instances started meanwhile skip their
+own probes.
+
 Usage:
-    python detect-backend.py [--json] [--check <backend>]
+    python detect-backend.py [--json] [--check <backend>] [--cached]
 
 Options:
     --json          Output results as JSON
     --check <name>  Check specific backend (http, cli, mcp)
+    --cached        Report a recently recorded detection instead of probing
 """
 
 import json
-import os
 import shutil
 import socket
 import subprocess
@@ -22,6 +26,10 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+# Config loading and the detection record, shared with LogseqClient
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "skills" / "reading-logseq-data" / "scripts"))
+from logseq_env import load_config, recent_detection, record_detection, resolve_settings
+
 # ANSI colors
 GREEN = "\033[0;32m"
 RED = "\033[0;31m"
@@ -185,19 +193,9 @@ def check_mcp_server(server_path: Optional[str] = None) -> dict:
 
 def detect_best_backend() -> dict:
     """Detect all backends and return the best available option."""
-    # Load config if exists
-    config_path = Path(__file__).parent.parent.parent / ".claude" / "logseq-expert" / "env.json"
-    config = {}
-    if config_path.exists():
-        try:
-            with open(config_path) as f:
-                config = json.load(f)
-        except Exception:
-            pass
-
-    # Get settings from config or environment
-    http_url = config.get("http", {}).get("url", os.environ.get("LOGSEQ_API_URL", "http://127.0.0.1:12315"))
-    http_token = config.get("http", {}).get("token", os.environ.get("LOGSEQ_API_TOKEN"))
+    # Settings from environment or the project's env.json
+    config = load_config()
+    http_url, http_token, graph_path = resolve_settings()
     mcp_path = config.get("mcp", {}).get("serverPath")
 
     results = {
@@ -207,7 +205,7 @@ def detect_best_backend() -> dict:
             "cli": check_cli(),
             "mcp": check_mcp_server(mcp_path)
         },
-        "config_loaded": config_path.exists()
+        "config_loaded": bool(config)
     }
 
     # Determine best backend (priority: MCP with HTTP -> HTTP -> CLI)
@@ -218,9 +216,24 @@ def detect_best_backend() -> dict:
     elif results["backends"]["cli"]["available"]:
         results["recommended"] = "cli"
 
+    # The MCP server talks to the HTTP API, which is what clients use
+    if results["backends"]["http"]["available"]:
+        record_detection(http_url, graph_path, "http")
+    elif results["recommended"] == "cli":
+        record_detection(http_url, graph_path, "cli")
+
     return results
 
 
+def cached_backend() -> Optional[dict]:
+    """The backend recorded by a recent detection, without probing."""
+    url, _, graph_path = resolve_settings()
+    detected = recent_detection(url, graph_path)
+    if not detected:
+        return None
+    return {"recommended": detected[0], "url": url, "graph_path": detected[1], "cached": True}
+
+
 def print_results(results: dict, as_json: bool = False):
     """Print detection results."""
     if as_json:
@@ -305,6 +318,15 @@ def main():
 
             sys.exit(0 if result["available"] else 1)
 
+    if "--cached" in args:
+        cached = cached_backend()
+        if cached:
+            if as_json:
+                print(json.dumps(cached, indent=2))
+            else:
+                print(f"{GREEN}Recommended backend: {cached['recommended'].upper()}{NC} (recently detected)")
+            sys.exit(0)
+
     results = detect_best_backend()
     print_results(results, as_json)
 
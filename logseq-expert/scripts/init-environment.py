@@ -9,9 +9,9 @@ Usage:
     python init-environment.py [--force] [--non-interactive]
 """
 
+import importlib.util
 import json
 import os
-import platform
 import subprocess
 import sys
 from pathlib import Path
@@ -26,10 +26,18 @@ CYAN = "\033[0;36m"
 BOLD = "\033[1m"
 NC = "\033[0m"
 
-# Import sibling modules
+# Import sibling modules (detect-backend.py isn't importable by name)
 script_dir = Path(__file__).parent
-sys.path.insert(0, str(script_dir))
-from detect_backend import check_http_api, check_cli, check_mcp_server
+_spec = importlib.util.spec_from_file_location("detect_backend", script_dir / "detect-backend.py")
+detect_backend = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(detect_backend)
+check_http_api, check_cli, check_mcp_server = (
+    detect_backend.check_http_api, detect_backend.check_cli, detect_backend.check_mcp_server)
+
+# Graph discovery and detection records, shared with LogseqClient
+sys.path.insert(0, str(script_dir.parent / "skills" / "reading-logseq-data" / "scripts"))
+from logseq_files import detect_os, find_logseq_graphs
+from logseq_env import forget_detection
 
 
 def get_env_dir() -> Path:
@@ -45,55 +53,6 @@ def get_env_path() -> Path:
     return get_env_dir() / "env.json"
 
 
-def detect_os() -> str:
-    """Detect the operating system."""
-    system = platform.system().lower()
-    if system == "darwin":
-        return "macos"
-    elif system == "windows":
-        return "windows"
-    return "linux"
-
-
-def find_logseq_graphs() -> list[Path]:
-    """Find Logseq graph directories."""
-    graphs = []
-    os_type = detect_os()
-
-    # Common locations
-    home = Path.home()
-    search_paths = []
-
-    if os_type == "macos":
-        search_paths = [
-            home / "Documents" / "logseq",
-            home / "logseq",
-            home / "Library" / "Application Support" / "Logseq",
-        ]
-    elif os_type == "windows":
-        search_paths = [
-            home / "Documents" / "logseq",
-            home / "logseq",
-            Path(os.environ.get("APPDATA", "")) / "Logseq",
-        ]
-    else:  # Linux
-        search_paths = [
-            home / "logseq",
-            home / "Documents" / "logseq",
-            home / ".logseq",
-        ]
-
-    for path in search_paths:
-        if path.exists() and path.is_dir():
-            # Look for graph directories (contain logseq/ folder or db.sqlite)
-            for item in path.iterdir():
-                if item.is_dir():
-                    if (item / "logseq").exists() or (item / "db.sqlite").exists():
-                        graphs.append(item)
-
-    return graphs
-
-
 def prompt(message: str, default: Optional[str] = None) -> str:
     """Prompt user for input."""
     if default:
@@ -311,6 +270,9 @@ def save_config(config: dict, force: bool = False) -> bool:
     with open(env_path, "w") as f:
         json.dump(config, f, indent=2)
 
+    # Backends detected under the old settings no longer apply
+    forget_detection()
+
     print(f"{GREEN}Configuration saved to {env_path}{NC}")
     return True
 
@@ -3,13 +3,14 @@
 Logseq Connection Test Script
 
 Tests connectivity to Logseq using the configured or specified backend.
+A working HTTP API or CLI is recorded in .claude/logseq-expert/detection.json
+so LogseqClient instances started soon after skip their own probes.
 
 Usage:
     python test-connection.py [--backend http|cli|mcp] [--verbose]
 """
 
 import json
-import os
 import subprocess
 import sys
 import urllib.request
@@ -17,6 +18,10 @@ import urllib.error
 from pathlib import Path
 from typing import Optional
 
+# Config loading and the detection record, shared with LogseqClient
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "skills" / "reading-logseq-data" / "scripts"))
+from logseq_env import record_detection, resolve_settings
+
 # ANSI colors
 GREEN = "\033[0;32m"
 RED = "\033[0;31m"
@@ -25,15 +30,6 @@ BLUE = "\033[0;34m"
 NC = "\033[0m"
 
 
-def load_config() -> dict:
-    """Load configuration from env.json if it exists."""
-    config_path = Path(__file__).parent.parent.parent / ".claude" / "logseq-expert" / "env.json"
-    if config_path.exists():
-        with open(config_path) as f:
-            return json.load(f)
-    return {}
-
-
 def test_http_connection(url: str, token: str, verbose: bool = False) -> tuple[bool, str, Optional[dict]]:
     """
     Test HTTP API connection.
@@ -172,16 +168,13 @@ def test_mcp_connection(verbose: bool = False) -> tuple[bool, str, Optional[dict
 
 def run_full_test(backend: Optional[str] = None, verbose: bool = False) -> dict:
     """Run connection test for specified or all backends."""
-    config = load_config()
+    url, token, graph_path = resolve_settings()
     results = {}
 
     backends_to_test = [backend] if backend else ["http", "cli", "mcp"]
 
     for b in backends_to_test:
         if b == "http":
-            url = config.get("http", {}).get("url", os.environ.get("LOGSEQ_API_URL", "http://127.0.0.1:12315"))
-            token = config.get("http", {}).get("token", os.environ.get("LOGSEQ_API_TOKEN", ""))
-
             if not token:
                 results["http"] = {
                     "success": False,
@@ -193,7 +186,6 @@ def run_full_test(backend: Optional[str] = None, verbose: bool = False) -> dict:
                 results["http"] = {"success": success, "message": message, "info": info}
 
         elif b == "cli":
-            graph_path = config.get("cli", {}).get("graphPath")
             success, message, info = test_cli_connection(graph_path, verbose)
             results["cli"] = {"success": success, "message": message, "info": info}
 
@@ -201,6 +193,12 @@ def run_full_test(backend: Optional[str] = None, verbose: bool = False) -> dict:
             success, message, info = test_mcp_connection(verbose)
             results["mcp"] = {"success": success, "message": message, "info": info}
 
+    # LogseqClient prefers HTTP, so the CLI counts only when HTTP was tried too
+    if results.get("http", {}).get("success"):
+        record_detection(url, graph_path, "http")
+    elif "http" in results and results.get("cli", {}).get("success"):
+        record_detection(url, graph_path, "cli")
+
     return results
 
 
@@ -0,0 +1,809 @@
+#!/usr/bin/env python3
+"""
+Fake Logseq API Server
+
+An in-process stand-in for the Logseq HTTP API (POST /api with
+{"method", "args"}), so LogseqClient and LogseqWriter can run offline in
+tests and benchmarks:
+- FakeGraph keeps pages and nested blocks in memory and answers the
+  methods the client and writer call (Editor getPage, createPage,
+  deletePage, getPageBlocksTree, getBlock, insertBlock, insertBatchBlock,
+  updateBlock, removeBlock, upsertBlockProperty, removeBlockProperty,
+  getBlockProperties; App getCurrentGraph, search; DB datascriptQuery)
+- datascriptQuery runs a Datalog subset over DB-graph attributes
+  (:block/title, :block/uuid, :block/name, :block/page, :block/parent,
+  :block/refs, :block/tags, :user.property/*): data patterns, :in inputs
+  (scalar, [?x ...], tuple), ground and comparison/string predicates,
+  and pull in :find; anything else is an error
+- FakeLogseqServer serves a graph over keep-alive HTTP on a free port,
+  with an optional token and a fixed latency per request, and counts
+  requests per method
+- results use the API's JSON shape: {"result": ...} or {"error": ...}, keys
+  without namespaces ("uuid", "originalName", "page": {"id": ...})
+
+Usage:
+    from fake_logseq_server import FakeLogseqServer
+
+    with FakeLogseqServer(token="test", latency=0.005) as server:
+        server.graph.add_page("Home", ["First block", "See [[Inbox]]"])
+        client = LogseqClient(backend="http", url=server.url, token="test")
+        client.get_page("Home")
+        print(server.requests)       # {"logseq.Editor.getPage": 1, ...}
+
+    python3 fake_logseq_server.py --port 12315 --token dev --latency-ms 20
+    python3 fake_logseq_server.py --benchmark 200      # client/writer operations per second
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import itertools
+import json
+import re
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+
+REF = re.compile(r"\[\[([^\]]+)\]\]|#\[\[([^\]]+)\]\]|(?<![\w#])#([^\s#,.!?;:()\[\]]+)")
+
+# Ref attributes (values are entity ids) and those holding several
+REF_ATTRS = {":block/page", ":block/parent", ":block/refs", ":block/tags"}
+MANY_ATTRS = {":block/refs", ":block/tags"}
+
+PAGE_CLASS = ":logseq.class/Page"
+
+
+class FakeApiError(Exception):
+    """Returned to the caller as {"error": message}."""
+    pass
+
+
+# ============== EDN ==============
+
+class Symbol(str):
+    """An EDN symbol (?x, _, $, clojure.string/includes?)."""
+
+
+class Keyword(str):
+    """An EDN keyword, kept with its leading colon."""
+
+
+NUMBER = re.compile(r"^[+-]?\d+(\.\d+)?([eE][+-]?\d+)?$")
+DELIMITERS = set("[](){}\",; \t\r\n")
+
+
+def read_edn(text: str) -> Any:
+    """Read one EDN form: vectors as lists, lists as tuples, maps as dicts."""
+    value, end = _read(text, 0)
+    if _skip(text, end) != len(text):
+        raise FakeApiError("Trailing characters after query")
+    return value
+
+
+def _skip(text: str, i: int) -> int:
+    while i < len(text):
+        if text[i] in " \t\r\n,":
+            i += 1
+        elif text[i] == ";":
+            while i < len(text) and text[i] != "\n":
+                i += 1
+        else:
+            break
+    return i
+
+
+def _read(text: str, i: int) -> tuple[Any, int]:
+    i = _skip(text, i)
+    if i >= len(text):
+        raise FakeApiError("Unexpected end of query")
+    char = text[i]
+    closers = {"[": "]", "(": ")", "{": "}"}
+    if char in closers or text.startswith("#{", i):
+        opener = "{" if char == "#" else char
+        i += 2 if char == "#" else 1
+        items = []
+        while True:
+            i = _skip(text, i)
+            if i >= len(text):
+                raise FakeApiError("Unbalanced brackets in query")
+            if text[i] == closers[opener]:
+                i += 1
+                break
+            item, i = _read(text, i)
+            items.append(item)
+        if char == "#":
+            return frozenset(items), i
+        if opener == "[":
+            return items, i
+        if opener == "(":
+            return tuple(items), i
+        return dict(zip(items[::2], items[1::2])), i
+    if char == '"':
+        end = i + 1
+        while end < len(text) and text[end] != '"':
+            end += 2 if text[end] == "\\" else 1
+        return json.loads(text[i:end + 1]), end + 1
+    if text.startswith("#uuid", i):
+        value, i = _read(text, i + 5)
+        return str(value).lower(), i
+    end = i
+    while end < len(text) and text[end] not in DELIMITERS:
+        end += 1
+    token = text[i:end]
+    if not token:
+        raise FakeApiError(f"Unexpected {char!r} in query")
+    if token in ("nil", "true", "false"):
+        return {"nil": None, "true": True, "false": False}[token], end
+    if NUMBER.match(token):
+        return (float(token) if any(c in token for c in ".eE") else int(token)), end
+    if token.startswith(":"):
+        return Keyword(token), end
+    return Symbol(token), end
+
+
+def json_key(attribute: str) -> str:
+    """:block/original-name -> originalName, as the API names keys."""
+    name = attribute.lstrip(":").split("/")[-1]
+    head, *rest = name.split("-")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+# ============== Graph ==============
+
+class FakeGraph:
+    """An in-memory Logseq graph answering API methods."""
+
+    def __init__(self, name: str = "fake-graph"):
+        self.name = name
+        self.pages: dict[str, dict] = {}   # lowercased name -> page
+        self.blocks: dict[str, dict] = {}  # uuid -> block
+        self.lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._version = 0
+        self._facts = None
+        self.page_class = next(self._ids)
+
+    def _new_id(self) -> tuple[int, str]:
+        entity = next(self._ids)
+        return entity, f"00000000-0000-4000-8000-{entity:012d}"
+
+    def _changed(self):
+        self._version += 1
+        self._facts = None
+
+    # ---- Building ----
+
+    def add_page(self, title: str, blocks: list = (), properties: Optional[dict] = None) -> dict:
+        """
+        Add a page (or reuse an existing one) with top-level blocks.
+
+        Blocks are strings or {"content", "properties", "children"} dicts.
+        """
+        with self.lock:
+            page = self._ensure_page(title, properties)
+            for block in blocks:
+                self._insert_tree(page, None, block if isinstance(block, dict) else {"content": block}, None)
+            self._changed()
+            return self._page_view(page)
+
+    def _ensure_page(self, title: str, properties: Optional[dict] = None) -> dict:
+        page = self.pages.get(title.lower())
+        if page is None:
+            entity, uuid = self._new_id()
+            page = self.pages[title.lower()] = {
+                "id": entity, "uuid": uuid, "name": title.lower(), "originalName": title,
+                "properties": {}, "children": [], "createdAt": int(time.time() * 1000),
+            }
+        page["properties"].update(properties or {})
+        return page
+
+    def _insert_tree(self, page: dict, parent: Optional[dict], data: dict, position: Optional[int]) -> dict:
+        entity, uuid = self._new_id()
+        block = {
+            "id": entity, "uuid": uuid, "content": str(data.get("content", "")),
+            "properties": dict(data.get("properties") or {}), "page": page["name"],
+            "parent": parent["uuid"] if parent else None, "children": [],
+        }
+        self.blocks[uuid] = block
+        self._refs(block)
+        siblings = (parent or page)["children"]
+        siblings.insert(len(siblings) if position is None else position, uuid)
+        for child in data.get("children") or []:
+            self._insert_tree(page, block, child if isinstance(child, dict) else {"content": child}, None)
+        return block
+
+    def _refs(self, block: dict):
+        """Pages referenced by a block's content, created as Logseq does."""
+        names = []
+        for match in REF.finditer(block["content"]):
+            title = next(group for group in match.groups() if group)
+            names.append(self._ensure_page(title)["name"])
+        block["refs"] = names
+
+    # ---- Lookups and views ----
+
+    def _page(self, key: Any) -> Optional[dict]:
+        if isinstance(key, int):
+            return next((p for p in self.pages.values() if p["id"] == key), None)
+        key = str(key)
+        return self.pages.get(key.lower()) or next((p for p in self.pages.values() if p["uuid"] == key.lower()), None)
+
+    def _block(self, uuid: Any) -> dict:
+        block = self.blocks.get(str(uuid).lower())
+        if block is None:
+            raise FakeApiError(f"Block not found: {uuid}")
+        return block
+
+    def _container(self, block: dict) -> dict:
+        return self.blocks[block["parent"]] if block["parent"] else self.pages[block["page"]]
+
+    def _page_view(self, page: dict) -> dict:
+        return {
+            "id": page["id"], "uuid": page["uuid"], "name": page["name"],
+            "originalName": page["originalName"], "properties": dict(page["properties"]),
+            "journal?": False, "format": "markdown", "createdAt": page["createdAt"],
+        }
+
+    def _block_view(self, block: dict, tree: bool = False) -> dict:
+        page = self.pages[block["page"]]
+        parent = self.blocks[block["parent"]]["id"] if block["parent"] else page["id"]
+        children = ([self._block_view(self.blocks[c], True) for c in block["children"]] if tree
+                    else [["uuid", c] for c in block["children"]])
+        return {
+            "id": block["id"], "uuid": block["uuid"], "content": block["content"],
+            "properties": dict(block["properties"]), "page": {"id": page["id"]},
+            "parent": {"id": parent}, "refs": [{"id": self.pages[name]["id"]} for name in block["refs"]],
+            "children": children,
+        }
+
+    def _detach(self, block: dict):
+        self._container(block)["children"].remove(block["uuid"])
+
+    def _drop(self, block: dict):
+        for child in block["children"]:
+            self._drop(self.blocks[child])
+        del self.blocks[block["uuid"]]
+
+    # ---- API ----
+
+    def call(self, method: str, args: list) -> Any:
+        """Run an API method (e.g. "logseq.Editor.getPage") on the graph."""
+        handler = METHODS.get(method)
+        if handler is None:
+            raise FakeApiError(f"MethodNotExist: {method}")
+        with self.lock:
+            try:
+                return handler(self, *args)
+            except TypeError as e:
+                raise FakeApiError(f"Bad arguments for {method}: {e}")
+
+    def get_current_graph(self) -> dict:
+        return {"name": self.name, "path": f"/fake/{self.name}", "url": f"logseq_local_/fake/{self.name}"}
+
+    def get_page(self, key: Any, options: Optional[dict] = None) -> Optional[dict]:
+        page = self._page(key)
+        return self._page_view(page) if page else None
+
+    def create_page(self, title: str, properties: Optional[dict] = None, options: Optional[dict] = None) -> dict:
+        if title.lower() in self.pages:
+            return self._page_view(self.pages[title.lower()])
+        page = self._ensure_page(title, properties)
+        if (options or {}).get("createFirstBlock", True):
+            self._insert_tree(page, None, {"content": ""}, None)
+        self._changed()
+        return self._page_view(page)
+
+    def delete_page(self, title: str) -> None:
+        page = self._page(title)
+        if page is None:
+            raise FakeApiError(f"Page not found: {title}")
+        for uuid in page["children"]:
+            self._drop(self.blocks[uuid])
+        del self.pages[page["name"]]
+        self._changed()
+
+    def get_page_blocks_tree(self, key: Any) -> Optional[list]:
+        page = self._page(key)
+        if page is None:
+            return None
+        return [self._block_view(self.blocks[uuid], True) for uuid in page["children"]]
+
+    def get_block(self, uuid: Any, options: Optional[dict] = None) -> Optional[dict]:
+        block = self.blocks.get(str(uuid).lower())
+        if block is None:
+            return None
+        return self._block_view(block, bool((options or {}).get("includeChildren")))
+
+    def _insert(self, target: Any, trees: list, options: Optional[dict]) -> list[dict]:
+        """Insert block trees after/before a block, as its children, or at the end of a page."""
+        options = options or {}
+        before = bool(options.get("before"))
+        if str(target).lower() in self.blocks:
+            anchor = self.blocks[str(target).lower()]
+            page = self.pages[anchor["page"]]
+            if options.get("sibling"):
+                parent = self.blocks[anchor["parent"]] if anchor["parent"] else None
+                position = self._container(anchor)["children"].index(anchor["uuid"]) + (0 if before else 1)
+            else:
+                parent, position = anchor, 0 if before else None
+        else:
+            page = self._page(target)
+            if page is None:
+                raise FakeApiError(f"Target not found: {target}")
+            parent, position = None, 0 if before else None
+        created = []
+        for data in trees:
+            created.append(self._insert_tree(page, parent, data, position))
+            if position is not None:
+                position += 1
+        self._changed()
+        return created
+
+    def insert_block(self, target: Any, content: str, options: Optional[dict] = None) -> dict:
+        data = {"content": content, "properties": (options or {}).get("properties")}
+        return self._block_view(self._insert(target, [data], options)[0])
+
+    def insert_batch_block(self, target: Any, batch: Any, options: Optional[dict] = None) -> list[dict]:
+        trees = batch if isinstance(batch, list) else [batch]
+        return [self._block_view(block) for block in self._insert(target, trees, options)]
+
+    def update_block(self, uuid: Any, content: str, options: Optional[dict] = None) -> None:
+        block = self._block(uuid)
+        block["content"] = content
+        block["properties"].update((options or {}).get("properties") or {})
+        self._refs(block)
+        self._changed()
+
+    def remove_block(self, uuid: Any) -> None:
+        block = self._block(uuid)
+        self._detach(block)
+        self._drop(block)
+        self._changed()
+
+    def upsert_block_property(self, uuid: Any, key: str, value: Any) -> None:
+        self._block(uuid)["properties"][key] = value
+        self._changed()
+
+    def remove_block_property(self, uuid: Any, key: str) -> None:
+        self._block(uuid)["properties"].pop(key, None)
+        self._changed()
+
+    def get_block_properties(self, uuid: Any) -> dict:
+        return dict(self._block(uuid)["properties"])
+
+    def search(self, text: str, options: Optional[dict] = None) -> list[dict]:
+        """Blocks whose content contains the text, ignoring case."""
+        needle = text.lower()
+        limit = (options or {}).get("limit", 100)
+        found = [b for b in self.blocks.values() if needle in b["content"].lower()][:limit]
+        return [{"uuid": b["uuid"], "content": b["content"], "page": {"id": self.pages[b["page"]]["id"]}}
+                for b in found]
+
+    def datascript_query(self, query: str, *inputs) -> list:
+        return Query(self, read_edn(query)).run(list(inputs))
+
+    # ---- Datalog facts ----
+
+    def facts(self) -> "Facts":
+        if self._facts is None:
+            self._facts = Facts(self)
+        return self._facts
+
+
+METHODS = {
+    "logseq.App.getCurrentGraph": FakeGraph.get_current_graph,
+    "logseq.App.search": FakeGraph.search,
+    "logseq.Editor.getPage": FakeGraph.get_page,
+    "logseq.Editor.createPage": FakeGraph.create_page,
+    "logseq.Editor.deletePage": FakeGraph.delete_page,
+    "logseq.Editor.getPageBlocksTree": FakeGraph.get_page_blocks_tree,
+    "logseq.Editor.getBlock": FakeGraph.get_block,
+    "logseq.Editor.insertBlock": FakeGraph.insert_block,
+    "logseq.Editor.insertBatchBlock": FakeGraph.insert_batch_block,
+    "logseq.Editor.updateBlock": FakeGraph.update_block,
+    "logseq.Editor.removeBlock": FakeGraph.remove_block,
+    "logseq.Editor.upsertBlockProperty": FakeGraph.upsert_block_property,
+    "logseq.Editor.removeBlockProperty": FakeGraph.remove_block_property,
+    "logseq.Editor.getBlockProperties": FakeGraph.get_block_properties,
+    "logseq.DB.datascriptQuery": FakeGraph.datascript_query,
+}
+
+
+class Facts:
+    """The graph as [entity attribute value] datoms, indexed by attribute and entity."""
+
+    def __init__(self, graph: FakeGraph):
+        self.by_attribute: dict[str, list[tuple]] = {}
+        self.by_entity: dict[int, dict[str, list]] = {}
+        self.add(graph.page_class, ":db/ident", Keyword(PAGE_CLASS))
+        self.add(graph.page_class, ":block/title", "Page")
+        for page in graph.pages.values():
+            entity = page["id"]
+            self.add(entity, ":block/uuid", page["uuid"])
+            self.add(entity, ":block/name", page["name"])
+            self.add(entity, ":block/title", page["originalName"])
+            self.add(entity, ":block/original-name", page["originalName"])
+            self.add(entity, ":block/tags", graph.page_class)
+            for key, value in page["properties"].items():
+                self.add(entity, f":user.property/{key}", value)
+        for block in graph.blocks.values():
+            entity = block["id"]
+            self.add(entity, ":block/uuid", block["uuid"])
+            self.add(entity, ":block/title", block["content"])
+            self.add(entity, ":block/content", block["content"])
+            self.add(entity, ":block/page", graph.pages[block["page"]]["id"])
+            parent = graph.blocks[block["parent"]]["id"] if block["parent"] else graph.pages[block["page"]]["id"]
+            self.add(entity, ":block/parent", parent)
+            for name in block["refs"]:
+                self.add(entity, ":block/refs", graph.pages[name]["id"])
+            for key, value in block["properties"].items():
+                self.add(entity, f":user.property/{key}", value)
+
+    def add(self, entity: int, attribute: str, value: Any):
+        self.by_attribute.setdefault(attribute, []).append((entity, value))
+        self.by_entity.setdefault(entity, {}).setdefault(attribute, []).append(value)
+
+    def pull(self, entity: int, pattern: list) -> dict:
+        attributes = self.by_entity.get(entity, {})
+        result = {}
+        for item in pattern:
+            if item == "*":
+                result["id"] = entity
+                for attribute, values in attributes.items():
+                    refs = [{"id": v} for v in values] if attribute in REF_ATTRS else values
+                    result[json_key(attribute)] = refs if attribute in MANY_ATTRS else refs[0]
+            elif isinstance(item, dict):
+                for attribute, sub in item.items():
+                    values = [self.pull(v, sub) for v in attributes.get(attribute, [])]
+                    if values:
+                        result[json_key(attribute)] = values if attribute in MANY_ATTRS else values[0]
+            elif item == ":db/id":
+                result["id"] = entity
+            else:
+                values = attributes.get(item, [])
+                if values:
+                    refs = [{"id": v} for v in values] if item in REF_ATTRS else values
+                    result[json_key(item)] = refs if item in MANY_ATTRS else refs[0]
+        return result
+
+
+# ============== Datalog ==============
+
+PREDICATES = {
+    "clojure.string/includes?": lambda s, part: isinstance(s, str) and part in s,
+    "clojure.string/starts-with?": lambda s, part: isinstance(s, str) and s.startswith(part),
+    "clojure.string/ends-with?": lambda s, part: isinstance(s, str) and s.endswith(part),
+    "=": lambda *values: all(v == values[0] for v in values),
+    "not=": lambda *values: not all(v == values[0] for v in values),
+    "<": lambda a, b: a < b,
+    ">": lambda a, b: a > b,
+    "<=": lambda a, b: a <= b,
+    ">=": lambda a, b: a >= b,
+    "contains?": lambda coll, value: value in coll,
+}
+
+FUNCTIONS = {
+    "ground": lambda value: value,
+    "str": lambda *values: "".join("" if v is None else str(v) for v in values),
+    "clojure.string/lower-case": lambda s: s.lower(),
+}
+
+
+def is_var(value: Any) -> bool:
+    return isinstance(value, Symbol) and value.startswith("?")
+
+
+class Query:
+    """A parsed Datalog query over a graph's facts."""
+
+    def __init__(self, graph: FakeGraph, form: Any):
+        if not isinstance(form, list) or not form or form[0] != ":find":
+            raise FakeApiError("Query must be a vector starting with :find")
+        self.facts = graph.facts()
+        sections, current = {}, None
+        for item in form:
+            if isinstance(item, Keyword):
+                current = sections.setdefault(item, [])
+            else:
+                current.append(item)
+        unknown = set(sections) - {":find", ":in", ":where"}
+        if unknown:
+            raise FakeApiError(f"Unsupported query section {sorted(unknown)[0]}")
+        self.find = sections[":find"]
+        self.inputs = sections.get(":in", [Symbol("$")])
+        self.where = sections.get(":where", [])
+
+    def run(self, inputs: list) -> list:
+        rows = [{}]
+        forms = [form for form in self.inputs if not (isinstance(form, Symbol) and form.startswith("$"))]
+        if len(forms) != len(inputs):
+            raise FakeApiError(f"Query expects {len(forms)} input(s), got {len(inputs)}")
+        for form, value in zip(forms, inputs):
+            rows = [row for base in rows for row in self._bind(form, value, base)]
+        for clause in self.where:
+            rows = self._clause(clause, rows)
+
+        results, seen = [], set()
+        for row in rows:
+            key = tuple(json.dumps(self._resolve(element, row, find=True), sort_keys=True, default=str)
+                        for element in self.find if not isinstance(element, tuple))
+            key += tuple(row.get(element[1]) for element in self.find if isinstance(element, tuple))
+            if key in seen:
+                continue
+            seen.add(key)
+            results.append([self._find(element, row) for element in self.find])
+        return results
+
+    def _find(self, element: Any, row: dict) -> Any:
+        if isinstance(element, tuple):
+            if len(element) != 3 or element[0] != "pull":
+                raise FakeApiError(f"Unsupported :find element {element[0]}")
+            return self.facts.pull(self._resolve(element[1], row), element[2])
+        return self._resolve(element, row, find=True)
+
+    def _resolve(self, value: Any, row: dict, find: bool = False) -> Any:
+        if is_var(value):
+            if value not in row:
+                raise FakeApiError(f"Insufficient bindings: {value} not bound")
+            return row[value]
+        if find:
+            raise FakeApiError(f"Unsupported :find element {value}")
+        return value
+
+    def _bind(self, form: Any, value: Any, row: dict) -> list[dict]:
+        """Rows extending row with a binding form (?x, _, [?x ...], [?a ?b], [[?a ?b]])."""
+        if form == "_":
+            return [row]
+        if is_var(form):
+            if form in row and row[form] != value:
+                return []
+            return [{**row, form: value}]
+        if isinstance(form, list):
+            if len(form) == 2 and form[1] == "...":
+                return [r for item in (value or []) for r in self._bind(form[0], item, row)]
+            if len(form) == 1 and isinstance(form[0], list):
+                return [r for item in (value or []) for r in self._bind(form[0], item, row)]
+            if not isinstance(value, (list, tuple)) or len(value) != len(form):
+                return []
+            rows = [row]
+            for part, item in zip(form, value):
+                rows = [r for base in rows for r in self._bind(part, item, base)]
+            return rows
+        raise FakeApiError(f"Unsupported binding form {form}")
+
+    def _clause(self, clause: Any, rows: list[dict]) -> list[dict]:
+        if isinstance(clause, tuple):
+            raise FakeApiError(f"Unsupported clause ({clause[0] if clause else ''} ...)")
+        if not isinstance(clause, list) or not clause:
+            raise FakeApiError(f"Unsupported clause {clause}")
+        if isinstance(clause[0], tuple):
+            return self._function(clause, rows)
+        if isinstance(clause[0], Symbol) and clause[0].startswith("$"):
+            clause = clause[1:]
+        return self._pattern(clause, rows)
+
+    def _function(self, clause: list, rows: list[dict]) -> list[dict]:
+        name, *args = clause[0]
+        binding = clause[1] if len(clause) > 1 else None
+        if binding is None:
+            predicate = PREDICATES.get(name)
+            if predicate is None:
+                raise FakeApiError(f"Unknown predicate {name}")
+            return [row for row in rows if self._apply(predicate, args, row)]
+        function = FUNCTIONS.get(name)
+        if function is None:
+            raise FakeApiError(f"Unknown function {name}")
+        return [r for row in rows for r in self._bind(binding, self._apply(function, args, row), row)]
+
+    def _apply(self, function, args: list, row: dict) -> Any:
+        try:
+            return function(*(self._resolve(arg, row) for arg in args))
+        except TypeError:
+            return False
+
+    def _pattern(self, clause: list, rows: list[dict]) -> list[dict]:
+        entity, attribute, *rest = clause
+        value = rest[0] if rest else Symbol("_")
+        if not isinstance(attribute, Keyword):
+            raise FakeApiError("Only constant attributes are supported in data patterns")
+        matched = []
+        for row in rows:
+            e = row.get(entity, entity) if is_var(entity) else entity
+            if is_var(e) or e == "_":
+                candidates = self.facts.by_attribute.get(attribute, [])
+            else:
+                candidates = [(e, v) for v in self.facts.by_entity.get(e, {}).get(attribute, [])]
+            for fact_entity, fact_value in candidates:
+                extended = self._bind(entity, fact_entity, row) if entity != "_" else [row]
+                for r in extended:
+                    if value == "_":
+                        matched.append(r)
+                    elif is_var(value):
+                        matched.extend(self._bind(value, fact_value, r))
+                    elif value == fact_value:
+                        matched.append(r)
+        return matched
+
+
+# ============== Server ==============
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this the body
+        # waits on the client's delayed ACK (about 40ms per request)
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_POST(self):
+        server = self.server.fake
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if server.latency:
+            time.sleep(server.latency)
+        if self.path.rstrip("/") != "/api":
+            return self._send(404, {"error": "Not found"})
+        if server.token and self.headers.get("Authorization") != f"Bearer {server.token}":
+            return self._send(401, {"error": "Unauthorized"})
+        try:
+            payload = json.loads(body)
+            method, args = payload["method"], payload.get("args") or []
+        except (ValueError, KeyError, TypeError):
+            return self._send(400, {"error": "Invalid request"})
+        server.count(method)
+        try:
+            return self._send(200, {"result": server.graph.call(method, args)})
+        except FakeApiError as e:
+            return self._send(200, {"error": str(e)})
+
+    def _send(self, status: int, payload: dict):
+        data = json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeLogseqServer:
+    """A FakeGraph served over HTTP on a background thread."""
+
+    def __init__(
+        self,
+        graph: Optional[FakeGraph] = None,
+        token: str = "",
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        """
+        Args:
+            graph: Graph to serve (a new empty one by default)
+            token: Bearer token required on every request ("" for none)
+            latency: Seconds each request waits before it is answered
+            host, port: Address to listen on (port 0: any free port)
+        """
+        self.graph = graph or FakeGraph()
+        self.token = token
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, method: str):
+        with self._lock:
+            self.requests[method] += 1
+
+    def reset_requests(self):
+        with self._lock:
+            self.requests.clear()
+
+    def start(self) -> "FakeLogseqServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.01,), daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeLogseqServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ============== Benchmark ==============
+
+def _load(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def benchmark(count: int = 200, latency: float = 0.002, concurrency: int = 8) -> dict:
+    """
+    Operations per second of LogseqClient, AsyncLogseqClient and LogseqWriter
+    against a fake server answering each request after `latency` seconds.
+    """
+    here = Path(__file__).resolve().parent
+    client_module = _load("logseq_client", here / "logseq-client.py")
+    writer_module = _load("write_operations", here.parents[1] / "writing-to-logseq" / "scripts" / "write-operations.py")
+    graph = FakeGraph()
+    titles = [f"Page {i}" for i in range(count)]
+    for title in titles:
+        graph.add_page(title, [f"Notes for {title} about [[Project {int(title.split()[1]) % 10}]]"])
+    results = {}
+
+    def timed(name: str, operations: int, run):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        results[name] = {"operations": operations, "seconds": round(elapsed, 3),
+                         "per_second": round(operations / elapsed, 1)}
+
+    with FakeLogseqServer(graph, token="bench", latency=latency) as server:
+        client = client_module.LogseqClient(backend="http", url=server.url, token="bench")
+        async_client = client_module.AsyncLogseqClient(
+            backend="http", url=server.url, token="bench", concurrency=concurrency)
+        writer = writer_module.LogseqWriter(url=server.url, token="bench")
+
+        timed("get_page", count, lambda: [client.get_page(title) for title in titles])
+        timed("gather_pages", count, lambda: asyncio.run(async_client.gather_pages(titles)))
+        timed("get_backlinks", 10, lambda: [client.get_backlinks(f"Project {i}") for i in range(10)])
+        timed("append_to_page", count, lambda: [writer.append_to_page("Inbox", f"Item {i}") for i in range(count)])
+        timed("import_blocks", count, lambda: writer.import_blocks(
+            "Imported", [{"content": f"Line {i}"} for i in range(count)]))
+        results["requests"] = dict(server.requests)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an in-memory fake of the Logseq HTTP API")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=12315, help="Port to listen on")
+    parser.add_argument("--token", default="", help="Bearer token to require")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay before each response")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Time client and writer operations on N pages")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(json.dumps(benchmark(args.benchmark, args.latency_ms / 1000), indent=2))
+        return 0
+
+    graph = FakeGraph()
+    graph.add_page("Home", ["Welcome to the fake graph", "See [[Inbox]]"])
+    server = FakeLogseqServer(graph, args.token, args.latency_ms / 1000, args.host, args.port).start()
+    print(f"Fake Logseq API at {server.url}/api (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
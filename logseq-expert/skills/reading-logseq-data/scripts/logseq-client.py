@@ -2,7 +2,8 @@
 """
 Logseq Client Library
 
-Unified client for reading data from Logseq graphs via HTTP API or CLI.
+Unified client for reading data from Logseq graphs via HTTP API, CLI,
+or the markdown files of a file-based graph.
 Supports auto-detection of available backends.
 
 Usage:
@@ -11,16 +12,40 @@ Usage:
     client = LogseqClient()
     page = client.get_page("My Page")
     results = client.datalog_query("[:find ?title :where [?p :block/title ?title]]")
+
+    # Repeated reads served from memory until a write or the TTL
+    client = LogseqClient(cache=True, cache_ttl=30)
+    client.get_page("My Page")
+    print(client.cache_stats())
+
+    # Several pages in one CLI invocation (one request each over HTTP)
+    pages = client.get_pages(["Home", "Inbox"])
+
+    # Many reads in flight at once from asyncio code
+    client = AsyncLogseqClient(concurrency=8)
+    pages = await client.gather_pages(["Home", "Inbox", "Project Alpha"])
 """
 
+import asyncio
 import json
-import os
-import subprocess
-import urllib.request
-import urllib.error
+import sys
+import time
 from pathlib import Path
 from typing import Any, Optional, Union
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from logseq_cache import ANY_WRITE, DEFAULT_MAX_ENTRIES, DEFAULT_TTL, ReadCache, is_mutation, uuids_in
+from logseq_cli import CliError, CliNotFound, CliRunner, cli_available
+from logseq_env import forget_detection, recent_detection, record_detection, resolve_settings
+from logseq_files import GraphIndex, find_logseq_graphs, is_file_graph
+from logseq_http import MAX_IDLE, TransportError, get_transport
+
+# Seconds between checks of a file graph for changed files
+FILE_REFRESH_INTERVAL = 2.0
+
+# Requests AsyncLogseqClient keeps in flight (each holds one pooled connection)
+ASYNC_CONCURRENCY = MAX_IDLE
+
 
 class LogseqError(Exception):
     """Base exception for Logseq operations."""
@@ -47,11 +72,20 @@ class QueryError(LogseqError):
     pass
 
 
+def _page_tags(key: str, include_children: bool) -> list:
+    """Cache tags for a page lookup by lowercased title."""
+    if include_children:
+        return [key]
+    # Page properties live in the page's first (pre-)block. Without the
+    # blocks its UUID isn't in the entry, so any write drops the page.
+    return [key, ANY_WRITE]
+
+
 class LogseqClient:
     """
     Unified client for Logseq operations.
 
-    Supports HTTP API and CLI backends with automatic fallback.
+    Supports HTTP API, CLI and file backends with automatic fallback.
     """
 
     # Exception classes as attributes for easy access
@@ -66,23 +100,30 @@ class LogseqClient:
         backend: Optional[str] = None,
         url: Optional[str] = None,
         token: Optional[str] = None,
-        graph_path: Optional[str] = None
+        graph_path: Optional[str] = None,
+        cache: bool = False,
+        cache_ttl: Optional[float] = DEFAULT_TTL,
+        cache_size: int = DEFAULT_MAX_ENTRIES
     ):
         """
         Initialize the Logseq client.
 
         Args:
-            backend: Force specific backend ("http", "cli", or None for auto)
+            backend: Force specific backend ("http", "cli", "file", or None for auto)
             url: HTTP API URL (default: from env or http://127.0.0.1:12315)
             token: API token (default: from env LOGSEQ_API_TOKEN)
-            graph_path: Path to graph for CLI backend
+            graph_path: Path to graph for CLI and file backends
+            cache: Cache page, block, property and query reads in memory;
+                LogseqWriter writes in this process invalidate them
+            cache_ttl: Seconds a cached read stays valid (None: until invalidated)
+            cache_size: Most cached reads kept (least recently used dropped)
         """
-        self.url = url or os.environ.get("LOGSEQ_API_URL", "http://127.0.0.1:12315")
-        self.token = token or os.environ.get("LOGSEQ_API_TOKEN", "")
-        self.graph_path = graph_path or os.environ.get("LOGSEQ_GRAPH_PATH", "")
+        # Arguments, then environment, then env.json (parsed once per process)
+        self.url, self.token, self.graph_path = resolve_settings(url, token, graph_path)
 
-        # Load config if available
-        self._load_config()
+        self.cache = ReadCache(self.url, cache_ttl, cache_size) if cache else None
+        self._graph_index: Optional[GraphIndex] = None
+        self._cli: Optional[CliRunner] = None
 
         # Detect backend
         if backend:
@@ -90,37 +131,23 @@ class LogseqClient:
         else:
             self.backend = self._detect_backend()
 
-    def _load_config(self):
-        """Load configuration from env.json if available."""
-        config_path = Path.cwd() / ".claude" / "logseq-expert" / "env.json"
-        if config_path.exists():
-            try:
-                with open(config_path) as f:
-                    config = json.load(f)
-
-                # HTTP settings
-                http_config = config.get("http", {})
-                if not self.url or self.url == "http://127.0.0.1:12315":
-                    self.url = http_config.get("url", self.url)
-                if not self.token:
-                    token = http_config.get("token", "")
-                    if token.startswith("${") and token.endswith("}"):
-                        # Environment variable reference
-                        var_name = token[2:-1]
-                        self.token = os.environ.get(var_name, "")
-                    else:
-                        self.token = token
-
-                # CLI settings
-                cli_config = config.get("cli", {})
-                if not self.graph_path:
-                    self.graph_path = cli_config.get("graphPath", "")
-
-            except Exception:
-                pass  # Config loading is optional
-
     def _detect_backend(self) -> str:
-        """Auto-detect the best available backend."""
+        """
+        Auto-detect the best available backend.
+
+        A detection recorded in the last few minutes (logseq_env) is reused
+        without probing; a new one is recorded for later clients.
+        """
+        configured = self.graph_path
+        detected = recent_detection(self.url, configured)
+        if detected:
+            backend, self.graph_path = detected
+            return backend
+        backend = self._probe_backends()
+        record_detection(self.url, configured, backend, self.graph_path)
+        return backend
+
+    def _probe_backends(self) -> str:
         # Try HTTP first
         if self._test_http():
             return "http"
@@ -129,7 +156,11 @@ class LogseqClient:
         if self._test_cli():
             return "cli"
 
-        raise ConnectionError("No Logseq backend available. Start Logseq or install CLI.")
+        # Then read a markdown graph's files directly
+        if self._test_files():
+            return "file"
+
+        raise ConnectionError("No Logseq backend available. Start Logseq, install CLI, or set a graph path.")
 
     def _test_http(self) -> bool:
         """Test if HTTP API is available."""
@@ -146,78 +177,120 @@ class LogseqClient:
             return False
 
     def _test_cli(self) -> bool:
-        """Test if CLI is available."""
-        try:
-            result = subprocess.run(
-                ["logseq", "--version"],
-                capture_output=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+        """Test if CLI is available (checked once per process)."""
+        return cli_available()
+
+    def _test_files(self) -> bool:
+        """Test if a file-based graph is available (configured or found)."""
+        if self.graph_path:
+            return is_file_graph(self.graph_path)
+        graphs = [graph for graph in find_logseq_graphs() if is_file_graph(graph)]
+        if graphs:
+            self.graph_path = str(graphs[0])
+            return True
+        return False
+
+    def _files(self) -> GraphIndex:
+        """The graph's file index, checked for changed files every FILE_REFRESH_INTERVAL."""
+        if self._graph_index is None:
+            if not self.graph_path or not is_file_graph(self.graph_path):
+                raise ConnectionError(f"Not a file-based Logseq graph: {self.graph_path or '(no graph path)'}")
+            self._graph_index = GraphIndex(self.graph_path)
+        index = self._graph_index
+        if time.monotonic() - index.refreshed_at >= FILE_REFRESH_INTERVAL:
+            index.refresh_and_save()
+        return index
 
     def _http_call(self, method: str, args: list = None) -> Any:
-        """Make HTTP API call."""
+        """Make HTTP API call over the shared keep-alive connection."""
         if not self.token:
             raise AuthError("No API token configured")
 
         try:
-            req = urllib.request.Request(
-                f"{self.url}/api",
-                data=json.dumps({"method": method, "args": args or []}).encode(),
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.token}"
-                },
-                method="POST"
+            status, reason, data = get_transport(self.url).post_json(
+                "/api",
+                {"method": method, "args": args or []},
+                {"Authorization": f"Bearer {self.token}"},
+                idempotent=not is_mutation(method),
             )
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                data = json.loads(response.read().decode())
-
-                if "error" in data:
-                    raise QueryError(data["error"])
-
-                return data.get("result")
-
-        except urllib.error.HTTPError as e:
-            if e.code == 401:
-                raise AuthError("Invalid token")
-            raise ConnectionError(f"HTTP error {e.code}: {e.reason}")
-        except urllib.error.URLError as e:
-            raise ConnectionError(f"Connection failed: {e.reason}")
-
-    def _cli_query(self, query: str, params: list = None) -> Any:
-        """Execute query via CLI."""
-        cmd = ["logseq", "query", query]
-
-        if self.graph_path:
-            cmd.extend(["--graph", self.graph_path])
-        elif self.token:
-            cmd.extend(["--in-app", "-a", self.token])
-
-        cmd.extend(["--format", "json"])
-
+        except (TransportError, ValueError) as e:
+            # Probe again next time rather than trust a recorded detection
+            forget_detection(self.url, "http")
+            raise ConnectionError(f"Connection failed: {e}")
+
+        if status == 401:
+            raise AuthError("Invalid token")
+        if status >= 400:
+            raise ConnectionError(f"HTTP error {status}: {reason}")
+        if not isinstance(data, dict):
+            raise QueryError("Invalid response from Logseq API")
+        if "error" in data:
+            raise QueryError(data["error"])
+
+        return data.get("result")
+
+    def _runner(self) -> CliRunner:
+        if self._cli is None:
+            self._cli = CliRunner(self.graph_path, self.token)
+        return self._cli
+
+    def _cli_call(self, run, *args) -> Any:
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            if result.returncode != 0:
-                raise QueryError(f"CLI error: {result.stderr}")
+            return run(*args)
+        except CliNotFound:
+            forget_detection(backend="cli")
+            raise ConnectionError("Logseq CLI not found")
+        except CliError as e:
+            raise QueryError(str(e))
 
-            return json.loads(result.stdout)
+    def _cli_query(self, query: str, params: list = None) -> Any:
+        """Execute query via CLI (inputs bound into the query text)."""
+        return self._cli_call(self._runner().query, query, params)
 
-        except subprocess.TimeoutExpired:
-            raise QueryError("Query timed out")
-        except json.JSONDecodeError:
-            raise QueryError("Invalid response from CLI")
-        except FileNotFoundError:
-            raise ConnectionError("Logseq CLI not found")
+    def _cli_lookup(self, kind: str, attribute: str, keys: list, include_children: bool) -> dict:
+        """
+        Cached pages or blocks by lowercased name or UUID, the misses looked
+        up together in one CLI invocation (for get_pages and get_blocks;
+        single lookups are cached by _cached).
+        """
+        found, missing = {}, []
+        for key in dict.fromkeys(keys):
+            hit, value = self.cache.get((kind, key, include_children)) if self.cache else (False, None)
+            if hit:
+                found[key] = value
+            else:
+                missing.append(key)
+        if missing:
+            entities = self._cli_call(self._runner().lookup, attribute, missing)
+            for key in missing:
+                found[key] = entities.get(key)
+                if self.cache is not None:
+                    tags = _page_tags(key, include_children) if kind == "page" else [key]
+                    self.cache.put((kind, key, include_children), found[key], [*tags, *uuids_in(found[key])])
+        return found
+
+    def _cached(self, key: tuple, fetch, tags: list, alternatives: tuple = ()) -> Any:
+        """Read through the cache: fetch() on a miss, tagged with tags plus the result's UUIDs."""
+        # The file backend already answers from memory
+        if self.cache is None or self.backend == "file":
+            return fetch()
+        hit, value = self.cache.get(key, alternatives)
+        if hit:
+            return value
+        value = fetch()
+        self.cache.put(key, value, [*tags, *uuids_in(value)])
+        return value
+
+    def cache_stats(self) -> dict:
+        """Read cache hit/miss statistics ({"enabled": False} without a cache)."""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.stats()}
+
+    def clear_cache(self):
+        """Drop every cached read."""
+        if self.cache is not None:
+            self.cache.clear()
 
     # ============== Read Operations ==============
 
@@ -225,6 +298,9 @@ class LogseqClient:
         """Get information about the current graph."""
         if self.backend == "http":
             return self._http_call("logseq.App.getCurrentGraph")
+        elif self.backend == "file":
+            index = self._files()
+            return {"path": str(index.root), "backend": "file", "pages": len(index.records)}
         else:
             # CLI doesn't have direct equivalent
             return {"path": self.graph_path, "backend": "cli"}
@@ -240,6 +316,19 @@ class LogseqClient:
         Returns:
             Page data or None if not found
         """
+        key = title.lower()
+        # A cached page with children also answers a request without them
+        page = self._cached(
+            ("page", key, include_children),
+            lambda: self._fetch_page(title, include_children),
+            _page_tags(key, include_children),
+            alternatives=() if include_children else (("page", key, True),),
+        )
+        if page and not include_children:
+            page.pop("blocks", None)
+        return page
+
+    def _fetch_page(self, title: str, include_children: bool) -> Optional[dict]:
         if self.backend == "http":
             page = self._http_call("logseq.Editor.getPage", [title])
             if page and include_children:
@@ -248,16 +337,10 @@ class LogseqClient:
                     [title]
                 )
             return page
+        elif self.backend == "file":
+            return self._files().get_page(title, include_children)
         else:
-            # Use query for CLI
-            result = self._cli_query(f'''
-                [:find (pull ?p [*])
-                 :in $ ?title
-                 :where [?p :block/title ?title]]
-            ''')
-            if result and len(result) > 0:
-                return result[0][0] if isinstance(result[0], list) else result[0]
-            return None
+            return self._cli_call(self._runner().lookup, ":block/name", [title.lower()]).get(title.lower())
 
     def get_block(self, uuid: str, include_children: bool = True) -> Optional[dict]:
         """
@@ -270,20 +353,58 @@ class LogseqClient:
         Returns:
             Block data or None if not found
         """
+        return self._cached(
+            ("block", uuid.lower(), include_children),
+            lambda: self._fetch_block(uuid, include_children),
+            [uuid],
+        )
+
+    def _fetch_block(self, uuid: str, include_children: bool) -> Optional[dict]:
         if self.backend == "http":
             return self._http_call(
                 "logseq.Editor.getBlock",
                 [uuid, {"includeChildren": include_children}]
             )
+        elif self.backend == "file":
+            # Only blocks with an id:: property have a UUID on disk
+            return self._files().get_block(uuid, include_children)
         else:
-            result = self._cli_query(f'''
-                [:find (pull ?b [*])
-                 :in $ ?uuid
-                 :where [?b :block/uuid ?uuid]]
-            ''')
-            if result and len(result) > 0:
-                return result[0][0] if isinstance(result[0], list) else result[0]
-            return None
+            return self._cli_call(self._runner().lookup, ":block/uuid", [uuid.lower()]).get(uuid.lower())
+
+    def get_pages(self, titles: list, include_children: bool = True) -> dict:
+        """
+        Get several pages by title.
+
+        The CLI backend looks up every uncached page in one invocation;
+        the others fetch each page in turn.
+
+        Args:
+            titles: Page titles
+            include_children: Include child blocks
+
+        Returns:
+            {title: page data or None}
+        """
+        if self.backend != "cli":
+            return {title: self.get_page(title, include_children) for title in titles}
+        pages = self._cli_lookup("page", ":block/name", [t.lower() for t in titles], include_children)
+        return {title: pages[title.lower()] for title in titles}
+
+    def get_blocks(self, uuids: list, include_children: bool = True) -> dict:
+        """
+        Get several blocks by UUID, in one invocation on the CLI backend.
+
+        Args:
+            uuids: Block UUIDs
+            include_children: Include child blocks
+
+        Returns:
+            {uuid: block data or None}
+        """
+        if self.backend != "cli":
+            return {uuid: self.get_block(uuid, include_children) for uuid in uuids}
+        blocks = self._cli_lookup("block", ":block/uuid", [u.lower() for u in uuids], include_children)
+        return {uuid: blocks[uuid.lower()] for uuid in uuids}
 
     def list_pages(self, limit: int = None) -> list:
         """
@@ -295,6 +416,9 @@ class LogseqClient:
         Returns:
             List of page summaries
         """
+        if self.backend == "file":
+            return self._files().list_pages(limit)
+
         query = '''
             [:find (pull ?p [:block/title :block/uuid])
              :where
@@ -323,6 +447,9 @@ class LogseqClient:
         Returns:
             List of matching blocks
         """
+        if self.backend == "file":
+            return self._files().search(query_text, limit)
+
         if self.backend == "http":
             # Use search API if available
             try:
@@ -331,12 +458,14 @@ class LogseqClient:
                 pass
 
         # Fallback to query (less efficient but works)
-        # Note: This is a simple substring match, not full-text search
+        # Note: This is a simple substring match, not full-text search.
+        # The text is embedded as an escaped string literal (the CLI takes
+        # no query inputs), so quotes in it can't break the query.
         query = f'''
             [:find (pull ?b [:block/title :block/uuid {{:block/page [:block/title]}}])
              :where
              [?b :block/title ?title]
-             [(clojure.string/includes? ?title "{query_text}")]]
+             [(clojure.string/includes? ?title {json.dumps(query_text, ensure_ascii=False)})]]
         '''
         results = self.datalog_query(query)
         return [r[0] if isinstance(r, list) else r for r in results][:limit]
@@ -352,10 +481,52 @@ class LogseqClient:
         Returns:
             Query results
         """
+        # Any write may change a query's results
+        return self._cached(
+            ("query", query, json.dumps(params, sort_keys=True, default=str)),
+            lambda: self._run_query(query, params),
+            [ANY_WRITE],
+        )
+
+    def datalog_queries(self, queries: list) -> list:
+        """
+        Execute several Datalog queries, results in order.
+
+        On the CLI backend the uncached queries run concurrently, each
+        distinct query once.
+
+        Args:
+            queries: Query strings or (query, params) pairs
+
+        Returns:
+            One result list per query
+        """
+        requests = [(q, None) if isinstance(q, str) else tuple(q) for q in queries]
+        if self.backend != "cli":
+            return [self.datalog_query(query, params) for query, params in requests]
+
+        keys = [("query", query, json.dumps(params, sort_keys=True, default=str)) for query, params in requests]
+        results, missing = {}, {}
+        for key, request in zip(keys, requests):
+            hit, value = self.cache.get(key) if self.cache else (False, None)
+            if hit:
+                results[key] = value
+            else:
+                missing[key] = request
+        if missing:
+            answers = self._cli_call(self._runner().query_many, list(missing.values()))
+            for key, answer in zip(missing, answers):
+                results[key] = answer or []
+                if self.cache is not None:
+                    self.cache.put(key, results[key], [ANY_WRITE])
+        return [results[key] for key in keys]
+
+    def _run_query(self, query: str, params: list = None) -> list:
+        if self.backend == "file":
+            raise QueryError("Datalog queries need the HTTP or CLI backend")
         if self.backend == "http":
-            args = [query]
-            if params:
-                args.append(params)
+            # The API takes each :in input as its own argument
+            args = [query, *(params or [])]
             return self._http_call("logseq.DB.datascriptQuery", args) or []
         else:
             return self._cli_query(query, params) or []
@@ -370,6 +541,9 @@ class LogseqClient:
         Returns:
             List of referencing blocks
         """
+        if self.backend == "file":
+            return self._files().get_backlinks(title)
+
         query = '''
             [:find (pull ?b [:block/title :block/uuid {:block/page [:block/title]}])
              :in $ ?page-title
@@ -390,11 +564,11 @@ class LogseqClient:
         Returns:
             Dictionary of properties
         """
-        if self.backend == "http":
-            page = self._http_call("logseq.Editor.getPage", [title])
+        # Served from a cached page (with or without children) when there is one
+        page = self.get_page(title, include_children=False)
+        if self.backend in ("http", "file"):
             return page.get("properties", {}) if page else {}
         else:
-            page = self.get_page(title, include_children=False)
             # Extract properties from page data
             if page:
                 props = {}
@@ -416,7 +590,14 @@ class LogseqClient:
             Dictionary of properties
         """
         if self.backend == "http":
-            return self._http_call("logseq.Editor.getBlockProperties", [uuid]) or {}
+            return self._cached(
+                ("block_properties", uuid.lower()),
+                lambda: self._http_call("logseq.Editor.getBlockProperties", [uuid]) or {},
+                [uuid],
+            )
+        elif self.backend == "file":
+            block = self.get_block(uuid, include_children=False)
+            return block.get("properties", {}) if block else {}
         else:
             block = self.get_block(uuid, include_children=False)
             if block:
@@ -429,6 +610,116 @@ class LogseqClient:
             return {}
 
 
+class AsyncLogseqClient:
+    """
+    asyncio interface to LogseqClient for fanning out many reads at once.
+
+    Each call runs the synchronous client in a worker thread, over the same
+    keep-alive HTTP transport and read cache; at most `concurrency` calls
+    are in flight. The file backend answers from memory and takes calls one
+    at a time. Raises the same exceptions as LogseqClient.
+
+    Backend detection happens in the constructor, as for LogseqClient.
+    """
+
+    Error = LogseqError
+    ConnectionError = ConnectionError
+    AuthError = AuthError
+    NotFoundError = NotFoundError
+    QueryError = QueryError
+
+    def __init__(self, *args, concurrency: int = ASYNC_CONCURRENCY, **kwargs):
+        """
+        Initialize the client.
+
+        Args:
+            concurrency: Most calls in flight at once
+            *args, **kwargs: As for LogseqClient
+        """
+        self.client = LogseqClient(*args, **kwargs)
+        self.concurrency = max(1, concurrency) if self.client.backend != "file" else 1
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop = None
+
+    @property
+    def backend(self) -> str:
+        return self.client.backend
+
+    async def _run(self, method, *args) -> Any:
+        # A semaphore belongs to one event loop; asyncio.run() makes a new one each time
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._slots, self._loop = asyncio.Semaphore(self.concurrency), loop
+        async with self._slots:
+            return await asyncio.to_thread(method, *args)
+
+    async def _gather(self, method, keys: list, *args) -> dict:
+        """{key: method(key, *args)} for each distinct key, run concurrently."""
+        keys = list(dict.fromkeys(keys))
+        results = await asyncio.gather(*(self._run(method, key, *args) for key in keys), return_exceptions=True)
+        # Raise the first failure only once every call has finished
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return dict(zip(keys, results))
+
+    # ============== Read Operations ==============
+
+    async def get_graph_info(self) -> dict:
+        return await self._run(self.client.get_graph_info)
+
+    async def get_page(self, title: str, include_children: bool = True) -> Optional[dict]:
+        return await self._run(self.client.get_page, title, include_children)
+
+    async def get_block(self, uuid: str, include_children: bool = True) -> Optional[dict]:
+        return await self._run(self.client.get_block, uuid, include_children)
+
+    async def gather_pages(self, titles: list, include_children: bool = True) -> dict:
+        """
+        Get many pages at once, as {title: page data or None}.
+
+        HTTP requests run concurrently; the CLI backend looks every page up
+        in one invocation.
+        """
+        if self.backend == "cli":
+            return await self._run(self.client.get_pages, titles, include_children)
+        return await self._gather(self.client.get_page, titles, include_children)
+
+    async def gather_blocks(self, uuids: list, include_children: bool = True) -> dict:
+        """Get many blocks at once, as {uuid: block data or None}."""
+        if self.backend == "cli":
+            return await self._run(self.client.get_blocks, uuids, include_children)
+        return await self._gather(self.client.get_block, uuids, include_children)
+
+    async def gather_page_properties(self, titles: list) -> dict:
+        """Get many pages' properties at once, as {title: properties}."""
+        return await self._gather(self.client.get_page_properties, titles)
+
+    async def list_pages(self, limit: int = None) -> list:
+        return await self._run(self.client.list_pages, limit)
+
+    async def search(self, query_text: str, limit: int = 50) -> list:
+        return await self._run(self.client.search, query_text, limit)
+
+    async def datalog_query(self, query: str, params: list = None) -> list:
+        return await self._run(self.client.datalog_query, query, params)
+
+    async def get_backlinks(self, title: str) -> list:
+        return await self._run(self.client.get_backlinks, title)
+
+    async def get_page_properties(self, title: str) -> dict:
+        return await self._run(self.client.get_page_properties, title)
+
+    async def get_block_properties(self, uuid: str) -> dict:
+        return await self._run(self.client.get_block_properties, uuid)
+
+    def cache_stats(self) -> dict:
+        return self.client.cache_stats()
+
+    def clear_cache(self):
+        self.client.clear_cache()
+
+
 # Convenience function for quick queries
 def query(datalog_query: str, params: list = None) -> list:
     """
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Logseq Read Cache
+
+An optional TTL + LRU cache for LogseqClient reads (pages, blocks,
+properties, Datalog query results), with a process-wide invalidation
+registry that LogseqWriter notifies after every mutating API call:
+- each entry is tagged with the page titles and block UUIDs it contains
+  (a cached page is tagged with every block in its tree)
+- a write to a page or block drops the entries carrying its tag; query
+  results, which can change with any write, are dropped on every write
+- caches are keyed by API URL, so writes to one graph leave others alone
+
+Writes made by other processes (or in the Logseq app) are only picked up
+when entries expire, so keep the TTL short.
+
+Usage:
+    from logseq_cache import ReadCache, invalidate
+
+    cache = ReadCache("http://127.0.0.1:12315", ttl=60)
+    hit, page = cache.get(("page", "home", True))
+    if not hit:
+        cache.put(("page", "home", True), page, ["home"])
+
+    invalidate("http://127.0.0.1:12315", ["home"])   # after a write
+"""
+
+import copy
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+
+DEFAULT_TTL = 60.0
+DEFAULT_MAX_ENTRIES = 256
+
+# Tag of entries that any write may change (query results)
+ANY_WRITE = "*"
+
+# API methods that only read; everything else counts as a write
+READ_PREFIXES = ("get", "search", "datascriptQuery", "q", "customQuery")
+
+# Keys holding a block or page UUID in HTTP and CLI results
+UUID_KEYS = ("uuid", "block/uuid", ":block/uuid")
+
+
+def is_mutation(method: str) -> bool:
+    """Whether an API method (e.g. logseq.Editor.insertBlock) may change the graph."""
+    return not method.rsplit(".", 1)[-1].startswith(READ_PREFIXES)
+
+
+def uuids_in(value: Any) -> set:
+    """Every UUID in a page, block tree or query result."""
+    found = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            for key, child in item.items():
+                if key in UUID_KEYS and isinstance(child, str):
+                    found.add(child.lower())
+                elif isinstance(child, (dict, list)):
+                    stack.append(child)
+        elif isinstance(item, list):
+            stack.extend(item)
+    return found
+
+
+class ReadCache:
+    """LRU cache of read results with a TTL and tag-based invalidation."""
+
+    def __init__(
+        self,
+        url: str = "",
+        ttl: Optional[float] = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.url = _normalize_url(url)
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.clock = clock
+        self._entries: OrderedDict = OrderedDict()   # key -> (expires, value, tags)
+        self._tagged: dict[str, set] = {}            # tag -> keys
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidated": 0}
+        _register(self)
+
+    def get(self, key: tuple, alternatives: Iterable[tuple] = ()) -> tuple[bool, Any]:
+        """
+        (hit, value) for the first live entry among key and alternatives.
+
+        Counts one hit or miss. The value is a copy, so callers may modify it.
+        """
+        now = self.clock()
+        with self._lock:
+            for candidate in (key, *alternatives):
+                entry = self._entries.get(candidate)
+                if entry is None:
+                    continue
+                if entry[0] is not None and entry[0] <= now:
+                    self._remove(candidate)
+                    self._stats["expired"] += 1
+                    continue
+                self._entries.move_to_end(candidate)
+                self._stats["hits"] += 1
+                value = entry[1]
+                break
+            else:
+                self._stats["misses"] += 1
+                return False, None
+        return True, copy.deepcopy(value)
+
+    def put(self, key: tuple, value: Any, tags: Iterable[str] = ()):
+        """Store a copy of value under key, tagged with page titles / UUIDs."""
+        tags = {str(tag).lower() for tag in tags}
+        expires = self.clock() + self.ttl if self.ttl else None
+        value = copy.deepcopy(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires, value, tags)
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, targets: Iterable[str]) -> int:
+        """Drop entries tagged with any target, plus every query result."""
+        tags = {str(target).lower() for target in targets} | {ANY_WRITE}
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tagged.get(tag, set())
+            for key in keys:
+                self._remove(key)
+            self._stats["invalidated"] += len(keys)
+        return len(keys)
+
+    def clear(self):
+        """Drop every entry; statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._tagged.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters, current size and hit rate."""
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _remove(self, key: tuple):
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+
+def _normalize_url(url: str) -> str:
+    return url.rstrip("/").lower()
+
+
+_caches: "weakref.WeakSet[ReadCache]" = weakref.WeakSet()
+_caches_lock = threading.Lock()
+
+
+def _register(cache: ReadCache):
+    with _caches_lock:
+        _caches.add(cache)
+
+
+def invalidate(url: str, targets: Iterable[str]) -> int:
+    """Tell every cache for `url` in this process that targets changed."""
+    url = _normalize_url(url)
+    targets = list(targets)
+    with _caches_lock:
+        caches = [cache for cache in _caches if cache.url == url]
+    return sum(cache.invalidate(targets) for cache in caches)
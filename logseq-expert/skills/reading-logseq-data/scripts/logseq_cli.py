@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Logseq CLI Runner
+
+Runs Datalog queries through the Logseq CLI (@logseq/cli) for LogseqClient.
+Every `logseq query` starts Node, which costs far more than the query, so:
+- whether the CLI is installed is checked once per process (cli_available)
+- lookups of many pages or blocks go into one query (lookup_query), so a
+  batch costs one invocation instead of one per item
+- independent queries run concurrently (query_many), and identical ones
+  in a batch run once
+- the CLI takes no query inputs, so `:in` parameters are bound inside the
+  query text (bind_inputs) instead of being dropped
+
+The CLI has no long-running session mode to keep open between queries;
+batching and concurrency are how its startup cost is shared.
+
+Callers map CliError to their own exceptions.
+
+Usage:
+    from logseq_cli import CliRunner, lookup_query
+
+    runner = CliRunner(graph_path="~/logseq/my-graph")
+    runner.query("[:find ?title :where [?p :block/title ?title]]")
+    runner.query_many([query_a, query_b])      # [result_a, result_b]
+    runner.query(lookup_query(":block/title", ["Home", "Inbox"]))
+
+    python3 logseq_cli.py --benchmark 200      # queries/second against a stub CLI
+"""
+
+import argparse
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_TIMEOUT = 60
+
+# Queries run at once by query_many
+MAX_WORKERS = 4
+
+# (command, ...) -> installed, checked once per process
+_available: dict[tuple, bool] = {}
+_available_lock = threading.Lock()
+
+IN_CLAUSE = re.compile(r":in\s+(.*?)\s*(?=:where\b)", re.S)
+WHERE = re.compile(r":where\b")
+UUID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+
+
+class CliError(Exception):
+    """The CLI failed, timed out or printed something that isn't JSON."""
+    pass
+
+
+class CliNotFound(CliError):
+    """The CLI is not installed."""
+    pass
+
+
+def default_command() -> list[str]:
+    """The CLI command: $LOGSEQ_CLI (e.g. "npx -y @logseq/cli") or `logseq`."""
+    return shlex.split(os.environ.get("LOGSEQ_CLI", "")) or ["logseq"]
+
+
+def cli_available(command: Optional[list[str]] = None) -> bool:
+    """Whether the CLI runs (`--version`), checked once per process per command."""
+    command = tuple(command or default_command())
+    with _available_lock:
+        if command in _available:
+            return _available[command]
+    if len(command) == 1 and not shutil.which(command[0]):
+        available = False
+    else:
+        try:
+            available = subprocess.run([*command, "--version"], capture_output=True, timeout=5).returncode == 0
+        except (OSError, subprocess.SubprocessError):
+            available = False
+    with _available_lock:
+        _available[command] = available
+    return available
+
+
+def edn(value: Any) -> str:
+    """A Python value as an EDN literal; UUID-shaped strings become #uuid."""
+    if value is None:
+        return "nil"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return json.dumps(value)
+    if isinstance(value, str):
+        if UUID.match(value):
+            return f'#uuid "{value.lower()}"'
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, (list, tuple, set)):
+        return "[" + " ".join(edn(item) for item in value) + "]"
+    if isinstance(value, dict):
+        return "{" + " ".join(f"{edn(k)} {edn(v)}" for k, v in value.items()) + "}"
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def _bindings(text: str) -> list[str]:
+    """Top-level binding forms of an :in clause ("?x", "[?x ...]", "[[?a ?b]]")."""
+    forms, depth, current = [], 0, ""
+    for char in text:
+        if char.isspace() and depth == 0:
+            if current:
+                forms.append(current)
+            current = ""
+            continue
+        depth += char == "["
+        depth -= char == "]"
+        current += char
+    if current:
+        forms.append(current)
+    return forms
+
+
+def bind_inputs(query: str, params: Optional[list]) -> str:
+    """
+    Bind a query's :in inputs inside its text, for a CLI that takes none.
+
+    Each input other than the database becomes a `[(ground value) binding]`
+    clause at the start of :where, so scalar, collection ([?x ...]), tuple
+    and relation bindings all keep their meaning.
+    """
+    match = IN_CLAUSE.search(query)
+    if not match:
+        return query
+    forms = [form for form in _bindings(match.group(1)) if not form.startswith("$")]
+    params = list(params or [])
+    if len(forms) != len(params):
+        raise CliError(f"Query expects {len(forms)} input(s), got {len(params)}")
+    clauses = " ".join(f"[(ground {edn(value)}) {form}]" for form, value in zip(forms, params))
+    query = query[:match.start()] + query[match.end():]
+    where = WHERE.search(query)
+    return f"{query[:where.end()]} {clauses}{query[where.end():]}"
+
+
+def lookup_query(attribute: str, values: list, pull: str = "[*]") -> str:
+    """One query pulling every entity whose attribute is one of values, as [[value, entity], ...]."""
+    return (
+        f"[:find ?value (pull ?e {pull})"
+        f" :where [(ground {edn(list(values))}) [?value ...]]"
+        f" [?e {attribute} ?value]]"
+    )
+
+
+class CliRunner:
+    """Runs queries against one graph (or the running app) through the CLI."""
+
+    def __init__(
+        self,
+        graph_path: str = "",
+        token: str = "",
+        command: Optional[list[str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_workers: int = MAX_WORKERS
+    ):
+        self.graph_path = graph_path
+        self.token = token
+        self.command = list(command or default_command())
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.invocations = 0
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return cli_available(self.command)
+
+    def _args(self, query: str) -> list[str]:
+        args = [*self.command, "query", query]
+        if self.graph_path:
+            args.extend(["--graph", self.graph_path])
+        elif self.token:
+            args.extend(["--in-app", "-a", self.token])
+        args.extend(["--format", "json"])
+        return args
+
+    def query(self, query: str, params: Optional[list] = None) -> Any:
+        """Run one query in one CLI invocation."""
+        with self._lock:
+            self.invocations += 1
+        try:
+            result = subprocess.run(
+                self._args(bind_inputs(query, params)),
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
+        except subprocess.TimeoutExpired:
+            raise CliError("Query timed out")
+        except FileNotFoundError:
+            raise CliNotFound("Logseq CLI not found")
+
+        if result.returncode != 0:
+            raise CliError(f"CLI error: {result.stderr}")
+        try:
+            return json.loads(result.stdout)
+        except json.JSONDecodeError:
+            raise CliError("Invalid response from CLI")
+
+    def query_many(self, queries: list) -> list:
+        """
+        Run several queries (strings or (query, params) pairs), results in order.
+
+        Identical queries run once; the rest run up to max_workers at a time.
+        The first failure is raised once every query has finished.
+        """
+        requests = [(q, None) if isinstance(q, str) else (q[0], q[1]) for q in queries]
+        distinct = {}
+        for query, params in requests:
+            distinct.setdefault((query, json.dumps(params, sort_keys=True, default=str)), (query, params))
+        if len(distinct) == 1 or self.max_workers <= 1:
+            results = {key: self.query(*request) for key, request in distinct.items()}
+        else:
+            with ThreadPoolExecutor(min(self.max_workers, len(distinct))) as pool:
+                futures = {key: pool.submit(self.query, *request) for key, request in distinct.items()}
+            results = {key: future.result() for key, future in futures.items()}
+        return [results[(query, json.dumps(params, sort_keys=True, default=str))] for query, params in requests]
+
+    def lookup(self, attribute: str, values: list, pull: str = "[*]") -> dict:
+        """{value: entity} for every value that matches, in one invocation."""
+        values = list(dict.fromkeys(values))
+        if not values:
+            return {}
+        found = {}
+        for row in self.query(lookup_query(attribute, values, pull)) or []:
+            value, entity = row[0], row[1]
+            found[str(value).lower()] = entity
+        return found
+
+
+# ============== Benchmark ==============
+
+# Stands in for the CLI: sleeps like Node startup, answers lookups by echoing titles
+STUB = """\
+import json, re, sys, time
+time.sleep(STARTUP)
+query = sys.argv[sys.argv.index("query") + 1]
+ground = re.search(r"\\(ground \\[(.*?)\\]\\)", query)
+titles = [json.loads(s) for s in re.findall(r'"(?:[^"\\\\]|\\\\.)*"', ground.group(1))] if ground else []
+print(json.dumps([[t, {"block/title": t}] for t in titles]))
+"""
+
+
+def benchmark(count: int = 100, startup: float = 0.05, workers: int = MAX_WORKERS) -> dict:
+    """
+    Queries per second against a stub CLI that sleeps `startup` seconds per
+    invocation, for one invocation per query, query_many and a batched lookup.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        stub = Path(tmp) / "logseq-stub.py"
+        stub.write_text(STUB.replace("STARTUP", repr(startup)))
+        runner = CliRunner(command=[sys.executable, str(stub)], max_workers=workers)
+        titles = [f"Page {i}" for i in range(count)]
+        queries = [lookup_query(":block/title", [title]) for title in titles]
+        results = {}
+
+        started = time.perf_counter()
+        for query in queries:
+            runner.query(query)
+        results["sequential"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        runner.query_many(queries)
+        results["query_many"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        found = runner.lookup(":block/title", titles)
+        results["lookup"] = time.perf_counter() - started
+        assert len(found) == count
+
+    return {name: {"seconds": round(elapsed, 3), "queries_per_second": round(count / elapsed, 1)}
+            for name, elapsed in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Datalog query through the Logseq CLI")
+    parser.add_argument("query", nargs="?", help="Datalog query")
+    parser.add_argument("--graph", default=os.environ.get("LOGSEQ_GRAPH_PATH", ""), help="Graph path")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Time N lookups against a stub CLI")
+    parser.add_argument("--startup-ms", type=float, default=50, help="Stub CLI startup time")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="Concurrent invocations")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(json.dumps(benchmark(args.benchmark, args.startup_ms / 1000, args.workers), indent=2))
+        return 0
+    if not args.query:
+        parser.error("a query or --benchmark is required")
+    try:
+        print(json.dumps(CliRunner(graph_path=args.graph).query(args.query), indent=2))
+    except CliError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Logseq Environment
+
+Configuration and backend detection shared by LogseqClient, LogseqWriter
+and the plugin's detect-backend.py / test-connection.py scripts:
+- .claude/logseq-expert/env.json (under the current project) is parsed
+  once per process, and again only when the file changes
+- connection settings resolve the same way everywhere: explicit argument,
+  then LOGSEQ_API_URL / LOGSEQ_API_TOKEN / LOGSEQ_GRAPH_PATH, then
+  env.json ("${VAR}" tokens read from the environment), then defaults
+- the backend a client detected is recorded for DETECTION_TTL seconds in
+  .claude/logseq-expert/detection.json (and in memory), so new clients
+  and later processes skip the socket and CLI probes; a connection
+  failure forgets the record so the next client probes again
+
+Usage:
+    from logseq_env import load_config, recent_detection, record_detection, resolve_settings
+
+    url, token, graph_path = resolve_settings()
+    detected = recent_detection(url, graph_path)    # (backend, graph_path) or None
+    record_detection(url, graph_path, "http")
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_URL = "http://127.0.0.1:12315"
+
+# Seconds a recorded detection is trusted
+DETECTION_TTL = 300
+
+# env.json path -> ((mtime_ns, size), config)
+_configs: dict[Path, tuple] = {}
+# detection.json path -> {key: record}, as last read or written
+_detections: dict[Path, dict] = {}
+_lock = threading.Lock()
+
+
+def env_dir(root: Optional[Path] = None) -> Path:
+    """The plugin's directory under the project's .claude directory."""
+    return Path(root or Path.cwd()) / ".claude" / "logseq-expert"
+
+
+def load_config(root: Optional[Path] = None) -> dict:
+    """env.json as a dict ({} when missing or unreadable), parsed once per change."""
+    path = env_dir(root) / "env.json"
+    try:
+        stat = path.stat()
+    except OSError:
+        return {}
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _configs.get(path)
+    if cached is None or cached[0] != stamp:
+        try:
+            config = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            config = {}
+        if not isinstance(config, dict):
+            config = {}
+        cached = (stamp, config)
+        with _lock:
+            _configs[path] = cached
+    return copy.deepcopy(cached[1])
+
+
+def expand_token(token: str) -> str:
+    """A configured token, with a "${VAR}" reference read from the environment."""
+    if token.startswith("${") and token.endswith("}"):
+        return os.environ.get(token[2:-1], "")
+    return token
+
+
+def resolve_settings(
+    url: Optional[str] = None,
+    token: Optional[str] = None,
+    graph_path: Optional[str] = None,
+    root: Optional[Path] = None
+) -> tuple[str, str, str]:
+    """(url, token, graph_path) from arguments, environment and env.json."""
+    config = load_config(root)
+    url = url or os.environ.get("LOGSEQ_API_URL", DEFAULT_URL)
+    if url == DEFAULT_URL:
+        url = config.get("http", {}).get("url") or url
+    token = token or os.environ.get("LOGSEQ_API_TOKEN", "") or expand_token(config.get("http", {}).get("token", ""))
+    graph_path = graph_path or os.environ.get("LOGSEQ_GRAPH_PATH", "") or config.get("cli", {}).get("graphPath", "")
+    return url, token, graph_path
+
+
+def _key(url: str, graph_path: str) -> str:
+    return f"{url.rstrip('/').lower()} {graph_path}"
+
+
+def _detection_path(root: Optional[Path]) -> Path:
+    return env_dir(root) / "detection.json"
+
+
+def _read_detections(path: Path) -> dict:
+    with _lock:
+        if path in _detections:
+            return _detections[path]
+    try:
+        records = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        records = {}
+    if not isinstance(records, dict):
+        records = {}
+    with _lock:
+        return _detections.setdefault(path, records)
+
+
+def _write_detections(path: Path, records: dict):
+    """Save atomically; a failure only means probing again next time."""
+    with _lock:
+        _detections[path] = records
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(records, indent=2), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        pass
+
+
+def recent_detection(
+    url: str,
+    graph_path: str = "",
+    ttl: float = DETECTION_TTL,
+    root: Optional[Path] = None
+) -> Optional[tuple[str, str]]:
+    """(backend, graph_path) recorded for these settings within ttl seconds, or None."""
+    record = _read_detections(_detection_path(root)).get(_key(url, graph_path))
+    if not isinstance(record, dict) or time.time() - record.get("at", 0) > ttl:
+        return None
+    return record.get("backend"), record.get("graph_path", graph_path)
+
+
+def record_detection(
+    url: str,
+    graph_path: str,
+    backend: str,
+    resolved_graph_path: Optional[str] = None,
+    root: Optional[Path] = None
+):
+    """
+    Record a successful detection for (url, graph_path).
+
+    resolved_graph_path is the graph the backend found when none was
+    configured (the file backend's discovered graph).
+    """
+    path = _detection_path(root)
+    records = dict(_read_detections(path))
+    records[_key(url, graph_path)] = {
+        "url": url,
+        "backend": backend,
+        "graph_path": resolved_graph_path if resolved_graph_path is not None else graph_path,
+        "at": time.time(),
+    }
+    _write_detections(path, records)
+
+
+def forget_detection(url: Optional[str] = None, backend: Optional[str] = None, root: Optional[Path] = None) -> int:
+    """Drop records for a URL and/or backend (all records with neither); returns how many."""
+    path = _detection_path(root)
+    records = _read_detections(path)
+    wanted = url.rstrip("/").lower() if url else None
+    kept = {
+        key: record for key, record in records.items()
+        if not ((wanted is None or str(record.get("url", "")).rstrip("/").lower() == wanted)
+                and (backend is None or record.get("backend") == backend))
+    }
+    dropped = len(records) - len(kept)
+    if dropped:
+        _write_detections(path, kept)
+    return dropped
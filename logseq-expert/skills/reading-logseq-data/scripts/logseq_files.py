@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+Logseq File Graph Reader
+
+Reads a file-based (markdown) Logseq graph straight from its pages/ and
+journals/ folders, for LogseqClient's "file" backend - no app, CLI or
+network needed:
+- each file becomes a page record: title, properties, aliases and the
+  block tree (content, properties, id:: UUIDs and page refs)
+- records are persisted under .claude/logseq-expert/graph-index/, and a
+  file is only parsed again when its mtime or size changed; like
+  scripts/component_index.py, an mtime less than RACY_NS old when
+  recorded is not trusted
+- name, alias, block and backlink lookups are rebuilt in memory from the
+  records
+- search() ranks blocks with BM25 over a full-text index
+  (logseq_search.py) built from per-block term counts stored in the
+  records, and updated file by file as files change
+
+Page titles come from a title:: property, else the file name (%-escapes
+decoded, ___ read as the / of namespaces). Journal files (2024_01_15.md)
+get Logseq's default title ("Jan 15th, 2024") and can also be looked up
+by ISO date.
+
+Usage:
+    from logseq_files import GraphIndex, find_logseq_graphs
+
+    index = GraphIndex("~/logseq/my-graph").refresh_and_save()
+    page = index.get_page("Project Alpha")
+    refs = index.get_backlinks("Project Alpha")
+
+    python3 logseq_files.py <graph-path> [page-title]
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import platform
+import re
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from logseq_search import SearchIndex, block_terms
+
+INDEX_VERSION = 2
+
+# Folders of a file graph holding pages
+PAGE_DIRS = ("pages", "journals")
+
+# Recorded mtimes newer than this aren't trusted (see module docstring)
+RACY_NS = 2_000_000_000
+
+BULLET = re.compile(r"^(\s*)-(?:\s+(.*))?$")
+PROPERTY = re.compile(r"^([A-Za-z0-9_./-]+)::\s*(.*)$")
+PAGE_REF = re.compile(r"\[\[([^\[\]]+)\]\]")
+TAG = re.compile(r"(?:^|(?<=\s))#(?:\[\[([^\[\]]+)\]\]|([^\s#\[\],;!?\"'()]+))")
+CODE = re.compile(r"```.*?(?:```|$)|`[^`\n]*`", re.S)
+JOURNAL_FILE = re.compile(r"^(\d{4})_(\d{2})_(\d{2})$")
+FENCE = "```"
+
+# Properties whose plain comma-separated values name pages
+REF_PROPERTIES = ("tags", "alias")
+
+
+def detect_os() -> str:
+    """The operating system, as init-environment names it."""
+    system = platform.system().lower()
+    if system == "darwin":
+        return "macos"
+    elif system == "windows":
+        return "windows"
+    return "linux"
+
+
+def find_logseq_graphs() -> list[Path]:
+    """Find Logseq graph directories."""
+    graphs = []
+    os_type = detect_os()
+
+    # Common locations
+    home = Path.home()
+    search_paths = []
+
+    if os_type == "macos":
+        search_paths = [
+            home / "Documents" / "logseq",
+            home / "logseq",
+            home / "Library" / "Application Support" / "Logseq",
+        ]
+    elif os_type == "windows":
+        search_paths = [
+            home / "Documents" / "logseq",
+            home / "logseq",
+            Path(os.environ.get("APPDATA", "")) / "Logseq",
+        ]
+    else:  # Linux
+        search_paths = [
+            home / "logseq",
+            home / "Documents" / "logseq",
+            home / ".logseq",
+        ]
+
+    for path in search_paths:
+        if path.exists() and path.is_dir():
+            # Look for graph directories (contain logseq/ folder or db.sqlite)
+            for item in path.iterdir():
+                if item.is_dir():
+                    if (item / "logseq").exists() or (item / "db.sqlite").exists():
+                        graphs.append(item)
+
+    return graphs
+
+
+def is_file_graph(path) -> bool:
+    """Whether a directory is a markdown graph (has pages/ or journals/)."""
+    path = Path(path).expanduser()
+    return any((path / folder).is_dir() for folder in PAGE_DIRS)
+
+
+def page_name(title: str) -> str:
+    """Logseq's lookup name for a page title."""
+    return title.strip().lower()
+
+
+def journal_title(day: date) -> str:
+    """Logseq's default journal title, e.g. "Jan 15th, 2024"."""
+    n = day.day
+    suffix = "th" if 11 <= n % 100 <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{day:%b} {n}{suffix}, {day.year}"
+
+
+def refs_in(text: str) -> set:
+    """Names of the pages a piece of content links to ([[page]], #tag, #[[tag]]), outside code."""
+    text = CODE.sub(" ", text)
+    refs = {page_name(ref) for ref in PAGE_REF.findall(text)}
+    for bracketed, plain in TAG.findall(text):
+        refs.add(page_name(bracketed or plain))
+    refs.discard("")
+    return refs
+
+
+def _property_refs(key: str, value: str) -> set:
+    refs = refs_in(value)
+    if key in REF_PROPERTIES:
+        for part in value.split(","):
+            part = part.strip().lstrip("#").removeprefix("[[").removesuffix("]]").strip()
+            if part:
+                refs.add(page_name(part))
+    return refs
+
+
+def parse_blocks(text: str) -> tuple[dict, list]:
+    """
+    Parse a page file into (page properties, block tree).
+
+    Blocks are {"content", "properties", "refs", "children"} plus "uuid"
+    when they carry an id:: property. Property lines before the first
+    bullet, or a first bullet holding only properties, are the page's.
+    """
+    page_properties: dict = {}
+    roots: list = []
+    stack: list = []        # (indent, block) of the open bullets
+    current = None
+    base = 0
+    in_fence = False
+    properties_open = False
+
+    for raw in text.splitlines():
+        line = raw.expandtabs(4).rstrip()
+        stripped = line.strip()
+        indent = len(line) - len(line.lstrip())
+
+        if in_fence:
+            current["content"] += "\n" + line[min(indent, base):]
+            in_fence = not stripped.startswith(FENCE)
+            continue
+        if not stripped:
+            continue
+
+        match = BULLET.match(line)
+        property_match = PROPERTY.match(stripped)
+        if match:
+            indent = len(match.group(1))
+            while stack and stack[-1][0] >= indent:
+                stack.pop()
+            current = {"content": "", "properties": {}, "children": []}
+            (stack[-1][1]["children"] if stack else roots).append(current)
+            stack.append((indent, current))
+            base = indent + 2
+            first = match.group(2) or ""
+            first_property = PROPERTY.match(first)
+            if first_property:
+                # A block of properties only (the first one may be the page's)
+                current["properties"][first_property.group(1).lower()] = first_property.group(2).strip()
+                properties_open = True
+                continue
+            current["content"] = first
+            properties_open = True
+            opened = first
+        elif current is None and property_match:
+            page_properties[property_match.group(1).lower()] = property_match.group(2).strip()
+            continue
+        elif stack:
+            current = stack[-1][1]
+            if properties_open and property_match:
+                current["properties"][property_match.group(1).lower()] = property_match.group(2).strip()
+                continue
+            text_line = line[min(indent, base):]
+            current["content"] = f"{current['content']}\n{text_line}" if current["content"] else text_line
+            properties_open = False
+            opened = stripped
+        else:
+            # Text outside any bullet (before the first one)
+            current = {"content": stripped, "properties": {}, "children": []}
+            roots.append(current)
+            base = 0
+            properties_open = False
+            opened = stripped
+
+        in_fence = opened.startswith(FENCE) and opened.count(FENCE) == 1
+
+    if roots and not roots[0]["content"] and not roots[0]["children"] and roots[0]["properties"]:
+        page_properties = {**roots.pop(0)["properties"], **page_properties}
+
+    def finish(block):
+        uuid = block["properties"].pop("id", None)
+        if uuid:
+            block["uuid"] = uuid.lower()
+        refs = refs_in(block["content"])
+        for key, value in block["properties"].items():
+            refs |= _property_refs(key, value)
+        block["refs"] = sorted(refs)
+        for child in block["children"]:
+            finish(child)
+
+    for block in roots:
+        finish(block)
+    return page_properties, roots
+
+
+def parse_page(rel: str, text: str) -> dict:
+    """A page record for the file at graph-relative path rel."""
+    properties, blocks = parse_blocks(text)
+    folder, stem = rel.split("/", 1)[0], Path(rel).stem
+    journal_day = None
+    day_match = JOURNAL_FILE.match(stem) if folder == "journals" else None
+    if day_match:
+        try:
+            journal_day = date(*(int(part) for part in day_match.groups()))
+        except ValueError:
+            journal_day = None
+
+    if properties.get("title"):
+        title = properties["title"]
+    elif journal_day:
+        title = journal_title(journal_day)
+    else:
+        title = unquote(stem).replace("___", "/")
+
+    aliases = sorted(_property_refs("alias", properties.get("alias", "")))
+    if journal_day:
+        aliases.append(journal_day.isoformat())
+    refs = set()
+    for key, value in properties.items():
+        refs |= _property_refs(key, value)
+
+    return {
+        "title": title,
+        "name": page_name(title),
+        "file": rel,
+        "journal": journal_day is not None,
+        "journal_day": int(journal_day.strftime("%Y%m%d")) if journal_day else None,
+        "properties": properties,
+        "aliases": aliases,
+        "refs": sorted(refs),
+        "blocks": blocks,
+        # Full-text terms of each block, in walk_blocks() order
+        "search": [block_terms(block_text(block)) for block in walk_blocks(blocks)],
+    }
+
+
+def block_text(block: dict) -> str:
+    """The searchable text of a block: content and property values."""
+    return " ".join([block["content"], *map(str, block["properties"].values())])
+
+
+def walk_blocks(blocks: list):
+    """Every block of a tree, depth first."""
+    stack = list(reversed(blocks))
+    while stack:
+        block = stack.pop()
+        yield block
+        stack.extend(reversed(block["children"]))
+
+
+def default_index_path(graph: Path) -> Path:
+    """Where the index of a graph is kept, under the project's .claude directory."""
+    digest = hashlib.sha1(str(graph).encode()).hexdigest()[:12]
+    return Path.cwd() / ".claude" / "logseq-expert" / "graph-index" / f"{graph.name}-{digest}.json"
+
+
+class GraphIndex:
+    """Page records of one file graph, kept in sync with the files by mtime and size."""
+
+    def __init__(self, graph_path, index_path=None):
+        self.root = Path(graph_path).expanduser().resolve()
+        self.path = Path(index_path) if index_path else default_index_path(self.root)
+        self.records: dict[str, dict] = {}
+        self.parsed = 0
+        self.refreshed_at = 0.0
+        self._lookups = None
+        self._search: Optional[SearchIndex] = None
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("version") == INDEX_VERSION and data.get("graph") == str(self.root):
+            self.records = data.get("files", {})
+
+    def _files(self) -> dict[str, os.stat_result]:
+        found = {}
+        for folder in PAGE_DIRS:
+            try:
+                entries = list(os.scandir(self.root / folder))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.endswith(".md") and not entry.name.startswith("."):
+                    try:
+                        found[f"{folder}/{entry.name}"] = entry.stat()
+                    except OSError:
+                        continue
+        return found
+
+    def refresh(self) -> bool:
+        """Parse new and changed files, forget deleted ones; returns whether anything changed."""
+        found = self._files()
+        changed = False
+        for rel in list(self.records):
+            if rel not in found:
+                del self.records[rel]
+                if self._search is not None:
+                    self._search.remove_file(rel)
+                changed = True
+
+        racy_after = time.time_ns() - RACY_NS
+        for rel, stat in found.items():
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            record = self.records.get(rel)
+            if record and record["stamp"] == stamp:
+                continue
+            try:
+                text = (self.root / rel).read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                if self.records.pop(rel, None) and self._search is not None:
+                    self._search.remove_file(rel)
+                continue
+            self.records[rel] = {
+                "stamp": None if stat.st_mtime_ns > racy_after else stamp,
+                "page": parse_page(rel, text),
+            }
+            if self._search is not None:
+                self._search.add_file(rel, self.records[rel]["page"]["search"])
+            self.parsed += 1
+            changed = True
+
+        self.refreshed_at = time.monotonic()
+        if changed:
+            self._lookups = None
+        return changed
+
+    def save(self):
+        """Write the index atomically; failures only cost a re-parse next time."""
+        data = {"version": INDEX_VERSION, "graph": str(self.root), "files": self.records}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError:
+            pass
+
+    def refresh_and_save(self) -> "GraphIndex":
+        """Refresh, saving when anything changed."""
+        if self.refresh():
+            self.save()
+        return self
+
+    # ---- Lookups ----
+
+    def lookups(self) -> dict:
+        """Name/alias -> page, UUID -> (page, block) and ref name -> referencing blocks."""
+        if self._lookups is None:
+            pages, blocks, backlinks = {}, {}, {}
+            for record in self.records.values():
+                page = record["page"]
+                pages.setdefault(page["name"], page)
+            for record in self.records.values():
+                page = record["page"]
+                for alias in page["aliases"]:
+                    pages.setdefault(alias, page)
+                for block in walk_blocks(page["blocks"]):
+                    if "uuid" in block:
+                        blocks[block["uuid"]] = (page, block)
+                    for ref in block["refs"]:
+                        backlinks.setdefault(ref, []).append((page, block))
+            self._lookups = {"pages": pages, "blocks": blocks, "backlinks": backlinks}
+        return self._lookups
+
+    def find_page(self, title: str) -> Optional[dict]:
+        """The page record for a title or alias."""
+        return self.lookups()["pages"].get(page_name(title))
+
+    # ---- Reads, shaped like the HTTP API's results ----
+
+    @staticmethod
+    def _block_view(block: dict, include_children: bool = True) -> dict:
+        view = {key: value for key, value in block.items() if key != "children"}
+        if include_children:
+            view["children"] = [GraphIndex._block_view(child) for child in block["children"]]
+        return view
+
+    @staticmethod
+    def _ref_view(page: dict, block: dict) -> dict:
+        return {"content": block["content"], "uuid": block.get("uuid"), "page": {"title": page["title"]}}
+
+    def get_page(self, title: str, include_children: bool = True) -> Optional[dict]:
+        """Page data (with its block tree as "blocks") or None."""
+        page = self.find_page(title)
+        if page is None:
+            return None
+        view = {
+            "name": page["name"],
+            "originalName": page["title"],
+            "title": page["title"],
+            "properties": dict(page["properties"]),
+            "journal?": page["journal"],
+            "journalDay": page["journal_day"],
+            "file": page["file"],
+        }
+        if include_children:
+            view["blocks"] = [self._block_view(block) for block in page["blocks"]]
+        return view
+
+    def get_block(self, uuid: str, include_children: bool = True) -> Optional[dict]:
+        """A block with an id:: property, or None."""
+        found = self.lookups()["blocks"].get(uuid.lower())
+        if found is None:
+            return None
+        page, block = found
+        return {**self._block_view(block, include_children), "page": {"title": page["title"]}}
+
+    def list_pages(self, limit: Optional[int] = None) -> list:
+        """Page summaries ordered by title."""
+        pages = sorted((record["page"] for record in self.records.values()), key=lambda page: page["name"])
+        summaries = [{"title": page["title"], "name": page["name"], "journal?": page["journal"]} for page in pages]
+        return summaries[:limit] if limit else summaries
+
+    def get_backlinks(self, title: str) -> list:
+        """Blocks referencing a page under its name or any alias."""
+        page = self.find_page(title)
+        names = {page_name(title)}
+        if page is not None:
+            names |= {page["name"], *page["aliases"]}
+        backlinks = self.lookups()["backlinks"]
+        # A block linking the page under two of its names is listed once
+        seen = set()
+        views = []
+        for name in sorted(names):
+            for ref_page, block in backlinks.get(name, []):
+                if id(block) not in seen:
+                    seen.add(id(block))
+                    views.append(self._ref_view(ref_page, block))
+        return views
+
+    def search_index(self) -> SearchIndex:
+        """The full-text index, built from the records on first use."""
+        if self._search is None:
+            search = SearchIndex()
+            for rel, record in self.records.items():
+                search.add_file(rel, record["page"]["search"])
+            self._search = search
+        return self._search
+
+    def search(self, query_text: str, limit: int = 50, require_all: bool = True) -> list:
+        """Blocks matching the query's words, best BM25 score first."""
+        results = []
+        for score, rel, position in self.search_index().search(query_text, limit, require_all):
+            page = self.records[rel]["page"]
+            block = next(itertools.islice(walk_blocks(page["blocks"]), position, None))
+            results.append({**self._ref_view(page, block), "score": score})
+        return results
+
+
+def main():
+    """Main entry point for command-line usage."""
+    if len(sys.argv) < 2:
+        print("Usage: python3 logseq_files.py <graph-path> [page-title]")
+        sys.exit(1)
+
+    index = GraphIndex(sys.argv[1]).refresh_and_save()
+    if len(sys.argv) > 2:
+        page = index.get_page(sys.argv[2])
+        print(json.dumps(page, indent=2))
+        sys.exit(0 if page else 1)
+    print(json.dumps({"pages": len(index.records), "parsed": index.parsed, "index": str(index.path)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
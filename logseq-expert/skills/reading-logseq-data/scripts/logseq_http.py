@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Logseq HTTP Transport
+
+Keep-alive connections to the Logseq HTTP API, shared by LogseqClient
+(logseq-client.py) and LogseqWriter (writing-to-logseq/scripts/write-operations.py):
+- one transport per API URL per process, from get_transport()
+- idle connections are kept open and reused, so a run of calls
+  (getPage, getPageBlocksTree, insertBlock, ...) pays one TCP handshake
+- idle connections the server has since closed are dropped before reuse
+- a reused connection that fails while sending is reopened and the request
+  sent once more; one that fails after the request was sent is only retried
+  for idempotent requests (reads), since the server may have applied it
+- safe to share between threads: each request holds its own connection
+
+Callers map TransportError and HTTP statuses to their own exceptions.
+
+Usage:
+    from logseq_http import get_transport
+
+    transport = get_transport("http://127.0.0.1:12315")
+    status, reason, data = transport.post_json("/api", {"method": "logseq.Editor.getPage", "args": ["Home"]},
+                                                {"Authorization": "Bearer <token>"})
+"""
+
+import http.client
+import json
+import select
+import threading
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 30
+
+# Idle connections kept per transport
+MAX_IDLE = 8
+
+# Errors meaning a kept-alive connection was closed by the server
+STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+
+class TransportError(OSError):
+    """The request could not be sent or no response was received."""
+    pass
+
+
+def _dropped(conn: http.client.HTTPConnection) -> bool:
+    """Whether an idle connection was closed by the server (its socket reads EOF)."""
+    if conn.sock is None:
+        return True
+    try:
+        return bool(select.select([conn.sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+class HTTPTransport:
+    """A pool of keep-alive connections to one HTTP(S) server."""
+
+    def __init__(self, url: str, timeout: float = DEFAULT_TIMEOUT, max_idle: int = MAX_IDLE):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported Logseq API URL: {url}")
+        self.url = url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.connections_opened = 0
+        self._idle: list[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.connections_opened += 1
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        """An idle connection (reused=True) or a new one."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn = self._idle.pop()
+            if not _dropped(conn):
+                return conn, True
+            conn.close()
+        return self._connect(), False
+
+    def _release(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[dict] = None, idempotent: bool = False) -> tuple[int, str, bytes]:
+        """
+        Send one request and read the whole response.
+
+        A reused connection the server closed is retried once on a fresh
+        one; after the request was sent, only when `idempotent`.
+
+        Returns (status, reason, body). Raises TransportError when the server
+        can't be reached or drops the connection.
+        """
+        conn, reused = self._acquire()
+        while True:
+            sent = False
+            try:
+                conn.request(method, self.base_path + path, body=body, headers=headers or {})
+                sent = True
+                response = conn.getresponse()
+                data = response.read()
+            except STALE_ERRORS as e:
+                conn.close()
+                if reused and (idempotent or not sent):
+                    # Closed while idle; retry once on a fresh connection
+                    conn, reused = self._connect(), False
+                    continue
+                raise TransportError(str(e) or type(e).__name__) from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise TransportError(str(e) or type(e).__name__) from e
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return response.status, response.reason, data
+
+    def post_json(self, path: str, payload: Any, headers: Optional[dict] = None,
+                  idempotent: bool = False) -> tuple[int, str, Any]:
+        """
+        POST `payload` as JSON; returns (status, reason, decoded body).
+
+        Pass `idempotent=True` for reads, which are safe to send twice. The
+        body is None when it is empty or not JSON (as with most error
+        responses).
+        """
+        status, reason, data = self.request(
+            "POST", path, json.dumps(payload).encode(),
+            {"Content-Type": "application/json", **(headers or {})},
+            idempotent,
+        )
+        try:
+            decoded = json.loads(data.decode()) if data else None
+        except (ValueError, UnicodeDecodeError):
+            decoded = None
+        return status, reason, decoded
+
+    def close(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_transports: dict[tuple[str, float], HTTPTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(url: str, timeout: float = DEFAULT_TIMEOUT) -> HTTPTransport:
+    """The shared transport for `url` in this process."""
+    key = (url.rstrip("/"), timeout)
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = _transports[key] = HTTPTransport(key[0], timeout)
+        return transport
+
+
+def close_all():
+    """Close the idle connections of every shared transport."""
+    with _transports_lock:
+        transports = list(_transports.values())
+    for transport in transports:
+        transport.close()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Logseq Full-Text Search
+
+An in-memory inverted index over block content for the file backend
+(logseq_files.GraphIndex), ranked with BM25:
+- documents are blocks, addressed by (file, position in the page's
+  depth-first block order); their term counts are computed when a file is
+  parsed and persisted with the graph index, so building the postings
+  needs no re-reading of files
+- files are added and removed one at a time as GraphIndex sees them
+  change, so the index stays current without a rebuild
+- by default every query term must match: candidates come from the rarest
+  term's postings and are narrowed term by term, stopping as soon as none
+  are left, so selective queries touch few postings however large the
+  graph; only the top `limit` results are ranked
+
+Usage:
+    from logseq_search import SearchIndex, block_terms
+
+    index = SearchIndex()
+    index.add_file("pages/a.md", [block_terms("Budget review for [[Project Alpha]]")])
+    index.search("budget alpha", limit=10)   # [(score, "pages/a.md", 0)]
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+
+TOKEN = re.compile(r"[^\W_]+")
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens."""
+    return TOKEN.findall(text.lower())
+
+
+def block_terms(text: str) -> list:
+    """[length, {term: count}] of one block's text, as stored per block."""
+    tokens = tokenize(text)
+    return [len(tokens), dict(Counter(tokens))]
+
+
+class SearchIndex:
+    """BM25-ranked postings of block terms, updated file by file."""
+
+    def __init__(self):
+        self.postings: dict[str, dict[int, int]] = {}       # term -> {document: count}
+        self.documents: dict[int, tuple[str, int, int]] = {}  # document -> (file, position, length)
+        self.files: dict[str, tuple[int, list]] = {}         # file -> (first document, blocks)
+        self.total_length = 0
+        self._next = 0
+
+    def df(self, term: str) -> int:
+        """Number of blocks containing a term."""
+        return len(self.postings.get(term, ()))
+
+    def add_file(self, rel: str, blocks: list):
+        """Index a file's blocks ([length, {term: count}] each), replacing any earlier version."""
+        if rel in self.files:
+            self.remove_file(rel)
+        first = self._next
+        self._next += len(blocks)
+        self.files[rel] = (first, blocks)
+        postings, documents = self.postings, self.documents
+        for position, (length, terms) in enumerate(blocks):
+            document = first + position
+            documents[document] = (rel, position, length)
+            self.total_length += length
+            for term, count in terms.items():
+                in_term = postings.get(term)
+                if in_term is None:
+                    in_term = postings[term] = {}
+                in_term[document] = count
+
+    def remove_file(self, rel: str):
+        """Drop a file's blocks from the index."""
+        first, blocks = self.files.pop(rel, (None, None))
+        if blocks is None:
+            return
+        for position, (length, terms) in enumerate(blocks):
+            document = first + position
+            del self.documents[document]
+            self.total_length -= length
+            for term in terms:
+                in_term = self.postings[term]
+                del in_term[document]
+                if not in_term:
+                    del self.postings[term]
+
+    def search(self, query: str, limit: int = 50, require_all: bool = True) -> list[tuple[float, str, int]]:
+        """
+        The best `limit` blocks for a query, as (score, file, position).
+
+        With require_all (default) a block must contain every query term;
+        otherwise any term counts and blocks matching more rank higher.
+        """
+        terms = sorted(set(tokenize(query)), key=self.df)
+        if not terms or limit <= 0 or not self.documents:
+            return []
+        if require_all and terms[0] not in self.postings:
+            return []
+
+        total = len(self.documents)
+        average = self.total_length / total
+        documents = self.documents
+        scores: dict[int, float] = {}
+
+        for step, term in enumerate(terms):
+            in_term = self.postings.get(term)
+            if not in_term:
+                continue
+            df = len(in_term)
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            if require_all and step:
+                # Narrow the candidates from the rarer terms
+                narrowed = {}
+                for document, score in scores.items():
+                    count = in_term.get(document)
+                    if count:
+                        length = documents[document][2]
+                        narrowed[document] = score + idf * count * (K1 + 1) / (
+                            count + K1 * (1 - B + B * length / average))
+                scores = narrowed
+                if not scores:
+                    return []
+            else:
+                for document, count in in_term.items():
+                    length = documents[document][2]
+                    scores[document] = scores.get(document, 0.0) + idf * count * (K1 + 1) / (
+                        count + K1 * (1 - B + B * length / average))
+
+        best = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], documents[item[0]][:2]))
+        return [(round(score, 4), *documents[document][:2]) for document, score in best]
@@ -10,16 +10,29 @@ Usage:
     writer = LogseqWriter()
     page = writer.create_page("My Page")
     block = writer.create_block(page["uuid"], "Content")
+
+    # Several edits in the fewest API calls
+    with writer.batch() as batch:
+        batch.add_tags(block["uuid"], ["research", "todo"])
+        batch.set_property(block["uuid"], "status", "Active")
+
+    # A whole notes tree, inserted in chunks
+    writer.import_blocks("Research", parse_outline(markdown_text))
 """
 
 import json
-import os
-import urllib.request
-import urllib.error
+import re
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional, Union
 
+# Keep-alive transport, read cache invalidation and settings shared with LogseqClient
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "reading-logseq-data" / "scripts"))
+from logseq_cache import invalidate, is_mutation
+from logseq_env import forget_detection, resolve_settings
+from logseq_http import TransportError, get_transport
+
 
 class WriteError(Exception):
     """Base exception for write operations."""
@@ -51,6 +64,178 @@ class ValidationError(WriteError):
     pass
 
 
+def convert_property(value: Any, property_type: Optional[str] = None) -> Any:
+    """Convert a property value to its type hint (number, checkbox, date)."""
+    if property_type == "number":
+        return float(value) if "." in str(value) else int(value)
+    if property_type == "checkbox":
+        return bool(value)
+    # Dates stay strings for date linking
+    return value
+
+
+def with_tag(content: str, tag: str) -> str:
+    """Content with #tag appended unless already present."""
+    tag_text = f"#{tag}"
+    if tag_text in content:
+        return content
+    return f"{content} {tag_text}".strip()
+
+
+def without_tag(content: str, tag: str) -> str:
+    """Content with #tag removed and whitespace tidied."""
+    tag_text = f"#{tag}"
+    if tag_text not in content:
+        return content
+    return " ".join(content.replace(tag_text, "").split())
+
+
+# Markdown outline syntax read by parse_outline()
+BULLET = re.compile(r"^(\s*)[-*+](?:\s+(.*))?$")
+PROPERTY = re.compile(r"^([A-Za-z0-9_-]+)::\s*(.*)$")
+HEADING = re.compile(r"^#{1,6}\s")
+FENCE = "```"
+
+
+def normalize_blocks(blocks: Union[list, dict]) -> list:
+    """
+    Validate a block tree and drop empty children/properties.
+
+    Accepts a list (or {"blocks": [...]}) of content strings or
+    {"content", "properties", "children"} dicts, nested to any depth.
+    """
+    if isinstance(blocks, dict) and "blocks" in blocks:
+        blocks = blocks["blocks"]
+    if not isinstance(blocks, list):
+        raise ValidationError("Expected a list of blocks")
+
+    normalized = []
+    for block in blocks:
+        if isinstance(block, str):
+            normalized.append({"content": block})
+            continue
+        if not isinstance(block, dict) or not isinstance(block.get("content"), str):
+            raise ValidationError(f"Block needs text content: {block!r}")
+        node = {"content": block["content"]}
+        if block.get("properties"):
+            node["properties"] = dict(block["properties"])
+        if block.get("children"):
+            node["children"] = normalize_blocks(block["children"])
+        normalized.append(node)
+    return normalized
+
+
+def parse_outline(text: str) -> list:
+    """
+    Parse markdown into a block tree for insertBatchBlock.
+
+    - bullets (-, *, +) nest by indentation; tabs count as 4 spaces
+    - indented lines under a bullet continue its content, and leading
+      `key:: value` lines become its properties
+    - headings and paragraphs outside bullets become top-level blocks
+    - fenced code stays inside the block it starts in
+    """
+    roots: list = []
+    stack: list = []        # (indent, node) of the open bullets
+    current = None          # block receiving continuation lines
+    base = 0                # columns to strip from its continuation lines
+    in_fence = False
+    properties_open = False
+    after_blank = False
+
+    for raw in text.splitlines():
+        line = raw.expandtabs(4).rstrip()
+        stripped = line.strip()
+        indent = len(line) - len(line.lstrip())
+
+        if in_fence:
+            current["content"] += "\n" + line[min(indent, base):]
+            in_fence = not stripped.startswith(FENCE)
+            continue
+
+        if not stripped:
+            after_blank = True
+            continue
+
+        match = BULLET.match(line)
+        if match:
+            indent = len(match.group(1))
+            while stack and stack[-1][0] >= indent:
+                stack.pop()
+            current = {"content": match.group(2) or "", "children": []}
+            (stack[-1][1]["children"] if stack else roots).append(current)
+            stack.append((indent, current))
+            base = indent + 2
+            properties_open = True
+        elif stack and indent > stack[-1][0]:
+            # Continuation of the innermost open bullet
+            current = stack[-1][1]
+            property_match = PROPERTY.match(stripped)
+            if properties_open and property_match:
+                current.setdefault("properties", {})[property_match.group(1)] = property_match.group(2)
+                after_blank = False
+                continue
+            current["content"] += "\n" + line[min(indent, base):]
+            properties_open = False
+        elif (current is not None and not stack and not after_blank
+              and not HEADING.match(stripped) and not HEADING.match(current["content"])):
+            # Next line of a top-level paragraph
+            current["content"] += "\n" + stripped
+        else:
+            stack = []
+            current = {"content": stripped, "children": []}
+            roots.append(current)
+            base = 0
+            properties_open = False
+
+        after_blank = False
+        opened = (match.group(2) or "") if match else stripped
+        in_fence = opened.startswith(FENCE) and opened.count(FENCE) == 1
+
+    return normalize_blocks(roots)
+
+
+def load_blocks(text: str, fmt: Optional[str] = None) -> list:
+    """
+    A block tree from JSON or markdown text.
+
+    fmt is "json" or "markdown"; without it, text starting with [ or {
+    is read as JSON.
+    """
+    if fmt is None:
+        fmt = "json" if text.lstrip()[:1] in ("[", "{") else "markdown"
+    if fmt == "json":
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise ValidationError(f"Invalid JSON: {e}")
+        return normalize_blocks(data)
+    return parse_outline(text)
+
+
+def count_blocks(blocks: list) -> int:
+    """Number of blocks in a tree, descendants included."""
+    return sum(1 + count_blocks(block.get("children", [])) for block in blocks)
+
+
+def chunk_blocks(blocks: list, size: int):
+    """
+    Yield runs of sibling blocks holding at most `size` blocks in all.
+
+    A block whose own subtree is larger is yielded alone.
+    """
+    chunk, total = [], 0
+    for block in blocks:
+        count = count_blocks([block])
+        if chunk and total + count > size:
+            yield chunk
+            chunk, total = [], 0
+        chunk.append(block)
+        total += count
+    if chunk:
+        yield chunk
+
+
 class LogseqWriter:
     """
     Write operations for Logseq graphs.
@@ -66,6 +251,9 @@ class LogseqWriter:
     NotFoundError = NotFoundError
     ValidationError = ValidationError
 
+    # Blocks per insertBatchBlock call in import_blocks
+    IMPORT_BATCH_SIZE = 200
+
     def __init__(
         self,
         url: Optional[str] = None,
@@ -78,63 +266,49 @@ class LogseqWriter:
             url: HTTP API URL (default: from env or http://127.0.0.1:12315)
             token: API token (default: from env LOGSEQ_API_TOKEN)
         """
-        self.url = url or os.environ.get("LOGSEQ_API_URL", "http://127.0.0.1:12315")
-        self.token = token or os.environ.get("LOGSEQ_API_TOKEN", "")
+        # Arguments, then environment, then env.json (parsed once per process)
+        self.url, self.token, _ = resolve_settings(url, token)
 
-        # Load from config if available
-        self._load_config()
+        # Last top-level block UUID per page (lowercased title), so
+        # consecutive appends skip getPage + getPageBlocksTree
+        self._last_blocks: dict[str, str] = {}
 
         if not self.token:
             raise AuthError("No API token configured. Set LOGSEQ_API_TOKEN or pass token parameter.")
 
-    def _load_config(self):
-        """Load configuration from env.json if available."""
-        config_path = Path.cwd() / ".claude" / "logseq-expert" / "env.json"
-        if config_path.exists():
-            try:
-                with open(config_path) as f:
-                    config = json.load(f)
-
-                http_config = config.get("http", {})
-                if not self.url or self.url == "http://127.0.0.1:12315":
-                    self.url = http_config.get("url", self.url)
-                if not self.token:
-                    token = http_config.get("token", "")
-                    if token.startswith("${") and token.endswith("}"):
-                        var_name = token[2:-1]
-                        self.token = os.environ.get(var_name, "")
-                    else:
-                        self.token = token
-            except Exception:
-                pass
-
     def _call(self, method: str, args: list = None) -> Any:
-        """Make HTTP API call."""
+        """
+        Make HTTP API call over the shared keep-alive connection.
+
+        After a write, cached LogseqClient reads of the pages/blocks named
+        in its first arguments are dropped (even if the call failed, since
+        it may have been applied).
+        """
         try:
-            req = urllib.request.Request(
-                f"{self.url}/api",
-                data=json.dumps({"method": method, "args": args or []}).encode(),
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.token}"
-                },
-                method="POST"
+            status, reason, data = get_transport(self.url).post_json(
+                "/api",
+                {"method": method, "args": args or []},
+                {"Authorization": f"Bearer {self.token}"},
+                idempotent=not is_mutation(method),
             )
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                data = json.loads(response.read().decode())
-
-                if "error" in data:
-                    raise WriteError(data["error"])
-
-                return data.get("result")
-
-        except urllib.error.HTTPError as e:
-            if e.code == 401:
-                raise AuthError("Invalid token")
-            raise ConnectionError(f"HTTP error {e.code}: {e.reason}")
-        except urllib.error.URLError as e:
-            raise ConnectionError(f"Connection failed: {e.reason}")
+        except (TransportError, ValueError) as e:
+            # LogseqClient probes again rather than trust a recorded detection
+            forget_detection(self.url, "http")
+            raise ConnectionError(f"Connection failed: {e}")
+        finally:
+            if is_mutation(method):
+                invalidate(self.url, [arg for arg in (args or [])[:2] if isinstance(arg, str)])
+
+        if status == 401:
+            raise AuthError("Invalid token")
+        if status >= 400:
+            raise ConnectionError(f"HTTP error {status}: {reason}")
+        if not isinstance(data, dict):
+            raise WriteError("Invalid response from Logseq API")
+        if "error" in data:
+            raise WriteError(data["error"])
+
+        return data.get("result")
 
     # ============== Page Operations ==============
 
@@ -208,6 +382,7 @@ class LogseqWriter:
             raise NotFoundError(f"Page '{title}' not found")
 
         self._call("logseq.Editor.deletePage", [title])
+        self._forget_last(title)
         return True
 
     # ============== Block Operations ==============
@@ -233,6 +408,8 @@ class LogseqWriter:
         """
         # Resolve parent
         parent_uuid = self._resolve_parent(parent)
+        if sibling:
+            self._forget_last(parent)
 
         # Insert block
         options = {"sibling": sibling}
@@ -270,12 +447,16 @@ class LogseqWriter:
             raise NotFoundError(f"Block '{uuid}' not found")
 
         self._call("logseq.Editor.removeBlock", [uuid])
+        self._forget_last(uuid)
         return True
 
     def append_to_page(self, title: str, content: str) -> dict:
         """
         Append content to the end of a page.
 
+        The new block's UUID is remembered, so the next append to the same
+        page is a single insertBlock call.
+
         Args:
             title: Page title
             content: Content to append
@@ -283,6 +464,101 @@ class LogseqWriter:
         Returns:
             Created block data
         """
+        block = self._insert_at_end(title, "logseq.Editor.insertBlock", content)
+        if isinstance(block, dict) and block.get("uuid"):
+            self._last_blocks[title.lower()] = block["uuid"]
+        return block
+
+    def import_blocks(self, title: str, blocks: list, batch_size: Optional[int] = None) -> dict:
+        """
+        Append a whole block tree to a page with few insertBatchBlock calls.
+
+        Top-level blocks are sent in chunks of at most batch_size blocks
+        (children included); a block with a larger subtree is inserted on
+        its own and its children imported under it the same way.
+
+        Args:
+            title: Page title (created if missing)
+            blocks: Block tree, as from parse_outline() or load_blocks()
+            batch_size: Blocks per call (default: IMPORT_BATCH_SIZE)
+
+        Returns:
+            {"page", "blocks", "calls", "last_uuid"}
+        """
+        blocks = normalize_blocks(blocks)
+        batch_size = max(1, batch_size or self.IMPORT_BATCH_SIZE)
+        if not blocks:
+            return {"page": title, "blocks": 0, "calls": 0, "last_uuid": None}
+
+        last_uuid, calls = self._insert_chunks(
+            blocks,
+            batch_size,
+            lambda payload: self._insert_at_end(title, "logseq.Editor.insertBatchBlock", payload),
+            lambda: self._page_tail(title)[0],
+        )
+        self._last_blocks[title.lower()] = last_uuid
+        return {"page": title, "blocks": count_blocks(blocks), "calls": calls, "last_uuid": last_uuid}
+
+    def _insert_chunks(self, blocks: list, batch_size: int, insert_first, find_last) -> tuple[str, int]:
+        """
+        Insert sibling blocks in chunks; returns (last block UUID, calls).
+
+        insert_first(payload) places the first chunk; later chunks go after
+        the previous chunk's last block. find_last() re-reads that block
+        when the API response doesn't identify it.
+        """
+        anchor, calls = None, 0
+        for chunk in chunk_blocks(blocks, batch_size):
+            head_only = count_blocks(chunk) > batch_size
+            payload = [{k: v for k, v in chunk[0].items() if k != "children"}] if head_only else chunk
+            if anchor is None:
+                created = insert_first(payload)
+            else:
+                created = self._call("logseq.Editor.insertBatchBlock", [anchor, payload, {"sibling": True}])
+            calls += 1
+
+            # Only a list of the top-level blocks tells us which one is last
+            if isinstance(created, list) and len(created) == len(payload) and isinstance(created[-1], dict) \
+                    and created[-1].get("uuid"):
+                anchor = created[-1]["uuid"]
+            else:
+                anchor = find_last()
+
+            if head_only:
+                parent = anchor
+                _, nested = self._insert_chunks(
+                    chunk[0]["children"],
+                    batch_size,
+                    lambda payload: self._call("logseq.Editor.insertBatchBlock", [parent, payload, {"sibling": False}]),
+                    lambda: self._last_child(parent),
+                )
+                calls += nested
+        return anchor, calls
+
+    def _insert_at_end(self, title: str, method: str, payload: Any) -> Any:
+        """
+        Insert content or blocks after the last block of a page.
+
+        Tries the cached last block first; if that block is gone (the insert
+        fails or returns nothing), the page is read again.
+        """
+        cached = self._last_blocks.get(title.lower())
+        if cached:
+            try:
+                result = self._call(method, [cached, payload, {"sibling": True}])
+            except (AuthError, ConnectionError):
+                raise
+            except WriteError:
+                result = None
+            if result:
+                return result
+            self._forget_last(title)
+
+        anchor, sibling = self._page_tail(title)
+        return self._call(method, [anchor, payload, {"sibling": sibling}])
+
+    def _page_tail(self, title: str) -> tuple[str, bool]:
+        """(UUID, sibling) to insert after the last block of a page, creating it if missing."""
         page = self._call("logseq.Editor.getPage", [title])
         if not page:
             # Create page if it doesn't exist
@@ -290,22 +566,26 @@ class LogseqWriter:
 
         # Get last block of page
         blocks = self._call("logseq.Editor.getPageBlocksTree", [title])
-
         if blocks and len(blocks) > 0:
             # Insert after last block
-            last_block = blocks[-1]
-            return self._call("logseq.Editor.insertBlock", [
-                last_block["uuid"],
-                content,
-                {"sibling": True}
-            ])
-        else:
-            # Page is empty, create first block
-            return self._call("logseq.Editor.insertBlock", [
-                page["uuid"],
-                content,
-                {"sibling": False}
-            ])
+            return blocks[-1]["uuid"], True
+        # Page is empty, create first block
+        return page["uuid"], False
+
+    def _last_child(self, uuid: str) -> str:
+        """UUID of a block's last child."""
+        block = self._call("logseq.Editor.getBlock", [uuid, {"includeChildren": True}])
+        children = (block or {}).get("children") or []
+        if not children or not isinstance(children[-1], dict):
+            raise WriteError(f"Block '{uuid}' has no children after insert")
+        return children[-1]["uuid"]
+
+    def _forget_last(self, target: str):
+        """Drop cached last blocks for a page title or block UUID."""
+        key = target.lower()
+        for title, uuid in list(self._last_blocks.items()):
+            if title == key or uuid == target:
+                del self._last_blocks[title]
 
     def _resolve_parent(self, parent: str) -> str:
         """Resolve parent to UUID."""
@@ -345,15 +625,7 @@ class LogseqWriter:
         Returns:
             True if set
         """
-        # Convert value based on type if specified
-        if property_type == "number":
-            value = float(value) if "." in str(value) else int(value)
-        elif property_type == "checkbox":
-            value = bool(value)
-        elif property_type == "date" and isinstance(value, str):
-            # Keep as string for date linking
-            pass
-
+        value = convert_property(value, property_type)
         self._call("logseq.Editor.upsertBlockProperty", [uuid, key, value])
         return True
 
@@ -368,8 +640,9 @@ class LogseqWriter:
         Returns:
             True if all set
         """
-        for key, value in properties.items():
-            self.set_property(uuid, key, value)
+        batch = self.batch()
+        batch.set_properties(uuid, properties)
+        batch.flush(raise_errors=True)
         return True
 
     def remove_property(self, uuid: str, key: str) -> bool:
@@ -425,8 +698,9 @@ class LogseqWriter:
         Returns:
             True if added
         """
-        for tag in tags:
-            self.add_tag(uuid, tag)
+        batch = self.batch()
+        batch.add_tags(uuid, tags)
+        batch.flush(raise_errors=True)
         return True
 
     def remove_tag(self, uuid: str, tag: str) -> bool:
@@ -454,6 +728,17 @@ class LogseqWriter:
 
         return True
 
+    # ============== Batched Operations ==============
+
+    def batch(self) -> "WriteBatch":
+        """
+        Start a batch of edits, applied with the fewest API calls on flush.
+
+        Used as a context manager, the batch flushes when the block exits
+        without an exception.
+        """
+        return WriteBatch(self)
+
     # ============== Utility Operations ==============
 
     def sync_notes(self, title: str, notes: str, page_prefix: str = "Claude Notes") -> dict:
@@ -480,6 +765,210 @@ class LogseqWriter:
         return self.append_to_page(page_title, content)
 
 
+class WriteBatch:
+    """
+    Collects block edits and applies them with the fewest API calls.
+
+    Edits are coalesced per block:
+    - content updates and tag additions/removals become at most one
+      getBlock (only when tags change and no new content was given) and
+      one updateBlock
+    - property sets are deduplicated by key (last value wins); when the
+      block's content is written anyway they ride along in updateBlock's
+      properties option, otherwise each key is one upsertBlockProperty
+      (never a read-modify-write of content nobody asked to change, which
+      could overwrite a concurrent edit)
+    - consecutive insert_blocks under the same parent become one
+      insertBatchBlock call
+
+    flush() returns one result per queued operation, in order:
+    {"index", "op", "target", "ok", "result", "error"}.
+    """
+
+    # Queueing methods, as named in JSON operation lists
+    OPERATIONS = (
+        "update_block", "set_property", "set_properties",
+        "add_tag", "add_tags", "remove_tag", "insert_blocks",
+    )
+
+    def __init__(self, writer: LogseqWriter):
+        self.writer = writer
+        self.operations: list[dict] = []
+        self.results: list[dict] = []
+        self.calls = 0
+
+    def __enter__(self) -> "WriteBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def _queue(self, op: str, target: str, **data) -> int:
+        self.operations.append({"op": op, "target": target, **data})
+        return len(self.operations) - 1
+
+    # ---- Queueing ----
+
+    def update_block(self, uuid: str, content: str) -> int:
+        """Replace a block's content; later tag edits apply on top."""
+        return self._queue("update_block", uuid, content=content)
+
+    def set_property(self, uuid: str, key: str, value: Any, property_type: Optional[str] = None) -> int:
+        """Set one property on a block."""
+        return self._queue("set_property", uuid, properties={key: convert_property(value, property_type)})
+
+    def set_properties(self, uuid: str, properties: dict) -> int:
+        """Set several properties on a block."""
+        return self._queue("set_properties", uuid, properties=dict(properties))
+
+    def add_tag(self, uuid: str, tag: str) -> int:
+        """Append #tag to a block unless present."""
+        return self._queue("add_tag", uuid, tags=[tag])
+
+    def add_tags(self, uuid: str, tags: list) -> int:
+        """Append several tags to a block."""
+        return self._queue("add_tags", uuid, tags=list(tags))
+
+    def remove_tag(self, uuid: str, tag: str) -> int:
+        """Remove #tag from a block."""
+        return self._queue("remove_tag", uuid, remove=tag)
+
+    def insert_blocks(self, parent: str, blocks: list, sibling: bool = False) -> int:
+        """
+        Insert blocks under (or after) a parent block UUID or page title.
+
+        Each block is content text or {"content", "properties", "children"}.
+        """
+        normalized = [{"content": b} if isinstance(b, str) else b for b in blocks]
+        return self._queue("insert_blocks", parent, blocks=normalized, sibling=sibling)
+
+    # ---- Flushing ----
+
+    def _call(self, method: str, args: list) -> Any:
+        self.calls += 1
+        return self.writer._call(method, args)
+
+    def _units(self) -> list[tuple[str, Any, list[int]]]:
+        """Operations grouped into flush units, in order of first appearance."""
+        units = []
+        block_units = {}
+        for index, operation in enumerate(self.operations):
+            if operation["op"] == "insert_blocks":
+                key = (operation["target"], operation["sibling"])
+                last = units[-1] if units else None
+                if last and last[0] == "insert" and last[1] == key:
+                    last[2].append(index)
+                else:
+                    units.append(("insert", key, [index]))
+            elif operation["target"] in block_units:
+                block_units[operation["target"]][2].append(index)
+            else:
+                unit = ("block", operation["target"], [index])
+                block_units[operation["target"]] = unit
+                units.append(unit)
+        return units
+
+    def _flush_block(self, uuid: str, indexes: list[int]) -> Any:
+        """Apply every edit queued for one block."""
+        content = None
+        content_set = False
+        tag_edits = []
+        properties = {}
+        for index in indexes:
+            operation = self.operations[index]
+            if operation["op"] == "update_block":
+                content, content_set = operation["content"], True
+                tag_edits = []
+            elif "tags" in operation:
+                tag_edits.extend(("add", tag) for tag in operation["tags"])
+            elif "remove" in operation:
+                tag_edits.append(("remove", operation["remove"]))
+            else:
+                properties.update(operation["properties"])
+
+        fold = content_set or bool(tag_edits)
+        original = None
+        if fold and not content_set:
+            block = self._call("logseq.Editor.getBlock", [uuid])
+            if not block:
+                raise NotFoundError(f"Block '{uuid}' not found")
+            original = content = block.get("content", "")
+
+        for action, tag in tag_edits:
+            content = with_tag(content, tag) if action == "add" else without_tag(content, tag)
+
+        if fold:
+            if content_set or properties or content != original:
+                options = {"properties": properties} if properties else {}
+                args = [uuid, content, options] if options else [uuid, content]
+                self._call("logseq.Editor.updateBlock", args)
+            return True
+
+        for key, value in properties.items():
+            self._call("logseq.Editor.upsertBlockProperty", [uuid, key, value])
+        return True
+
+    def _flush_inserts(self, parent: str, sibling: bool, indexes: list[int]) -> list:
+        """Insert every queued block under one parent in a single call."""
+        parent_uuid = self.writer._resolve_parent(parent)
+        if sibling:
+            self.writer._forget_last(parent)
+        blocks = [block for index in indexes for block in self.operations[index]["blocks"]]
+        created = self._call("logseq.Editor.insertBatchBlock", [parent_uuid, blocks, {"sibling": sibling}])
+        if not isinstance(created, list) or len(created) != len(blocks):
+            return [created] * len(indexes)
+        # Hand each operation the blocks it queued
+        results, start = [], 0
+        for index in indexes:
+            count = len(self.operations[index]["blocks"])
+            results.append(created[start:start + count])
+            start += count
+        return results
+
+    def flush(self, raise_errors: bool = False) -> list[dict]:
+        """
+        Apply every queued operation and clear the queue.
+
+        A failure only fails the operations of that block or insert group.
+        With raise_errors, the first failure is re-raised after the rest of
+        the batch has been applied.
+        """
+        results: list[Optional[dict]] = [None] * len(self.operations)
+        first_error = None
+
+        def record(indexes, outcomes=None, error=None):
+            for position, index in enumerate(indexes):
+                results[index] = {
+                    "index": index,
+                    "op": self.operations[index]["op"],
+                    "target": self.operations[index]["target"],
+                    "ok": error is None,
+                    "result": outcomes[position] if outcomes is not None else None,
+                    "error": str(error) if error is not None else None,
+                }
+
+        for kind, key, indexes in self._units():
+            try:
+                if kind == "insert":
+                    record(indexes, self._flush_inserts(key[0], key[1], indexes))
+                else:
+                    outcome = self._flush_block(key, indexes)
+                    record(indexes, [outcome] * len(indexes))
+            except WriteError as e:
+                first_error = first_error or e
+                record(indexes, error=e)
+
+        self.operations = []
+        self.results = results
+        if raise_errors and first_error is not None:
+            raise first_error
+        return results
+
+
 if __name__ == "__main__":
     import sys
 
@@ -489,6 +978,8 @@ if __name__ == "__main__":
         print("  create-page <title>")
         print("  create-block <parent> <content>")
         print("  append <page-title> <content>")
+        print("  batch <operations.json|->")
+        print("  import <page-title> <notes.md|notes.json|-> [--batch-size N]")
         sys.exit(1)
 
     writer = LogseqWriter()
@@ -507,6 +998,37 @@ if __name__ == "__main__":
             result = writer.append_to_page(sys.argv[2], sys.argv[3])
             print(json.dumps(result, indent=2))
 
+        elif command == "batch" and len(sys.argv) >= 3:
+            # [{"op": "add_tags", "uuid": "...", "tags": [...]}, ...]
+            source = sys.stdin if sys.argv[2] == "-" else open(sys.argv[2])
+            with source:
+                operations = json.load(source)
+            batch = writer.batch()
+            for operation in operations:
+                args = dict(operation)
+                op = args.pop("op", None)
+                if op not in WriteBatch.OPERATIONS:
+                    raise ValidationError(f"Unknown batch operation: {op}")
+                getattr(batch, op)(**args)
+            results = batch.flush()
+            print(json.dumps({"calls": batch.calls, "results": results}, indent=2))
+            if not all(r["ok"] for r in results):
+                sys.exit(1)
+
+        elif command == "import" and len(sys.argv) >= 4:
+            # Nested markdown outline or JSON block tree
+            batch_size = None
+            if "--batch-size" in sys.argv[4:]:
+                batch_size = int(sys.argv[sys.argv.index("--batch-size") + 1])
+            source = sys.argv[3]
+            if source == "-":
+                blocks = load_blocks(sys.stdin.read())
+            else:
+                with open(source) as f:
+                    blocks = load_blocks(f.read(), "json" if source.endswith(".json") else "markdown")
+            result = writer.import_blocks(sys.argv[2], blocks, batch_size=batch_size)
+            print(json.dumps(result, indent=2))
+
         else:
             print(f"Unknown command or missing arguments: {command}")
             sys.exit(1)
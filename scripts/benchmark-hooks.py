@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Hook Benchmark Harness
+
+Replays hook payloads through every command hook declared in the plugins'
+hooks/hooks.json files, the way Claude Code runs them (shell command,
+payload on stdin, CLAUDE_PLUGIN_ROOT and CLAUDE_PROJECT_DIR set), and
+reports p50/p95 latency and peak RSS per hook and scenario.
+
+Built-in scenarios:
+- pre-write, pre-write-component, pre-edit: Write/Edit PreToolUse
+- session-start: SessionStart
+- session-end-1k, session-end-10k, session-end-100k: SessionEnd with a
+  generated transcript of that many lines
+
+Recorded payloads can be replayed too: each *.json file in --payloads is a
+hook payload (with hook_event_name and, for tool events, tool_name) and
+becomes a scenario named after the file.
+
+Prompt hooks run inside the model, not as processes, and are skipped.
+Hooks run with HOME set to a scratch directory so benchmarking never
+touches real learnings or metrics; the first run of each pair is a
+warm-up and isn't measured.
+
+Peak RSS is the largest VmHWM of any process in the hook's tree, sampled
+from /proc every couple of milliseconds while it runs (a process that
+exits between samples is missed). Without /proc it comes from wait4(), which also
+counts the forked copy of this process before exec, so a hook's RSS can't
+be told apart below that floor (measured once with a no-op command and
+reported as "<=floor").
+
+Budgets in scripts/hook-budgets.json map "<plugin>/<event>/<scenario>"
+(or a "*" wildcard for any part) to {"p95_ms": ..., "peak_rss_mb": ...};
+the exit code is 1 when a measurement exceeds its budget, or an RSS budget
+can't be checked because the peak wasn't measured.
+
+Usage:
+    python3 scripts/benchmark-hooks.py                       # All hooks and scenarios
+    python3 scripts/benchmark-hooks.py --plugin agent-builder --runs 50
+    python3 scripts/benchmark-hooks.py --scenario pre-write --json
+    python3 scripts/benchmark-hooks.py --payloads recorded/ --budgets my-budgets.json
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGETS = Path(__file__).resolve().parent / "hook-budgets.json"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from component_index import load_index
+
+# Events whose matcher is checked against the payload's tool_name
+TOOL_EVENTS = {"PreToolUse", "PostToolUse"}
+
+# Scenario -> (event, tool name, default runs); payloads are built in make_payload()
+SCENARIOS = {
+    "pre-write": ("PreToolUse", "Write", 20),
+    "pre-write-component": ("PreToolUse", "Write", 20),
+    "pre-edit": ("PreToolUse", "Edit", 20),
+    "session-start": ("SessionStart", None, 20),
+    "session-end-1k": ("SessionEnd", None, 10),
+    "session-end-10k": ("SessionEnd", None, 5),
+    "session-end-100k": ("SessionEnd", None, 3),
+}
+
+HOOK_TIMEOUT = 120
+
+# Sample hook memory from /proc when it's available
+PROC_STATUS = Path("/proc/self/status").is_file()
+RSS_POLL_INTERVAL = 0.002
+
+SAMPLE_CODE = '''import os
+import subprocess
+
+
+def load_settings(path):
+    """Read settings from disk."""
+    with open(path) as f:
+        return f.read()
+
+
+def run(command):
+    # TODO: validate the command first
+    return subprocess.run(command, shell=True, capture_output=True)
+
+
+def main():
+    password = "hunter2"
+    settings = load_settings(os.path.expanduser("~/.app"))
+    try:
+        run(settings)
+    except:
+        pass
+'''
+
+SAMPLE_AGENT = '''---
+name: benchmark-helper
+description: Use when benchmarking hooks.
+tools: Read, Grep
+---
+
+# Benchmark Helper
+'''
+
+
+def hook_commands(root: Path = REPO_ROOT, plugin: Optional[str] = None) -> tuple[list[dict], list[dict]]:
+    """
+    Command hooks from every plugin's hooks.json, plus the skipped ones.
+
+    Each hook is {plugin, plugin_root, event, matcher, command}.
+    """
+    commands, skipped = [], []
+    for path in load_index(root).paths("hook", plugin):
+        try:
+            events = json.loads(path.read_text(encoding="utf-8")).get("hooks", {})
+        except (OSError, ValueError, AttributeError):
+            continue
+        for event, entries in events.items():
+            for entry in entries or []:
+                for hook in entry.get("hooks", []):
+                    record = {
+                        "plugin": path.parent.parent.name,
+                        "plugin_root": str(path.parent.parent),
+                        "event": event,
+                        "matcher": entry.get("matcher"),
+                    }
+                    if hook.get("type") == "command":
+                        commands.append({**record, "command": hook.get("command", "")})
+                    else:
+                        skipped.append({**record, "type": hook.get("type")})
+    return commands, skipped
+
+
+def matches(hook: dict, event: str, tool_name: Optional[str]) -> bool:
+    """Whether Claude Code would run `hook` for this event and tool."""
+    if hook["event"] != event:
+        return False
+    matcher = hook.get("matcher")
+    if event not in TOOL_EVENTS or not matcher or matcher == "*":
+        return True
+    return re.fullmatch(matcher, tool_name or "") is not None
+
+
+def write_transcript(path: Path, lines: int):
+    """A JSONL transcript of `lines` user/assistant/tool entries."""
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(lines):
+            timestamp = f"2025-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z"
+            kind = i % 4
+            if kind == 0:
+                message = {"role": "user", "content": f"Please fix the failing test number {i} in the parser."}
+            elif kind == 1:
+                message = {"role": "assistant", "content": [
+                    {"type": "text", "text": f"Looking at the parser now (step {i})."},
+                    {"type": "tool_use", "name": "Read", "input": {"file_path": "src/parser.py"}},
+                ]}
+            elif kind == 2:
+                message = {"role": "user", "content": [{"type": "tool_result", "content": "ok"}]}
+            else:
+                message = {"role": "assistant", "content": [
+                    {"type": "text", "text": f"Here is the fix:\n```python\n{SAMPLE_CODE}```\n"},
+                ]}
+            entry = {"type": message["role"], "message": message, "timestamp": timestamp}
+            f.write(json.dumps(entry) + "\n")
+
+
+def make_payload(scenario: str, workdir: Path) -> dict:
+    """The hook payload for a built-in scenario; fixtures go under `workdir`."""
+    event, tool_name, _ = SCENARIOS[scenario]
+    transcript = workdir / f"{scenario}.jsonl"
+    base = {
+        "session_id": f"benchmark-{scenario}",
+        "transcript_path": str(transcript),
+        "cwd": str(workdir),
+        "hook_event_name": event,
+    }
+
+    if scenario.startswith("session-end-"):
+        if not transcript.exists():
+            write_transcript(transcript, int(scenario.rsplit("-", 1)[1].rstrip("k")) * 1000)
+        return {**base, "reason": "other"}
+    if not transcript.exists():
+        write_transcript(transcript, 40)
+    if scenario == "session-start":
+        return {**base, "source": "startup"}
+
+    if scenario == "pre-write-component":
+        tool_input = {"file_path": str(workdir / "my-plugin" / "agents" / "benchmark-helper.md"), "content": SAMPLE_AGENT}
+    elif scenario == "pre-write":
+        tool_input = {"file_path": str(workdir / "src" / "settings.py"), "content": SAMPLE_CODE * 5}
+    else:
+        target = workdir / "src" / "edited.py"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(SAMPLE_CODE * 5, encoding="utf-8")
+        tool_input = {"file_path": str(target), "old_string": '    password = "hunter2"\n', "new_string": '    password = os.environ["APP_PASSWORD"]\n'}
+    return {**base, "tool_name": tool_name, "tool_input": tool_input}
+
+
+def load_payloads(directory: Path) -> dict[str, tuple[str, Optional[str], dict]]:
+    """Recorded payloads: scenario name -> (event, tool name, payload)."""
+    payloads = {}
+    for path in sorted(Path(directory).glob("*.json")):
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        payloads[path.stem] = (payload.get("hook_event_name", ""), payload.get("tool_name"), payload)
+    return payloads
+
+
+def sample_peak_rss(pid: int, peaks: dict[int, int]):
+    """Record the VmHWM (KiB) of `pid` and every descendant in `peaks`."""
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status", "rb") as f:
+                for line in f:
+                    if line.startswith(b"VmHWM:"):
+                        # An exiting process reports 0 once its memory is released
+                        peak = int(line.split()[1])
+                        if peak:
+                            peaks[current] = max(peaks.get(current, 0), peak)
+                        break
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children", "rb") as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+
+
+def poll_peak_rss(pid: int, peaks: dict[int, int], done: threading.Event):
+    """Sample the process tree under `pid` until `done` is set."""
+    while True:
+        sample_peak_rss(pid, peaks)
+        if done.wait(RSS_POLL_INTERVAL):
+            return
+
+
+def run_once(command: str, payload: bytes, env: dict, cwd: Path) -> tuple[float, Optional[int], int]:
+    """Run one hook: (seconds, peak RSS in KiB or None, exit code)."""
+    with tempfile.TemporaryFile() as stdin:
+        stdin.write(payload)
+        stdin.seek(0)
+        start = time.perf_counter()
+        proc = subprocess.Popen(
+            command, shell=True, stdin=stdin, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, env=env, cwd=cwd,
+        )
+        timer = threading.Timer(HOOK_TIMEOUT, proc.kill)
+        timer.start()
+        peaks, done = {}, threading.Event()
+        poller = None
+        if PROC_STATUS:
+            # Popen returns after exec, so every sample is the hook's own memory
+            poller = threading.Thread(target=poll_peak_rss, args=(proc.pid, peaks, done), daemon=True)
+            poller.start()
+        try:
+            if hasattr(os, "wait4"):
+                # wait4's usage covers the hook and every child it waited for
+                _, status, usage = os.wait4(proc.pid, 0)
+                elapsed = time.perf_counter() - start
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                peak = usage.ru_maxrss
+            else:
+                proc.wait()
+                elapsed = time.perf_counter() - start
+                peak = None
+        finally:
+            timer.cancel()
+            done.set()
+        if poller is not None:
+            poller.join()
+            peak = max(peaks.values()) if peaks else None
+        return elapsed, peak, proc.returncode
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Linear-interpolated percentile of `samples`."""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def benchmark(
+    hooks: list[dict],
+    scenarios: dict[str, tuple[str, Optional[str], dict]],
+    runs: Optional[int],
+    workdir: Path,
+    root: Path = REPO_ROOT,
+) -> list[dict]:
+    """Measure every (hook, scenario) pair that Claude Code would run."""
+    home = workdir / "home"
+    home.mkdir(exist_ok=True)
+    # Only wait4's peak includes the forked copy of this process
+    floor = None if PROC_STATUS else run_once("exit 0", b"", dict(os.environ), workdir)[1]
+    results = []
+    for hook in hooks:
+        env = {
+            **os.environ,
+            "HOME": str(home),
+            "CLAUDE_PLUGIN_ROOT": hook["plugin_root"],
+            "CLAUDE_PROJECT_DIR": str(root),
+        }
+        for name, (event, tool_name, payload) in scenarios.items():
+            if not matches(hook, event, tool_name):
+                continue
+            count = runs or SCENARIOS.get(name, (None, None, 10))[2]
+            data = json.dumps(payload).encode("utf-8")
+            run_once(hook["command"], data, env, workdir)
+            times, peaks, failures = [], [], 0
+            for _ in range(count):
+                elapsed, peak, code = run_once(hook["command"], data, env, workdir)
+                times.append(elapsed * 1000)
+                if peak is not None:
+                    peaks.append(peak)
+                failures += code != 0
+            results.append({
+                "key": f"{hook['plugin']}/{event}/{name}",
+                "plugin": hook["plugin"],
+                "event": event,
+                "scenario": name,
+                "command": hook["command"],
+                "runs": count,
+                "failures": failures,
+                "p50_ms": round(statistics.median(times), 2),
+                "p95_ms": round(percentile(times, 95), 2),
+                "peak_rss_mb": round(max(peaks) / 1024, 1) if peaks else None,
+                "rss_floor_mb": round(floor / 1024, 1) if floor else None,
+            })
+    return results
+
+
+def load_budgets(path: Path) -> dict[str, dict]:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8")).get("budgets", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def budget_for(key: str, budgets: dict[str, dict]) -> Optional[dict]:
+    """The exact budget for `key`, else the first wildcard pattern matching it."""
+    if key in budgets:
+        return budgets[key]
+    for pattern, budget in budgets.items():
+        if fnmatch.fnmatchcase(key, pattern):
+            return budget
+    return None
+
+
+def check_budgets(results: list[dict], budgets: dict[str, dict]) -> list[str]:
+    """
+    Messages for every result over its budget (and every failing hook).
+
+    An RSS budget fails when the peak wasn't measured or is hidden below
+    the fork floor, since the hook can't be shown to be within it.
+    """
+    violations = []
+    for result in results:
+        if result["failures"]:
+            violations.append(f"{result['key']}: exited non-zero in {result['failures']} of {result['runs']} runs")
+        budget = budget_for(result["key"], budgets) or {}
+        limit = budget.get("p95_ms")
+        if limit is not None and result["p95_ms"] > limit:
+            violations.append(f"{result['key']}: p95 {result['p95_ms']}ms > budget {limit}ms")
+        limit = budget.get("peak_rss_mb")
+        if limit is None:
+            continue
+        if result["peak_rss_mb"] is None:
+            violations.append(f"{result['key']}: peak RSS not measured, can't check budget {limit}MB")
+        elif below_floor(result):
+            violations.append(
+                f"{result['key']}: peak RSS hidden below the {result['rss_floor_mb']}MB fork floor "
+                f"in every run, can't check budget {limit}MB"
+            )
+        elif result["peak_rss_mb"] > limit:
+            violations.append(f"{result['key']}: peak RSS {result['peak_rss_mb']}MB > budget {limit}MB")
+    return violations
+
+
+def below_floor(result: dict) -> bool:
+    """Whether the hook's peak RSS is hidden by the fork floor (or unknown)."""
+    if result["peak_rss_mb"] is None:
+        return True
+    return result["rss_floor_mb"] is not None and result["peak_rss_mb"] <= result["rss_floor_mb"]
+
+
+def print_report(results: list[dict], skipped: list[dict], violations: list[str]):
+    width = max((len(r["key"]) for r in results), default=20)
+    print(f"{'Hook / event / scenario':<{width}}  {'runs':>4}  {'p50 ms':>9}  {'p95 ms':>9}  {'peak RSS':>9}")
+    print("-" * (width + 42))
+    for r in results:
+        if r["peak_rss_mb"] is None:
+            rss = "n/a"
+        elif below_floor(r):
+            rss = f"<={r['rss_floor_mb']}MB"
+        else:
+            rss = f"{r['peak_rss_mb']}MB"
+        print(f"{r['key']:<{width}}  {r['runs']:>4}  {r['p50_ms']:>9.1f}  {r['p95_ms']:>9.1f}  {rss:>9}")
+    if skipped:
+        print(f"\nSkipped {len(skipped)} non-command hook(s): "
+              + ", ".join(sorted({f"{s['plugin']}/{s['event']} ({s['type']})" for s in skipped})))
+    print()
+    if violations:
+        print("✗ Budget regressions:")
+        for violation in violations:
+            print(f"  - {violation}")
+    else:
+        print("✓ All hooks within budget")
+
+
+def main():
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(description="Benchmark every plugin hook command")
+    parser.add_argument("--plugin", help="Only benchmark this plugin's hooks")
+    parser.add_argument("--scenario", action="append", help="Only run this scenario (repeatable)")
+    parser.add_argument("--payloads", type=Path, help="Directory of recorded hook payloads (*.json)")
+    parser.add_argument("--runs", type=int, help="Measured runs per hook and scenario")
+    parser.add_argument("--budgets", type=Path, default=DEFAULT_BUDGETS, help="Budget file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    hooks, skipped = hook_commands(REPO_ROOT, args.plugin)
+
+    with tempfile.TemporaryDirectory(prefix="hook-benchmark-") as tmp:
+        workdir = Path(tmp)
+        scenarios = {
+            name: (event, tool_name, make_payload(name, workdir))
+            for name, (event, tool_name, _) in SCENARIOS.items()
+            if not args.scenario or name in args.scenario
+        }
+        if args.payloads:
+            recorded = load_payloads(args.payloads)
+            scenarios.update({k: v for k, v in recorded.items() if not args.scenario or k in args.scenario})
+        results = benchmark(hooks, scenarios, args.runs, workdir)
+
+    violations = check_budgets(results, load_budgets(args.budgets))
+
+    if args.json:
+        print(json.dumps({"results": results, "skipped": skipped, "violations": violations}, indent=2))
+    else:
+        print_report(results, skipped, violations)
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
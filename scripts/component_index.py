@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Marketplace Component Index
+
+Maintains components.index.json at the repository root: one record per
+agent, skill, command and hooks.json across all plugins, with its plugin,
+type, name, tools, description hash and path. Tools and tests query the
+index instead of globbing the tree and parsing frontmatter themselves.
+
+The index is rebuilt incrementally:
+- the root is listed every time (it is small, and saving the index
+  changes its mtime); plugin and component directories are only listed
+  again when their mtime changed (an entry was added, removed or renamed)
+- a component file is only parsed again when its mtime or size changed
+
+Like git's index, an mtime less than RACY_NS old when recorded isn't
+trusted (the same clock tick could hide a later change), so that
+directory or file is checked again on the next refresh.
+
+Usage:
+    python3 scripts/component_index.py build                # Refresh and save
+    python3 scripts/component_index.py list [--type agent] [--plugin name]
+    python3 scripts/component_index.py find <name>
+    python3 scripts/component_index.py tools <tool> [<tool> ...]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+INDEX_NAME = "components.index.json"
+INDEX_VERSION = 1
+
+sys.path.insert(0, str(REPO_ROOT / "agent-builder" / "skills" / "building-agents" / "scripts"))
+from frontmatter_parser import parse_file
+
+# Component type -> glob relative to a plugin directory
+COMPONENT_GLOBS = {
+    "agent": "agents/*.md",
+    "skill": "skills/*/SKILL.md",
+    "command": "commands/*.md",
+    "hook": "hooks/hooks.json",
+}
+
+# Directories whose listings determine which components exist
+CONTAINER_DIRS = ("agents", "commands", "skills", "hooks")
+
+# Timestamps this recent are re-checked on the next refresh
+RACY_NS = 2_000_000_000
+
+# Frontmatter field listing a component's tools
+TOOLS_FIELDS = {"agent": "tools", "skill": "allowed-tools", "command": "allowed-tools"}
+
+
+def split_tools(value) -> list[str]:
+    """Tools from a comma-separated string or a YAML list."""
+    if isinstance(value, str):
+        return [tool.strip() for tool in value.split(",") if tool.strip()]
+    if isinstance(value, list):
+        return [str(tool).strip() for tool in value if str(tool).strip()]
+    return []
+
+
+def description_hash(description) -> Optional[str]:
+    if not description:
+        return None
+    return hashlib.sha256(str(description).encode("utf-8")).hexdigest()[:16]
+
+
+def describe(component_type: str, plugin: str, path: Path, relative: str) -> dict:
+    """Index record for one component file."""
+    record = {"plugin": plugin, "type": component_type, "path": relative}
+    if component_type == "hook":
+        return {**record, "name": f"{plugin}-hooks", "tools": [], "description_hash": None}
+
+    try:
+        fields = parse_file(path).fields
+    except (OSError, UnicodeDecodeError):
+        fields = {}
+    default_name = path.parent.name if component_type == "skill" else path.stem
+    name = fields.get("name") if component_type != "command" else None
+    return {
+        **record,
+        "name": str(name) if name else default_name,
+        "tools": split_tools(fields.get(TOOLS_FIELDS[component_type])),
+        "description_hash": description_hash(fields.get("description")),
+    }
+
+
+def _mtime(path: Path) -> Optional[int]:
+    """Directory mtime, or None when missing or too recent to trust."""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return None if mtime > time.time_ns() - RACY_NS else mtime
+
+
+class ComponentIndex:
+    """Records for every component in the marketplace, refreshed from mtimes."""
+
+    def __init__(self, root: Path = REPO_ROOT, path: Optional[Path] = None):
+        self.root = Path(root)
+        self.path = Path(path) if path else self.root / INDEX_NAME
+        self.dirs: dict[str, Optional[int]] = {}
+        self.records: dict[str, dict] = {}
+        self.parsed = 0
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == INDEX_VERSION:
+                self.dirs = data["dirs"]
+                self.records = data["components"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    def _rel(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def _plugins(self) -> list[Path]:
+        return sorted(p for p in self.root.iterdir() if p.is_dir() and (p / ".claude-plugin").is_dir())
+
+    def _listing_changed(self) -> bool:
+        if not self.dirs:
+            return True
+        if {self._rel(p) for p in self._plugins()} != {rel for rel in self.dirs if "/" not in rel}:
+            return True
+        return any(mtime is None or _mtime(self.root / rel) != mtime for rel, mtime in self.dirs.items())
+
+    def _discover(self) -> dict[str, tuple[str, str]]:
+        """List the tree: relative path -> (type, plugin). Records directory mtimes."""
+        dirs = {}
+        found = {}
+        for plugin in self._plugins():
+            dirs[self._rel(plugin)] = _mtime(plugin)
+            for container in CONTAINER_DIRS:
+                directory = plugin / container
+                if directory.is_dir():
+                    dirs[self._rel(directory)] = _mtime(directory)
+            for skill in sorted((plugin / "skills").glob("*/")):
+                dirs[self._rel(skill)] = _mtime(skill)
+            for component_type, pattern in COMPONENT_GLOBS.items():
+                for path in sorted(plugin.glob(pattern)):
+                    found[self._rel(path)] = (component_type, plugin.name)
+        self.dirs = dirs
+        return found
+
+    def refresh(self) -> bool:
+        """Bring the index up to date; returns whether anything changed."""
+        relist = self._listing_changed()
+        if not relist:
+            changed, missing = self._update({rel: (r["type"], r["plugin"]) for rel, r in self.records.items()})
+            if not missing:
+                return changed
+            # Deleted or renamed within an unchanged-looking directory
+        found = self._discover()
+        for rel in list(self.records):
+            if rel not in found:
+                del self.records[rel]
+        self._update(found)
+        return True
+
+    def _update(self, found: dict[str, tuple[str, str]]) -> tuple[bool, bool]:
+        """Re-parse changed files; returns (anything changed, any file missing)."""
+        changed = missing = False
+        for rel, (component_type, plugin) in found.items():
+            path = self.root / rel
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self.records.pop(rel, None)
+                changed = missing = True
+                continue
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            record = self.records.get(rel)
+            if record and record["stamp"] == stamp:
+                continue
+            if stat.st_mtime_ns > time.time_ns() - RACY_NS:
+                stamp = None
+            self.records[rel] = {**describe(component_type, plugin, path, rel), "stamp": stamp}
+            self.parsed += 1
+            changed = True
+        return changed, missing
+
+    def save(self):
+        """Write the index atomically; a read-only checkout just skips it."""
+        data = {"version": INDEX_VERSION, "dirs": self.dirs, "components": dict(sorted(self.records.items()))}
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, indent=1), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError:
+            pass
+
+    def components(self, component_type: Optional[str] = None, plugin: Optional[str] = None) -> list[dict]:
+        """Records, optionally filtered, ordered by path."""
+        return [
+            record for rel, record in sorted(self.records.items())
+            if (component_type is None or record["type"] == component_type)
+            and (plugin is None or record["plugin"] == plugin)
+        ]
+
+    def paths(self, component_type: Optional[str] = None, plugin: Optional[str] = None) -> list[Path]:
+        """Absolute paths of the matching components."""
+        return [self.root / record["path"] for record in self.components(component_type, plugin)]
+
+    def get(self, path: Union[str, Path]) -> Optional[dict]:
+        """Record for a component file, by absolute or root-relative path."""
+        path = Path(path)
+        rel = self._rel(path) if path.is_absolute() else path.as_posix()
+        return self.records.get(rel)
+
+    def find(self, name: str, component_type: Optional[str] = None) -> list[dict]:
+        """Components with this name."""
+        return [r for r in self.components(component_type) if r["name"] == name]
+
+    def with_tools(self, *tools: str, component_type: Optional[str] = None) -> list[dict]:
+        """Components whose tools include every one of `tools`."""
+        wanted = set(tools)
+        return [r for r in self.components(component_type) if wanted <= set(r["tools"])]
+
+
+_loaded: dict[Path, ComponentIndex] = {}
+
+# Resolved root -> index file, for roots whose index shouldn't be kept at
+# <root>/components.index.json (the test suites keep the repository's in
+# a temporary directory)
+INDEX_PATHS: dict[Path, Path] = {}
+
+
+def load_index(root: Path = REPO_ROOT) -> ComponentIndex:
+    """
+    The index for `root`, refreshed and saved if anything changed.
+
+    The file is read once per process; later calls only re-check mtimes.
+    """
+    root = Path(root).resolve()
+    index = _loaded.get(root)
+    if index is None:
+        index = _loaded[root] = ComponentIndex(root, INDEX_PATHS.get(root))
+    if index.refresh():
+        index.save()
+    return index
+
+
+def main():
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(description="Query the marketplace component index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="Refresh and save the index")
+    listing = sub.add_parser("list", help="List components")
+    listing.add_argument("--type", choices=sorted(COMPONENT_GLOBS))
+    listing.add_argument("--plugin")
+    find = sub.add_parser("find", help="Find components by name")
+    find.add_argument("name")
+    tools = sub.add_parser("tools", help="Find components that have all of these tools")
+    tools.add_argument("tools", nargs="+")
+    args = parser.parse_args()
+
+    index = load_index()
+
+    if args.command == "build":
+        print(json.dumps({"components": len(index.records), "parsed": index.parsed, "path": str(index.path)}))
+        return
+    if args.command == "list":
+        records = index.components(args.type, args.plugin)
+    elif args.command == "find":
+        records = index.find(args.name)
+    else:
+        records = index.with_tools(*args.tools)
+    print(json.dumps(records, indent=2))
+    sys.exit(0 if records else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+"""
+Marketplace Validation Driver
+
+Validates every plugin in the repository in one Python process pool instead
+of one interpreter per component:
+- plugin.json (validate_plugin)
+- agents/*.md (validate_agent)
+- skills/*/SKILL.md (validate_skill)
+- commands/*.md (validate_command)
+- hooks/hooks.json (validate_hooks)
+- .claude-plugin/marketplace.json plugin sources
+
+The validators are the agent-builder scripts, imported as functions.
+Prints the same report as the old validate-plugins.sh loops, or JSON.
+
+Results are cached in .claude/validation-cache.json, keyed by a hash of
+everything a component's validator reads plus the validator's own source,
+so only changed components (and plugins whose referenced files changed)
+are validated again.
+
+Usage:
+    python3 scripts/validate-marketplace.py                 # Human report
+    python3 scripts/validate-marketplace.py --json          # Machine-readable
+    python3 scripts/validate-marketplace.py --workers 1     # No process pool
+    python3 scripts/validate-marketplace.py --skip-tests    # Skip tests/run_tests.py
+    python3 scripts/validate-marketplace.py --no-cache      # Validate everything
+    python3 scripts/validate-marketplace.py --changed-since origin/main
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from component_index import ComponentIndex, load_index
+
+VALIDATOR_SCRIPTS = REPO_ROOT / "agent-builder" / "skills"
+
+# Component kind -> (validator script, function name)
+VALIDATORS = {
+    "plugin": ("building-plugins/scripts/validate-plugin.py", "validate_plugin"),
+    "agent": ("building-agents/scripts/validate-agent.py", "validate_agent"),
+    "skill": ("building-skills/scripts/validate-skill.py", "validate_skill"),
+    "command": ("building-commands/scripts/validate-command.py", "validate_command"),
+    "hooks": ("building-hooks/scripts/validate-hooks.py", "validate_hooks"),
+}
+
+# Bump to discard every cached result
+CACHE_VERSION = 1
+DEFAULT_CACHE = REPO_ROOT / ".claude" / "validation-cache.json"
+
+# Absolute script paths in hook commands, checked by validate_hooks
+HOOK_SCRIPT_PATTERN = re.compile(r'"(?:bash|sh) (/[^\s"]+)')
+
+# Modules the validators import; editing one invalidates every result
+VALIDATOR_LIBRARIES = ("building-agents/scripts/frontmatter_parser.py",)
+
+# Report order within a plugin, matching validate-plugins.sh
+KIND_ORDER = ("plugin", "agent", "hooks", "skill", "command")
+KIND_LABELS = {"agent": "Agent", "skill": "Skill", "command": "Command"}
+
+# Colors for output
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+NC = "\033[0m"
+
+_validators: dict = {}
+
+
+def load_validator(kind: str):
+    """Import a validator script (once per process) and return its function."""
+    if kind not in _validators:
+        script, function = VALIDATORS[kind]
+        path = VALIDATOR_SCRIPTS / script
+        name = path.stem.replace("-", "_")
+        module = sys.modules.get(name)
+        if module is None:
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+        _validators[kind] = getattr(module, function)
+    return _validators[kind]
+
+
+def is_advisory(message: str) -> bool:
+    """Warnings and recommendations don't fail a component."""
+    return message.startswith("Warning:") or message.startswith("Recommendation:")
+
+
+def run_task(task: tuple[str, str, str]) -> dict:
+    """
+    Validate one component.
+
+    `status` is "pass", "warn" (issues that don't fail the run) or "fail",
+    following the exit codes validate-plugins.sh used to act on.
+    """
+    kind, plugin, path = task
+    result = {"kind": kind, "plugin": plugin, "path": relative(Path(path)), "name": Path(path).name}
+    try:
+        validator = load_validator(kind)
+        if kind == "plugin":
+            _, errors, warnings = validator(path)
+        else:
+            _, messages = validator(path)
+            errors = [m for m in messages if not is_advisory(m)]
+            warnings = [m for m in messages if is_advisory(m)]
+    except Exception as e:
+        errors, warnings = [f"Validator crashed: {type(e).__name__}: {e}"], []
+
+    result["errors"] = errors
+    result["warnings"] = warnings
+    if not errors:
+        result["status"] = "pass"
+    elif kind == "skill":
+        # Skill failures have always been reported as warnings
+        result["status"] = "warn"
+    else:
+        result["status"] = "fail"
+    return result
+
+
+def relative(path: Path) -> str:
+    try:
+        return str(path.relative_to(REPO_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def discover_plugins(root: Path = REPO_ROOT) -> list[Path]:
+    """Top-level directories with a .claude-plugin directory, sorted."""
+    return sorted(p for p in root.iterdir() if p.is_dir() and (p / ".claude-plugin").is_dir())
+
+
+def plugin_tasks(plugin_dir: Path, index: ComponentIndex) -> list[tuple[str, str, str]]:
+    """Validation tasks for one plugin's components, from the component index."""
+    plugin = plugin_dir.name
+    tasks = [("plugin", plugin, str(plugin_dir))]
+    for kind, component_type in (("agent", "agent"), ("hooks", "hook"), ("skill", "skill"), ("command", "command")):
+        for path in index.paths(component_type, plugin):
+            tasks.append((kind, plugin, str(path.parent if kind == "skill" else path)))
+    return tasks
+
+
+def validator_versions() -> dict[str, str]:
+    """Hash of each validator and the libraries it uses, so editing one invalidates its results."""
+    versions = {}
+    for kind, (script, _) in VALIDATORS.items():
+        digest = hashlib.sha256(f"{CACHE_VERSION}:".encode())
+        for source in (script, *VALIDATOR_LIBRARIES):
+            digest.update((VALIDATOR_SCRIPTS / source).read_bytes())
+        versions[kind] = digest.hexdigest()
+    return versions
+
+
+def _hash_file(digest, path: Path):
+    digest.update(f"{path}\0".encode())
+    try:
+        digest.update(path.read_bytes())
+    except OSError:
+        digest.update(b"<missing>")
+    digest.update(b"\0")
+
+
+def _hash_mode(digest, path: Path):
+    try:
+        mode = path.stat().st_mode & 0o111
+    except OSError:
+        mode = -1
+    digest.update(f"{path}:{mode}\0".encode())
+
+
+def _hash_tree(digest, directory: Path):
+    """Names, executable bits and layout of everything under `directory`."""
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        base = os.path.relpath(dirpath, directory)
+        digest.update(f"{base}/:{','.join(dirnames)}\0".encode())
+        for name in sorted(filenames):
+            try:
+                mode = os.stat(os.path.join(dirpath, name)).st_mode & 0o111
+            except OSError:
+                continue
+            digest.update(f"{base}/{name}:{mode}\0".encode())
+
+
+def fingerprint(task: tuple[str, str, str], version: str) -> str:
+    """
+    Hash of the validator version and every input the validator reads.
+
+    - agents, commands: the file
+    - hooks: hooks.json and the absolute script paths it runs
+    - skills: SKILL.md and the skill directory's layout
+    - plugins: plugin.json, README.md, shell scripts, referenced hooks
+      files and the plugin's layout (for referenced paths and components)
+    """
+    kind, _, path = task
+    path = Path(path)
+    digest = hashlib.sha256(f"{version}:{kind}\0".encode())
+    if kind == "hooks":
+        _hash_file(digest, path)
+        try:
+            scripts = HOOK_SCRIPT_PATTERN.findall(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            scripts = []
+        for script in sorted(set(scripts)):
+            _hash_mode(digest, Path(script))
+    elif kind == "skill":
+        _hash_file(digest, path / "SKILL.md")
+        _hash_tree(digest, path)
+    elif kind == "plugin":
+        manifest = path / ".claude-plugin" / "plugin.json"
+        _hash_file(digest, manifest)
+        _hash_file(digest, path / "README.md")
+        _hash_tree(digest, path)
+        for script in sorted(path.rglob("*.sh")):
+            _hash_file(digest, script)
+        try:
+            hooks = json.loads(manifest.read_text(encoding="utf-8")).get("hooks", [])
+        except (OSError, ValueError, AttributeError):
+            hooks = []
+        for hook in [hooks] if isinstance(hooks, str) else hooks:
+            if isinstance(hook, str) and hook.endswith(".json"):
+                _hash_file(digest, path / hook.lstrip("./"))
+    else:
+        _hash_file(digest, path)
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """Per-component results keyed by fingerprint."""
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        if path and path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if data.get("version") == CACHE_VERSION:
+                    self.entries = data["entries"]
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+
+    @staticmethod
+    def entry_key(task: tuple[str, str, str]) -> str:
+        return f"{task[0]}:{relative(Path(task[2]))}"
+
+    def get(self, task: tuple[str, str, str], key: str) -> Optional[dict]:
+        entry = self.entries.get(self.entry_key(task))
+        if entry and entry.get("key") == key:
+            self.hits += 1
+            return entry["result"]
+        return None
+
+    def put(self, task: tuple[str, str, str], key: str, result: dict):
+        self.entries[self.entry_key(task)] = {"key": key, "result": result}
+
+    def prune(self, tasks: list[tuple[str, str, str]]):
+        """Forget components that no longer exist."""
+        keep = {self.entry_key(task) for task in tasks}
+        self.entries = {k: v for k, v in self.entries.items() if k in keep}
+
+    def save(self):
+        """Write the cache atomically; a read-only checkout just skips it."""
+        if not self.path:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"version": CACHE_VERSION, "entries": self.entries}), encoding="utf-8")
+            tmp.replace(self.path)
+        except OSError:
+            pass
+
+
+def changed_paths(ref: str, root: Path = REPO_ROOT) -> set[Path]:
+    """Files changed since `ref` (committed, staged, unstaged and untracked)."""
+    commands = (
+        ["git", "diff", "--name-only", "--relative", ref, "--"],
+        ["git", "ls-files", "--others", "--exclude-standard"],
+    )
+    paths = set()
+    for command in commands:
+        proc = subprocess.run(command, cwd=root, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise ValueError(proc.stderr.strip() or f"git failed: {' '.join(command)}")
+        paths.update(root / line for line in proc.stdout.splitlines() if line)
+    return paths
+
+
+def is_affected(task: tuple[str, str, str], changed: set[Path]) -> bool:
+    """Whether a changed file is one of the component's inputs or its validator."""
+    kind, _, path = task
+    if any(VALIDATOR_SCRIPTS / source in changed for source in (VALIDATORS[kind][0], *VALIDATOR_LIBRARIES)):
+        return True
+    scope = Path(path)
+    if kind == "plugin":
+        # Includes plugin.json, README.md and every path it may reference
+        return any(p == scope or scope in p.parents for p in changed)
+    if kind == "skill":
+        return any(scope in p.parents for p in changed)
+    return scope in changed
+
+
+def validate_marketplace_json(root: Path = REPO_ROOT) -> dict:
+    """Check marketplace.json parses and every plugin source exists."""
+    path = root / ".claude-plugin" / "marketplace.json"
+    result = {"path": relative(path), "errors": []}
+    if not path.is_file():
+        result["errors"].append("marketplace.json not found")
+        return result
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        result["errors"].append("marketplace.json is invalid JSON")
+        return result
+    for plugin in data.get("plugins", []):
+        source = str(plugin.get("source", "")).strip()
+        plugin_dir = source[2:] if source.startswith("./") else source
+        if not (root / plugin_dir).is_dir():
+            result["errors"].append(f"Plugin directory not found: {plugin_dir}")
+    return result
+
+
+def run_tasks(tasks: list[tuple[str, str, str]], workers: int) -> list[dict]:
+    """Run validation tasks, in a process pool when `workers` > 1."""
+    if workers <= 1 or len(tasks) < 2:
+        return [run_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def run_agent_tests() -> dict:
+    """Run tests/run_tests.py (one interpreter for the whole suite)."""
+    script = REPO_ROOT / "tests" / "run_tests.py"
+    if not script.is_file():
+        return {"status": "missing", "output": ""}
+    proc = subprocess.run([sys.executable, str(script)], cwd=REPO_ROOT, capture_output=True, text=True)
+    return {"status": "pass" if proc.returncode == 0 else "fail", "output": proc.stdout + proc.stderr}
+
+
+def validate(
+    workers: int,
+    skip_tests: bool = False,
+    root: Path = REPO_ROOT,
+    cache_path: Optional[Path] = None,
+    changed: Optional[set[Path]] = None,
+) -> dict:
+    """
+    Validate the marketplace and return a JSON-serializable report.
+
+    With `cache_path`, unchanged components reuse their cached result.
+    With `changed`, only components affected by those files are validated.
+    """
+    plugins = discover_plugins(root)
+    index = load_index(root)
+    tasks = []
+    plugin_errors = {}
+    for plugin_dir in plugins:
+        manifest = plugin_dir / ".claude-plugin" / "plugin.json"
+        if not manifest.is_file():
+            plugin_errors[plugin_dir.name] = "Missing plugin.json manifest"
+            continue
+        try:
+            json.loads(manifest.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            plugin_errors[plugin_dir.name] = "Invalid JSON in plugin.json"
+            continue
+        tasks.extend(plugin_tasks(plugin_dir, index))
+
+    cache = ValidationCache(cache_path)
+    if changed is None:
+        cache.prune(tasks)
+    else:
+        tasks = [task for task in tasks if is_affected(task, changed)]
+        plugins = [p for p in plugins if p.name in plugin_errors or any(t[1] == p.name for t in tasks)]
+
+    versions = validator_versions()
+    keys = [fingerprint(task, versions[task[0]]) for task in tasks]
+    results = [cache.get(task, key) for task, key in zip(tasks, keys)]
+    misses = [i for i, result in enumerate(results) if result is None]
+    for i, result in zip(misses, run_tasks([tasks[i] for i in misses], workers)):
+        results[i] = result
+        cache.put(tasks[i], keys[i], result)
+    cache.save()
+
+    report = {"plugins": [], "marketplace": validate_marketplace_json(root), "tests": None}
+    for plugin_dir in plugins:
+        name = plugin_dir.name
+        components = [r for r in results if r["plugin"] == name]
+        components.sort(key=lambda r: KIND_ORDER.index(r["kind"]))
+        report["plugins"].append({
+            "name": name,
+            "path": relative(plugin_dir),
+            "error": plugin_errors.get(name),
+            "components": components,
+        })
+
+    if not skip_tests:
+        report["tests"] = run_agent_tests()
+
+    errors = sum(1 for r in results if r["status"] == "fail") + len(plugin_errors)
+    errors += len(report["marketplace"]["errors"])
+    warnings = sum(1 for r in results if r["status"] == "warn")
+    if report["tests"]:
+        errors += report["tests"]["status"] == "fail"
+        warnings += report["tests"]["status"] == "missing"
+    report["summary"] = {
+        "components": len(results),
+        "cached": cache.hits,
+        "errors": errors,
+        "warnings": warnings,
+    }
+    return report
+
+
+def print_report(report: dict):
+    """Human-readable report, in the format of validate-plugins.sh."""
+    print("🔍 Validating all plugins in the repository...")
+    print()
+    for plugin in report["plugins"]:
+        print(f"📦 Validating plugin: {plugin['name']}")
+        print(f"   Location: {plugin['path']}/")
+        if plugin["error"]:
+            print(f"   {RED}✗{NC} {plugin['error']}")
+            print()
+            continue
+        for component in plugin["components"]:
+            kind, status = component["kind"], component["status"]
+            if kind == "plugin":
+                if status == "pass":
+                    print(f"   {GREEN}✓{NC} plugin.json exists and is valid JSON")
+                else:
+                    print(f"   {RED}✗{NC} plugin.json validation failed")
+                    for error in component["errors"]:
+                        print(f"      {error}")
+            elif kind == "hooks":
+                if status == "pass":
+                    print(f"   {GREEN}✓{NC} hooks.json is valid")
+                else:
+                    print(f"   {RED}✗{NC} hooks.json validation failed")
+            else:
+                label = f"{KIND_LABELS[kind]}: {component['name']}"
+                if status == "pass":
+                    print(f"   {GREEN}✓{NC} {label}")
+                elif status == "warn":
+                    print(f"   {YELLOW}⚠{NC}  {label} (validation warnings)")
+                else:
+                    print(f"   {RED}✗{NC} {label} (validation failed)")
+                    for error in component["errors"]:
+                        print(f"      {error}")
+        print()
+
+    print("📋 Validating marketplace.json...")
+    marketplace = report["marketplace"]
+    if not marketplace["errors"]:
+        print(f"   {GREEN}✓{NC} marketplace.json is valid JSON")
+    for error in marketplace["errors"]:
+        print(f"   {RED}✗{NC} {error}")
+
+    tests = report["tests"]
+    if tests:
+        print()
+        print("🧪 Running agent invocation tests...")
+        if tests["status"] == "missing":
+            print(f"   {YELLOW}⚠{NC}  tests/run_tests.py not found, skipping tests")
+        else:
+            print(tests["output"].rstrip())
+            if tests["status"] == "pass":
+                print(f"   {GREEN}✓{NC} Agent invocation tests passed")
+            else:
+                print(f"   {RED}✗{NC} Agent invocation tests failed")
+
+    summary = report["summary"]
+    if summary["cached"]:
+        print()
+        print(f"⚡ {summary['cached']} of {summary['components']} component(s) unchanged, reused cached results")
+    print()
+    print("════════════════════════════════════════")
+    print("Validation Summary:")
+    print("════════════════════════════════════════")
+    if summary["errors"] == 0 and summary["warnings"] == 0:
+        print(f"{GREEN}✓ All validations passed!{NC}")
+    elif summary["errors"] == 0:
+        print(f"{YELLOW}⚠ Validation completed with {summary['warnings']} warning(s){NC}")
+    else:
+        print(f"{RED}✗ Validation failed with {summary['errors']} error(s) and {summary['warnings']} warning(s){NC}")
+
+
+def main():
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(description="Validate every plugin in the marketplace")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--skip-tests", action="store_true", help="Don't run tests/run_tests.py")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE, help="Validation cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Validate every component")
+    parser.add_argument("--changed-since", metavar="GIT_REF", help="Only validate components changed since GIT_REF")
+    args = parser.parse_args()
+
+    if sys.stdout.encoding and sys.stdout.encoding.lower() != "utf-8":
+        sys.stdout.reconfigure(encoding="utf-8")
+
+    changed = None
+    if args.changed_since:
+        try:
+            changed = changed_paths(args.changed_since)
+        except (OSError, ValueError) as e:
+            print(f"Error: can't diff against {args.changed_since}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    cache_path = None if args.no_cache else args.cache
+    report = validate(args.workers, args.skip_tests, cache_path=cache_path, changed=changed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    sys.exit(1 if report["summary"]["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ LOG_DIR="${HOME}/.claude/self-improvement"
 DEBUG_LOG="${LOG_DIR}/pre-write-debug.log"
 WARNING_TRACKER="${LOG_DIR}/warning-tracker.json"
 USER_CONFIG="${LOG_DIR}/config.json"
+FINDINGS_CACHE="${LOG_DIR}/pre-write-cache.json"
 DEFAULT_CONFIG="${PLUGIN_ROOT}/config/default-config.json"
 
 # Create directories
@@ -48,29 +49,38 @@ if ! command -v python3 &> /dev/null; then
     exit 0
 fi
 
-# Read hook payload from stdin
-payload=$(cat)
-debug_log "Received payload length: ${#payload}"
+# Read hook payload from stdin into a temp file - Write payloads carry whole
+# files and can exceed the argument size limit if passed on the command line
+PAYLOAD_FILE=$(mktemp "${TMPDIR:-/tmp}/pre-write-payload.XXXXXX")
+trap 'rm -f "${PAYLOAD_FILE}"' EXIT
+cat > "${PAYLOAD_FILE}"
+payload_size=$(wc -c < "${PAYLOAD_FILE}" | tr -d ' ')
+debug_log "Received payload length: ${payload_size}"
 
-if [[ -z "${payload}" ]]; then
+if [[ "${payload_size}" -eq 0 ]]; then
     debug_log "Empty payload"
     echo '{"decision": "approve"}'
     exit 0
 fi
 
 # Analyze the content and provide feedback
-python3 - "$payload" "$SCRIPT_DIR" "$WARNING_TRACKER" "$CONFIG_FILE" <<'EOF'
+python3 - "$PAYLOAD_FILE" "$SCRIPT_DIR" "$WARNING_TRACKER" "$CONFIG_FILE" "$FINDINGS_CACHE" <<'EOF'
 import json
 import sys
 import os
-import re
 from datetime import datetime
 from pathlib import Path
 
-payload_str = sys.argv[1]
+payload_path = sys.argv[1]
 script_dir = sys.argv[2]
 warning_tracker_path = sys.argv[3] if len(sys.argv) > 3 else ""
 config_path = sys.argv[4] if len(sys.argv) > 4 else ""
+findings_cache_path = sys.argv[5] if len(sys.argv) > 5 else ""
+
+# Opt-in phase timings (SELF_IMPROVEMENT_TRACE=1)
+sys.path.insert(0, script_dir)
+from hook_trace import Tracer
+tracer = Tracer("analyze-before-write")
 
 def load_config():
     """Load configuration."""
@@ -162,11 +172,15 @@ def record_warnings(file_path, issues):
     tracker["warnings"] = tracker["warnings"][-50:]
     save_warning_tracker(tracker)
 
-try:
-    payload = json.loads(payload_str)
-except json.JSONDecodeError as e:
-    print('{"decision": "approve"}')
-    sys.exit(0)
+with tracer.span("payload_parse"):
+    try:
+        with open(payload_path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        print('{"decision": "approve"}')
+        sys.exit(0)
+    if isinstance(payload, dict):
+        tracer.session = str(payload.get("session_id", ""))
 
 # Get tool name and input
 tool_name = payload.get("tool_name", "")
@@ -192,48 +206,54 @@ if not content:
 file_path = tool_input.get("file_path", "")
 file_ext = os.path.splitext(file_path)[1].lower() if file_path else ""
 
-# Security patterns to check - CRITICAL issues that should warn
-CRITICAL_PATTERNS = [
-    (r'\beval\s*\(', "eval() detected - can execute arbitrary code"),
-    (r'\bexec\s*\(', "exec() detected - can execute arbitrary code"),
-    (r'password\s*=\s*["\'][^"\']{5,}["\']', "Potential hardcoded password"),
-    (r'api_?key\s*=\s*["\'][^"\']{10,}["\']', "Potential hardcoded API key"),
-    (r'secret\s*=\s*["\'][^"\']{5,}["\']', "Potential hardcoded secret"),
-    (r'subprocess.*shell\s*=\s*True', "shell=True is dangerous - use shell=False"),
-    (r'\.innerHTML\s*=\s*[^"\'`]', "innerHTML with variable - potential XSS"),
-    (r'rm\s+-rf?\s+["\']?\$', "rm -rf with variable - dangerous"),
-]
-
-# Important patterns - should suggest but not block
-IMPORTANT_PATTERNS = [
-    (r'except:\s*$', "Bare except clause - specify exception types"),
-    (r'except\s+Exception\s*:', "Catching all exceptions - be more specific"),
-    (r'SELECT.*FROM.*["\'].*\+', "SQL string concatenation - use parameterized queries"),
-    (r'pickle\.load', "pickle can execute arbitrary code - use safe alternatives"),
-]
+# Scan with the shared rule registry. Incremental mode only rescans what
+# changed relative to the file on disk, reusing cached findings for the rest.
+from rule_registry import CRITICAL, IMPORTANT
+from incremental_scan import FindingsCache, analyze_edit, analyze_write, read_current, scan_findings
+
+config = load_config()
+analysis_config = config.get("analysis", {})
+
+with tracer.span("pattern_scan"):
+    if analysis_config.get("incremental_pre_write", True):
+        context_lines = analysis_config.get("pre_write_context_lines", 3)
+        cache = FindingsCache(findings_cache_path, "pre_write")
+        current = read_current(file_path)
+        if tool_name == "Write":
+            findings = analyze_write("pre_write", content, current, cache, context_lines)
+            has_file_lines = True
+        else:
+            # Lines count from new_string's start when the edit can't be placed
+            findings, has_file_lines = analyze_edit(
+                "pre_write", content, tool_input.get("old_string", ""), current, cache,
+                tool_input.get("replace_all", False), context_lines
+            )
+        cache.save()
+    else:
+        findings = scan_findings("pre_write", content)
+        has_file_lines = tool_name == "Write"
 
 issues = []
 issue_types = []  # Short identifiers for tracking
 suggestions = []
 
-# Check critical patterns
-for pattern, message in CRITICAL_PATTERNS:
-    if re.search(pattern, content, re.IGNORECASE | re.MULTILINE):
+seen_rules = set()
+for finding in findings:
+    if finding.rule_id in seen_rules:
+        continue
+    seen_rules.add(finding.rule_id)
+    message = f"{finding.message} (line {finding.line})" if has_file_lines else finding.message
+    if finding.severity == CRITICAL:
         issues.append(message)
-        # Extract short type from message
-        issue_type = message.split()[0].lower().rstrip('()')
-        issue_types.append(issue_type)
-
-# Check important patterns
-for pattern, message in IMPORTANT_PATTERNS:
-    if re.search(pattern, content, re.IGNORECASE | re.MULTILINE):
+        issue_types.append(finding.issue)
+    elif finding.severity == IMPORTANT:
         suggestions.append(message)
 
 # Check if previous warnings were addressed
-addressed, ignored = check_previous_warnings(file_path, issue_types)
+with tracer.span("tracker_io"):
+    addressed, ignored = check_previous_warnings(file_path, issue_types)
 
-# Load config for enforcement policy
-config = load_config()
+# Enforcement policy
 enforcement = config.get("enforcement", {})
 critical_policy = enforcement.get("critical_issues", "warn")
 repeated_threshold = enforcement.get("require_confirmation_after", 3)
@@ -241,7 +261,8 @@ repeated_threshold = enforcement.get("require_confirmation_after", 3)
 # Build response
 if issues:
     # Record new warnings for tracking
-    record_warnings(file_path, issue_types)
+    with tracer.span("tracker_io"):
+        record_warnings(file_path, issue_types)
 
     # Check if we should block
     should_block = False
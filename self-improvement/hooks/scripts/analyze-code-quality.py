@@ -9,6 +9,8 @@ Analyzes actual code blocks from conversations using:
 - Code complexity metrics
 
 This replaces naive keyword matching with semantic code analysis.
+Issues carry a "location" (block number plus line/column range in the
+analyzed text) so findings can be aggregated across sessions.
 """
 
 import ast
@@ -16,12 +18,11 @@ import json
 import re
 import sys
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, Union
 
-# Issue severity levels
-CRITICAL = "critical"
-IMPORTANT = "important"
-MINOR = "minor"
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from code_blocks import LineIndex, extract_code_blocks
+from rule_registry import CRITICAL, IMPORTANT, MINOR, RULES, scan
 
 
 class CodeAnalysisResult:
@@ -42,14 +43,17 @@ class CodeAnalysisResult:
         self.patterns: list[dict] = []
         self.learnings: list[dict] = []
 
-    def add_issue(self, severity: str, issue_type: str, message: str, code_snippet: str = ""):
-        """Add an issue found during analysis."""
-        self.issues.append({
+    def add_issue(self, severity: str, issue_type: str, message: str, code_snippet: str = "", location: Optional[dict] = None):
+        """Add an issue found during analysis, optionally anchored to a location."""
+        issue = {
             "severity": severity,
             "type": issue_type,
             "message": message,
             "snippet": code_snippet[:200] if code_snippet else ""
-        })
+        }
+        if location:
+            issue["location"] = location
+        self.issues.append(issue)
 
     def add_pattern(self, pattern_type: str, description: str, severity: str):
         """Add a detected pattern."""
@@ -76,30 +80,12 @@ class CodeAnalysisResult:
         }, indent=2)
 
 
-def extract_code_blocks(text: str) -> list[dict]:
-    """
-    Extract code blocks from markdown-formatted text.
-
-    Returns list of dicts with 'language' and 'code' keys.
-    """
-    # Match fenced code blocks with optional language specifier
-    pattern = r"```(\w*)\n(.*?)```"
-    matches = re.findall(pattern, text, re.DOTALL)
-
-    blocks = []
-    for lang, code in matches:
-        blocks.append({
-            "language": lang.lower() if lang else "unknown",
-            "code": code.strip()
-        })
-
-    return blocks
-
-
-def analyze_python_code(code: str, result: CodeAnalysisResult) -> None:
+def analyze_python_code(code: str, result: CodeAnalysisResult, index: Optional[LineIndex] = None) -> None:
     """
     Analyze Python code using AST parsing.
 
+    `index` is the block's line index; findings are located through it.
+
     Detects:
     - Missing error handling
     - Security issues (eval, exec, etc.)
@@ -107,14 +93,21 @@ def analyze_python_code(code: str, result: CodeAnalysisResult) -> None:
     - Missing docstrings
     - Bare exceptions
     """
+    index = index or LineIndex(code)
+
     try:
         tree = ast.parse(code)
     except SyntaxError as e:
+        location = None
+        if e.lineno:
+            offset = index.offset_of(e.lineno) + max((e.offset or 1) - 1, 0)
+            location = index.location(offset, offset)
         result.add_issue(
             IMPORTANT,
             "syntax_error",
             f"Python syntax error: {e.msg} at line {e.lineno}",
-            code[:100]
+            code[:100],
+            location
         )
         return
 
@@ -128,17 +121,18 @@ def analyze_python_code(code: str, result: CodeAnalysisResult) -> None:
 
     # Analyze each function
     for func in functions + async_functions:
-        analyze_function(func, code, result)
+        analyze_function(func, index, result)
 
     # Security checks
-    check_security_issues(tree, code, result)
+    check_security_issues(tree, index, result)
 
     # Check for global code quality issues
-    check_global_issues(tree, code, result)
+    check_global_issues(tree, index, result)
 
 
-def analyze_function(func: ast.FunctionDef | ast.AsyncFunctionDef, code: str, result: CodeAnalysisResult) -> None:
+def analyze_function(func: Union[ast.FunctionDef, ast.AsyncFunctionDef], index: LineIndex, result: CodeAnalysisResult) -> None:
     """Analyze a single function for quality issues."""
+    func_location = index.node_location(func)
 
     # Check for missing docstring
     if not ast.get_docstring(func):
@@ -149,7 +143,8 @@ def analyze_function(func: ast.FunctionDef | ast.AsyncFunctionDef, code: str, re
                 MINOR,
                 "missing_docstring",
                 f"Function '{func.name}' lacks a docstring",
-                ""
+                "",
+                func_location
             )
 
     # Check for bare except clauses
@@ -160,7 +155,8 @@ def analyze_function(func: ast.FunctionDef | ast.AsyncFunctionDef, code: str, re
                     IMPORTANT,
                     "bare_except",
                     f"Bare except clause in function '{func.name}' - catches all exceptions including KeyboardInterrupt",
-                    ""
+                    "",
+                    index.node_location(node)
                 )
 
     # Check function complexity (count branches)
@@ -170,7 +166,8 @@ def analyze_function(func: ast.FunctionDef | ast.AsyncFunctionDef, code: str, re
             IMPORTANT,
             "high_complexity",
             f"Function '{func.name}' has cyclomatic complexity of {complexity} (>10 is high)",
-            ""
+            "",
+            func_location
         )
         result.metrics["complexity_score"] += complexity
 
@@ -182,7 +179,8 @@ def analyze_function(func: ast.FunctionDef | ast.AsyncFunctionDef, code: str, re
             MINOR,
             "too_many_arguments",
             f"Function '{func.name}' has {total_args} arguments (>5 may indicate need for refactoring)",
-            ""
+            "",
+            index.node_location(args)
         )
 
     # Check for missing return type hint (Python 3.5+)
@@ -193,7 +191,8 @@ def analyze_function(func: ast.FunctionDef | ast.AsyncFunctionDef, code: str, re
                 MINOR,
                 "missing_type_hint",
                 f"Function '{func.name}' lacks return type hint",
-                ""
+                "",
+                func_location
             )
 
 
@@ -218,7 +217,7 @@ def count_complexity(node: ast.AST) -> int:
     return complexity
 
 
-def check_security_issues(tree: ast.AST, code: str, result: CodeAnalysisResult) -> None:
+def check_security_issues(tree: ast.AST, index: LineIndex, result: CodeAnalysisResult) -> None:
     """Check for common security vulnerabilities in Python code."""
 
     for node in ast.walk(tree):
@@ -232,7 +231,8 @@ def check_security_issues(tree: ast.AST, code: str, result: CodeAnalysisResult)
                     CRITICAL,
                     "dangerous_eval",
                     f"Use of {func_name}() is dangerous - can execute arbitrary code",
-                    get_node_source(node, code)
+                    index.node_source(node),
+                    index.node_location(node)
                 )
                 result.add_learning(
                     "avoid_eval_exec",
@@ -245,7 +245,8 @@ def check_security_issues(tree: ast.AST, code: str, result: CodeAnalysisResult)
                     CRITICAL,
                     "insecure_deserialization",
                     "pickle.load() can execute arbitrary code - don't use with untrusted data",
-                    get_node_source(node, code)
+                    index.node_source(node),
+                    index.node_location(node)
                 )
 
             # subprocess with shell=True
@@ -256,7 +257,8 @@ def check_security_issues(tree: ast.AST, code: str, result: CodeAnalysisResult)
                             IMPORTANT,
                             "shell_injection",
                             "subprocess with shell=True can lead to command injection",
-                            get_node_source(node, code)
+                            index.node_source(node),
+                            index.node_location(node)
                         )
                         result.add_learning(
                             "subprocess_shell_false",
@@ -269,7 +271,8 @@ def check_security_issues(tree: ast.AST, code: str, result: CodeAnalysisResult)
                     IMPORTANT,
                     "shell_injection",
                     "os.system() is vulnerable to command injection - use subprocess instead",
-                    get_node_source(node, code)
+                    index.node_source(node),
+                    index.node_location(node)
                 )
 
         # Check for hardcoded secrets (basic patterns)
@@ -284,7 +287,8 @@ def check_security_issues(tree: ast.AST, code: str, result: CodeAnalysisResult)
                                     CRITICAL,
                                     "hardcoded_secret",
                                     f"Potential hardcoded secret in variable '{target.id}'",
-                                    ""
+                                    "",
+                                    index.node_location(node)
                                 )
                                 result.add_learning(
                                     "use_env_vars_for_secrets",
@@ -292,7 +296,7 @@ def check_security_issues(tree: ast.AST, code: str, result: CodeAnalysisResult)
                                 )
 
 
-def check_global_issues(tree: ast.AST, code: str, result: CodeAnalysisResult) -> None:
+def check_global_issues(tree: ast.AST, index: LineIndex, result: CodeAnalysisResult) -> None:
     """Check for code-wide quality issues."""
 
     # Check for wildcard imports
@@ -304,7 +308,8 @@ def check_global_issues(tree: ast.AST, code: str, result: CodeAnalysisResult) ->
                         MINOR,
                         "wildcard_import",
                         f"Wildcard import from {node.module} - imports unknown names into namespace",
-                        ""
+                        "",
+                        index.node_location(node)
                     )
 
     # Check for global variables (excluding constants)
@@ -320,7 +325,7 @@ def check_global_issues(tree: ast.AST, code: str, result: CodeAnalysisResult) ->
 
     # Check for missing if __name__ == "__main__" guard
     has_main_guard = False
-    has_top_level_calls = False
+    first_top_level_call = None
 
     for node in module_body:
         if isinstance(node, ast.If):
@@ -328,15 +333,16 @@ def check_global_issues(tree: ast.AST, code: str, result: CodeAnalysisResult) ->
                 has_main_guard = True
         elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
             # Top-level function call
-            has_top_level_calls = True
+            first_top_level_call = first_top_level_call or node
 
-    if has_top_level_calls and not has_main_guard:
+    if first_top_level_call and not has_main_guard:
         # Only flag if there are actual function calls at module level
         result.add_issue(
             MINOR,
             "missing_main_guard",
             "Module has top-level code without if __name__ == '__main__' guard",
-            ""
+            "",
+            index.node_location(first_top_level_call)
         )
 
 
@@ -369,154 +375,84 @@ def get_call_name(node: ast.Call) -> str:
     return ""
 
 
-def get_node_source(node: ast.AST, code: str) -> str:
-    """Extract the source code for a given AST node."""
-    if hasattr(node, 'lineno') and hasattr(node, 'end_lineno'):
-        lines = code.split('\n')
-        start = node.lineno - 1
-        end = node.end_lineno
-        return '\n'.join(lines[start:end])
-    return ""
-
-
-def analyze_javascript_code(code: str, result: CodeAnalysisResult) -> None:
+# Learnings recorded with registry hits (issue types and messages come from the rules)
+RULE_LEARNINGS = {
+    "js_eval": ("avoid_eval_js", "Avoid eval() in JavaScript - use JSON.parse() for data or explicit parsing"),
+    "js_inner_html": ("use_textcontent", "Use textContent instead of innerHTML when possible, or sanitize HTML input"),
+    "shell_rm_rf": ("safe_rm_rf", "Use 'rm -rf \"${var:?}\"' to fail if variable is empty, or use explicit paths"),
+    "sql_string_building": ("parameterized_queries", "Always use parameterized queries (?, :param, or %s) instead of string concatenation"),
+}
+
+# Counted rules: (minimum count to report, message template)
+COUNTED_RULES = {
+    "console_log": (6, "Found {count} console.log statements - remove before production"),
+    "var_declaration": (4, "Found {count} uses of 'var' - prefer 'let' or 'const' for block scoping"),
+    "loose_equality": (1, "Found {count} uses of '==' - prefer '===' for strict comparison"),
+}
+
+
+def report_rule_hits(rule_set: str, code: str, result: CodeAnalysisResult, index: LineIndex) -> None:
+    """Scan code with a shared registry rule set and record located findings."""
+    counts: dict[str, int] = {}
+    first_location: dict[str, dict] = {}
+    for hit in scan(rule_set, code, index):
+        rule_id = hit.rule.id
+        counts[rule_id] = counts.get(rule_id, 0) + 1
+        if counts[rule_id] > 1:
+            continue
+        first_location[rule_id] = index.location(hit.start, hit.end)
+        if rule_id in COUNTED_RULES:
+            continue
+
+        result.add_issue(hit.severity, hit.rule.issue, hit.rule.message, hit.text, first_location[rule_id])
+        if rule_id in RULE_LEARNINGS:
+            result.add_learning(*RULE_LEARNINGS[rule_id])
+
+    for rule_id, (threshold, message) in COUNTED_RULES.items():
+        count = counts.get(rule_id, 0)
+        if count >= threshold:
+            result.add_issue(MINOR, RULES[rule_id].issue, message.format(count=count), "", first_location[rule_id])
+
+
+def analyze_javascript_code(code: str, result: CodeAnalysisResult, index: Optional[LineIndex] = None) -> None:
     """
     Analyze JavaScript code using pattern matching.
 
     Note: Full AST parsing would require a JS parser like esprima.
-    This uses regex patterns for common issues.
+    This uses the shared registry's "javascript" rules for common issues.
     """
+    report_rule_hits("javascript", code, result, index or LineIndex(code))
 
-    # Check for eval()
-    if re.search(r'\beval\s*\(', code):
-        result.add_issue(
-            CRITICAL,
-            "dangerous_eval",
-            "Use of eval() in JavaScript is dangerous - can execute arbitrary code",
-            ""
-        )
-        result.add_learning(
-            "avoid_eval_js",
-            "Avoid eval() in JavaScript - use JSON.parse() for data or explicit parsing"
-        )
-
-    # Check for innerHTML with variables (potential XSS)
-    if re.search(r'\.innerHTML\s*=\s*[^"\'`]', code):
-        result.add_issue(
-            CRITICAL,
-            "potential_xss",
-            "innerHTML assignment with variable - potential XSS vulnerability",
-            ""
-        )
-        result.add_learning(
-            "use_textcontent",
-            "Use textContent instead of innerHTML when possible, or sanitize HTML input"
-        )
-
-    # Check for document.write
-    if re.search(r'\bdocument\.write\s*\(', code):
-        result.add_issue(
-            IMPORTANT,
-            "document_write",
-            "document.write() is deprecated and can cause security issues",
-            ""
-        )
-
-    # Check for console.log (should be removed in production)
-    console_logs = len(re.findall(r'\bconsole\.log\s*\(', code))
-    if console_logs > 5:
-        result.add_issue(
-            MINOR,
-            "excessive_logging",
-            f"Found {console_logs} console.log statements - remove before production",
-            ""
-        )
-
-    # Check for var instead of let/const
-    var_count = len(re.findall(r'\bvar\s+\w+', code))
-    if var_count > 3:
-        result.add_issue(
-            MINOR,
-            "use_let_const",
-            f"Found {var_count} uses of 'var' - prefer 'let' or 'const' for block scoping",
-            ""
-        )
 
-    # Check for ==  instead of ===
-    loose_equality = len(re.findall(r'[^=!]==[^=]', code))
-    if loose_equality > 0:
-        result.add_issue(
-            MINOR,
-            "use_strict_equality",
-            f"Found {loose_equality} uses of '==' - prefer '===' for strict comparison",
-            ""
-        )
-
-
-def analyze_shell_code(code: str, result: CodeAnalysisResult) -> None:
+def analyze_shell_code(code: str, result: CodeAnalysisResult, index: Optional[LineIndex] = None) -> None:
     """Analyze shell/bash code for common issues."""
+    index = index or LineIndex(code)
 
     # Check for unquoted variables
-    if re.search(r'\$\w+(?!["\'])', code):
+    unquoted = re.search(r'\$\w+(?!["\'])', code)
+    if unquoted:
         if not re.search(r'"\$\w+"', code):  # Not all quoted
             result.add_issue(
                 IMPORTANT,
                 "unquoted_variable",
                 "Unquoted shell variables can cause word splitting issues",
-                ""
+                unquoted.group(),
+                index.location(*unquoted.span())
             )
             result.add_learning(
                 "quote_shell_vars",
                 "Always quote shell variables: use \"$var\" instead of $var"
             )
 
-    # Check for rm -rf with variables
-    if re.search(r'rm\s+-rf?\s+\$', code):
-        result.add_issue(
-            CRITICAL,
-            "dangerous_rm",
-            "rm -rf with variable path is dangerous - variable could be empty or wrong",
-            ""
-        )
-        result.add_learning(
-            "safe_rm_rf",
-            "Use 'rm -rf \"${var:?}\"' to fail if variable is empty, or use explicit paths"
-        )
-
-    # Check for curl | bash pattern
-    if re.search(r'curl.*\|\s*(?:ba)?sh', code):
-        result.add_issue(
-            CRITICAL,
-            "curl_pipe_bash",
-            "curl | bash is dangerous - downloads and executes untrusted code",
-            ""
-        )
+    # rm -rf with variables, curl | bash
+    report_rule_hits("shell", code, result, index)
 
 
-def analyze_sql_code(code: str, result: CodeAnalysisResult) -> None:
+def analyze_sql_code(code: str, result: CodeAnalysisResult, index: Optional[LineIndex] = None) -> None:
     """Analyze SQL code for common issues."""
 
-    # Check for string concatenation in queries (potential SQL injection)
-    if re.search(r"['\"].*\+.*['\"]|f['\"].*\{.*\}.*['\"]", code):
-        result.add_issue(
-            CRITICAL,
-            "sql_injection",
-            "String concatenation in SQL query - use parameterized queries",
-            ""
-        )
-        result.add_learning(
-            "parameterized_queries",
-            "Always use parameterized queries (?, :param, or %s) instead of string concatenation"
-        )
-
-    # Check for SELECT *
-    if re.search(r'SELECT\s+\*', code, re.IGNORECASE):
-        result.add_issue(
-            MINOR,
-            "select_star",
-            "SELECT * can fetch unnecessary data - specify columns explicitly",
-            ""
-        )
+    # String concatenation in queries (potential SQL injection), SELECT *
+    report_rule_hits("sql", code, result, index or LineIndex(code))
 
 
 def analyze_code_blocks(text: str) -> CodeAnalysisResult:
@@ -530,27 +466,33 @@ def analyze_code_blocks(text: str) -> CodeAnalysisResult:
 
     result.metrics["total_code_blocks"] = len(blocks)
 
-    for block in blocks:
-        lang = block["language"]
-        code = block["code"]
+    for number, block in enumerate(blocks):
+        lang = block.language
+        code = block.code
+        first_issue = len(result.issues)
 
         result.metrics["total_lines"] += code.count('\n') + 1
 
         if lang in ("python", "py", "python3"):
             result.metrics["python_blocks"] += 1
-            analyze_python_code(code, result)
+            analyze_python_code(code, result, block.index)
         elif lang in ("javascript", "js", "typescript", "ts", "jsx", "tsx"):
             result.metrics["javascript_blocks"] += 1
-            analyze_javascript_code(code, result)
+            analyze_javascript_code(code, result, block.index)
         elif lang in ("bash", "sh", "shell", "zsh"):
             result.metrics["other_blocks"] += 1
-            analyze_shell_code(code, result)
+            analyze_shell_code(code, result, block.index)
         elif lang in ("sql", "mysql", "postgresql", "postgres"):
             result.metrics["other_blocks"] += 1
-            analyze_sql_code(code, result)
+            analyze_sql_code(code, result, block.index)
         else:
             result.metrics["other_blocks"] += 1
 
+        # Anchor this block's findings to it for cross-session aggregation
+        for issue in result.issues[first_issue:]:
+            if "location" in issue:
+                issue["location"]["block"] = number
+
     # Generate patterns based on analysis
     generate_patterns(result)
 
@@ -15,6 +15,7 @@ PLUGIN_ROOT="${CLAUDE_PLUGIN_ROOT:-$(dirname "$(dirname "$SCRIPT_DIR")")}"
 LOG_DIR="${HOME}/.claude/self-improvement"
 PATTERNS_DB="${LOG_DIR}/patterns.json"
 METRICS_DB="${LOG_DIR}/metrics.json"
+METRICS_SERIES="${LOG_DIR}/metrics-series.json"
 LEARNINGS_DB="${LOG_DIR}/learnings.json"
 ANALYSIS_LOG="${LOG_DIR}/analysis.log"
 DEBUG_LOG="${LOG_DIR}/analyze-debug.log"
@@ -22,6 +23,9 @@ DEBUG_LOG="${LOG_DIR}/analyze-debug.log"
 # Create directories if they don't exist
 mkdir -p "${LOG_DIR}"
 
+# Opt-in phase timings (SELF_IMPROVEMENT_TRACE=1)
+source "${SCRIPT_DIR}/trace-spans.sh"
+
 # Debug logging function
 debug_log() {
     local timestamp=$(date '+%Y-%m-%d %H:%M:%S' 2>/dev/null || echo "timestamp-unavailable")
@@ -114,7 +118,7 @@ analyze_transcript() {
     local temp_text="${LOG_DIR}/temp_transcript.txt"
     local summary
 
-    summary=$(python3 "${SCRIPT_DIR}/parse-jsonl.py" "${transcript_file}" "${temp_text}" 2>&1)
+    summary=$(trace_span transcript_parse python3 "${SCRIPT_DIR}/parse-jsonl.py" "${transcript_file}" "${temp_text}" 2>&1)
 
     if [[ ! -f "${temp_text}" ]]; then
         log_analysis "Failed to parse JSONL transcript"
@@ -131,26 +135,30 @@ analyze_transcript() {
     log_analysis "Statistics: ${total_turns} total turns, ${user_turns} user, ${assistant_turns} assistant, ${total_lines} lines"
 
     # Analyze the plain text version
+    trace_begin pattern_scan
     analyze_keywords "${temp_text}"
     analyze_code_quality "${temp_text}"
     analyze_errors "${temp_text}"
     analyze_security "${temp_text}"
     analyze_sentiment "${temp_text}"
+    trace_end pattern_scan
 
     # Run real code analysis if available
     local code_analysis_result=""
+    trace_begin code_analysis
     if [[ -f "${SCRIPT_DIR}/analyze-code-quality.py" ]]; then
         code_analysis_result=$(python3 "${SCRIPT_DIR}/analyze-code-quality.py" "${temp_text}" 2>/dev/null || echo "")
         if [[ -n "${code_analysis_result}" ]]; then
             process_code_analysis "${code_analysis_result}"
         fi
     fi
+    trace_end code_analysis
 
     # Check compliance with session-start advice
-    check_compliance
+    trace_span tracker_io check_compliance
 
     # Store metrics with quality indicators
-    store_session_metrics "${total_turns}" "${user_turns}" "${assistant_turns}" "${total_lines}" "${code_analysis_result}"
+    trace_span db_write store_session_metrics "${total_turns}" "${user_turns}" "${assistant_turns}" "${total_lines}" "${code_analysis_result}"
 
     # Clean up temp file
     rm -f "${temp_text}"
@@ -586,7 +594,7 @@ store_session_metrics() {
     local code_analysis="${5:-}"
 
     # Update metrics database using Python with quality indicators
-    python3 - "$SESSION_ID" "$TIMESTAMP" "$total_turns" "$user_turns" "$assistant_turns" "$total_lines" "$code_analysis" "$METRICS_DB" "$PATTERNS_DB" <<'EOF'
+    python3 - "$SESSION_ID" "$TIMESTAMP" "$total_turns" "$user_turns" "$assistant_turns" "$total_lines" "$code_analysis" "$METRICS_DB" "$PATTERNS_DB" "$METRICS_SERIES" "$SCRIPT_DIR" <<'EOF'
 import json
 import sys
 
@@ -600,6 +608,8 @@ total_lines = int(sys.argv[6])
 code_analysis_json = sys.argv[7] if len(sys.argv) > 7 else ""
 metrics_file = sys.argv[8]
 patterns_file = sys.argv[9]
+series_file = sys.argv[10] if len(sys.argv) > 10 else ""
+script_dir = sys.argv[11] if len(sys.argv) > 11 else ""
 
 # Parse code analysis if available
 quality_metrics = {
@@ -694,6 +704,21 @@ try:
 except Exception as e:
     print(f"Error storing metrics: {e}", file=sys.stderr)
     sys.exit(1)
+
+# Append to the time-series store (rollups are maintained on write)
+if series_file and script_dir:
+    try:
+        sys.path.insert(0, script_dir)
+        from metrics_store import load_store
+        from pathlib import Path
+        backfilling = not Path(series_file).exists()
+        store = load_store(series_file, metrics_file)
+        # A first-use backfill from metrics.json already includes this session
+        if not backfilling or len(store) == 0:
+            store.append(session_data)
+        store.save()
+    except Exception as e:
+        print(f"Error storing metrics series: {e}", file=sys.stderr)
 EOF
 }
 
@@ -704,7 +729,10 @@ main() {
     # Check dependencies
     check_python
 
+    trace_begin total
+
     # Read hook payload from stdin
+    trace_begin payload_parse
     local payload
     payload=$(cat)
 
@@ -726,6 +754,8 @@ main() {
     if [[ -z "${SESSION_ID}" ]]; then
         SESSION_ID=$(date +%s)
     fi
+    TRACE_SESSION="${SESSION_ID}"
+    trace_end payload_parse
 
     debug_log "TRANSCRIPT_PATH: ${transcript_path}"
     debug_log "SESSION_ID: ${SESSION_ID}"
@@ -756,6 +786,8 @@ main() {
         debug_log "Analysis failed"
     fi
 
+    trace_end total
+
     # Return success - allow session to end
     echo '{"decision": "approve", "suppressOutput": true}'
 
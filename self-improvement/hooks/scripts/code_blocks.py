@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Code Block Extraction with Line-Anchored Locations
+
+Shared by the self-improvement analyzers so that every finding can carry a
+line/column range in the analyzed text:
+- LineIndex: line-start offsets for a block, built once and reused for
+  every lookup and snippet (a slice, never a re-split)
+- extract_code_blocks(): fenced markdown blocks with their position
+
+Locations use 1-based lines and columns; `end_column` points one past the
+last character, so a range can be sliced straight out of the line.
+"""
+
+import ast
+import re
+from bisect import bisect_right
+from typing import Optional
+
+# Fenced code block with optional language specifier
+FENCE_PATTERN = re.compile(r"```(\w*)\n(.*?)```", re.DOTALL)
+
+
+class LineIndex:
+    """Offsets of line starts within a block of text.
+
+    Built once per block and shared by every scanner and analyzer run over
+    it, so mapping an offset to a line is a binary search instead of
+    counting newlines in a prefix slice. `base_line` and `base_column`
+    place the block inside a larger document (the column base only applies
+    to the block's first line).
+    """
+
+    __slots__ = ("text", "starts", "base_line", "base_column")
+
+    def __init__(self, text: str, base_line: int = 1, base_column: int = 1):
+        self.text = text
+        self.base_line = base_line
+        self.base_column = base_column
+        starts = [0]
+        find = text.find
+        pos = find("\n")
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = find("\n", pos + 1)
+        self.starts = starts
+
+    def line_of(self, offset: int) -> int:
+        """Return the document line number containing `offset`."""
+        return bisect_right(self.starts, offset) + self.base_line - 1
+
+    def column_of(self, offset: int) -> int:
+        """Return the document column of `offset`."""
+        row = bisect_right(self.starts, offset) - 1
+        column = offset - self.starts[row] + 1
+        return column + self.base_column - 1 if row == 0 else column
+
+    def offset_of(self, line: int, col_offset: int = 0) -> int:
+        """
+        Convert a block-relative position, as reported by `ast`, to an offset.
+
+        `line` is 1-based and `col_offset` counts UTF-8 bytes, matching
+        ast node attributes.
+        """
+        row = min(max(line - 1, 0), len(self.starts) - 1)
+        start = self.starts[row]
+        if col_offset <= 0:
+            return start
+        end = self.starts[row + 1] if row + 1 < len(self.starts) else len(self.text)
+        line_text = self.text[start:end]
+        if not line_text.isascii():
+            col_offset = len(line_text.encode("utf-8")[:col_offset].decode("utf-8", errors="ignore"))
+        return start + min(col_offset, len(line_text))
+
+    def location(self, start: int, end: int) -> dict:
+        """Structured location for the offset range [start, end)."""
+        return {
+            "line": self.line_of(start),
+            "column": self.column_of(start),
+            "end_line": self.line_of(end),
+            "end_column": self.column_of(end),
+        }
+
+    def node_span(self, node: ast.AST) -> Optional[tuple[int, int]]:
+        """Offset range covered by an AST node parsed from this block."""
+        if getattr(node, "lineno", None) is None:
+            return None
+        start = self.offset_of(node.lineno, node.col_offset)
+        if getattr(node, "end_lineno", None) is None:
+            return start, start
+        return start, self.offset_of(node.end_lineno, node.end_col_offset)
+
+    def node_location(self, node: ast.AST) -> Optional[dict]:
+        """Structured location for an AST node parsed from this block."""
+        span = self.node_span(node)
+        return self.location(*span) if span else None
+
+    def node_source(self, node: ast.AST) -> str:
+        """Source text of an AST node - a slice of the block."""
+        span = self.node_span(node)
+        return self.text[span[0]:span[1]] if span else ""
+
+
+class CodeBlock:
+    """A fenced code block and where its code starts in the source text."""
+
+    __slots__ = ("language", "code", "line", "column", "_index")
+
+    def __init__(self, language: str, code: str, line: int = 1, column: int = 1):
+        self.language = language
+        self.code = code
+        self.line = line
+        self.column = column
+        self._index = None
+
+    @property
+    def index(self) -> LineIndex:
+        """Line index of the block's code, built on first use."""
+        if self._index is None:
+            self._index = LineIndex(self.code, self.line, self.column)
+        return self._index
+
+
+def extract_code_blocks(text: str) -> list[CodeBlock]:
+    """
+    Extract fenced code blocks from markdown-formatted text.
+
+    Languages are lowercased ("unknown" when missing) and code is stripped;
+    each block records the line and column where its stripped code begins.
+    """
+    blocks = []
+    text_index = None
+
+    for match in FENCE_PATTERN.finditer(text):
+        lang, raw = match.group(1), match.group(2)
+        code = raw.strip()
+        if text_index is None:
+            text_index = LineIndex(text)
+        start = match.start(2) + len(raw) - len(raw.lstrip())
+        blocks.append(CodeBlock(
+            lang.lower() if lang else "unknown",
+            code,
+            text_index.line_of(start),
+            text_index.column_of(start),
+        ))
+
+    return blocks
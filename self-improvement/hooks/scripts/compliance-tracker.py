@@ -21,6 +21,7 @@ import os
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 
 # Configuration
@@ -43,6 +44,16 @@ def ensure_db():
         }, indent=2))
 
 
+def session_record(session_id: str, advice: list[str], timestamp: Optional[str] = None) -> dict:
+    """The current-session-advice.json record for advice given at session start."""
+    return {
+        "session_id": session_id,
+        "timestamp": timestamp or datetime.now().isoformat(),
+        "advice_given": advice,
+        "status": "active"
+    }
+
+
 def record_advice(session_id: str, advice: list[str]) -> dict:
     """
     Record advice given at the start of a session.
@@ -57,14 +68,7 @@ def record_advice(session_id: str, advice: list[str]) -> dict:
     ensure_db()
 
     # Save current session advice for later checking
-    session_data = {
-        "session_id": session_id,
-        "timestamp": datetime.now().isoformat(),
-        "advice_given": advice,
-        "status": "active"
-    }
-
-    CURRENT_SESSION.write_text(json.dumps(session_data, indent=2))
+    CURRENT_SESSION.write_text(json.dumps(session_record(session_id, advice), indent=2))
 
     return {
         "status": "recorded",
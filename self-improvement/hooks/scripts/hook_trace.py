@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Hook Phase Tracing
+
+Opt-in span timings for the self-improvement hooks. With
+SELF_IMPROVEMENT_TRACE=1 in the environment, each hook phase (payload
+parse, pattern scan, tracker I/O, transcript parse, code analysis, DB
+writes) appends one JSON line to ~/.claude/self-improvement/trace.jsonl:
+
+    {"ts": 1735689600.123, "session": "...", "hook": "analyze-conversation",
+     "span": "transcript_parse", "ms": 41.7, "pid": 4242}
+
+The shell hooks record spans with trace-spans.sh (same format); Python code
+uses Tracer.span(). Without the variable, spans cost one attribute check.
+The file is rotated to trace.jsonl.1 past TRACE_MAX_BYTES.
+
+view-trace.sh aggregates the file into the slowest phases across sessions.
+
+Usage:
+    python3 hook_trace.py summary [--sessions N] [--top N] [trace]   # Print summary JSON
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
+
+TRACE_ENV = "SELF_IMPROVEMENT_TRACE"
+
+DEFAULT_PATH = Path.home() / ".claude" / "self-improvement" / "trace.jsonl"
+
+# Rotate to trace.jsonl.1 past this size
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+
+
+def enabled() -> bool:
+    """Whether tracing was requested for this process."""
+    return os.environ.get(TRACE_ENV, "") not in ("", "0")
+
+
+class Tracer:
+    """Records span timings for one hook run; a no-op unless enabled()."""
+
+    def __init__(self, hook: str, session: str = "", path: Optional[Union[str, Path]] = None):
+        self.hook = hook
+        self.session = session
+        self.path = Path(path) if path else DEFAULT_PATH
+        self.enabled = enabled()
+        self._rotated = False
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block as phase `name` (also when it raises or exits)."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name: str, ms: float):
+        """Append one span; tracing never fails the hook."""
+        if not self.enabled:
+            return
+        import json
+
+        line = json.dumps({
+            "ts": round(time.time(), 3),
+            "session": self.session,
+            "hook": self.hook,
+            "span": name,
+            "ms": round(ms, 3),
+            "pid": os.getpid(),
+        })
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if not self._rotated:
+                self._rotated = True
+                if self.path.exists() and self.path.stat().st_size > TRACE_MAX_BYTES:
+                    os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError:
+            pass
+
+
+def load_spans(path: Union[str, Path] = DEFAULT_PATH) -> list[dict]:
+    """Spans from the rotated and current trace files, oldest first."""
+    import json
+
+    path = Path(path)
+    spans = []
+    for candidate in (path.with_name(path.name + ".1"), path):
+        try:
+            lines = candidate.read_text(encoding="utf-8").splitlines()
+        except (OSError, UnicodeDecodeError):
+            continue
+        for line in lines:
+            try:
+                span = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(span, dict) and "span" in span and isinstance(span.get("ms"), (int, float)):
+                spans.append(span)
+    return spans
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(spans: list[dict], sessions: Optional[int] = None) -> dict:
+    """
+    Per (hook, span) timings, slowest total first.
+
+    Spans are grouped into sessions by session ID (or hook process when a
+    hook has none); `sessions` keeps only the most recent ones.
+    """
+    def session_of(span):
+        return span.get("session") or f"pid-{span.get('pid')}"
+
+    # Sessions in order of first appearance
+    order = list(dict.fromkeys(session_of(span) for span in spans))
+    if sessions is not None:
+        order = order[-sessions:] if sessions > 0 else []
+        keep = set(order)
+        spans = [span for span in spans if session_of(span) in keep]
+
+    groups: dict[tuple[str, str], list[float]] = {}
+    for span in spans:
+        groups.setdefault((span.get("hook", "?"), span["span"]), []).append(float(span["ms"]))
+
+    phases = []
+    for (hook, name), samples in groups.items():
+        ordered = sorted(samples)
+        phases.append({
+            "hook": hook,
+            "span": name,
+            "count": len(ordered),
+            "total_ms": round(sum(ordered), 1),
+            "mean_ms": round(sum(ordered) / len(ordered), 1),
+            "p95_ms": round(_percentile(ordered, 95), 1),
+            "max_ms": round(ordered[-1], 1),
+        })
+    phases.sort(key=lambda phase: phase["total_ms"], reverse=True)
+    return {"sessions": len(order), "spans": len(spans), "phases": phases}
+
+
+def main():
+    """Main entry point for command-line usage."""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Summarize hook trace spans")
+    parser.add_argument("command", choices=["summary"])
+    parser.add_argument("trace", nargs="?", default=str(DEFAULT_PATH))
+    parser.add_argument("--sessions", type=int, help="Only the most recent N sessions")
+    parser.add_argument("--top", type=int, help="Only the N slowest phases")
+    args = parser.parse_args()
+
+    summary = summarize(load_spans(args.trace), args.sessions)
+    if args.top is not None:
+        summary["phases"] = summary["phases"][:args.top]
+    print(json.dumps(summary, indent=2))
+    sys.exit(0 if summary["spans"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Incremental Pre-Write Scanning
+
+Keeps PreToolUse analysis cost proportional to the size of a change rather
+than the size of the file:
+- Edit: the replaced region is located in the current file and only the
+  changed lines plus a small context window are scanned
+- Write: the proposed content is diffed against the file on disk; changed
+  hunks (plus context) are rescanned and findings for unchanged lines are
+  carried over from the cached findings of the current content
+
+Findings are cached by content hash, so after a Write or Edit the next
+change to the same file starts from a warm cache. Everything falls back to
+a full scan when there is nothing to diff against.
+
+Usage:
+    python3 incremental_scan.py <old-file> <new-file>   # Print findings as JSON
+"""
+
+import hashlib
+import json
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import NamedTuple, Optional, Union
+
+from code_blocks import LineIndex
+from rule_registry import RULE_SETS, RULES, SEVERITY_ORDER, scan
+
+# Lines of unchanged context rescanned around each hunk, so matches that
+# straddle a hunk boundary are still found
+CONTEXT_LINES = 3
+
+# Above this many differing lines, one hunk is cheaper than a line diff
+MAX_DIFF_LINES = 2000
+
+# Don't read files larger than this from disk for diffing
+MAX_FILE_BYTES = 5 * 1024 * 1024
+
+# Number of content hashes kept in the findings cache
+MAX_CACHE_ENTRIES = 64
+
+
+class Finding(NamedTuple):
+    """A rule hit reduced to what survives a line shift."""
+    rule_id: str
+    severity: str
+    line: int
+    end_line: int
+    text: str
+
+    @property
+    def message(self) -> str:
+        return RULES[self.rule_id].message
+
+    @property
+    def issue(self) -> str:
+        return RULES[self.rule_id].issue
+
+
+class Hunk(NamedTuple):
+    """Changed line range: old[old_start:old_end] became new[new_start:new_end]."""
+    old_start: int
+    old_end: int
+    new_start: int
+    new_end: int
+
+
+def content_hash(text: str) -> str:
+    """Hash used as the findings cache key."""
+    return hashlib.sha256(text.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+def rule_set_signature(rule_set: str) -> str:
+    """Fingerprint of a rule set, so cached findings expire when rules change."""
+    parts = []
+    for severity, rule_ids in sorted(RULE_SETS[rule_set].items()):
+        for rule_id in rule_ids:
+            rule = RULES[rule_id]
+            parts.append(f"{severity}:{rule.id}:{rule.pattern}:{rule.ignore_case}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def scan_findings(rule_set: str, text: str, base_line: int = 1) -> list[Finding]:
+    """Scan text (starting at document line `base_line`) into findings."""
+    index = LineIndex(text, base_line)
+    return [
+        Finding(hit.rule.id, hit.severity, hit.line, index.line_of(max(hit.end - 1, hit.start)), hit.text)
+        for hit in scan(rule_set, text, index)
+    ]
+
+
+def split_lines(text: str) -> list[str]:
+    """Split on "\\n" only, keeping line ends, to agree with LineIndex."""
+    lines = text.split("\n")
+    last = lines.pop()
+    lines = [line + "\n" for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def sort_findings(findings: list[Finding]) -> list[Finding]:
+    """Order findings like scan(): by severity, then by position."""
+    return sorted(findings, key=lambda f: (SEVERITY_ORDER.index(f.severity), f.line))
+
+
+def line_hunks(old_lines: list[str], new_lines: list[str]) -> list[Hunk]:
+    """
+    Changed line ranges between two versions of a file.
+
+    Common leading and trailing lines are trimmed first, so a small edit to a
+    large file only diffs the few lines in between.
+    """
+    prefix = 0
+    limit = min(len(old_lines), len(new_lines))
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+
+    suffix = 0
+    limit -= prefix
+    while suffix < limit and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+
+    old_end = len(old_lines) - suffix
+    new_end = len(new_lines) - suffix
+    if prefix == old_end and prefix == new_end:
+        return []
+
+    old_middle = old_lines[prefix:old_end]
+    new_middle = new_lines[prefix:new_end]
+    if len(old_middle) + len(new_middle) > MAX_DIFF_LINES:
+        return [Hunk(prefix, old_end, prefix, new_end)]
+
+    matcher = SequenceMatcher(None, old_middle, new_middle, autojunk=False)
+    return [
+        Hunk(prefix + i1, prefix + i2, prefix + j1, prefix + j2)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def context_windows(hunks: list[Hunk], line_count: int, context: int = CONTEXT_LINES) -> list[tuple[int, int]]:
+    """Merge hunks (in new-file lines, 0-based) widened by `context` lines."""
+    windows: list[tuple[int, int]] = []
+    for hunk in hunks:
+        start = max(hunk.new_start - context, 0)
+        end = min(hunk.new_end + context, line_count)
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+    return windows
+
+
+def carry_over(old_findings: list[Finding], hunks: list[Hunk], windows: list[tuple[int, int]]) -> list[Finding]:
+    """
+    Shift findings from unchanged lines to their new line numbers.
+
+    Findings touching a changed hunk are dropped, as are those landing in a
+    rescanned window (the rescan reports them again).
+    """
+    kept = []
+    for finding in old_findings:
+        shift = 0
+        changed = False
+        for hunk in hunks:
+            if finding.end_line <= hunk.old_start:
+                break
+            if finding.line <= hunk.old_end:
+                changed = True
+                break
+            shift += (hunk.new_end - hunk.new_start) - (hunk.old_end - hunk.old_start)
+        if changed:
+            continue
+        line = finding.line + shift
+        end_line = finding.end_line + shift
+        if any(start < end_line and line <= end for start, end in windows):
+            continue
+        kept.append(finding._replace(line=line, end_line=end_line))
+    return kept
+
+
+def rescan_windows(rule_set: str, new_lines: list[str], windows: list[tuple[int, int]]) -> list[Finding]:
+    """Scan only the given windows of the new content."""
+    findings = []
+    for start, end in windows:
+        findings.extend(scan_findings(rule_set, "".join(new_lines[start:end]), start + 1))
+    return findings
+
+
+def apply_edit(current: str, old_string: str, new_string: str, replace_all: bool = False) -> Optional[tuple[str, list[Hunk]]]:
+    """
+    Apply an Edit to the current file content.
+
+    Returns the new content and the changed line ranges, located directly
+    from the replacement offsets (no diff needed), or None when
+    `old_string` is not in the file.
+    """
+    if not old_string:
+        return None
+    position = current.find(old_string)
+    if position == -1:
+        return None
+
+    hunks = []
+    pieces = []
+    previous = 0
+    old_line = 0
+    new_line = 0
+    old_newlines = old_string.count("\n")
+    new_newlines = new_string.count("\n")
+    while position != -1:
+        unchanged = current.count("\n", previous, position)
+        old_line += unchanged
+        new_line += unchanged
+        pieces.append(current[previous:position])
+        pieces.append(new_string)
+        hunk = Hunk(old_line, old_line + old_newlines + 1, new_line, new_line + new_newlines + 1)
+        if hunks and hunk.old_start < hunks[-1].old_end:
+            # Two replacements on one line form a single hunk
+            last = hunks[-1]
+            hunk = Hunk(last.old_start, hunk.old_end, last.new_start, hunk.new_end)
+            hunks[-1] = hunk
+        else:
+            hunks.append(hunk)
+        old_line += old_newlines
+        new_line += new_newlines
+        previous = position + len(old_string)
+        if not replace_all:
+            break
+        position = current.find(old_string, previous)
+
+    pieces.append(current[previous:])
+    return "".join(pieces), hunks
+
+
+class FindingsCache:
+    """Findings keyed by content hash, persisted as JSON between hook runs."""
+
+    def __init__(self, path: Optional[Union[str, Path]], rule_set: str):
+        self.path = Path(path) if path else None
+        self.rule_set = rule_set
+        self.signature = rule_set_signature(rule_set)
+        self.entries: dict[str, dict] = {}
+        self.dirty = False
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("signature") == self.signature:
+                    self.entries = data.get("entries", {})
+            except (OSError, ValueError, AttributeError):
+                self.entries = {}
+
+    def get(self, digest: str) -> Optional[list[Finding]]:
+        entry = self.entries.get(digest)
+        if entry is None:
+            return None
+        entry["used"] = time.time()
+        self.dirty = True
+        return [Finding(*item) for item in entry["findings"]]
+
+    def put(self, digest: str, findings: list[Finding]) -> None:
+        self.entries[digest] = {"used": time.time(), "findings": [list(f) for f in findings]}
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self.dirty:
+            return
+        if len(self.entries) > MAX_CACHE_ENTRIES:
+            newest = sorted(self.entries.items(), key=lambda item: item[1].get("used", 0), reverse=True)
+            self.entries = dict(newest[:MAX_CACHE_ENTRIES])
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"signature": self.signature, "entries": self.entries}, f)
+            tmp.replace(self.path)
+        except OSError:
+            pass
+
+
+def read_current(file_path: str) -> Optional[str]:
+    """Current file content, or None if missing, too large or unreadable."""
+    if not file_path:
+        return None
+    try:
+        path = Path(file_path)
+        if not path.is_file() or path.stat().st_size > MAX_FILE_BYTES:
+            return None
+        return path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def analyze_write(rule_set: str, content: str, current: Optional[str], cache: FindingsCache,
+                  context: int = CONTEXT_LINES) -> list[Finding]:
+    """
+    Findings for the full proposed content of a Write.
+
+    Rescans only the changed hunks when the current content's findings are
+    cached; otherwise scans everything. Caches the result for the new content.
+    """
+    digest = content_hash(content)
+    findings = cache.get(digest)
+    if findings is not None:
+        return findings
+
+    old_findings = cache.get(content_hash(current)) if current is not None else None
+    if old_findings is None:
+        findings = scan_findings(rule_set, content)
+    else:
+        new_lines = split_lines(content)
+        hunks = line_hunks(split_lines(current), new_lines)
+        windows = context_windows(hunks, len(new_lines), context)
+        findings = sort_findings(
+            carry_over(old_findings, hunks, windows) + rescan_windows(rule_set, new_lines, windows)
+        )
+
+    cache.put(digest, findings)
+    return findings
+
+
+def analyze_edit(rule_set: str, new_string: str, old_string: str, current: Optional[str], cache: FindingsCache,
+                 replace_all: bool = False, context: int = CONTEXT_LINES) -> tuple[list[Finding], bool]:
+    """
+    Findings introduced or touched by an Edit, and whether their line
+    numbers are file lines.
+
+    Only the replaced lines plus `context` lines around them are scanned.
+    When the current content's findings are cached, the full result is
+    cached for the edited content too. Without the file on disk, or when
+    `old_string` isn't in it, only `new_string` is scanned and lines count
+    from its start.
+    """
+    edited = apply_edit(current, old_string, new_string, replace_all) if current is not None else None
+    if edited is None:
+        return scan_findings(rule_set, new_string), False
+
+    content, hunks = edited
+    new_lines = split_lines(content)
+    windows = context_windows(hunks, len(new_lines), context)
+    rescanned = rescan_windows(rule_set, new_lines, windows)
+
+    old_findings = cache.get(content_hash(current))
+    if old_findings is not None:
+        cache.put(content_hash(content), sort_findings(carry_over(old_findings, hunks, windows) + rescanned))
+
+    # Report what overlaps the edited lines, not pre-existing context
+    return [
+        finding for finding in rescanned
+        if any(hunk.new_start < finding.end_line and finding.line <= hunk.new_end for hunk in hunks)
+    ], True
+
+
+def main():
+    """Main entry point for command-line usage."""
+    if len(sys.argv) < 3:
+        print("Usage: incremental_scan.py <old-file> <new-file>", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        old = Path(sys.argv[1]).read_text(encoding="utf-8")
+        new = Path(sys.argv[2]).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    cache = FindingsCache(None, "pre_write")
+    cache.put(content_hash(old), scan_findings("pre_write", old))
+    print(json.dumps([finding._asdict() for finding in analyze_write("pre_write", new, old, cache)], indent=2))
+
+
+if __name__ == "__main__":
+    main()
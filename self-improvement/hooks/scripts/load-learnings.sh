@@ -23,6 +23,9 @@ LOG_DIR="${HOME}/.claude/self-improvement"
 PATTERNS_DB="${LOG_DIR}/patterns.json"
 LEARNINGS_DB="${LOG_DIR}/learnings.json"
 METRICS_DB="${LOG_DIR}/metrics.json"
+DIGEST_DIR="${LOG_DIR}/digest-cache"
+CURRENT_SESSION="${LOG_DIR}/current-session-advice.json"
+COMPLIANCE_DB="${LOG_DIR}/compliance.json"
 
 # Create directory if it doesn't exist
 mkdir -p "${LOG_DIR}"
@@ -30,6 +33,44 @@ mkdir -p "${LOG_DIR}"
 # Generate session ID
 SESSION_ID=$(date +%s)
 
+# Opt-in phase timings (SELF_IMPROVEMENT_TRACE=1)
+TRACE_SESSION="${SESSION_ID}"
+source "${SCRIPT_DIR}/trace-spans.sh"
+
+# Print "mtime:size" for a file (GNU stat with sub-second mtime, then BSD stat)
+file_stamp() {
+    stat -c '%y:%s' "$1" 2>/dev/null || stat -f '%m:%z' "$1" 2>/dev/null || echo "missing"
+}
+
+# Serve the digest rendered for unchanged databases without starting Python.
+# The key covers both databases, this script (which holds the templates) and
+# compliance-tracker.py (which defines the advice record).
+serve_cached_digest() {
+    local key="$1"
+    local cached_key=""
+
+    [[ -f "${DIGEST_DIR}/key" && -f "${DIGEST_DIR}/output.json" ]] || return 1
+    cached_key=$(cat "${DIGEST_DIR}/key" 2>/dev/null) || return 1
+    [[ "${cached_key}" == "${key}" ]] || return 1
+
+    # Record the advice for compliance tracking from the record template
+    # compliance-tracker.py built; without its database, let it run again
+    if [[ -f "${DIGEST_DIR}/advice-record.json" ]]; then
+        [[ -f "${COMPLIANCE_DB}" ]] || return 1
+        local record session_id timestamp
+        record=$(cat "${DIGEST_DIR}/advice-record.json") || return 1
+        session_id="${SESSION_ID//\\/\\\\}"
+        session_id="${session_id//\"/\\\"}"
+        session_id="${session_id//[[:cntrl:]]/}"
+        timestamp=$(date '+%Y-%m-%dT%H:%M:%S')
+        record="${record/@SESSION_ID@/"${session_id}"}"
+        record="${record/@TIMESTAMP@/"${timestamp}"}"
+        printf '%s' "${record}" > "${CURRENT_SESSION}" 2>/dev/null || true
+    fi
+
+    cat "${DIGEST_DIR}/output.json"
+}
+
 # Function to load and display learnings
 load_learnings() {
     if [[ ! -f "${LEARNINGS_DB}" || ! -f "${PATTERNS_DB}" ]]; then
@@ -38,8 +79,16 @@ load_learnings() {
         exit 0
     fi
 
+    local digest_key
+    digest_key="$(file_stamp "${LEARNINGS_DB}") $(file_stamp "${PATTERNS_DB}") $(file_stamp "${BASH_SOURCE[0]}")"
+    digest_key+=" $(file_stamp "${SCRIPT_DIR}/compliance-tracker.py")"
+    if serve_cached_digest "${digest_key}"; then
+        return 0
+    fi
+
     # Pass variables as arguments to Python script
-    python3 - "$LEARNINGS_DB" "$PATTERNS_DB" "$SESSION_ID" "$SCRIPT_DIR" <<'EOF'
+    python3 - "$LEARNINGS_DB" "$PATTERNS_DB" "$SESSION_ID" "$SCRIPT_DIR" "$DIGEST_DIR" "$digest_key" <<'EOF'
+import importlib.util
 import json
 import sys
 import subprocess
@@ -51,6 +100,36 @@ learnings_file = sys.argv[1]
 patterns_file = sys.argv[2]
 session_id = sys.argv[3] if len(sys.argv) > 3 else str(int(datetime.now().timestamp()))
 script_dir = sys.argv[4] if len(sys.argv) > 4 else ""
+digest_dir = sys.argv[5] if len(sys.argv) > 5 else ""
+digest_key = sys.argv[6] if len(sys.argv) > 6 else ""
+
+def advice_record_template(advice):
+    """
+    compliance-tracker.py's session record for this advice, with
+    @SESSION_ID@ and @TIMESTAMP@ for the cached path to fill in.
+    """
+    spec = importlib.util.spec_from_file_location("compliance_tracker", Path(script_dir) / "compliance-tracker.py")
+    tracker = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(tracker)
+    return json.dumps(tracker.session_record("@SESSION_ID@", advice, "@TIMESTAMP@"), indent=2)
+
+def save_digest(output, advice):
+    """Cache the rendered output and advice record under the databases' stamp."""
+    if not digest_dir or not digest_key:
+        return
+    try:
+        cache = Path(digest_dir)
+        cache.mkdir(parents=True, exist_ok=True)
+        (cache / "output.json").write_text(output + "\n")
+        record = cache / "advice-record.json"
+        if advice and script_dir:
+            record.write_text(advice_record_template(advice))
+        elif record.exists():
+            record.unlink()
+        # Written last: a stale key never pairs with a newer output
+        (cache / "key").write_text(digest_key)
+    except OSError:
+        pass
 
 # Actionable templates for each pattern type
 # These provide specific guidance instead of generic warnings
@@ -278,14 +357,17 @@ if critical_patterns or important_patterns or actionable_learnings:
     if script_dir and advice_given:
         tracker_path = Path(script_dir) / "compliance-tracker.py"
         if tracker_path.exists():
-            try:
-                subprocess.run(
-                    ["python3", str(tracker_path), "record", session_id, json.dumps(advice_given)],
-                    capture_output=True,
-                    timeout=5
-                )
-            except Exception:
-                pass  # Don't fail session start if tracking fails
+            sys.path.insert(0, script_dir)
+            from hook_trace import Tracer
+            with Tracer("load-learnings", session_id).span("tracker_io"):
+                try:
+                    subprocess.run(
+                        ["python3", str(tracker_path), "record", session_id, json.dumps(advice_given)],
+                        capture_output=True,
+                        timeout=5
+                    )
+                except Exception:
+                    pass  # Don't fail session start if tracking fails
 
     # Output for Claude to use
     result = {
@@ -299,15 +381,21 @@ if critical_patterns or important_patterns or actionable_learnings:
 """
         }
     }
-    print(json.dumps(result))
+    output = json.dumps(result)
+    save_digest(output, advice_given)
+    print(output)
 else:
     # No significant learnings yet, suppress output
-    print('{"decision": "approve", "suppressOutput": true}')
+    output = '{"decision": "approve", "suppressOutput": true}'
+    save_digest(output, [])
+    print(output)
 
 EOF
 }
 
 # Main execution
 # Strip Windows CRLF from Python output to ensure clean JSON
+trace_begin total
 load_learnings | tr -d '\r'
+trace_end total
 exit 0
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Session Metrics Time-Series Store
+
+Columnar store for per-session metrics, written by analyze-conversation.sh
+next to metrics.json and read by view-metrics.sh and verify-improvement.sh:
+- columns: one list per field for the most recent sessions
+- running sums: cumulative totals per session, plus how many sessions
+  had the field, so the mean over any window of recent sessions is a few
+  lookups and a division
+- rollups: daily and weekly count/sum/min/max per field, updated on append
+
+A session without a field (older metrics.json entries predate some fields)
+is stored as None and left out of that field's means, rollups and counts.
+
+Every section is capped, so loading the store and answering trend or
+"improvement over N sessions" queries costs the same however long the
+history is.
+
+Usage:
+    python3 metrics_store.py summary [store]             # Print summary JSON
+    python3 metrics_store.py improvement <field> <n> [store]
+    python3 metrics_store.py import <metrics.json> [store]
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+
+STORE_VERSION = 2
+
+DEFAULT_PATH = Path.home() / ".claude" / "self-improvement" / "metrics-series.json"
+
+# Numeric session fields tracked as columns and rollups
+FIELDS = (
+    "quality_score",
+    "total_turns",
+    "user_turns",
+    "assistant_turns",
+    "total_lines",
+    "code_blocks_analyzed",
+    "critical_issues",
+    "important_issues",
+    "minor_issues",
+    "security_issues",
+    "patterns_detected",
+)
+
+# Fields where a lower value is an improvement
+LOWER_IS_BETTER = {
+    "critical_issues",
+    "important_issues",
+    "minor_issues",
+    "security_issues",
+    "patterns_detected",
+}
+
+# Retention limits
+MAX_SESSIONS = 500
+MAX_DAYS = 90
+MAX_WEEKS = 104
+
+# Relative change that counts as improving/worsening
+TREND_THRESHOLD = 0.1
+
+
+def _empty() -> dict:
+    return {
+        "version": STORE_VERSION,
+        "fields": list(FIELDS),
+        "count": 0,
+        "columns": {"timestamp": [], "session_id": [], **{field: [] for field in FIELDS}},
+        "running": {field: [] for field in FIELDS},
+        "seen": {field: [] for field in FIELDS},
+        "totals": {field: 0 for field in FIELDS},
+        "present": {field: 0 for field in FIELDS},
+        "rollups": {"daily": {}, "weekly": {}},
+    }
+
+
+def period_keys(timestamp: str) -> tuple[str, str]:
+    """Daily (YYYY-MM-DD) and ISO weekly (YYYY-Www) bucket for a timestamp."""
+    try:
+        moment = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        moment = datetime.now()
+    year, week, _ = moment.isocalendar()
+    return moment.date().isoformat(), f"{year}-W{week:02d}"
+
+
+def _bucket() -> dict:
+    return {"sessions": 0, "count": {}, "sum": {}, "min": {}, "max": {}}
+
+
+def _upgrade_v1(data: dict):
+    """
+    Add version 2's per-field session counts to a version 1 store.
+
+    Version 1 stored a missing field as 0, so every recorded value counts
+    as present.
+    """
+    count = data.get("count", 0)
+    retained = len(data["columns"]["timestamp"])
+    data["seen"] = {field: list(range(count - retained + 1, count + 1)) for field in data["running"]}
+    data["present"] = {field: count for field in data["totals"]}
+    for buckets in data["rollups"].values():
+        for bucket in buckets.values():
+            bucket["count"] = {field: bucket["sessions"] for field in bucket["sum"]}
+    data["version"] = STORE_VERSION
+
+
+class MetricsStore:
+    """Capped columnar session metrics with running sums and rollups."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path else DEFAULT_PATH
+        self.data = _empty()
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == 1:
+                    _upgrade_v1(data)
+                if data.get("version") == STORE_VERSION:
+                    self.data = data
+            except (OSError, ValueError):
+                pass
+        self._add_missing_fields()
+
+    def _add_missing_fields(self):
+        """Start columns for fields added since the store was created."""
+        data = self.data
+        length = len(data["columns"]["timestamp"])
+        for field in FIELDS:
+            if field not in data["columns"]:
+                data["columns"][field] = [None] * length
+                data["running"][field] = [0] * length
+                data["seen"][field] = [0] * length
+                data["totals"][field] = 0
+                data["present"][field] = 0
+        data["fields"] = list(FIELDS)
+
+    def __len__(self) -> int:
+        """Sessions ever appended (not just those retained)."""
+        return self.data["count"]
+
+    @property
+    def retained(self) -> int:
+        return len(self.data["columns"]["timestamp"])
+
+    def append(self, session: dict):
+        """Add one session and update running sums and rollups."""
+        data = self.data
+        columns = data["columns"]
+        timestamp = session.get("timestamp") or datetime.now().isoformat()
+        columns["timestamp"].append(timestamp)
+        columns["session_id"].append(session.get("session_id", ""))
+
+        day, week = period_keys(timestamp)
+        daily = data["rollups"]["daily"].setdefault(day, _bucket())
+        weekly = data["rollups"]["weekly"].setdefault(week, _bucket())
+        daily["sessions"] += 1
+        weekly["sessions"] += 1
+
+        for field in FIELDS:
+            value = session.get(field)
+            if not isinstance(value, (int, float)):
+                value = None
+            columns[field].append(value)
+            if value is not None:
+                data["totals"][field] += value
+                data["present"][field] += 1
+                for bucket in (daily, weekly):
+                    bucket["count"][field] = bucket["count"].get(field, 0) + 1
+                    bucket["sum"][field] = bucket["sum"].get(field, 0) + value
+                    bucket["min"][field] = min(bucket["min"].get(field, value), value)
+                    bucket["max"][field] = max(bucket["max"].get(field, value), value)
+            data["running"][field].append(data["totals"][field])
+            data["seen"][field].append(data["present"][field])
+
+        data["count"] += 1
+        self._trim()
+
+    def _trim(self):
+        data = self.data
+        excess = self.retained - MAX_SESSIONS
+        if excess > 0:
+            for column in data["columns"].values():
+                del column[:excess]
+            for column in data["running"].values():
+                del column[:excess]
+            for column in data["seen"].values():
+                del column[:excess]
+        for period, limit in (("daily", MAX_DAYS), ("weekly", MAX_WEEKS)):
+            buckets = data["rollups"][period]
+            if len(buckets) > limit:
+                for key in sorted(buckets)[:len(buckets) - limit]:
+                    del buckets[key]
+
+    def save(self):
+        """Write the store atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, separators=(",", ":"))
+        tmp.replace(self.path)
+
+    def column(self, field: str) -> list:
+        """Retained values of a field, oldest first."""
+        return self.data["columns"][field]
+
+    def recent(self, count: int) -> list[dict]:
+        """The last `count` retained sessions as records."""
+        columns = self.data["columns"]
+        start = max(self.retained - count, 0)
+        return [
+            {name: values[i] for name, values in columns.items()}
+            for i in range(start, self.retained)
+        ]
+
+    def window_mean(self, field: str, count: int, skip: int = 0) -> Optional[float]:
+        """
+        Mean of `field` over `count` sessions, ending `skip` sessions ago.
+
+        Uses the running sums, so the cost doesn't depend on `count`.
+        Sessions without the field are left out. Returns None when those
+        sessions aren't retained or none of them has the field.
+        """
+        running = self.data["running"][field]
+        seen = self.data["seen"][field]
+        end = len(running) - skip
+        start = end - count
+        if count <= 0 or start < 0 or end <= 0:
+            return None
+        # Running sums are absolute; the one before the window may be trimmed
+        if start > 0:
+            sum_before, seen_before = running[start - 1], seen[start - 1]
+        else:
+            first = self.data["columns"][field][0]
+            sum_before = running[0] - (first or 0)
+            seen_before = seen[0] - (first is not None)
+        sessions = seen[end - 1] - seen_before
+        return (running[end - 1] - sum_before) / sessions if sessions else None
+
+    def mean(self, field: str) -> Optional[float]:
+        """Mean over every session ever appended that had the field."""
+        present = self.data["present"][field]
+        return self.data["totals"][field] / present if present else None
+
+    def improvement(self, field: str, sessions: int) -> dict:
+        """
+        Compare the last `sessions` sessions with the `sessions` before them.
+
+        `trend` is "improving", "worsening", "stable", or "insufficient_data"
+        when fewer than 2 * `sessions` sessions are retained.
+        """
+        recent = self.window_mean(field, sessions)
+        previous = self.window_mean(field, sessions, skip=sessions)
+        result = {"field": field, "sessions": sessions, "recent": recent, "previous": previous, "change": None}
+        if recent is None or previous is None:
+            result["trend"] = "insufficient_data"
+            return result
+
+        change = recent - previous
+        result["change"] = round(change, 2)
+        scale = abs(previous) or 1
+        if abs(change) / scale < TREND_THRESHOLD:
+            result["trend"] = "stable"
+        elif (change < 0) == (field in LOWER_IS_BETTER):
+            result["trend"] = "improving"
+        else:
+            result["trend"] = "worsening"
+        return result
+
+    def rollup(self, period: str, field: str, count: Optional[int] = None) -> list[dict]:
+        """
+        Per-period session count and mean/min/max of `field`, oldest first.
+
+        The mean is over the period's sessions that had the field (None if none did).
+        """
+        buckets = self.data["rollups"][period]
+        keys = sorted(buckets)
+        if count is not None:
+            keys = keys[-count:]
+        rows = []
+        for key in keys:
+            bucket = buckets[key]
+            present = bucket["count"].get(field, 0)
+            rows.append({
+                "period": key,
+                "sessions": bucket["sessions"],
+                "mean": bucket["sum"].get(field, 0) / present if present else None,
+                "min": bucket["min"].get(field),
+                "max": bucket["max"].get(field),
+            })
+        return rows
+
+    def summary(self, sessions: int = 10) -> dict:
+        """Overall means plus improvement over the last `sessions` sessions."""
+        return {
+            "sessions": len(self),
+            "retained": self.retained,
+            "means": {field: self.mean(field) for field in FIELDS},
+            "improvement": {
+                field: self.improvement(field, sessions)
+                for field in ("quality_score", "critical_issues", "security_issues", "patterns_detected")
+            },
+            "weekly": self.rollup("weekly", "quality_score", 4),
+        }
+
+
+def load_store(
+    path: Optional[Union[str, Path]] = None,
+    legacy_metrics: Optional[Union[str, Path]] = None
+) -> MetricsStore:
+    """
+    Open the store, backfilling it from metrics.json on first use.
+
+    `legacy_metrics` is only read when the store file doesn't exist yet.
+    """
+    store = MetricsStore(path)
+    if len(store) == 0 and legacy_metrics and not store.path.exists():
+        try:
+            with open(legacy_metrics, "r", encoding="utf-8") as f:
+                sessions = json.load(f).get("sessions", [])
+        except (OSError, ValueError, AttributeError):
+            sessions = []
+        for session in sessions:
+            store.append(session)
+        if sessions:
+            try:
+                store.save()
+            except OSError:
+                pass
+    return store
+
+
+def main():
+    """Main entry point for command-line usage."""
+    if len(sys.argv) < 2 or sys.argv[1] not in ("summary", "improvement", "import"):
+        print("Usage: metrics_store.py summary [store]", file=sys.stderr)
+        print("       metrics_store.py improvement <field> <n> [store]", file=sys.stderr)
+        print("       metrics_store.py import <metrics.json> [store]", file=sys.stderr)
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command == "summary":
+        store = MetricsStore(sys.argv[2] if len(sys.argv) > 2 else None)
+        print(json.dumps(store.summary(), indent=2))
+    elif command == "improvement":
+        if len(sys.argv) < 4 or sys.argv[2] not in FIELDS:
+            print(f"Usage: metrics_store.py improvement <{'|'.join(FIELDS)}> <n> [store]", file=sys.stderr)
+            sys.exit(1)
+        store = MetricsStore(sys.argv[4] if len(sys.argv) > 4 else None)
+        print(json.dumps(store.improvement(sys.argv[2], int(sys.argv[3])), indent=2))
+    else:
+        if len(sys.argv) < 3:
+            print("Usage: metrics_store.py import <metrics.json> [store]", file=sys.stderr)
+            sys.exit(1)
+        store = load_store(sys.argv[3] if len(sys.argv) > 3 else None, sys.argv[2])
+        print(json.dumps({"sessions": len(store), "retained": store.retained}))
+
+
+if __name__ == "__main__":
+    main()
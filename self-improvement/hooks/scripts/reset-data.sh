@@ -44,6 +44,16 @@ fi
 echo '{"patterns": []}' > "${LOG_DIR}/patterns.json"
 echo '{"learnings": []}' > "${LOG_DIR}/learnings.json"
 echo '{"sessions": []}' > "${LOG_DIR}/metrics.json"
+rm -f "${LOG_DIR}/metrics-series.json"
+
+# Drop cached pre-write findings
+rm -f "${LOG_DIR}/pre-write-cache.json"
+
+# Drop cached component quality scores
+rm -f "${LOG_DIR}/quality-score-cache.json"
+
+# Drop hook phase traces
+rm -f "${LOG_DIR}/trace.jsonl" "${LOG_DIR}/trace.jsonl.1"
 
 # Clear logs
 > "${LOG_DIR}/analysis.log"
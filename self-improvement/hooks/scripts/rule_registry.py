@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Shared Security Rule Registry
+
+Single source of truth for the regex rules used by:
+- analyze-before-write.sh (PreToolUse hook, rule set "pre_write")
+- analyze-code-quality.py (SessionEnd analysis, rule sets "javascript", "shell", "sql")
+- check-security.py (response quality skill, rule set "response")
+
+Each rule set is compiled into one combined scanner per severity, with a
+named group per rule, so a single pass over the text reports every hit with
+its line number (from the shared code_blocks.LineIndex). Rules whose literal
+hints do not occur in the text are dropped before compiling, and compiled
+scanners are cached per process.
+
+Usage:
+    python3 rule_registry.py <rule-set> <file>       # Print hits as JSON
+    python3 rule_registry.py --benchmark [lines]     # Compare against per-rule loop
+"""
+
+import json
+import re
+import sys
+import time
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from code_blocks import LineIndex
+
+# Issue severity levels
+CRITICAL = "critical"
+IMPORTANT = "important"
+MINOR = "minor"
+
+SEVERITY_ORDER = (CRITICAL, IMPORTANT, MINOR)
+
+
+class Rule(NamedTuple):
+    """A single detection rule.
+
+    `id` doubles as the named group in the combined scanner, so it must be a
+    valid Python identifier. `hints` are lowercase literals of which at least
+    one must occur in any matching text; they let the scanner skip rules
+    cheaply before running any regex. `issue` is the issue type the consumer
+    reports for a hit (check-security's "type", the pre-write warning
+    tracker's entries, the analyzer's issue types); it is empty for rules
+    whose hits are only shown as messages.
+    """
+    id: str
+    pattern: str
+    message: str
+    hints: tuple[str, ...]
+    ignore_case: bool = True
+    issue: str = ""
+
+
+class Hit(NamedTuple):
+    """A rule match located in the scanned text."""
+    rule: Rule
+    severity: str
+    line: int
+    start: int
+    end: int
+    text: str
+
+
+# Each consumer keeps its own patterns, messages and issue types, so that
+# findings, scores and recorded warnings don't change with the scanner.
+_RULES = (
+    # Pre-write hook (analyze-before-write.sh). `issue` is what the warning
+    # tracker records: the message's first word.
+    Rule("write_eval", r'\beval\s*\(', "eval() detected - can execute arbitrary code", ("eval",), issue="eval"),
+    Rule("write_exec", r'\bexec\s*\(', "exec() detected - can execute arbitrary code", ("exec",), issue="exec"),
+    Rule("write_password", r'password\s*=\s*["\'][^"\']{5,}["\']', "Potential hardcoded password", ("password",), issue="potential"),
+    Rule("write_api_key", r'api_?key\s*=\s*["\'][^"\']{10,}["\']', "Potential hardcoded API key", ("api",), issue="potential"),
+    Rule("write_secret", r'secret\s*=\s*["\'][^"\']{5,}["\']', "Potential hardcoded secret", ("secret",), issue="potential"),
+    Rule("write_shell_true", r'subprocess.*shell\s*=\s*True', "shell=True is dangerous - use shell=False", ("subprocess",), issue="shell=true"),
+    Rule("write_inner_html", r'\.innerHTML\s*=\s*[^"\'`]', "innerHTML with variable - potential XSS", ("innerhtml",), issue="innerhtml"),
+    Rule("write_rm_rf", r'rm\s+-rf?\s+["\']?\$', "rm -rf with variable - dangerous", ("rm",), issue="rm"),
+    Rule("write_bare_except", r'except:\s*$', "Bare except clause - specify exception types", ("except",)),
+    Rule("write_broad_except", r'except\s+Exception\s*:', "Catching all exceptions - be more specific", ("except",)),
+    Rule("write_sql_concatenation", r'SELECT.*FROM.*["\'].*\+', "SQL string concatenation - use parameterized queries", ("select",)),
+    Rule("write_pickle", r'pickle\.load', "pickle can execute arbitrary code - use safe alternatives", ("pickle.load",)),
+
+    # Response checker (check-security.py)
+    Rule("eval", r'\beval\s*\(', "Code execution vulnerability - eval can run arbitrary code", ("eval",), issue="eval"),
+    Rule("exec", r'\bexec\s*\(', "Code execution vulnerability - exec can run arbitrary code", ("exec",), issue="exec"),
+    Rule("pickle", r'pickle\.(?:loads?|dump)', "Insecure deserialization - pickle can execute arbitrary code", ("pickle.",), issue="pickle"),
+    Rule("yaml_load", r'yaml\.load\s*\([^)]*\)', "Use yaml.safe_load() instead of yaml.load()", ("yaml.load",), issue="yaml.load"),
+    Rule("shell_true", r'subprocess.*shell\s*=\s*True', "Command injection risk - avoid shell=True", ("subprocess",), issue="shell=true"),
+    Rule("os_system", r'\bos\.system\s*\(', "Command injection risk - use subprocess with shell=False", ("os.system",), issue="os.system"),
+    Rule("inner_html", r'\.innerHTML\s*=', "XSS vulnerability - sanitize HTML or use textContent", ("innerhtml",), issue="innerhtml"),
+    Rule("document_write", r'document\.write\s*\(', "XSS vulnerability - avoid document.write", ("document.write",), issue="document.write"),
+    Rule("rm_rf_variable", r'rm\s+-rf?\s+["\']?\$', "Dangerous file deletion with variable", ("rm",), issue="rm_-rf_$var"),
+    Rule("curl_pipe_shell", r'curl.*\|\s*(?:ba)?sh', "Remote code execution - never pipe curl to shell", ("curl",), issue="curl_|_bash"),
+    Rule("hardcoded_password", r'password\s*=\s*["\'][^"\']+["\']', "Store passwords in environment variables or vaults", ("password",), issue="hardcoded_password"),
+    Rule("hardcoded_api_key", r'api_?key\s*=\s*["\'][^"\']+["\']', "Store API keys in environment variables", ("api",), issue="hardcoded_api_key"),
+    Rule("hardcoded_secret", r'secret\s*=\s*["\'][^"\']+["\']', "Store secrets securely, not in code", ("secret",), issue="hardcoded_secret"),
+    Rule("hardcoded_token", r'token\s*=\s*["\'][^"\']+["\']', "Store tokens in environment variables", ("token",), issue="hardcoded_token"),
+    Rule("private_key", r'["\']-----BEGIN (?:RSA |DSA )?PRIVATE KEY-----', "Never commit private keys", ("-----begin",), issue="private_key_in_code"),
+    Rule("database_url_password", r'(?:mysql|postgres|mongodb)://[^:]+:[^@]+@', "Use environment variables for credentials", ("mysql://", "postgres://", "mongodb://"), issue="database_url_with_password"),
+    Rule("sql_concatenation", r'SELECT.*FROM.*WHERE.*["\'].*\+', "Use parameterized queries", ("select",), issue="sql_string_concatenation"),
+    Rule("sql_fstring", r'f["\'].*SELECT.*\{', "Use parameterized queries, not f-strings", ("select",), issue="sql_f-string"),
+    Rule("sql_query_concatenation", r'query\s*\+\s*["\']', "Use parameterized queries", ("query",), issue="sql_concatenation"),
+    Rule("php_unsanitized_input", r'\$_(?:GET|POST|REQUEST)\[', "Sanitize and validate all user input", ("$_",), issue="unsanitized_php_input"),
+    Rule("dangerously_set_inner_html", r'dangerouslySetInnerHTML', "XSS risk - sanitize content first", ("dangerouslysetinnerhtml",), issue="dangerouslysetinnerhtml"),
+    Rule("md5", r'\bMD5\s*\(|hashlib\.md5', "MD5 is weak - use SHA-256 or bcrypt for passwords", ("md5",), issue="md5_hash"),
+    Rule("sha1", r'\bSHA1\s*\(|hashlib\.sha1', "SHA1 is weak - use SHA-256 or better", ("sha1",), issue="sha1_hash"),
+    Rule("ssl_verify_disabled", r'verify\s*=\s*False', "Don't disable SSL certificate verification", ("verify",), issue="ssl_verification_disabled"),
+    Rule("weak_random", r'random\.(?:random|randint|choice)\s*\(', "Use secrets module for security-sensitive randomness", ("random.",), issue="weak_random"),
+    Rule("math_random", r'Math\.random\s*\(', "Use crypto.getRandomValues() for security", ("math.random",), issue="math.random"),
+    Rule("chmod_777", r'chmod\s+777', "Overly permissive - use minimal required permissions", ("chmod",), issue="chmod_777"),
+    Rule("logging_sensitive_data", r'console\.(?:log|warn)\s*\(.*(?:password|secret|key|token)', "Don't log secrets", ("console.",), issue="logging_sensitive_data"),
+
+    # Session-end analyzer (analyze-code-quality.py); case-sensitive except SELECT *
+    Rule("js_eval", r'\beval\s*\(', "Use of eval() in JavaScript is dangerous - can execute arbitrary code", ("eval",), False, "dangerous_eval"),
+    Rule("js_inner_html", r'\.innerHTML\s*=\s*[^"\'`]', "innerHTML assignment with variable - potential XSS vulnerability", ("innerhtml",), False, "potential_xss"),
+    Rule("js_document_write", r'\bdocument\.write\s*\(', "document.write() is deprecated and can cause security issues", ("document.write",), False, "document_write"),
+    # Counted rather than reported one by one
+    Rule("console_log", r'\bconsole\.log\s*\(', "console.log statement - remove before production", ("console.log",), False, "excessive_logging"),
+    Rule("var_declaration", r'\bvar\s+\w+', "'var' declaration - prefer 'let' or 'const'", ("var",), False, "use_let_const"),
+    Rule("loose_equality", r'[^=!]==[^=]', "'==' comparison - prefer '==='", ("==",), False, "use_strict_equality"),
+    Rule("shell_rm_rf", r'rm\s+-rf?\s+\$', "rm -rf with variable path is dangerous - variable could be empty or wrong", ("rm",), False, "dangerous_rm"),
+    Rule("shell_curl_pipe", r'curl.*\|\s*(?:ba)?sh', "curl | bash is dangerous - downloads and executes untrusted code", ("curl",), False, "curl_pipe_bash"),
+    Rule("sql_string_building", r"['\"].*\+.*['\"]|f['\"].*\{.*\}.*['\"]", "String concatenation in SQL query - use parameterized queries", ("+", "{"), False, "sql_injection"),
+    Rule("select_star", r'SELECT\s+\*', "SELECT * can fetch unnecessary data - specify columns explicitly", ("select",), issue="select_star"),
+)
+
+RULES: dict[str, Rule] = {rule.id: rule for rule in _RULES}
+
+# Rule ids per severity for each consumer
+RULE_SETS: dict[str, dict[str, tuple[str, ...]]] = {
+    "pre_write": {
+        CRITICAL: (
+            "write_eval", "write_exec", "write_password", "write_api_key",
+            "write_secret", "write_shell_true", "write_inner_html", "write_rm_rf",
+        ),
+        IMPORTANT: ("write_bare_except", "write_broad_except", "write_sql_concatenation", "write_pickle"),
+    },
+    "response": {
+        CRITICAL: (
+            "eval", "exec", "pickle", "yaml_load", "shell_true", "os_system",
+            "inner_html", "document_write", "rm_rf_variable", "curl_pipe_shell",
+        ),
+        IMPORTANT: (
+            "hardcoded_password", "hardcoded_api_key", "hardcoded_secret",
+            "hardcoded_token", "private_key", "database_url_password",
+            "sql_concatenation", "sql_fstring", "sql_query_concatenation",
+            "php_unsanitized_input", "dangerously_set_inner_html",
+        ),
+        MINOR: (
+            "md5", "sha1", "ssl_verify_disabled", "weak_random",
+            "math_random", "chmod_777", "logging_sensitive_data",
+        ),
+    },
+    "javascript": {
+        CRITICAL: ("js_eval", "js_inner_html"),
+        IMPORTANT: ("js_document_write",),
+        MINOR: ("console_log", "var_declaration", "loose_equality"),
+    },
+    "shell": {
+        CRITICAL: ("shell_rm_rf", "shell_curl_pipe"),
+    },
+    "sql": {
+        CRITICAL: ("sql_string_building",),
+        MINOR: ("select_star",),
+    },
+}
+
+_FLAGS = re.IGNORECASE | re.MULTILINE
+
+
+def _group(rule: Rule) -> str:
+    """Wrap a rule as a zero-width named group so overlapping hits survive."""
+    pattern = rule.pattern if rule.ignore_case else f"(?-i:{rule.pattern})"
+    return f"(?=(?P<{rule.id}>{pattern}))"
+
+
+@lru_cache(maxsize=None)
+def _rule_regex(rule_id: str) -> re.Pattern:
+    """Compile a single rule (used to resolve hits that share a start offset)."""
+    rule = RULES[rule_id]
+    return re.compile(rule.pattern, _FLAGS if rule.ignore_case else re.MULTILINE)
+
+
+@lru_cache(maxsize=256)
+def compile_scanner(rule_ids: tuple[str, ...]) -> re.Pattern:
+    """Compile (and cache) the combined scanner for an ordered set of rules."""
+    return re.compile("|".join(_group(RULES[rule_id]) for rule_id in rule_ids), _FLAGS)
+
+
+def live_rules(rule_ids: tuple[str, ...], lowered: str) -> tuple[str, ...]:
+    """Filter rules down to those whose literal hints occur in the text."""
+    return tuple(
+        rule_id for rule_id in rule_ids
+        if any(hint in lowered for hint in RULES[rule_id].hints)
+    )
+
+
+def _scan_severity(rule_ids: tuple[str, ...], severity: str, text: str, index: LineIndex, hits: list[Hit]) -> None:
+    """Run one combined scanner and append its hits, in offset order."""
+    scanner = compile_scanner(rule_ids)
+    position = {rule_id: i for i, rule_id in enumerate(rule_ids)}
+    last_end: dict[str, int] = {}
+
+    def record(rule_id: str, start: int, end: int) -> None:
+        # Mirror re.finditer semantics per rule: no overlapping hits of one rule
+        if start < last_end.get(rule_id, 0):
+            return
+        last_end[rule_id] = end
+        hits.append(Hit(RULES[rule_id], severity, index.line_of(start), start, end, text[start:end]))
+
+    for match in scanner.finditer(text):
+        rule_id = match.lastgroup
+        start, end = match.span(rule_id)
+        record(rule_id, start, end)
+        # Alternation stops at the first rule matching here; later rules may too
+        for other in rule_ids[position[rule_id] + 1:]:
+            other_match = _rule_regex(other).match(text, start)
+            if other_match:
+                record(other, start, other_match.end())
+
+
+def scan(rule_set: str, text: str, index: Optional[LineIndex] = None, severities: tuple[str, ...] = SEVERITY_ORDER) -> list[Hit]:
+    """
+    Scan text with every rule in a rule set.
+
+    Returns hits ordered by severity, then by offset. Pass a prebuilt
+    `index` when scanning the same block more than once.
+    """
+    hits: list[Hit] = []
+    if not text:
+        return hits
+
+    table = RULE_SETS[rule_set]
+    lowered = text.lower()
+    for severity in severities:
+        rule_ids = live_rules(table.get(severity, ()), lowered)
+        if not rule_ids:
+            continue
+        if index is None:
+            index = LineIndex(text)
+        _scan_severity(rule_ids, severity, text, index, hits)
+
+    return hits
+
+
+def first_hits(hits: list[Hit]) -> list[Hit]:
+    """Keep only the first hit of each rule, preserving order."""
+    seen = set()
+    unique = []
+    for hit in hits:
+        if hit.rule.id not in seen:
+            seen.add(hit.rule.id)
+            unique.append(hit)
+    return unique
+
+
+def _legacy_scan(rule_set: str, text: str) -> int:
+    """The pre-registry approach: one re.finditer per rule, line from a prefix slice."""
+    count = 0
+    for severity, rule_ids in RULE_SETS[rule_set].items():
+        for rule_id in rule_ids:
+            rule = RULES[rule_id]
+            flags = _FLAGS if rule.ignore_case else re.MULTILINE
+            for match in re.finditer(rule.pattern, text, flags):
+                _ = text[:match.start()].count('\n') + 1
+                count += 1
+    return count
+
+
+def benchmark(lines: int = 20000) -> dict:
+    """Time the combined scanner against the legacy per-rule loop on generated files."""
+    filler = [
+        "def handler(request):",
+        "    value = request.args.get('value', default=None)",
+        "    # Normalize the value before returning it",
+        "    return normalize(value)",
+        "class Repository(Base):",
+        "    '''Persistence for domain objects.'''",
+    ]
+    risky = [
+        "result = eval(user_input)",
+        "password = 'hunter2hunter2'",
+        "subprocess.run(cmd, shell=True)",
+        "cursor.execute(\"SELECT * FROM users WHERE id = '\" + uid)",
+    ]
+
+    corpora = {
+        "sparse": "\n".join(
+            risky[i // 1000 % len(risky)] if i % 1000 == 0 else filler[i % len(filler)]
+            for i in range(lines)
+        ),
+        "dense": "\n".join(
+            risky[i // 10 % len(risky)] if i % 10 == 0 else filler[i % len(filler)]
+            for i in range(lines)
+        ),
+    }
+
+    report = {"lines": lines, "corpora": {}}
+    for name, text in corpora.items():
+        started = time.perf_counter()
+        legacy_hits = _legacy_scan("response", text)
+        legacy = time.perf_counter() - started
+
+        scan("response", text)  # warm the compile cache, as a long-lived caller would
+        started = time.perf_counter()
+        hits = scan("response", text)
+        combined = time.perf_counter() - started
+
+        report["corpora"][name] = {
+            "bytes": len(text),
+            "legacy_seconds": round(legacy, 4),
+            "combined_seconds": round(combined, 4),
+            "legacy_hits": legacy_hits,
+            "combined_hits": len(hits),
+            "speedup": round(legacy / combined, 1) if combined else None,
+        }
+    return report
+
+
+def main():
+    """Main entry point for command-line usage."""
+    if len(sys.argv) >= 2 and sys.argv[1] == "--benchmark":
+        lines = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+        print(json.dumps(benchmark(lines), indent=2))
+        return
+
+    if len(sys.argv) < 3 or sys.argv[1] not in RULE_SETS:
+        print(f"Usage: rule_registry.py <{'|'.join(RULE_SETS)}> <file>", file=sys.stderr)
+        print("       rule_registry.py --benchmark [lines]", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        print(f"Error: File not found: {sys.argv[2]}", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps([
+        {"rule": hit.rule.id, "severity": hit.severity, "line": hit.line, "match": hit.text[:50]}
+        for hit in scan(sys.argv[1], text)
+    ], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -164,6 +164,36 @@ run_test "analyze-conversation.sh handles non-existent file" \
     "echo '{\"transcript_path\": \"/nonexistent/file.jsonl\"}' | bash '${SCRIPT_DIR}/analyze-conversation.sh'" \
     '"decision"'
 
+echo ""
+echo "=== Pre-Write Analysis Tests ==="
+echo ""
+
+# Payloads for the PreToolUse hook
+WRITE_PAYLOAD="${TEST_DIR}/write-payload.json"
+cat > "${WRITE_PAYLOAD}" << 'EOF'
+{"tool_name": "Write", "tool_input": {"file_path": "/tmp/test-hooks-example.py", "content": "result = eval(user_input)\n"}}
+EOF
+
+run_test "analyze-before-write.sh flags eval() via rule registry" \
+    "bash '${SCRIPT_DIR}/analyze-before-write.sh' < '${WRITE_PAYLOAD}'" \
+    'eval() detected - can execute arbitrary code'
+
+# old_string isn't in the file, so new_string's line numbers aren't file lines
+EDIT_TARGET="${TEST_DIR}/edit-target.py"
+printf 'x = 1\ny = 2\n' > "${EDIT_TARGET}"
+EDIT_PAYLOAD="${TEST_DIR}/edit-payload.json"
+cat > "${EDIT_PAYLOAD}" << EOF
+{"tool_name": "Edit", "tool_input": {"file_path": "${EDIT_TARGET}", "old_string": "missing", "new_string": "z = 3\\nresult = eval(user_input)"}}
+EOF
+
+run_test "analyze-before-write.sh omits line numbers for an unplaced Edit" \
+    "bash '${SCRIPT_DIR}/analyze-before-write.sh' < '${EDIT_PAYLOAD}'" \
+    'can execute arbitrary code\\n'
+
+run_test "analyze-before-write.sh approves non-write tools" \
+    "echo '{\"tool_name\": \"Read\", \"tool_input\": {}}' | bash '${SCRIPT_DIR}/analyze-before-write.sh'" \
+    '"decision": "approve"'
+
 echo ""
 echo "=== Database Operations Tests ==="
 echo ""
@@ -199,6 +229,39 @@ if [[ -f "${LOG_DIR}/metrics.json.bak" ]]; then
     mv "${LOG_DIR}/metrics.json.bak" "${LOG_DIR}/metrics.json"
 fi
 
+echo ""
+echo "=== Session Digest Cache Tests ==="
+echo ""
+
+# Isolated home so the cache can be inspected without touching real data
+DIGEST_HOME="${TEST_DIR}/digest-home"
+DIGEST_LOG_DIR="${DIGEST_HOME}/.claude/self-improvement"
+mkdir -p "${DIGEST_LOG_DIR}"
+echo '{"learnings": [{"key": "security_vulnerabilities"}]}' > "${DIGEST_LOG_DIR}/learnings.json"
+echo '{"patterns": [{"type": "high_error_rate", "severity": "critical", "count": 3}]}' > "${DIGEST_LOG_DIR}/patterns.json"
+
+run_test "load-learnings.sh renders and caches the digest" \
+    "HOME='${DIGEST_HOME}' bash '${SCRIPT_DIR}/load-learnings.sh' && cat '${DIGEST_LOG_DIR}/digest-cache/key'" \
+    'Critical Actions Required'
+
+run_test "load-learnings.sh serves the cached digest and records advice" \
+    "rm -f '${DIGEST_LOG_DIR}/current-session-advice.json' && HOME='${DIGEST_HOME}' bash '${SCRIPT_DIR}/load-learnings.sh' >/dev/null && cat '${DIGEST_LOG_DIR}/current-session-advice.json'" \
+    'high_error_rate'
+
+run_test "load-learnings.sh writes the cached advice record as the tracker does" \
+    "python3 -c 'import json, sys; r = json.load(open(sys.argv[1])); print(sorted(r), r[\"status\"])' '${DIGEST_LOG_DIR}/current-session-advice.json'" \
+    "\['advice_given', 'session_id', 'status', 'timestamp'\] active"
+
+run_test "load-learnings.sh runs the tracker when its database is missing" \
+    "rm -f '${DIGEST_LOG_DIR}/compliance.json' && HOME='${DIGEST_HOME}' bash '${SCRIPT_DIR}/load-learnings.sh' >/dev/null && ls '${DIGEST_LOG_DIR}'" \
+    'compliance.json'
+
+echo '{"patterns": []}' > "${DIGEST_LOG_DIR}/patterns.json"
+echo '{"learnings": []}' > "${DIGEST_LOG_DIR}/learnings.json"
+run_test "load-learnings.sh recomputes the digest after data changes" \
+    "HOME='${DIGEST_HOME}' bash '${SCRIPT_DIR}/load-learnings.sh'" \
+    '"suppressOutput": true'
+
 echo ""
 echo "=== View Scripts Tests ==="
 echo ""
@@ -0,0 +1,76 @@
+#!/usr/bin/env bash
+#
+# Hook Phase Tracing (shell side)
+# Sourced by the hook scripts; writes the same span lines as hook_trace.py
+#
+# Enabled with SELF_IMPROVEMENT_TRACE=1. Without it every function returns
+# immediately, so sourcing this costs nothing measurable.
+#
+#   trace_begin <span>            # start timing a phase
+#   trace_end <span>              # append its span line
+#   trace_span <span> cmd args... # time one command, keeping its exit code
+#
+# TRACE_HOOK names the hook (default: the script name) and TRACE_SESSION
+# the session, once the payload has been parsed.
+
+TRACE_FILE="${HOME}/.claude/self-improvement/trace.jsonl"
+TRACE_HOOK="${TRACE_HOOK:-$(basename "$0" .sh)}"
+TRACE_SESSION="${TRACE_SESSION:-}"
+TRACE_MAX_BYTES=$((5 * 1024 * 1024))
+
+trace_enabled() {
+    [[ -n "${SELF_IMPROVEMENT_TRACE:-}" && "${SELF_IMPROVEMENT_TRACE}" != "0" ]]
+}
+
+# Set variable $1 to the current time in microseconds, without forking
+# where the shell allows it (bash 5's EPOCHREALTIME)
+_trace_now() {
+    local _trace_us
+    if [[ -n "${EPOCHREALTIME:-}" ]]; then
+        _trace_us="${EPOCHREALTIME/[.,]/}"
+    else
+        _trace_us=$(date +%s%N 2>/dev/null)
+        if [[ ! "${_trace_us}" =~ ^[0-9]+$ ]]; then
+            _trace_us="$(date +%s)000000000"
+        fi
+        _trace_us="${_trace_us:0:${#_trace_us}-3}"
+    fi
+    printf -v "$1" '%s' "${_trace_us}"
+}
+
+trace_begin() {
+    trace_enabled || return 0
+    _trace_now "_TRACE_T0_$1"
+}
+
+trace_end() {
+    trace_enabled || return 0
+    local start_var="_TRACE_T0_$1"
+    local start="${!start_var:-}"
+    [[ -n "${start}" ]] || return 0
+    local now
+    _trace_now now
+    local elapsed=$((now - start))
+    printf '{"ts": %d.%03d, "session": "%s", "hook": "%s", "span": "%s", "ms": %d.%03d, "pid": %d}\n' \
+        $((now / 1000000)) $((now / 1000 % 1000)) "${TRACE_SESSION//[\"\\]/}" "${TRACE_HOOK}" "$1" \
+        $((elapsed / 1000)) $((elapsed % 1000)) $$ >> "${TRACE_FILE}" 2>/dev/null || true
+    unset "${start_var}"
+}
+
+trace_span() {
+    local span="$1"
+    shift
+    trace_begin "${span}"
+    local status=0
+    "$@" || status=$?
+    trace_end "${span}"
+    return ${status}
+}
+
+# Rotate once per hook run, like hook_trace.Tracer
+if trace_enabled; then
+    mkdir -p "$(dirname "${TRACE_FILE}")" 2>/dev/null || true
+    if [[ -f "${TRACE_FILE}" ]] && (( $(wc -c < "${TRACE_FILE}") > TRACE_MAX_BYTES )); then
+        mv -f "${TRACE_FILE}" "${TRACE_FILE}.1" 2>/dev/null || true
+    fi
+fi
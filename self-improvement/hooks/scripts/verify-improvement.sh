@@ -7,19 +7,23 @@
 #   verify-improvement.sh              # Show improvement report
 #   verify-improvement.sh --json       # Output as JSON
 #   verify-improvement.sh --pattern missing_tests  # Check specific pattern
+#   verify-improvement.sh --sessions 20    # Quality window (default 10 sessions)
 #
 
 set -uo pipefail
 
 # Configuration
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 LOG_DIR="${HOME}/.claude/self-improvement"
 PATTERNS_DB="${LOG_DIR}/patterns.json"
 METRICS_DB="${LOG_DIR}/metrics.json"
+METRICS_SERIES="${LOG_DIR}/metrics-series.json"
 IMPROVEMENT_LOG="${LOG_DIR}/improvement-history.json"
 
 # Parse arguments
 OUTPUT_FORMAT="text"
 SPECIFIC_PATTERN=""
+QUALITY_SESSIONS=10
 
 while [[ $# -gt 0 ]]; do
     case $1 in
@@ -31,6 +35,10 @@ while [[ $# -gt 0 ]]; do
             SPECIFIC_PATTERN="$2"
             shift 2
             ;;
+        --sessions)
+            QUALITY_SESSIONS="$2"
+            shift 2
+            ;;
         *)
             shift
             ;;
@@ -52,7 +60,7 @@ if [[ ! -f "${IMPROVEMENT_LOG}" ]]; then
 fi
 
 # Run analysis
-python3 - "$PATTERNS_DB" "$METRICS_DB" "$IMPROVEMENT_LOG" "$OUTPUT_FORMAT" "$SPECIFIC_PATTERN" <<'EOF'
+python3 - "$PATTERNS_DB" "$METRICS_DB" "$IMPROVEMENT_LOG" "$OUTPUT_FORMAT" "$SPECIFIC_PATTERN" "$METRICS_SERIES" "$SCRIPT_DIR" "$QUALITY_SESSIONS" <<'EOF'
 import json
 import sys
 from datetime import datetime, timedelta
@@ -64,6 +72,15 @@ metrics_file = sys.argv[2]
 improvement_file = sys.argv[3]
 output_format = sys.argv[4]
 specific_pattern = sys.argv[5] if len(sys.argv) > 5 else ""
+series_file = sys.argv[6] if len(sys.argv) > 6 else ""
+script_dir = sys.argv[7] if len(sys.argv) > 7 else ""
+try:
+    quality_sessions = max(int(sys.argv[8]), 1) if len(sys.argv) > 8 else 10
+except ValueError:
+    quality_sessions = 10
+
+sys.path.insert(0, script_dir)
+from metrics_store import load_store
 
 def load_json(filepath):
     try:
@@ -74,11 +91,12 @@ def load_json(filepath):
 
 # Load data
 patterns_data = load_json(patterns_file)
-metrics_data = load_json(metrics_file)
 improvement_data = load_json(improvement_file)
 
 patterns = patterns_data.get('patterns', [])
-sessions = metrics_data.get('sessions', [])
+# Session metrics come from the time-series store (running sums make the
+# "last N vs previous N sessions" comparison constant time)
+store = load_store(series_file, metrics_file)
 snapshots = improvement_data.get('snapshots', [])
 
 # Calculate current state
@@ -87,7 +105,7 @@ current_snapshot = {
     "timestamp": now,
     "total_patterns": len(patterns),
     "pattern_counts": {},
-    "total_sessions": len(sessions)
+    "total_sessions": len(store)
 }
 
 for pattern in patterns:
@@ -100,7 +118,11 @@ results = {
     "summary": "",
     "patterns": [],
     "overall_trend": "unknown",
-    "recommendations": []
+    "recommendations": [],
+    "quality": {
+        field: store.improvement(field, quality_sessions)
+        for field in ("quality_score", "critical_issues", "security_issues")
+    }
 }
 
 if specific_pattern:
@@ -261,6 +283,14 @@ else:
 
             print(f"  {severity_color} {p['type']}: {p['count']}x {trend_icon} ({p['trend']})")
 
+    quality = [q for q in results['quality'].values() if q['trend'] != 'insufficient_data']
+    if quality:
+        print("\n" + "-" * 40)
+        print(f"Session Quality (last {quality_sessions} vs previous {quality_sessions} sessions):")
+        print("-" * 40)
+        for q in quality:
+            print(f"  {q['field']}: {q['previous']:.1f} → {q['recent']:.1f} ({q['trend']})")
+
     if results['recommendations']:
         print("\n" + "-" * 40)
         print("Recommendations:")
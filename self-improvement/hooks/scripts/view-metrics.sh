@@ -6,28 +6,30 @@
 
 set -euo pipefail
 
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 LOG_DIR="${HOME}/.claude/self-improvement"
 METRICS_DB="${LOG_DIR}/metrics.json"
+METRICS_SERIES="${LOG_DIR}/metrics-series.json"
 
-if [[ ! -f "${METRICS_DB}" ]]; then
+if [[ ! -f "${METRICS_SERIES}" && ! -f "${METRICS_DB}" ]]; then
     echo "No metrics tracked yet. The system will start tracking after conversations end."
     exit 0
 fi
 
-python3 - "$METRICS_DB" <<'EOF'
-import json
+python3 - "$METRICS_SERIES" "$METRICS_DB" "$SCRIPT_DIR" <<'EOF'
 import sys
-from datetime import datetime
 from statistics import mean, median
 
-metrics_file = sys.argv[1]
+series_file = sys.argv[1]
+metrics_file = sys.argv[2]
+sys.path.insert(0, sys.argv[3])
 
-with open(metrics_file, 'r') as f:
-    data = json.load(f)
+from metrics_store import load_store
 
-sessions = data.get('sessions', [])
+# Time-series store with rollups; backfilled from metrics.json on first use
+store = load_store(series_file, metrics_file)
 
-if not sessions:
+if len(store) == 0:
     print("No sessions tracked yet.")
     exit(0)
 
@@ -36,10 +38,10 @@ print("📈 CONVERSATION METRICS - Self-Improvement System")
 print("=" * 80)
 print()
 
-# Calculate statistics
-total_sessions = len(sessions)
-total_turns = [s.get('total_turns', 0) for s in sessions if s.get('total_turns', 0) > 0]
-total_lines = [s.get('total_lines', 0) for s in sessions if s.get('total_lines', 0) > 0]
+# Calculate statistics over retained sessions
+total_sessions = len(store)
+total_turns = [t for t in store.column('total_turns') if t is not None and t > 0]
+total_lines = [l for l in store.column('total_lines') if l is not None and l > 0]
 
 if total_turns:
     print("📊 Conversation Statistics:")
@@ -56,11 +58,29 @@ if total_lines:
     print(f"   Median lines per conversation: {median(total_lines):.1f}")
     print()
 
+# Quality trend from running sums and weekly rollups
+print("✅ Quality Trend:")
+average_quality = store.mean('quality_score')
+if average_quality is not None:
+    print(f"   Average quality score: {average_quality:.1f}")
+for field in ('quality_score', 'critical_issues', 'security_issues'):
+    result = store.improvement(field, 10)
+    if result['trend'] == 'insufficient_data':
+        continue
+    print(f"   {field}: {result['previous']:.1f} → {result['recent']:.1f} over last 10 sessions ({result['trend']})")
+for week in store.rollup('weekly', 'quality_score', 4):
+    if week['mean'] is None:
+        continue
+    print(f"   {week['period']}: {week['sessions']} sessions, quality {week['mean']:.1f} (min {week['min']}, max {week['max']})")
+print()
+
 # Recent sessions
 print("🕐 Recent Sessions:")
-for session in sessions[-10:]:
+for session in store.recent(10):
     timestamp = session.get('timestamp', 'N/A')
-    turns = session.get('total_turns', 0)
+    turns = session.get('total_turns')
+    if turns is None:
+        turns = 'N/A'
     print(f"   {timestamp}: {turns} turns")
 
 print()
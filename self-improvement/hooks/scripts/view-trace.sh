@@ -0,0 +1,58 @@
+#!/usr/bin/env bash
+#
+# View Trace Script
+# Display the slowest hook phases recorded with SELF_IMPROVEMENT_TRACE=1
+#
+# Usage: view-trace.sh [sessions] [top]
+#   sessions: only the most recent N sessions (default: all)
+#   top:      show the N slowest phases (default: 15)
+#
+
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+LOG_DIR="${HOME}/.claude/self-improvement"
+TRACE_FILE="${LOG_DIR}/trace.jsonl"
+
+if [[ ! -f "${TRACE_FILE}" && ! -f "${TRACE_FILE}.1" ]]; then
+    echo "No trace recorded yet. Set SELF_IMPROVEMENT_TRACE=1 before starting Claude Code to record hook timings."
+    exit 0
+fi
+
+python3 - "$TRACE_FILE" "$SCRIPT_DIR" "${1:-}" "${2:-15}" <<'EOF'
+import sys
+
+trace_file = sys.argv[1]
+sys.path.insert(0, sys.argv[2])
+sessions = int(sys.argv[3]) if sys.argv[3] else None
+top = int(sys.argv[4])
+
+from hook_trace import load_spans, summarize
+
+summary = summarize(load_spans(trace_file), sessions)
+
+if not summary["phases"]:
+    print("No spans recorded yet.")
+    exit(0)
+
+print("=" * 80)
+print("⏱️  HOOK PHASE TIMINGS - Self-Improvement System")
+print("=" * 80)
+print()
+print(f"{summary['spans']} spans across {summary['sessions']} session(s), slowest total first")
+print()
+print(f"{'Hook':<22} {'Phase':<18} {'Count':>6} {'Total ms':>10} {'Mean':>8} {'p95':>8} {'Max':>8}")
+print("-" * 84)
+for phase in summary["phases"][:top]:
+    print(f"{phase['hook']:<22} {phase['span']:<18} {phase['count']:>6} {phase['total_ms']:>10.1f} "
+          f"{phase['mean_ms']:>8.1f} {phase['p95_ms']:>8.1f} {phase['max_ms']:>8.1f}")
+
+# "total" spans include the phases, so point at the slowest real phase
+phases = [p for p in summary["phases"] if p["span"] != "total"]
+if phases:
+    slowest = max(phases, key=lambda p: p["p95_ms"])
+    print()
+    print(f"🐢 Slowest phase (p95): {slowest['hook']} / {slowest['span']} at {slowest['p95_ms']:.1f}ms")
+print()
+print("=" * 80)
+EOF
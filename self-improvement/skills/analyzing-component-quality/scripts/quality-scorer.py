@@ -3,31 +3,95 @@
 Quality Scorer for Claude Code Components
 
 Provides automated quality scoring based on heuristics.
-Analyzes description clarity, tool permissions, security, and usability.
+Analyzes description clarity, tool permissions, security, and usability of
+agents, skills and commands, and structure, security and performance of
+hooks.json files.
+
+Usage:
+    python quality-scorer.py <component-file> [--json]
+    python quality-scorer.py --all [root] [--workers N] [--json] [--no-cache]
+
+--all scores every agent, skill, command and hooks.json across all plugins
+in parallel and prints a ranked leaderboard. Scores are cached by content
+hash in ~/.claude/self-improvement/quality-score-cache.json.
 """
 
+import argparse
+import hashlib
+import json
+import os
 import sys
 import re
 import yaml
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+# Frontmatter parsing is shared with the agent-builder validators
+PARSER_DIR = Path(__file__).resolve().parents[4] / 'agent-builder' / 'skills' / 'building-agents' / 'scripts'
+sys.path.insert(0, str(PARSER_DIR))
+try:
+    from frontmatter_parser import parse_file, parse_text
+except ImportError:
+    parse_file = parse_text = None
+
+# Marketplace component index, when run from a checkout of the marketplace
+sys.path.insert(0, str(Path(__file__).resolve().parents[4] / 'scripts'))
+try:
+    from component_index import load_index
+except ImportError:
+    load_index = None
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SCORE_CACHE = Path.home() / '.claude' / 'self-improvement' / 'quality-score-cache.json'
+
+# Component files scored by --all, relative to the marketplace root
+COMPONENT_GLOBS = ('*/agents/*.md', '*/skills/*/SKILL.md', '*/commands/*.md', '*/hooks/hooks.json')
+
+# Bump to discard every cached score
+CACHE_VERSION = 1
+
+# Hook events and the ones that run on every tool call or prompt
+HOOK_EVENTS = {
+    'PreToolUse', 'PostToolUse', 'UserPromptSubmit', 'Notification', 'Stop',
+    'SubagentStop', 'SessionStart', 'SessionEnd', 'PreCompact',
+}
+TOOL_EVENTS = {'PreToolUse', 'PostToolUse'}
+HOT_EVENTS = TOOL_EVENTS | {'UserPromptSubmit'}
 
 # Orchestrator agents are permitted to have the Task tool for delegation
 # These agents coordinate work across other specialized agents
 ORCHESTRATOR_AGENTS = ['project-coordinator', 'investigator', 'workflow-orchestrator', 'meta-architect']
 
+def read_component(file_path: Path, content: Optional[str] = None) -> Tuple[Dict, str]:
+    """Frontmatter and full content of a component, reading the file at most once."""
+    if parse_file is None:
+        if content is None:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        return _parse_frontmatter_standalone(content), content
+
+    parsed = parse_file(file_path) if content is None else parse_text(content)
+    if parsed.error:
+        print(f"Error parsing YAML: {parsed.error}", file=sys.stderr)
+        return {}, parsed.content
+    return parsed.fields, parsed.content
+
+
 def extract_frontmatter(file_path: Path) -> Dict:
     """Extract YAML frontmatter from markdown file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    return read_component(file_path)[0]
 
+
+def _parse_frontmatter_standalone(content: str) -> Dict:
+    """Frontmatter parsing for when the plugin is installed without agent-builder."""
     # Extract frontmatter between --- markers
     match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
     if not match:
         return {}
 
     try:
-        return yaml.safe_load(match.group(1))
+        return yaml.safe_load(match.group(1)) or {}
     except yaml.YAMLError as e:
         print(f"Error parsing YAML: {e}", file=sys.stderr)
         return {}
@@ -215,18 +279,144 @@ def determine_component_type(file_path: Path) -> str:
     else:
         return 'unknown'
 
-def analyze_component(file_path: Path) -> Dict:
-    """Analyze component and return quality scores."""
+def iter_hook_entries(config: Dict):
+    """Yield (event, matcher group, hook) for every hook in a hooks.json config."""
+    for event, groups in config.get('hooks', {}).items():
+        for group in groups if isinstance(groups, list) else []:
+            if not isinstance(group, dict):
+                continue
+            for hook in group.get('hooks', []) if isinstance(group.get('hooks'), list) else []:
+                if isinstance(hook, dict):
+                    yield event, group, hook
+
+def score_hook_structure(config: Dict) -> Tuple[int, List[str]]:
+    """Score hooks.json structure (1-5)."""
+    score = 5
+    issues = []
+
+    if not isinstance(config.get('hooks'), dict):
+        return 1, ["Missing top-level 'hooks' object"]
+
+    for event, groups in config['hooks'].items():
+        if event not in HOOK_EVENTS:
+            score -= 1
+            issues.append(f"Unknown hook event '{event}'")
+        if not isinstance(groups, list):
+            score -= 1
+            issues.append(f"Event '{event}' must be an array of matcher groups")
+        elif not groups:
+            issues.append(f"Event '{event}' has no hooks; consider removing it")
+        elif event in TOOL_EVENTS and any(isinstance(g, dict) and 'matcher' not in g for g in groups):
+            score -= 1
+            issues.append(f"{event} hook without a 'matcher' runs for every tool")
+
+    for event, _, hook in iter_hook_entries(config):
+        hook_type = hook.get('type')
+        if hook_type not in ('command', 'prompt'):
+            score -= 1
+            issues.append(f"{event} hook has unknown type '{hook_type}'")
+        elif not str(hook.get(hook_type, '')).strip():
+            score -= 1
+            issues.append(f"{event} {hook_type} hook is missing its '{hook_type}' field")
+
+    return max(1, score), issues
+
+def score_hook_security(config: Dict) -> Tuple[int, List[str]]:
+    """Score hook command security (1-5)."""
+    score = 5
+    issues = []
+
+    for event, _, hook in iter_hook_entries(config):
+        command = hook.get('command')
+        if hook.get('type') != 'command' or not isinstance(command, str):
+            continue
+
+        if re.search(r'\beval\s', command):
+            score -= 2
+            issues.append(f"SECURITY: {event} hook uses eval")
+        if re.search(r'\brm\s+-rf\s+[/~$]', command):
+            score -= 2
+            issues.append(f"SECURITY: {event} hook runs rm -rf on a broad path")
+        if re.search(r'\b(curl|wget)\b[^|]*\|\s*(ba|z)?sh\b', command):
+            score -= 2
+            issues.append(f"SECURITY: {event} hook pipes a download into a shell")
+        if re.search(r'(?:^|\s)(?:bash|sh|python3?|node)\s+/(?!dev/)', command):
+            score -= 1
+            issues.append(f"{event} hook runs a script from a hardcoded absolute path; use ${{CLAUDE_PLUGIN_ROOT}}")
+        if 'CLAUDE_PROJECT_DIR' in command and 'CLAUDE_PLUGIN_ROOT' not in command:
+            score -= 1
+            issues.append(f"{event} hook locates its script via $CLAUDE_PROJECT_DIR; use ${{CLAUDE_PLUGIN_ROOT}} so it works when installed")
+        if re.search(r'(?<!["\'])\$\{?CLAUDE_\w+\}?/', command):
+            score -= 1
+            issues.append(f"{event} hook uses an unquoted path variable (breaks on paths with spaces)")
+
+    return max(1, score), issues
+
+def score_hook_performance(config: Dict) -> Tuple[int, List[str]]:
+    """Score hook cost on hot events (1-5)."""
+    score = 5
+    issues = []
+
+    for event, group, hook in iter_hook_entries(config):
+        if event not in HOT_EVENTS:
+            continue
+        if hook.get('type') == 'prompt':
+            score -= 1
+            issues.append(f"{event} prompt hook adds a model call to every {'prompt' if event == 'UserPromptSubmit' else 'matching tool call'}")
+        if event in TOOL_EVENTS and group.get('matcher', '') in ('', '*', '.*'):
+            score -= 1
+            issues.append(f"{event} hook matches all tools; narrow the matcher")
+        if hook.get('type') == 'command' and 'timeout' not in hook:
+            issues.append(f"Consider a 'timeout' for the {event} command hook")
+
+    return max(1, score), issues
+
+def analyze_hooks(file_path: Path, content: str) -> Dict:
+    """Analyze a hooks.json file and return quality scores."""
+    try:
+        config = json.loads(content)
+    except json.JSONDecodeError as e:
+        config, structure = {}, (1, [f"Invalid JSON: {e}"])
+    else:
+        if isinstance(config, dict):
+            structure = score_hook_structure(config)
+        else:
+            config, structure = {}, (1, ["hooks.json must contain a JSON object"])
+
+    security = score_hook_security(config)
+    performance = score_hook_performance(config)
+    scores = [structure[0], security[0], performance[0]]
+
+    return {
+        'component_type': 'hook',
+        'component_name': f"{file_path.parent.parent.name} hooks",
+        'overall_score': sum(scores) / len(scores),
+        'scores': {
+            'structure': structure[0],
+            'security': security[0],
+            'performance': performance[0],
+        },
+        'issues': {
+            'structure': structure[1],
+            'security': security[1],
+            'performance': performance[1],
+        }
+    }
+
+def analyze_component(file_path: Path, content: Optional[str] = None) -> Dict:
+    """
+    Analyze component and return quality scores.
+
+    Pass `content` when the file has already been read.
+    """
     component_type = determine_component_type(file_path)
 
     if component_type == 'hook':
-        print("Hook analysis not yet implemented", file=sys.stderr)
-        return {}
+        if content is None:
+            content = file_path.read_text(encoding='utf-8')
+        return analyze_hooks(file_path, content)
 
-    frontmatter = extract_frontmatter(file_path)
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    frontmatter, content = read_component(file_path, content)
 
     # Score each dimension
     desc_score, desc_issues = score_description_clarity(frontmatter, content, component_type)
@@ -332,13 +522,184 @@ def format_report(analysis: Dict) -> str:
 
     return '\n'.join(report)
 
+def scorer_version() -> str:
+    """Hash of the scoring code, so cached scores expire when it changes."""
+    digest = hashlib.sha256(f"{CACHE_VERSION}:".encode())
+    for source in (Path(__file__), PARSER_DIR / 'frontmatter_parser.py'):
+        try:
+            digest.update(source.read_bytes())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+def discover_components(root: Path) -> List[Path]:
+    """Every agent, skill, command and hooks.json across the plugins under root."""
+    if load_index is not None:
+        return sorted(load_index(root).paths())
+
+    paths = set()
+    for pattern in COMPONENT_GLOBS:
+        paths.update(root.glob(pattern))
+    return sorted(paths)
+
+def _score_job(job: Tuple[str, str]) -> Dict:
+    """Score one component from already-read content (runs in a worker)."""
+    path, content = job
+    try:
+        return analyze_component(Path(path), content)
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+def score_components(paths: List[Path], workers: int = 1, cache_path: Optional[Path] = None,
+                     root: Optional[Path] = None) -> Dict:
+    """
+    Score many components, each file read once, in parallel when workers > 1.
+
+    Scores are reused from `cache_path` while a file's content hash is
+    unchanged, keyed by resolved path so different checkouts sharing the
+    cache don't see each other's scores. Returns the components ranked
+    best first, plus a summary.
+    """
+    root = root or REPO_ROOT
+    version = scorer_version()
+    cache = {}
+    if cache_path and cache_path.is_file():
+        try:
+            data = json.loads(cache_path.read_text(encoding='utf-8'))
+            if data.get('version') == version:
+                cache = data['entries']
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    rows, jobs, hashes = [], [], {}
+    for path in paths:
+        key = str(path.resolve())
+        try:
+            relative = path.relative_to(root).as_posix()
+        except ValueError:
+            relative = str(path)
+        row = {'path': relative, 'plugin': relative.split('/')[0]}
+        rows.append(row)
+        try:
+            content = path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            row['error'] = str(e)
+            continue
+        content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        hashes[key] = (row, content_hash)
+        cached = cache.get(key)
+        if cached and cached['hash'] == content_hash:
+            row.update(cached['analysis'], cached=True)
+        else:
+            jobs.append((row, (str(path), content)))
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            analyses = list(pool.map(_score_job, [job for _, job in jobs]))
+    else:
+        analyses = [_score_job(job) for _, job in jobs]
+    for (row, _), analysis in zip(jobs, analyses):
+        row.update(analysis, cached=False)
+
+    if cache_path:
+        # Keep scores for other checkouts whose files still exist
+        entries = {key: entry for key, entry in cache.items() if key not in hashes and os.path.isfile(key)}
+        entries.update({
+            key: {'hash': content_hash, 'analysis': {k: v for k, v in row.items() if k not in ('path', 'plugin', 'cached')}}
+            for key, (row, content_hash) in hashes.items() if 'error' not in row
+        })
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix('.tmp')
+            tmp.write_text(json.dumps({'version': version, 'entries': entries}), encoding='utf-8')
+            tmp.replace(cache_path)
+        except OSError:
+            pass
+
+    scored = [row for row in rows if 'error' not in row]
+    scored.sort(key=lambda row: (-row['overall_score'], row['component_type'], row['path']))
+    for rank, row in enumerate(scored, 1):
+        row['rank'] = rank
+
+    by_type = {}
+    for row in scored:
+        by_type.setdefault(row['component_type'], []).append(row['overall_score'])
+
+    return {
+        'components': scored,
+        'errors': [row for row in rows if 'error' in row],
+        'summary': {
+            'scored': len(scored),
+            'cached': sum(1 for row in scored if row['cached']),
+            'mean_score': round(sum(r['overall_score'] for r in scored) / len(scored), 2) if scored else None,
+            'mean_by_type': {t: round(sum(v) / len(v), 2) for t, v in sorted(by_type.items())},
+        }
+    }
+
+def format_leaderboard(results: Dict) -> str:
+    """Format batch results as a ranked table, best first."""
+    report = []
+    report.append("=" * 90)
+    report.append("Component Quality Leaderboard")
+    report.append("=" * 90)
+    report.append(f"{'Rank':>4}  {'Score':>5}  {'Type':<8} {'Plugin':<20} {'Component':<32} {'Issues':>6}")
+    report.append("-" * 90)
+    for row in results['components']:
+        issue_count = sum(
+            1 for issue_list in row['issues'].values() for issue in issue_list if not issue.startswith('✓')
+        )
+        report.append(
+            f"{row['rank']:>4}  {row['overall_score']:>5.2f}  {row['component_type']:<8} "
+            f"{row['plugin'][:20]:<20} {str(row['component_name'])[:32]:<32} {issue_count:>6}"
+        )
+
+    for row in results['errors']:
+        report.append(f"   ✗ {row['path']}: {row['error']}")
+
+    summary = results['summary']
+    report.append("-" * 90)
+    if summary['scored']:
+        by_type = ", ".join(f"{t} {m:.2f}" for t, m in summary['mean_by_type'].items())
+        report.append(f"{summary['scored']} components, mean {summary['mean_score']:.2f}/5.0 ({by_type})")
+        report.append(f"{summary['cached']} reused from cache")
+    report.append("=" * 90)
+    return '\n'.join(report)
+
+def quality_exit_code(score: float) -> int:
+    """Exit code for a (lowest) overall score."""
+    if score < 3.0:
+        return 2  # Quality too low
+    elif score < 4.0:
+        return 1  # Quality adequate but has issues
+    return 0  # Quality good
+
 def main():
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="Score Claude Code component quality")
+    parser.add_argument('component', nargs='?', help="Agent, skill or command markdown file, or hooks.json")
+    parser.add_argument('--all', nargs='?', const=str(REPO_ROOT), metavar='ROOT',
+                        help="Score every component under ROOT (default: this marketplace)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes for --all")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    parser.add_argument('--no-cache', action='store_true', help="Don't reuse or save cached scores")
+    args = parser.parse_args()
+
+    if args.all:
+        root = Path(args.all).resolve()
+        results = score_components(discover_components(root), args.workers,
+                                   None if args.no_cache else SCORE_CACHE, root)
+        print(json.dumps(results, indent=2) if args.json else format_leaderboard(results))
+        if results['errors']:
+            sys.exit(3)
+        scores = [row['overall_score'] for row in results['components']]
+        sys.exit(quality_exit_code(min(scores)) if scores else 0)
+
+    if not args.component:
         print("Usage: python quality-scorer.py <component-file>", file=sys.stderr)
-        print("  component-file: Path to agent, skill, or command markdown file", file=sys.stderr)
+        print("  component-file: Path to agent, skill, or command markdown file, or hooks.json", file=sys.stderr)
+        print("       python quality-scorer.py --all [root]  # Rank every component", file=sys.stderr)
         sys.exit(1)
 
-    file_path = Path(sys.argv[1])
+    file_path = Path(args.component)
 
     if not file_path.exists():
         print(f"Error: File not found: {file_path}", file=sys.stderr)
@@ -346,16 +707,11 @@ def main():
 
     try:
         analysis = analyze_component(file_path)
-        report = format_report(analysis)
+        report = json.dumps(analysis, indent=2) if args.json else format_report(analysis)
         print(report)
 
         # Exit code based on quality
-        if analysis['overall_score'] < 3.0:
-            sys.exit(2)  # Quality too low
-        elif analysis['overall_score'] < 4.0:
-            sys.exit(1)  # Quality adequate but has issues
-        else:
-            sys.exit(0)  # Quality good
+        sys.exit(quality_exit_code(analysis['overall_score']))
 
     except Exception as e:
         print(f"Error analyzing component: {e}", file=sys.stderr)
@@ -19,11 +19,17 @@ import ast
 import json
 import re
 import sys
-from typing import Any
+from pathlib import Path
+from typing import Any, Optional
 
+# Block extraction and line indexing are shared with the hooks
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "hooks" / "scripts"))
+from code_blocks import CodeBlock, LineIndex, extract_code_blocks
 
-def check_python_quality(code: str) -> dict:
+
+def check_python_quality(code: str, index: Optional[LineIndex] = None) -> dict:
     """Check Python code quality and return scores."""
+    index = index or LineIndex(code)
     result = {
         "score": 100,
         "issues": [],
@@ -40,9 +46,11 @@ def check_python_quality(code: str) -> dict:
         tree = ast.parse(code)
     except SyntaxError as e:
         result["score"] = 0
+        offset = index.offset_of(e.lineno or 1) + max((e.offset or 1) - 1, 0)
         result["issues"].append({
             "severity": "critical",
-            "message": f"Syntax error: {e.msg} at line {e.lineno}"
+            "message": f"Syntax error: {e.msg} at line {e.lineno}",
+            "location": index.location(offset, offset)
         })
         return result
 
@@ -62,7 +70,8 @@ def check_python_quality(code: str) -> dict:
             if func_lines > 3:
                 result["issues"].append({
                     "severity": "minor",
-                    "message": f"Function '{func.name}' lacks docstring"
+                    "message": f"Function '{func.name}' lacks docstring",
+                    "location": index.node_location(func)
                 })
                 result["score"] -= 2
 
@@ -77,7 +86,8 @@ def check_python_quality(code: str) -> dict:
         if total_args > 7:
             result["issues"].append({
                 "severity": "important",
-                "message": f"Function '{func.name}' has {total_args} arguments (consider refactoring)"
+                "message": f"Function '{func.name}' has {total_args} arguments (consider refactoring)",
+                "location": index.node_location(func.args)
             })
             result["score"] -= 5
 
@@ -86,7 +96,8 @@ def check_python_quality(code: str) -> dict:
             if isinstance(node, ast.ExceptHandler) and node.type is None:
                 result["issues"].append({
                     "severity": "important",
-                    "message": f"Bare except in '{func.name}'"
+                    "message": f"Bare except in '{func.name}'",
+                    "location": index.node_location(node)
                 })
                 result["score"] -= 10
 
@@ -97,7 +108,8 @@ def check_python_quality(code: str) -> dict:
                 if alias.name == "*":
                     result["issues"].append({
                         "severity": "minor",
-                        "message": f"Wildcard import from {node.module}"
+                        "message": f"Wildcard import from {node.module}",
+                        "location": index.node_location(node)
                     })
                     result["score"] -= 3
 
@@ -107,8 +119,9 @@ def check_python_quality(code: str) -> dict:
     return result
 
 
-def check_javascript_quality(code: str) -> dict:
+def check_javascript_quality(code: str, index: Optional[LineIndex] = None) -> dict:
     """Check JavaScript code quality using pattern analysis."""
+    index = index or LineIndex(code)
     result = {
         "score": 100,
         "issues": [],
@@ -118,39 +131,49 @@ def check_javascript_quality(code: str) -> dict:
         }
     }
 
+    def find(pattern: str) -> tuple[int, Optional[dict]]:
+        """Count matches and locate the first one."""
+        matches = list(re.finditer(pattern, code))
+        location = index.location(*matches[0].span()) if matches else None
+        return len(matches), location
+
     # Check for var usage
-    var_count = len(re.findall(r'\bvar\s+', code))
+    var_count, location = find(r'\bvar\s+')
     if var_count > 0:
         result["issues"].append({
             "severity": "minor",
-            "message": f"Found {var_count} uses of 'var' - prefer let/const"
+            "message": f"Found {var_count} uses of 'var' - prefer let/const",
+            "location": location
         })
         result["score"] -= var_count * 2
 
     # Check for == vs ===
-    loose_eq = len(re.findall(r'[^=!]==[^=]', code))
+    loose_eq, location = find(r'[^=!]==[^=]')
     if loose_eq > 0:
         result["issues"].append({
             "severity": "minor",
-            "message": f"Found {loose_eq} uses of '==' - prefer '==='"
+            "message": f"Found {loose_eq} uses of '==' - prefer '==='",
+            "location": location
         })
         result["score"] -= loose_eq
 
     # Check for console.log
-    console_count = len(re.findall(r'console\.(log|warn|error)\s*\(', code))
+    console_count, location = find(r'console\.(log|warn|error)\s*\(')
     if console_count > 3:
         result["issues"].append({
             "severity": "minor",
-            "message": f"Found {console_count} console statements"
+            "message": f"Found {console_count} console statements",
+            "location": location
         })
         result["score"] -= 2
 
     # Check for empty catch blocks
-    empty_catch = len(re.findall(r'catch\s*\([^)]*\)\s*\{\s*\}', code))
+    empty_catch, location = find(r'catch\s*\([^)]*\)\s*\{\s*\}')
     if empty_catch > 0:
         result["issues"].append({
             "severity": "important",
-            "message": f"Found {empty_catch} empty catch blocks"
+            "message": f"Found {empty_catch} empty catch blocks",
+            "location": location
         })
         result["score"] -= empty_catch * 10
 
@@ -158,21 +181,19 @@ def check_javascript_quality(code: str) -> dict:
     return result
 
 
-def extract_code_blocks(text: str) -> list[tuple[str, str]]:
-    """Extract code blocks with their language."""
-    pattern = r"```(\w*)\n(.*?)```"
-    matches = re.findall(pattern, text, re.DOTALL)
-    return [(lang.lower() if lang else "unknown", code.strip()) for lang, code in matches]
-
+def check_quality(text: str, blocks: Optional[list[CodeBlock]] = None) -> dict:
+    """
+    Main entry point: check quality of all code in text.
 
-def check_quality(text: str) -> dict:
-    """Main entry point: check quality of all code in text."""
-    blocks = extract_code_blocks(text)
+    Pass `blocks` when they were already extracted from `text`.
+    """
+    if blocks is None:
+        blocks = extract_code_blocks(text)
 
     if not blocks:
         # Check if the text itself is code
         if re.search(r'(def |class |function |const |import |from )', text):
-            blocks = [("unknown", text)]
+            blocks = [CodeBlock("unknown", text)]
         else:
             return {
                 "overall_score": 100,
@@ -184,11 +205,12 @@ def check_quality(text: str) -> dict:
     results = []
     total_score = 0
 
-    for lang, code in blocks:
+    for block in blocks:
+        lang, code = block.language, block.code
         if lang in ("python", "py", "python3", ""):
-            result = check_python_quality(code)
+            result = check_python_quality(code, block.index)
         elif lang in ("javascript", "js", "typescript", "ts"):
-            result = check_javascript_quality(code)
+            result = check_javascript_quality(code, block.index)
         else:
             result = {"score": 100, "issues": [], "metrics": {"lines": code.count('\n') + 1}}
 
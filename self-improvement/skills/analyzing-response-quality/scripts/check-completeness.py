@@ -18,10 +18,111 @@ Returns JSON with completeness scores and gaps.
 import json
 import re
 import sys
-
-
-def analyze_completeness(response: str, requirements: str = "") -> dict:
-    """Analyze the completeness of a response."""
+from pathlib import Path
+from typing import Optional
+
+# Block extraction is shared with the other checkers and the hooks
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "hooks" / "scripts"))
+from code_blocks import CodeBlock, extract_code_blocks
+
+# Any fenced span, including fences without a newline after the language
+FENCE_SPAN_PATTERN = re.compile(r'```.*?```', re.DOTALL)
+
+# Word tokens; keywords are the purely alphabetic ones of 4+ letters
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Common words that never count as requirement keywords
+STOPWORDS = frozenset({
+    'that', 'this', 'with', 'from', 'have', 'will', 'would', 'could', 'should',
+    'been', 'were', 'they', 'their', 'them', 'then', 'than', 'when', 'where',
+    'what', 'which', 'while', 'also', 'your', 'about', 'into', 'some', 'more',
+    'like', 'just', 'only', 'other', 'each', 'make', 'made', 'does', 'done'
+})
+
+# Edge case indicator words and phrases, matched through the term index
+# ("edgecase" is one token, "edge case" two)
+EDGE_CASE_WORDS = frozenset({'empty', 'null', 'none', 'undefined', 'zero', 'negative'})
+EDGE_CASE_TERMS = frozenset({'edgecase', 'cornercase', 'boundary'})
+EDGE_CASE_PHRASES = (('edge', 'case'), ('corner', 'case'))
+IF_LEN_PATTERN = re.compile(r'\bif\s+len\s*\([^)]+\)\s*[=<>]', re.IGNORECASE)
+
+
+def normalize_term(word: str) -> str:
+    """Fold case and simple plurals so "Inputs" matches "input"."""
+    word = word.lower()
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 4 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+class TermIndex:
+    """
+    A text tokenized once into lowercase terms with their positions, plus
+    the normalized keywords of its prose (fenced code excluded).
+
+    Indicator checks and requirement matching become set lookups instead of
+    one regex scan of the text per check, and phrase checks compare the
+    terms following each position of the phrase's first word.
+    """
+
+    def __init__(self, text: str):
+        lowered = text.lower()
+        self.terms: list[str] = []
+        # Whether only whitespace separates each term from the one before
+        self.spaced: list[bool] = []
+        self.positions: dict[str, list[int]] = {}
+        end = None
+        for match in TOKEN_PATTERN.finditer(lowered):
+            term = match.group()
+            self.positions.setdefault(term, []).append(len(self.terms))
+            self.terms.append(term)
+            self.spaced.append(end is not None and lowered[end:match.start()].isspace())
+            end = match.end()
+
+        terms = self.terms
+        if '```' in lowered:
+            # Keywords come from prose only
+            terms = TOKEN_PATTERN.findall(FENCE_SPAN_PATTERN.sub('', lowered))
+        self.keywords = dict.fromkeys(
+            normalize_term(term)
+            for term in dict.fromkeys(terms)
+            if len(term) >= 4 and term.isascii() and term.isalpha() and term not in STOPWORDS
+        )
+
+    def has(self, term: str) -> bool:
+        return term in self.positions
+
+    def has_any(self, terms) -> bool:
+        return not self.positions.keys().isdisjoint(terms)
+
+    def sequence(self, words: tuple[str, ...], then_word: bool = False) -> bool:
+        """
+        Whether `words` occur in order separated only by whitespace.
+
+        With `then_word`, another word must follow the last one.
+        """
+        rest = list(words[1:])
+        span = len(words) + then_word
+        for start in self.positions.get(words[0], ()):
+            end = start + span
+            if (end <= len(self.terms) and all(self.spaced[start + 1:end])
+                    and self.terms[start + 1:start + len(words)] == rest):
+                return True
+        return False
+
+    def ordered_keywords(self) -> list[str]:
+        """Keywords in order of first appearance."""
+        return list(self.keywords)
+
+
+def analyze_completeness(response: str, requirements: str = "", blocks: Optional[list[CodeBlock]] = None) -> dict:
+    """
+    Analyze the completeness of a response.
+
+    Pass `blocks` when they were already extracted from `response`.
+    """
     result = {
         "score": 100,
         "checks": [],
@@ -29,12 +130,11 @@ def analyze_completeness(response: str, requirements: str = "") -> dict:
         "suggestions": []
     }
 
-    # Check for code blocks
-    code_blocks = len(re.findall(r"```", response)) // 2
-    has_code = code_blocks > 0
-
     # Extract code for analysis
-    code_content = "\n".join(re.findall(r"```\w*\n(.*?)```", response, re.DOTALL))
+    if blocks is None:
+        blocks = extract_code_blocks(response)
+    has_code = bool(blocks)
+    code_content = "\n".join(block.code for block in blocks)
 
     # Check 1: Error Handling
     if has_code:
@@ -81,14 +181,15 @@ def analyze_completeness(response: str, requirements: str = "") -> dict:
             result["score"] -= 10
 
     # Check 3: Edge Cases
+    index = TermIndex(response)
     edge_case_indicators = [
-        r'\b(empty|null|none|undefined|zero|negative)\b',
-        r'\b(edge\s*case|corner\s*case|boundary)\b',
-        r'\bif\s+len\s*\([^)]+\)\s*[=<>]',
-        r'\bif\s+not\s+\w+\b'
+        index.has_any(EDGE_CASE_WORDS),
+        index.has_any(EDGE_CASE_TERMS) or any(index.sequence(phrase) for phrase in EDGE_CASE_PHRASES),
+        index.has('if') and index.has('len') and bool(IF_LEN_PATTERN.search(response)),
+        index.sequence(('if', 'not'), then_word=True),
     ]
 
-    edge_cases_mentioned = sum(1 for pattern in edge_case_indicators if re.search(pattern, response, re.IGNORECASE))
+    edge_cases_mentioned = sum(edge_case_indicators)
 
     if edge_cases_mentioned >= 2:
         result["checks"].append({
@@ -149,10 +250,11 @@ def analyze_completeness(response: str, requirements: str = "") -> dict:
 
     # Check 6: Requirements Coverage (if requirements provided)
     if requirements:
-        req_keywords = extract_keywords(requirements)
-        resp_keywords = extract_keywords(response)
+        req_keywords = TermIndex(requirements).ordered_keywords()
+        resp_keywords = index.keywords
 
-        covered = len(req_keywords & resp_keywords)
+        missing = [keyword for keyword in req_keywords if keyword not in resp_keywords]
+        covered = len(req_keywords) - len(missing)
         total = len(req_keywords)
 
         if total > 0:
@@ -169,8 +271,7 @@ def analyze_completeness(response: str, requirements: str = "") -> dict:
                     "passed": False,
                     "message": f"Requirements coverage: {coverage:.0f}%"
                 })
-                missing = req_keywords - resp_keywords
-                result["gaps"].append(f"Missing requirement keywords: {', '.join(list(missing)[:5])}")
+                result["gaps"].append(f"Missing requirement keywords: {', '.join(missing[:5])}")
                 result["score"] -= int((100 - coverage) / 5)
 
     # Ensure score doesn't go negative
@@ -185,22 +286,8 @@ def analyze_completeness(response: str, requirements: str = "") -> dict:
 
 
 def extract_keywords(text: str) -> set:
-    """Extract significant keywords from text."""
-    # Remove code blocks
-    text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
-
-    # Extract words
-    words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
-
-    # Filter common words
-    stopwords = {
-        'that', 'this', 'with', 'from', 'have', 'will', 'would', 'could', 'should',
-        'been', 'were', 'they', 'their', 'them', 'then', 'than', 'when', 'where',
-        'what', 'which', 'while', 'also', 'your', 'about', 'into', 'some', 'more',
-        'like', 'just', 'only', 'other', 'each', 'make', 'made', 'does', 'done'
-    }
-
-    return {w for w in words if w not in stopwords}
+    """Extract significant (normalized) keywords from text, ignoring code blocks."""
+    return set(TermIndex(text).keywords)
 
 
 def main():
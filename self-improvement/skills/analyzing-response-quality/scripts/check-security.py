@@ -19,51 +19,22 @@ import ast
 import json
 import re
 import sys
-from typing import Any
-
-
-# Vulnerability patterns by severity
-CRITICAL_PATTERNS = [
-    (r'\beval\s*\(', "eval()", "Code execution vulnerability - eval can run arbitrary code"),
-    (r'\bexec\s*\(', "exec()", "Code execution vulnerability - exec can run arbitrary code"),
-    (r'pickle\.(loads?|dump)', "pickle", "Insecure deserialization - pickle can execute arbitrary code"),
-    (r'yaml\.load\s*\([^)]*\)', "yaml.load", "Use yaml.safe_load() instead of yaml.load()"),
-    (r'subprocess.*shell\s*=\s*True', "shell=True", "Command injection risk - avoid shell=True"),
-    (r'\bos\.system\s*\(', "os.system()", "Command injection risk - use subprocess with shell=False"),
-    (r'\.innerHTML\s*=', "innerHTML", "XSS vulnerability - sanitize HTML or use textContent"),
-    (r'document\.write\s*\(', "document.write()", "XSS vulnerability - avoid document.write"),
-    (r"rm\s+-rf?\s+[\"']?\$", "rm -rf $var", "Dangerous file deletion with variable"),
-    (r'curl.*\|\s*(?:ba)?sh', "curl | bash", "Remote code execution - never pipe curl to shell"),
-]
-
-IMPORTANT_PATTERNS = [
-    (r'password\s*=\s*["\'][^"\']+["\']', "Hardcoded password", "Store passwords in environment variables or vaults"),
-    (r'api_?key\s*=\s*["\'][^"\']+["\']', "Hardcoded API key", "Store API keys in environment variables"),
-    (r'secret\s*=\s*["\'][^"\']+["\']', "Hardcoded secret", "Store secrets securely, not in code"),
-    (r'token\s*=\s*["\'][^"\']+["\']', "Hardcoded token", "Store tokens in environment variables"),
-    (r'["\']-----BEGIN (?:RSA |DSA )?PRIVATE KEY-----', "Private key in code", "Never commit private keys"),
-    (r'(?:mysql|postgres|mongodb)://[^:]+:[^@]+@', "Database URL with password", "Use environment variables for credentials"),
-    (r'SELECT.*FROM.*WHERE.*["\'].*\+', "SQL string concatenation", "Use parameterized queries"),
-    (r'f["\'].*SELECT.*\{', "SQL f-string", "Use parameterized queries, not f-strings"),
-    (r'query\s*\+\s*["\']', "SQL concatenation", "Use parameterized queries"),
-    (r'\$_(?:GET|POST|REQUEST)\[', "Unsanitized PHP input", "Sanitize and validate all user input"),
-    (r'dangerouslySetInnerHTML', "dangerouslySetInnerHTML", "XSS risk - sanitize content first"),
-]
-
-MINOR_PATTERNS = [
-    (r'\bMD5\s*\(|hashlib\.md5', "MD5 hash", "MD5 is weak - use SHA-256 or bcrypt for passwords"),
-    (r'\bSHA1\s*\(|hashlib\.sha1', "SHA1 hash", "SHA1 is weak - use SHA-256 or better"),
-    (r'verify\s*=\s*False', "SSL verification disabled", "Don't disable SSL certificate verification"),
-    (r'random\.(random|randint|choice)\s*\(', "Weak random", "Use secrets module for security-sensitive randomness"),
-    (r'Math\.random\s*\(', "Math.random()", "Use crypto.getRandomValues() for security"),
-    (r'chmod\s+777', "chmod 777", "Overly permissive - use minimal required permissions"),
-    (r'console\.(log|warn)\s*\(.*(password|secret|key|token)', "Logging sensitive data", "Don't log secrets"),
-]
-
-
-def check_python_security(code: str) -> list[dict]:
+from pathlib import Path
+from typing import Any, Optional
+
+
+# Vulnerability patterns live in the shared rule registry next to the hooks
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "hooks" / "scripts"))
+from code_blocks import CodeBlock, LineIndex, extract_code_blocks
+from rule_registry import scan
+
+PYTHON_LANGUAGES = ("python", "py", "python3", "unknown")
+
+
+def check_python_security(code: str, index: Optional[LineIndex] = None) -> list[dict]:
     """Check Python code for security issues using AST."""
     issues = []
+    index = index or LineIndex(code)
 
     try:
         tree = ast.parse(code)
@@ -80,7 +51,7 @@ def check_python_security(code: str) -> list[dict]:
                     "severity": "critical",
                     "type": "code_execution",
                     "message": "eval() can execute arbitrary code",
-                    "line": node.lineno,
+                    **located(node, index),
                     "fix": "Use ast.literal_eval() for data parsing, or explicit parsing"
                 })
 
@@ -89,7 +60,7 @@ def check_python_security(code: str) -> list[dict]:
                     "severity": "critical",
                     "type": "code_execution",
                     "message": "exec() can execute arbitrary code",
-                    "line": node.lineno,
+                    **located(node, index),
                     "fix": "Avoid exec() - use explicit function calls instead"
                 })
 
@@ -98,7 +69,7 @@ def check_python_security(code: str) -> list[dict]:
                     "severity": "critical",
                     "type": "insecure_deserialization",
                     "message": "pickle can execute arbitrary code during deserialization",
-                    "line": node.lineno,
+                    **located(node, index),
                     "fix": "Use JSON or other safe serialization formats"
                 })
 
@@ -114,13 +85,19 @@ def check_python_security(code: str) -> list[dict]:
                                     "severity": "important",
                                     "type": "hardcoded_secret",
                                     "message": f"Potential hardcoded secret in '{target.id}'",
-                                    "line": node.lineno,
+                                    **located(node, index),
                                     "fix": "Use os.environ.get() or a secrets manager"
                                 })
 
     return issues
 
 
+def located(node: ast.AST, index: LineIndex) -> dict:
+    """Line and structured location fields for an issue at an AST node."""
+    location = index.node_location(node)
+    return {"line": location["line"], "location": location}
+
+
 def get_call_name(node: ast.Call) -> str:
     """Get the full name of a function call."""
     if isinstance(node.func, ast.Name):
@@ -137,65 +114,38 @@ def get_call_name(node: ast.Call) -> str:
     return ""
 
 
-def check_patterns(code: str) -> list[dict]:
+def check_patterns(code: str, index: Optional[LineIndex] = None) -> list[dict]:
     """Check code against vulnerability patterns."""
-    issues = []
-
-    for pattern, name, message in CRITICAL_PATTERNS:
-        matches = list(re.finditer(pattern, code, re.IGNORECASE | re.MULTILINE))
-        for match in matches:
-            line_num = code[:match.start()].count('\n') + 1
-            issues.append({
-                "severity": "critical",
-                "type": name.lower().replace(' ', '_').replace('()', ''),
-                "message": message,
-                "line": line_num,
-                "match": match.group()[:50]
-            })
-
-    for pattern, name, message in IMPORTANT_PATTERNS:
-        matches = list(re.finditer(pattern, code, re.IGNORECASE | re.MULTILINE))
-        for match in matches:
-            line_num = code[:match.start()].count('\n') + 1
-            issues.append({
-                "severity": "important",
-                "type": name.lower().replace(' ', '_'),
-                "message": message,
-                "line": line_num,
-                "match": match.group()[:50]
-            })
-
-    for pattern, name, message in MINOR_PATTERNS:
-        matches = list(re.finditer(pattern, code, re.IGNORECASE | re.MULTILINE))
-        for match in matches:
-            line_num = code[:match.start()].count('\n') + 1
-            issues.append({
-                "severity": "minor",
-                "type": name.lower().replace(' ', '_').replace('()', ''),
-                "message": message,
-                "line": line_num,
-                "match": match.group()[:50]
-            })
-
-    return issues
-
-
-def extract_code_blocks(text: str) -> str:
-    """Extract all code from text (both in blocks and inline)."""
-    # Get code blocks
-    blocks = re.findall(r"```\w*\n(.*?)```", text, re.DOTALL)
-
-    # Also get the full text in case code isn't in blocks
-    return "\n".join(blocks) + "\n" + text
-
-
-def check_security(text: str) -> dict:
-    """Main entry point: check security of all code in text."""
-    code = extract_code_blocks(text)
-
-    # Combine pattern-based and AST-based checks
-    pattern_issues = check_patterns(code)
-    ast_issues = check_python_security(code)
+    index = index or LineIndex(code)
+    return [
+        {
+            "severity": hit.severity,
+            "type": hit.rule.issue,
+            "message": hit.rule.message,
+            "line": hit.line,
+            "location": index.location(hit.start, hit.end),
+            "match": hit.text[:50]
+        }
+        for hit in scan("response", code, index)
+    ]
+
+
+def check_security(text: str, blocks: Optional[list[CodeBlock]] = None) -> dict:
+    """
+    Main entry point: check security of all code in text.
+
+    Pass `blocks` when they were already extracted from `text`.
+    """
+    # Patterns run over the whole text once (code blocks are part of it, and
+    # code isn't always fenced); AST checks run per Python block
+    pattern_issues = check_patterns(text, LineIndex(text))
+
+    ast_issues = []
+    if blocks is None:
+        blocks = extract_code_blocks(text)
+    for block in blocks or [CodeBlock("unknown", text)]:
+        if block.language in PYTHON_LANGUAGES:
+            ast_issues.extend(check_python_security(block.code, block.index))
 
     # Deduplicate issues (same line and type)
     seen = set()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Batch Response Checker
+
+Runs check-security.py, check-code-quality.py and check-completeness.py
+over many responses in one process (or one pool of worker processes),
+extracting each response's code blocks once and sharing them between the
+three checkers.
+
+Input is JSONL, one response per line, either a JSON string or an object:
+    {"id": "r1", "response": "...", "requirements": "..."}
+
+Output is JSONL in input order:
+    {"id": "r1", "security": {...}, "quality": {...}, "completeness": {...}}
+Lines that can't be parsed produce {"line": n, "error": "..."}.
+
+Usage:
+    python3 response_checks.py <responses.jsonl> [--workers N] [--output results.jsonl]
+    cat responses.jsonl | python3 response_checks.py - --workers 4
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Shared block extraction lives next to the hooks
+sys.path.insert(0, str(SCRIPT_DIR.parents[2] / "hooks" / "scripts"))
+from code_blocks import extract_code_blocks
+
+# Below this many responses a pool costs more than it saves
+POOL_THRESHOLD = 200
+
+# Responses handed to the pool per batch (bounds memory on large inputs)
+BATCH_SIZE = 512
+
+
+def _load_checker(filename: str):
+    """Import a hyphenated checker script as a module."""
+    name = filename[:-3].replace("-", "_")
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, SCRIPT_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_security = _load_checker("check-security.py")
+_quality = _load_checker("check-code-quality.py")
+_completeness = _load_checker("check-completeness.py")
+
+
+def check_response(response: str, requirements: str = "") -> dict:
+    """Run all three checkers over one response, extracting blocks once."""
+    blocks = extract_code_blocks(response)
+    return {
+        "security": _security.check_security(response, blocks),
+        "quality": _quality.check_quality(response, blocks),
+        "completeness": _completeness.analyze_completeness(response, requirements, blocks),
+    }
+
+
+def check_line(numbered: tuple[int, str]) -> dict:
+    """Check one JSONL input line; errors are reported, not raised."""
+    number, line = numbered
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {"line": number, "error": f"Invalid JSON: {e}"}
+
+    if isinstance(record, str):
+        record = {"response": record}
+    if not isinstance(record, dict) or not isinstance(record.get("response"), str):
+        return {"line": number, "error": "Expected a string or an object with a 'response' string"}
+
+    result = {"id": record.get("id", number)}
+    try:
+        result.update(check_response(record["response"], record.get("requirements") or ""))
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _numbered_lines(lines: Iterable[str]) -> Iterator[tuple[int, str]]:
+    for number, line in enumerate(lines, 1):
+        if line.strip():
+            yield number, line
+
+
+def check_lines(lines: Iterable[str], workers: int = 1) -> Iterator[dict]:
+    """
+    Check JSONL lines, yielding results in input order.
+
+    With `workers` > 1, batches of lines are spread over a process pool.
+    """
+    numbered = _numbered_lines(lines)
+    if workers <= 1:
+        for item in numbered:
+            yield check_line(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = list(islice(numbered, BATCH_SIZE))
+            if not batch:
+                break
+            chunksize = max(1, len(batch) // (workers * 4))
+            yield from pool.map(check_line, batch, chunksize=chunksize)
+
+
+def default_workers(path: str) -> int:
+    """One process for small inputs, otherwise one per CPU."""
+    if path == "-":
+        return 1
+    try:
+        with open(path, "rb") as f:
+            small = sum(1 for _ in islice(f, POOL_THRESHOLD)) < POOL_THRESHOLD
+    except OSError:
+        return 1
+    return 1 if small else (os.cpu_count() or 1)
+
+
+def main():
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(description="Check a JSONL stream of responses")
+    parser.add_argument("input", help="JSONL file of responses, or - for stdin")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count for large inputs)")
+    parser.add_argument("--output", help="Write JSONL results here instead of stdout")
+    args = parser.parse_args()
+
+    workers = args.workers if args.workers is not None else default_workers(args.input)
+
+    try:
+        source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failed = 0
+    try:
+        for result in check_lines(source, workers):
+            failed += "error" in result
+            out.write(json.dumps(result) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    if failed:
+        print(f"{failed} response(s) could not be checked", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
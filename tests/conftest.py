@@ -5,13 +5,34 @@ Provides common utilities for:
 - Finding agent/skill/command files
 - Parsing YAML frontmatter
 - Extracting tool permissions
+- Importing plugin scripts by path
 """
+import importlib.util
+import sys
 import pytest
 from pathlib import Path
-import yaml
-import re
+from types import ModuleType
 from typing import Dict, List, Optional
 
+REPO_ROOT = Path(__file__).parent.parent
+
+# Shared, memoized frontmatter parsing
+sys.path.insert(0, str(REPO_ROOT / 'agent-builder' / 'skills' / 'building-agents' / 'scripts'))
+from frontmatter_parser import read_frontmatter
+
+# Generated component index (scripts/component_index.py)
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
+from component_index import INDEX_NAME, INDEX_PATHS, load_index
+
+
+@pytest.fixture(scope='session', autouse=True)
+def component_index_path(tmp_path_factory):
+    """Keep the repository's component index out of the working tree."""
+    root = REPO_ROOT.resolve()
+    INDEX_PATHS[root] = tmp_path_factory.mktemp('index') / INDEX_NAME
+    yield
+    del INDEX_PATHS[root]
+
 
 @pytest.fixture
 def repo_root() -> Path:
@@ -22,19 +43,19 @@ def repo_root() -> Path:
 @pytest.fixture
 def all_agent_files(repo_root: Path) -> List[Path]:
     """Find all agent definition files across all plugins."""
-    return sorted(repo_root.glob('*/agents/*.md'))
+    return load_index(repo_root).paths('agent')
 
 
 @pytest.fixture
 def all_skill_files(repo_root: Path) -> List[Path]:
     """Find all skill definition files across all plugins."""
-    return sorted(repo_root.glob('*/skills/*/SKILL.md'))
+    return load_index(repo_root).paths('skill')
 
 
 @pytest.fixture
 def all_command_files(repo_root: Path) -> List[Path]:
     """Find all command definition files across all plugins."""
-    return sorted(repo_root.glob('*/commands/*.md'))
+    return load_index(repo_root).paths('command')
 
 
 def extract_frontmatter(file_path: Path) -> Dict:
@@ -45,16 +66,10 @@ def extract_frontmatter(file_path: Path) -> Dict:
         file_path: Path to the markdown file
 
     Returns:
-        Dictionary containing the parsed YAML frontmatter
+        Dictionary containing the parsed YAML frontmatter (shared between
+        callers and parsed once per file; don't modify it)
     """
-    content = file_path.read_text(encoding='utf-8')
-    match = re.match(r'^---\s*\n(.*?)\n---', content, re.DOTALL)
-    if match:
-        try:
-            return yaml.safe_load(match.group(1)) or {}
-        except yaml.YAMLError:
-            return {}
-    return {}
+    return read_frontmatter(file_path)
 
 
 def get_agent_tools(file_path: Path) -> List[str]:
@@ -91,6 +106,35 @@ def get_agent_name(file_path: Path) -> Optional[str]:
     return frontmatter.get('name')
 
 
+def load_script(relative_path: str) -> ModuleType:
+    """
+    Import a plugin script as a module.
+
+    Script file names often contain hyphens, so they cannot be imported
+    with a plain import statement. The script's directory is put on
+    sys.path so its sibling modules resolve as they do at runtime. A
+    script is only executed once; later calls return the same module, so
+    functions handed to worker processes still pickle by name.
+
+    Args:
+        relative_path: Path of the script relative to the repository root
+
+    Returns:
+        The loaded module
+    """
+    path = REPO_ROOT / relative_path
+    sys.path.insert(0, str(path.parent))
+    module_name = path.stem.replace('-', '_')
+    loaded = sys.modules.get(module_name)
+    if loaded is not None and getattr(loaded, '__file__', None) == str(path):
+        return loaded
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
 @pytest.fixture
 def extract_frontmatter_fixture():
     """Fixture wrapper for extract_frontmatter function."""
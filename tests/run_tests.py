@@ -4,30 +4,30 @@ Standalone test runner for agent invocation tests.
 Does not require pytest - uses built-in unittest.
 """
 import sys
+import tempfile
 import unittest
 from pathlib import Path
-import yaml
-import re
 from typing import Dict, List, Optional
 
 # Add the quality-scorer module to path
 REPO_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(REPO_ROOT / 'self-improvement' / 'skills' / 'analyzing-component-quality' / 'scripts'))
 
+# Shared, memoized frontmatter parsing
+sys.path.insert(0, str(REPO_ROOT / 'agent-builder' / 'skills' / 'building-agents' / 'scripts'))
+from frontmatter_parser import read_frontmatter
+
+# Generated component index (scripts/component_index.py)
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
+from component_index import INDEX_NAME, INDEX_PATHS, load_index
+
 # Orchestrator agents that are permitted to have Task tool
 ORCHESTRATOR_AGENTS = ['project-coordinator', 'investigator', 'workflow-orchestrator', 'meta-architect']
 
 
 def extract_frontmatter(file_path: Path) -> Dict:
-    """Extract YAML frontmatter from a markdown file."""
-    content = file_path.read_text(encoding='utf-8')
-    match = re.match(r'^---\s*\n(.*?)\n---', content, re.DOTALL)
-    if match:
-        try:
-            return yaml.safe_load(match.group(1)) or {}
-        except yaml.YAMLError:
-            return {}
-    return {}
+    """Extract YAML frontmatter from a markdown file (parsed once per run)."""
+    return read_frontmatter(file_path)
 
 
 def get_agent_tools(file_path: Path) -> List[str]:
@@ -50,7 +50,7 @@ def get_agent_name(file_path: Path) -> Optional[str]:
 
 def get_all_agent_files() -> List[Path]:
     """Find all agent definition files across all plugins."""
-    return sorted(REPO_ROOT.glob('*/agents/*.md'))
+    return load_index(REPO_ROOT).paths('agent')
 
 
 class TestAgentTaskToolPermissions(unittest.TestCase):
@@ -69,21 +69,18 @@ class TestAgentTaskToolPermissions(unittest.TestCase):
 
     def test_orchestrator_agents_exist(self):
         """Verify orchestrator agents are defined in the repository."""
-        agent_names = [get_agent_name(f) for f in self.agent_files]
+        index = load_index(REPO_ROOT)
 
-        self.assertIn('project-coordinator', agent_names, "project-coordinator agent not found")
-        self.assertIn('investigator', agent_names, "investigator agent not found")
+        self.assertTrue(index.find('project-coordinator', 'agent'), "project-coordinator agent not found")
+        self.assertTrue(index.find('investigator', 'agent'), "investigator agent not found")
 
     def test_non_orchestrator_agents_no_task_tool(self):
         """Non-orchestrator agents should NOT have Task tool."""
-        violations = []
-
-        for agent_file in self.agent_files:
-            agent_name = get_agent_name(agent_file)
-            tools = get_agent_tools(agent_file)
-
-            if agent_name not in ORCHESTRATOR_AGENTS and 'Task' in tools:
-                violations.append(f"{agent_name} has Task tool but is not an orchestrator")
+        violations = [
+            f"{agent['name']} has Task tool but is not an orchestrator"
+            for agent in load_index(REPO_ROOT).with_tools('Task', component_type='agent')
+            if agent['name'] not in ORCHESTRATOR_AGENTS
+        ]
 
         self.assertEqual(violations, [],
             f"Non-orchestrator agents with Task tool found:\n" +
@@ -205,9 +202,11 @@ def main():
     suite.addTests(loader.loadTestsFromTestCase(TestCircularDelegationPrevention))
     suite.addTests(loader.loadTestsFromTestCase(TestAgentToolConsistency))
 
-    # Run tests with verbosity
+    # Run tests with verbosity, keeping the component index out of the working tree
     runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    with tempfile.TemporaryDirectory() as index_dir:
+        INDEX_PATHS[REPO_ROOT.resolve()] = Path(index_dir) / INDEX_NAME
+        result = runner.run(suite)
 
     print()
     print("=" * 60)
@@ -0,0 +1,145 @@
+"""
+Tests for the hook benchmark harness (scripts/benchmark-hooks.py).
+"""
+import json
+import sys
+
+import pytest
+
+from .conftest import load_script
+
+benchmark_hooks = load_script('scripts/benchmark-hooks.py')
+
+
+def hook(event, matcher=None, command='exit 0'):
+    return {'plugin': 'fixtures', 'plugin_root': '/tmp', 'event': event, 'matcher': matcher, 'command': command}
+
+
+class TestDiscovery:
+    """Command hooks come from every plugin's hooks.json."""
+
+    def test_repository_hooks(self, repo_root):
+        commands, skipped = benchmark_hooks.hook_commands(repo_root)
+        found = {(h['plugin'], h['event']) for h in commands}
+        assert ('self-improvement', 'PreToolUse') in found
+        assert ('self-improvement', 'SessionEnd') in found
+        assert ('self-improvement', 'SessionStart') in found
+        assert ('agent-builder', 'PreToolUse') in found
+        assert all(s['type'] != 'command' for s in skipped)
+        assert ('project-manager', 'PostToolUse') in {(s['plugin'], s['event']) for s in skipped}
+
+    def test_plugin_filter(self, repo_root):
+        commands, _ = benchmark_hooks.hook_commands(repo_root, 'agent-builder')
+        assert commands and {h['plugin'] for h in commands} == {'agent-builder'}
+
+    def test_matches(self):
+        assert benchmark_hooks.matches(hook('PreToolUse', 'Write|Edit'), 'PreToolUse', 'Edit')
+        assert not benchmark_hooks.matches(hook('PreToolUse', 'Write'), 'PreToolUse', 'WriteFile')
+        assert not benchmark_hooks.matches(hook('PreToolUse', 'Write'), 'SessionEnd', None)
+        assert benchmark_hooks.matches(hook('SessionEnd'), 'SessionEnd', None)
+        assert benchmark_hooks.matches(hook('PostToolUse', '*'), 'PostToolUse', 'Bash')
+
+
+class TestPayloads:
+    """Built-in scenarios produce realistic payloads and transcripts."""
+
+    def test_transcript_lines(self, tmp_path):
+        path = tmp_path / 'transcript.jsonl'
+        benchmark_hooks.write_transcript(path, 1000)
+        lines = path.read_text().splitlines()
+        assert len(lines) == 1000
+        assert {json.loads(line)['type'] for line in lines} == {'user', 'assistant'}
+
+    def test_scenarios(self, tmp_path):
+        for name, (event, tool_name, _) in benchmark_hooks.SCENARIOS.items():
+            if name == 'session-end-100k':
+                continue
+            payload = benchmark_hooks.make_payload(name, tmp_path)
+            assert payload['hook_event_name'] == event
+            assert payload.get('tool_name') == tool_name
+        edit = benchmark_hooks.make_payload('pre-edit', tmp_path)
+        assert edit['tool_input']['old_string'] in (tmp_path / 'src' / 'edited.py').read_text()
+
+    def test_recorded_payloads(self, tmp_path):
+        (tmp_path / 'big-write.json').write_text(json.dumps(
+            {'hook_event_name': 'PreToolUse', 'tool_name': 'Write', 'tool_input': {}}))
+        assert benchmark_hooks.load_payloads(tmp_path) == {
+            'big-write': ('PreToolUse', 'Write', {'hook_event_name': 'PreToolUse', 'tool_name': 'Write', 'tool_input': {}}),
+        }
+
+
+class TestMeasurement:
+    """Hooks are run and summarized into p50/p95 and peak RSS."""
+
+    def test_percentile(self):
+        assert benchmark_hooks.percentile([5.0], 95) == 5.0
+        assert benchmark_hooks.percentile([1, 2, 3, 4, 5], 50) == 3
+        assert benchmark_hooks.percentile(list(range(1, 101)), 95) == 95.05
+
+    def test_benchmark(self, tmp_path, repo_root):
+        hooks = [hook('PreToolUse', 'Write', 'cat > /dev/null; echo \'{"decision": "approve"}\''), hook('SessionEnd', command='exit 3')]
+        scenarios = {'pre-write': ('PreToolUse', 'Write', {'tool_name': 'Write'})}
+        results = benchmark_hooks.benchmark(hooks, scenarios, 2, tmp_path, repo_root)
+        assert len(results) == 1
+        result = results[0]
+        assert result['key'] == 'fixtures/PreToolUse/pre-write'
+        assert result['runs'] == 2 and result['failures'] == 0
+        assert 0 < result['p50_ms'] <= result['p95_ms']
+        assert result['peak_rss_mb'] is None or result['peak_rss_mb'] >= 0
+
+    @pytest.mark.skipif(not benchmark_hooks.PROC_STATUS, reason='needs /proc')
+    def test_peak_rss_is_the_hooks_own(self, tmp_path, repo_root):
+        allocate = f'{sys.executable} -c "import time; b = bytearray(64 << 20); time.sleep(0.05)"'
+        hooks = [hook('SessionEnd', command='sleep 0.05'), hook('SessionEnd', command=allocate)]
+        small, large = benchmark_hooks.benchmark(hooks, {'end': ('SessionEnd', None, {})}, 2, tmp_path, repo_root)
+        assert small['rss_floor_mb'] is None
+        assert small['peak_rss_mb'] < 16
+        assert large['peak_rss_mb'] > 64
+
+    def test_failures_are_counted(self, tmp_path, repo_root):
+        results = benchmark_hooks.benchmark(
+            [hook('SessionEnd', command='exit 3')], {'end': ('SessionEnd', None, {})}, 2, tmp_path, repo_root)
+        assert results[0]['failures'] == 2
+
+
+class TestBudgets:
+    """Measurements over budget fail the run."""
+
+    def result(self, **overrides):
+        return {'key': 'self-improvement/PreToolUse/pre-write', 'runs': 5, 'failures': 0,
+                'p95_ms': 100.0, 'peak_rss_mb': 80.0, 'rss_floor_mb': 20.0, **overrides}
+
+    def test_exact_key_wins_over_wildcard(self):
+        budgets = {'*': {'p95_ms': 1}, 'self-improvement/PreToolUse/pre-write': {'p95_ms': 500}}
+        assert benchmark_hooks.budget_for('self-improvement/PreToolUse/pre-write', budgets) == {'p95_ms': 500}
+        assert benchmark_hooks.budget_for('agent-builder/PreToolUse/pre-write', budgets) == {'p95_ms': 1}
+        assert benchmark_hooks.budget_for('x/y/z', {}) is None
+
+    def test_violations(self):
+        budgets = {'*/PreToolUse/*': {'p95_ms': 50, 'peak_rss_mb': 64}}
+        violations = benchmark_hooks.check_budgets([self.result()], budgets)
+        assert len(violations) == 2
+        assert 'p95 100.0ms > budget 50ms' in violations[0]
+        assert benchmark_hooks.check_budgets([self.result(p95_ms=10.0, peak_rss_mb=30.0)], budgets) == []
+
+    def test_unmeasured_rss_is_a_violation(self):
+        budgets = {'*': {'peak_rss_mb': 10}}
+        assert benchmark_hooks.check_budgets([self.result(peak_rss_mb=20.0)], budgets) == [
+            "self-improvement/PreToolUse/pre-write: peak RSS hidden below the 20.0MB fork floor in every run, "
+            "can't check budget 10MB"]
+        assert benchmark_hooks.check_budgets([self.result(peak_rss_mb=None)], budgets) == [
+            "self-improvement/PreToolUse/pre-write: peak RSS not measured, can't check budget 10MB"]
+        assert benchmark_hooks.check_budgets([self.result(peak_rss_mb=5.0, rss_floor_mb=None)], budgets) == []
+
+    def test_failing_hook_is_a_violation(self):
+        assert benchmark_hooks.check_budgets([self.result(failures=1)], {}) == [
+            'self-improvement/PreToolUse/pre-write: exited non-zero in 1 of 5 runs']
+
+    def test_shipped_budgets_cover_every_hook(self, repo_root):
+        budgets = benchmark_hooks.load_budgets(benchmark_hooks.DEFAULT_BUDGETS)
+        commands, _ = benchmark_hooks.hook_commands(repo_root)
+        for command in commands:
+            for name, (event, tool_name, _) in benchmark_hooks.SCENARIOS.items():
+                if benchmark_hooks.matches(command, event, tool_name):
+                    key = f"{command['plugin']}/{event}/{name}"
+                    assert benchmark_hooks.budget_for(key, {k: v for k, v in budgets.items() if k != '*'}), key
@@ -0,0 +1,73 @@
+"""
+Tests for the term index behind check-completeness.py.
+"""
+import re
+
+import pytest
+
+from .conftest import load_script
+
+completeness = load_script('self-improvement/skills/analyzing-response-quality/scripts/check-completeness.py')
+
+# The per-check regexes the term index replaces
+REFERENCE_INDICATORS = [
+    r'\b(empty|null|none|undefined|zero|negative)\b',
+    r'\b(edge\s*case|corner\s*case|boundary)\b',
+    r'\bif\s+len\s*\([^)]+\)\s*[=<>]',
+    r'\bif\s+not\s+\w+\b',
+]
+
+SAMPLES = [
+    "Handle the Edge case where the list is EMPTY.",
+    "edge cases and is_empty() and nonempty values",
+    "Consider edgecase input.\n```python\nif not items:\n    return []\n```",
+    "If  not\nready, bail. if len(items) == 0: return",
+    "if not, then what? corner\tcase boundary",
+    "if len(x) > 3 and null",
+    "Nothing relevant here at all.",
+    "zero-length negative_numbers undefined",
+]
+
+
+class TestTermIndex:
+    """Index lookups agree with the regex checks they replace."""
+
+    @pytest.mark.parametrize('text', SAMPLES)
+    def test_edge_case_indicators_match_regexes(self, text):
+        expected = sum(1 for pattern in REFERENCE_INDICATORS if re.search(pattern, text, re.IGNORECASE))
+        checks = {c['name']: c for c in completeness.analyze_completeness(text)['checks']}
+        assert checks['edge_cases']['passed'] == (expected >= 2)
+        if expected >= 2:
+            assert f"({expected} indicators found)" in checks['edge_cases']['message']
+
+    def test_keywords_skip_code_and_stopwords(self):
+        index = completeness.TermIndex("Parse the config files.\n```python\nimport yaml\n```\nThen validate them.")
+        assert index.ordered_keywords() == ['parse', 'config', 'file', 'validate']
+
+    def test_sequence_requires_whitespace_gaps(self):
+        index = completeness.TermIndex("if, not this; but if not ready")
+        assert index.sequence(('if', 'not'), then_word=True)
+        assert not completeness.TermIndex("if, not this").sequence(('if', 'not'))
+
+    def test_sequence_uses_term_positions(self):
+        index = completeness.TermIndex("An edge of the case, then an Edge\n case and if not")
+        assert index.positions['edge'] == [1, 7]
+        assert index.sequence(('edge', 'case'))
+        assert not completeness.TermIndex("edge of the case").sequence(('edge', 'case'))
+        assert index.sequence(('if', 'not'))
+        assert not index.sequence(('if', 'not'), then_word=True)
+
+
+class TestRequirementsCoverage:
+    """Requirements are matched against the response's normalized terms."""
+
+    def test_plural_and_case_folding(self):
+        result = completeness.analyze_completeness(
+            "This validates every Input and retries queries.", "Validate inputs; retry the query"
+        )
+        coverage = next(c for c in result['checks'] if c['name'] == 'requirements_coverage')
+        assert coverage['passed']
+
+    def test_missing_keywords_in_requirement_order(self):
+        result = completeness.analyze_completeness("Nothing useful.", "Support pagination, caching and retries")
+        assert "Missing requirement keywords: support, pagination, caching, retry" in result['gaps']
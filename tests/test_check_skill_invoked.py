@@ -0,0 +1,131 @@
+"""
+Tests and a latency budget for the agent-builder check-skill-invoked.py hook.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+
+import pytest
+
+from .conftest import REPO_ROOT, load_script
+
+SCRIPT = 'agent-builder/hooks/scripts/check-skill-invoked.py'
+check_skill_invoked = load_script(SCRIPT)
+
+# The patterns the hook matched one by one before the combined regex
+REFERENCE_PATTERNS = [
+    (r".*/skills/[^/]+/SKILL\.md$", "skill", "building-skills"),
+    (r".*/commands/[^/]+\.md$", "command", "building-commands"),
+    (r".*/agents/[^/]+\.md$", "agent", "building-agents"),
+    (r".*/hooks/hooks\.json$", "hook", "building-hooks"),
+    (r".*/\.claude/hooks\.json$", "hook", "building-hooks"),
+    (r".*/\.claude-plugin/plugin\.json$", "plugin", "building-plugins"),
+]
+
+PATHS = [
+    "/repo/my-plugin/skills/doing-things/SKILL.md",
+    "/repo/my-plugin/skills/doing-things/skill.md",
+    "/repo/my-plugin/skills/doing-things/README.md",
+    "/repo/my-plugin/skills/SKILL.md",
+    "/repo/my-plugin/skills//SKILL.md",
+    "/repo/skills/commands/SKILL.md",
+    "/repo/my-plugin/commands/run-tests.md",
+    "/repo/my-plugin/commands/nested/run-tests.md",
+    "/repo/my-plugin/commands/.md",
+    "/repo/my-plugin/COMMANDS/Run.MD",
+    "/repo/my-plugin/agents/reviewer.md",
+    "/repo/agents/commands/x.md",
+    "/repo/my-plugin/hooks/hooks.json",
+    "/repo/my-plugin/hooks/other.json",
+    "/repo/.claude/hooks.json",
+    "/repo/.claude/settings.json",
+    "/repo/my-plugin/.claude-plugin/plugin.json",
+    "/repo/my-plugin/.claude-plugin/marketplace.json",
+    "C:\\repo\\my-plugin\\agents\\reviewer.md",
+    "skills/x/SKILL.md",
+    "agents/reviewer.md",
+    "/repo/src/app.py",
+    "/repo/docs/agents.md",
+    "/repo/package.json",
+    "",
+]
+
+
+def reference_component_type(file_path):
+    path = file_path.replace("\\", "/")
+    for pattern, component_type, skill_name in REFERENCE_PATTERNS:
+        if re.match(pattern, path, re.IGNORECASE):
+            return component_type, skill_name
+    return None, None
+
+
+class TestGetComponentType:
+    """The fast path classifies paths exactly like the per-pattern matcher."""
+
+    @pytest.mark.parametrize('path', PATHS)
+    def test_matches_reference(self, path):
+        assert check_skill_invoked.get_component_type(path) == reference_component_type(path)
+
+    def test_order_of_precedence(self):
+        assert check_skill_invoked.get_component_type("/repo/skills/commands/SKILL.md")[0] == "skill"
+        assert check_skill_invoked.get_component_type("/repo/agents/commands/x.md")[0] == "command"
+
+
+class TestHookOutput:
+    """The hook's stdout is unchanged and the common case imports nothing extra."""
+
+    def run_hook(self, file_path, *flags):
+        env = {**os.environ, 'TOOL_INPUT_FILE_PATH': file_path}
+        return subprocess.run(
+            [sys.executable, *flags, str(REPO_ROOT / SCRIPT)],
+            env=env, capture_output=True, text=True, check=True,
+        )
+
+    def test_non_component_fast_path(self):
+        proc = self.run_hook('/repo/src/app.py', '-X', 'importtime')
+        assert proc.stdout.strip() == '{"decision": "approve", "suppressOutput": true}'
+        imported = {line.rsplit('|', 1)[-1].strip() for line in proc.stderr.splitlines()}
+        assert 're' not in imported
+        assert 'json' not in imported
+
+    def test_component_reminder(self):
+        proc = self.run_hook('/repo/my-plugin/agents/reviewer.md')
+        assert '"reason": "Writing agent file"' in proc.stdout
+        assert "agent-builder:building-agents" in proc.stdout
+
+
+class TestLatencyBudget:
+    """Micro-benchmark: classification is timed against the per-pattern matcher.
+
+    Budgets are ratios with wide margins, so they hold on slow or busy
+    machines where absolute timings would not.
+    """
+
+    # The cheap rejection is ~5x faster than matching every pattern
+    NON_COMPONENT_SPEEDUP = 2
+    # One combined regex costs about the same as the per-pattern matcher
+    COMPONENT_SLOWDOWN = 3
+
+    def mean_us(self, classify, paths, rounds=2000):
+        """Best of three mean per-call timings, in microseconds."""
+        classify(paths[0])  # compile the regex outside the timing
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for path in paths:
+                    classify(path)
+            best = min(best, (time.perf_counter() - start) / (rounds * len(paths)) * 1e6)
+        return best
+
+    def test_non_component_paths(self):
+        paths = ["/repo/src/app.py", "/repo/docs/guide.md", "/repo/package.json", "/repo/src/components/Button.tsx"]
+        fast = self.mean_us(check_skill_invoked.get_component_type, paths)
+        assert fast * self.NON_COMPONENT_SPEEDUP < self.mean_us(reference_component_type, paths)
+
+    def test_component_paths(self):
+        paths = [p for p in PATHS if reference_component_type(p)[0]]
+        fast = self.mean_us(check_skill_invoked.get_component_type, paths, rounds=500)
+        assert fast < self.mean_us(reference_component_type, paths, rounds=500) * self.COMPONENT_SLOWDOWN
@@ -0,0 +1,101 @@
+"""
+Tests for line-anchored findings: the shared LineIndex, code block
+extraction, and the locations the analyzers attach to issues.
+"""
+import ast
+
+from .conftest import load_script
+
+code_blocks = load_script('self-improvement/hooks/scripts/code_blocks.py')
+
+DOCUMENT = """Intro text.
+
+```python
+import os
+
+def run(cmd):
+    os.system(cmd)
+```
+
+More prose, then:
+```js
+  el.innerHTML = html;
+```
+"""
+
+
+class TestLineIndex:
+    """Offset and position lookups match naive newline counting."""
+
+    def test_line_and_column_of(self):
+        text = "a\nbb\n\nccc\n"
+        index = code_blocks.LineIndex(text)
+        for offset in range(len(text)):
+            prefix = text[:offset]
+            assert index.line_of(offset) == prefix.count('\n') + 1
+            assert index.column_of(offset) == offset - (prefix.rfind('\n') + 1) + 1
+
+    def test_base_position_applies_to_first_line_column_only(self):
+        index = code_blocks.LineIndex("ab\ncd", base_line=10, base_column=5)
+        assert index.location(0, 2) == {'line': 10, 'column': 5, 'end_line': 10, 'end_column': 7}
+        assert index.location(3, 5) == {'line': 11, 'column': 1, 'end_line': 11, 'end_column': 3}
+
+    def test_node_source_is_a_slice(self):
+        code = "x = 1\ny = call(x,\n         2)\n"
+        index = code_blocks.LineIndex(code)
+        call = next(n for n in ast.walk(ast.parse(code)) if isinstance(n, ast.Call))
+        assert index.node_source(call) == "call(x,\n         2)"
+        assert index.node_location(call) == {'line': 2, 'column': 5, 'end_line': 3, 'end_column': 12}
+
+    def test_utf8_column_offsets(self):
+        code = "s = 'héllo'; eval(s)\n"
+        index = code_blocks.LineIndex(code)
+        call = next(n for n in ast.walk(ast.parse(code)) if isinstance(n, ast.Call))
+        assert index.node_source(call) == "eval(s)"
+
+
+class TestExtractCodeBlocks:
+    """Blocks record where their code starts in the document."""
+
+    def test_positions(self):
+        blocks = code_blocks.extract_code_blocks(DOCUMENT)
+        assert [(b.language, b.line, b.column) for b in blocks] == [('python', 4, 1), ('js', 12, 3)]
+        assert blocks[1].code == "el.innerHTML = html;"
+
+    def test_missing_language(self):
+        blocks = code_blocks.extract_code_blocks("```\nplain\n```")
+        assert blocks[0].language == 'unknown'
+
+
+class TestAnalyzerLocations:
+    """Analyzer findings carry document-relative locations."""
+
+    def test_analyze_code_quality(self):
+        analyzer = load_script('self-improvement/hooks/scripts/analyze-code-quality.py')
+        issues = {i['type']: i for i in analyzer.analyze_code_blocks(DOCUMENT).issues}
+        assert issues['shell_injection']['location'] == {
+            'line': 7, 'column': 5, 'end_line': 7, 'end_column': 19, 'block': 0
+        }
+        assert issues['shell_injection']['snippet'] == 'os.system(cmd)'
+        assert issues['potential_xss']['location']['line'] == 12
+        assert issues['potential_xss']['location']['column'] == 5
+        assert issues['potential_xss']['location']['block'] == 1
+
+    def test_check_security(self):
+        check_security = load_script(
+            'self-improvement/skills/analyzing-response-quality/scripts/check-security.py'
+        )
+        result = check_security.check_security(DOCUMENT)
+        os_system = next(i for i in result['issues'] if i['type'] == 'os.system')
+        assert os_system['line'] == 7
+        assert os_system['location']['column'] == 5
+        # Fenced code is scanned once, not once per block and again in the text
+        assert sum(1 for i in result['issues'] if i['type'] == 'os.system') == 1
+
+    def test_check_code_quality(self):
+        check_quality = load_script(
+            'self-improvement/skills/analyzing-response-quality/scripts/check-code-quality.py'
+        )
+        result = check_quality.check_quality("```javascript\nlet a = 1;\nvar b = 2;\n```\n")
+        issue = result['results'][0]['issues'][0]
+        assert issue['location']['line'] == 3
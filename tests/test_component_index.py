@@ -0,0 +1,159 @@
+"""
+Tests for the generated marketplace component index.
+"""
+import os
+import time
+
+from .conftest import load_script
+
+component_index = load_script('scripts/component_index.py')
+
+AGENT = """---
+name: reviewer
+description: Use when reviewing fixtures.
+tools: Read, Grep, Task
+---
+
+# Reviewer
+"""
+
+SKILL = """---
+name: fixture-skill
+description: Handles fixtures.
+allowed-tools: Read, Bash
+---
+
+# Skill
+"""
+
+COMMAND = """---
+description: Run the fixtures
+allowed-tools: Bash
+---
+
+Run them.
+"""
+
+
+def make_plugin(root, name='fixtures'):
+    plugin = root / name
+    (plugin / '.claude-plugin').mkdir(parents=True)
+    (plugin / '.claude-plugin' / 'plugin.json').write_text('{}')
+    (plugin / 'agents').mkdir()
+    (plugin / 'agents' / 'reviewer.md').write_text(AGENT)
+    (plugin / 'skills' / 'fixture-skill').mkdir(parents=True)
+    (plugin / 'skills' / 'fixture-skill' / 'SKILL.md').write_text(SKILL)
+    (plugin / 'commands').mkdir()
+    (plugin / 'commands' / 'run-fixtures.md').write_text(COMMAND)
+    (plugin / 'hooks').mkdir()
+    (plugin / 'hooks' / 'hooks.json').write_text('{"hooks": {}}')
+    (root / 'not-a-plugin' / 'agents').mkdir(parents=True)
+    (root / 'not-a-plugin' / 'agents' / 'stray.md').write_text(AGENT)
+    return plugin
+
+
+def age(root, seconds=60):
+    """Backdate every mtime so the index trusts them (see RACY_NS)."""
+    past = time.time() - seconds
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            os.utime(os.path.join(dirpath, name), (past, past))
+    os.utime(root, (past, past))
+
+
+class TestRecords:
+    """Every component is indexed with plugin, type, name and tools."""
+
+    def test_records(self, tmp_path):
+        make_plugin(tmp_path)
+        index = component_index.ComponentIndex(tmp_path)
+        assert index.refresh()
+        by_type = {record['type']: record for record in index.components()}
+        assert set(by_type) == {'agent', 'skill', 'command', 'hook'}
+        assert by_type['agent']['name'] == 'reviewer'
+        assert by_type['agent']['tools'] == ['Read', 'Grep', 'Task']
+        assert by_type['skill']['path'] == 'fixtures/skills/fixture-skill/SKILL.md'
+        assert by_type['command']['name'] == 'run-fixtures'
+        assert by_type['hook']['name'] == 'fixtures-hooks'
+        assert by_type['agent']['description_hash'] != by_type['skill']['description_hash']
+        assert all(record['plugin'] == 'fixtures' for record in by_type.values())
+
+    def test_queries(self, tmp_path):
+        make_plugin(tmp_path)
+        index = component_index.ComponentIndex(tmp_path)
+        index.refresh()
+        assert [r['type'] for r in index.find('reviewer')] == ['agent']
+        assert [r['name'] for r in index.with_tools('Bash')] == ['run-fixtures', 'fixture-skill']
+        assert index.with_tools('Task', 'Read', component_type='agent')[0]['name'] == 'reviewer'
+        assert index.get(tmp_path / 'fixtures' / 'agents' / 'reviewer.md')['name'] == 'reviewer'
+        assert index.paths('agent') == [tmp_path / 'fixtures' / 'agents' / 'reviewer.md']
+
+
+class TestIncrementalRefresh:
+    """Only changed files are parsed and only changed directories listed."""
+
+    def test_unchanged_tree_parses_nothing(self, tmp_path):
+        make_plugin(tmp_path)
+        age(tmp_path)
+        first = component_index.ComponentIndex(tmp_path)
+        first.refresh()
+        first.save()
+        assert first.parsed == 4
+
+        second = component_index.ComponentIndex(tmp_path)
+        assert not second.refresh()
+        assert second.parsed == 0
+        assert second.records == first.records
+
+    def test_modified_added_and_removed(self, tmp_path):
+        plugin = make_plugin(tmp_path)
+        age(tmp_path)
+        index = component_index.ComponentIndex(tmp_path)
+        index.refresh()
+
+        agent = plugin / 'agents' / 'reviewer.md'
+        agent.write_text(AGENT.replace('Task', 'Write'))
+        age(agent, seconds=30)
+        index.parsed = 0
+        assert index.refresh()
+        assert index.parsed == 1
+        assert index.find('reviewer')[0]['tools'] == ['Read', 'Grep', 'Write']
+
+        (plugin / 'commands' / 'run-fixtures.md').unlink()
+        (plugin / 'agents' / 'second.md').write_text(AGENT.replace('reviewer', 'second'))
+        assert index.refresh()
+        assert index.find('run-fixtures') == []
+        assert [r['name'] for r in index.components('agent')] == ['reviewer', 'second']
+
+    def test_rename_within_unchanged_directory(self, tmp_path):
+        plugin = make_plugin(tmp_path)
+        age(tmp_path)
+        index = component_index.ComponentIndex(tmp_path)
+        index.refresh()
+        agents = plugin / 'agents'
+        stat = agents.stat()
+        (agents / 'reviewer.md').rename(agents / 'renamed.md')
+        os.utime(agents, ns=(stat.st_atime_ns, stat.st_mtime_ns))  # hide the directory change
+        assert index.refresh()
+        assert [r['path'] for r in index.components('agent')] == ['fixtures/agents/renamed.md']
+
+    def test_new_plugin(self, tmp_path):
+        make_plugin(tmp_path)
+        age(tmp_path)
+        index = component_index.ComponentIndex(tmp_path)
+        index.refresh()
+        index.save()
+        make_plugin(tmp_path / 'nested')  # not a top-level plugin
+        (tmp_path / 'not-a-plugin' / '.claude-plugin').mkdir()
+        assert index.refresh()
+        assert [r['plugin'] for r in index.components('agent')] == ['fixtures', 'not-a-plugin']
+
+
+class TestRepository:
+    """The index covers the same files as globbing the repository."""
+
+    def test_matches_glob(self, repo_root):
+        index = component_index.load_index(repo_root)
+        for component_type, pattern in component_index.COMPONENT_GLOBS.items():
+            globbed = sorted(p for p in repo_root.glob(f'*/{pattern}') if (p.parents[len(pattern.split("/")) - 1] / '.claude-plugin').is_dir())
+            assert index.paths(component_type) == globbed
@@ -0,0 +1,186 @@
+"""
+Tests for the in-process fake Logseq API server, driven through LogseqClient and LogseqWriter.
+"""
+import asyncio
+import time
+
+import pytest
+
+from .conftest import load_script
+
+fake = load_script('logseq-expert/skills/reading-logseq-data/scripts/fake_logseq_server.py')
+logseq_client = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq-client.py')
+logseq_http = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq_http.py')
+write_operations = load_script('logseq-expert/skills/writing-to-logseq/scripts/write-operations.py')
+
+TOKEN = 'test-token'
+
+
+@pytest.fixture
+def server():
+    graph = fake.FakeGraph('test-graph')
+    graph.add_page('Project Alpha', [
+        {'content': 'Goals', 'children': ['Ship v1', 'Write docs']},
+        'Status is #active',
+    ], properties={'status': 'active'})
+    graph.add_page('Journal', ['Worked on [[Project Alpha]] today', 'Lunch'])
+    with fake.FakeLogseqServer(graph, token=TOKEN) as server:
+        yield server
+    logseq_http.close_all()
+
+
+@pytest.fixture
+def client(server):
+    return logseq_client.LogseqClient(backend='http', url=server.url, token=TOKEN)
+
+
+@pytest.fixture
+def writer(server):
+    return write_operations.LogseqWriter(url=server.url, token=TOKEN)
+
+
+class TestReads:
+    """The client reads pages, blocks and properties as the API returns them."""
+
+    def test_get_page(self, client):
+        page = client.get_page('project alpha')
+        assert page['originalName'] == 'Project Alpha'
+        assert [b['content'] for b in page['blocks']] == ['Goals', 'Status is #active']
+        assert [c['content'] for c in page['blocks'][0]['children']] == ['Ship v1', 'Write docs']
+        assert client.get_page('Missing') is None
+
+    def test_get_block(self, client, server):
+        goals = client.get_page('Project Alpha')['blocks'][0]
+        block = server.graph.call('logseq.Editor.getBlock', [goals['uuid']])
+        assert block['children'] == [['uuid', c['uuid']] for c in goals['children']]
+        assert client.get_block(goals['uuid'])['children'][1]['content'] == 'Write docs'
+
+    def test_properties_and_graph(self, client):
+        assert client.get_page_properties('Project Alpha') == {'status': 'active'}
+        assert client.get_graph_info()['name'] == 'test-graph'
+
+    def test_refs_create_pages(self, client):
+        assert client.get_page('active')['originalName'] == 'active'
+
+
+class TestQueries:
+    """App.search and the Datalog subset cover the client's queries."""
+
+    def test_search(self, client):
+        assert [r['content'] for r in client.search('project')] == ['Worked on [[Project Alpha]] today']
+
+    def test_list_pages(self, client):
+        titles = {p['title'] for p in client.list_pages()}
+        assert titles == {'Project Alpha', 'Journal', 'active'}
+
+    def test_backlinks(self, client):
+        (link,) = client.get_backlinks('Project Alpha')
+        assert link['title'] == 'Worked on [[Project Alpha]] today'
+        assert link['page'] == {'title': 'Journal'}
+
+    def test_collection_input_and_predicates(self, client):
+        query = '''
+            [:find ?title ?n
+             :in $ [?name ...]
+             :where
+             [?p :block/name ?name]
+             [?p :block/title ?title]
+             [(ground 3) ?n]
+             [(clojure.string/starts-with? ?title "Jour")]]
+        '''
+        assert client.datalog_query(query, [['journal', 'project alpha']]) == [['Journal', 3]]
+
+    def test_pull_star(self, client):
+        (row,) = client.datalog_query('[:find (pull ?p [*]) :where [?p :block/name "journal"]]')
+        assert row[0]['originalName'] == 'Journal'
+        assert row[0]['tags'] == [{'id': row[0]['tags'][0]['id']}]
+
+    def test_unsupported_query(self, client):
+        with pytest.raises(logseq_client.QueryError, match='Unsupported clause'):
+            client.datalog_query('[:find ?p :where (or [?p :block/name "a"] [?p :block/name "b"])]')
+        with pytest.raises(logseq_client.QueryError, match='input'):
+            client.datalog_query('[:find ?p :in $ ?name :where [?p :block/name ?name]]')
+
+
+class TestWrites:
+    """LogseqWriter's changes are visible to the client."""
+
+    def test_create_and_append(self, writer, client, server):
+        writer.create_page('Inbox')
+        for item in ('one', 'two', 'three'):
+            writer.append_to_page('Inbox', item)
+        assert [b['content'] for b in client.get_page('Inbox')['blocks']] == ['', 'one', 'two', 'three']
+        # Later appends go after the remembered block
+        assert server.requests['logseq.Editor.insertBlock'] == 3
+
+    def test_import_blocks(self, writer, client):
+        writer.import_blocks('Imported', [
+            {'content': 'Parent', 'children': [{'content': 'Child'}]},
+            {'content': 'Next'},
+        ], batch_size=1)
+        blocks = client.get_page('Imported')['blocks']
+        assert [b['content'] for b in blocks if b['content']] == ['Parent', 'Next']
+        assert blocks[-2]['children'][0]['content'] == 'Child'
+
+    def test_update_and_properties(self, writer, client):
+        uuid = client.get_page('Journal')['blocks'][1]['uuid']
+        assert writer.update_block(uuid, 'Lunch with #team')['content'] == 'Lunch with #team'
+        writer.set_property(uuid, 'rating', 5)
+        assert client.get_block_properties(uuid) == {'rating': 5}
+        assert client.get_page('team') is not None
+
+    def test_batch_round_trip(self, writer, client, server):
+        uuid = client.get_page('Journal')['blocks'][1]['uuid']
+        with writer.batch() as batch:
+            batch.update_block(uuid, 'Lunch')
+            batch.set_properties(uuid, {'rating': 5, 'place': 'cafe'})
+            batch.add_tag(uuid, 'food')
+        assert all(r['ok'] for r in batch.results)
+        # Properties ride along in the one updateBlock call
+        assert server.requests['logseq.Editor.updateBlock'] == 1
+        assert 'logseq.Editor.upsertBlockProperty' not in server.requests
+        assert client.get_block(uuid)['content'] == 'Lunch #food'
+        assert client.get_block_properties(uuid) == {'rating': 5, 'place': 'cafe'}
+
+    def test_delete(self, writer, client):
+        uuid = client.get_page('Project Alpha')['blocks'][0]['uuid']
+        writer.delete_block(uuid)
+        assert [b['content'] for b in client.get_page('Project Alpha')['blocks']] == ['Status is #active']
+        writer.delete_page('Journal')
+        assert client.get_page('Journal') is None
+
+
+class TestServer:
+    """Auth, latency and request counts."""
+
+    def test_auth(self, server):
+        client = logseq_client.LogseqClient(backend='http', url=server.url, token='wrong')
+        with pytest.raises(logseq_client.AuthError):
+            client.get_page('Journal')
+
+    def test_unknown_method(self, client):
+        with pytest.raises(logseq_client.QueryError, match='MethodNotExist'):
+            client._http_call('logseq.Editor.noSuchMethod', [])
+
+    def test_latency_overlaps(self, server):
+        server.latency = 0.05
+        titles = ['Journal'] + [f'Missing {i}' for i in range(15)]
+
+        def elapsed(concurrency):
+            client = logseq_client.AsyncLogseqClient(
+                backend='http', url=server.url, token=TOKEN, concurrency=concurrency)
+            started = time.perf_counter()
+            asyncio.run(client.gather_pages(titles, include_children=False))
+            return time.perf_counter() - started
+
+        concurrent, sequential = elapsed(8), elapsed(1)
+        # Two waves of eight against sixteen in a row; only require 2x
+        assert concurrent >= 2 * 0.05
+        assert concurrent * 2 < sequential
+        assert server.requests['logseq.Editor.getPage'] == 32
+
+    def test_benchmark(self):
+        results = fake.benchmark(count=5, latency=0)
+        assert results['append_to_page']['operations'] == 5
+        assert all(r['per_second'] > 0 for name, r in results.items() if name != 'requests')
+        assert results['requests']['logseq.Editor.insertBatchBlock'] == 1
@@ -0,0 +1,93 @@
+"""
+Tests for the shared frontmatter parser used by the validators and test suites.
+"""
+import os
+
+import pytest
+
+from .conftest import load_script
+
+# Put on sys.path by conftest; the same module the validators import
+import frontmatter_parser
+
+AGENT = """---
+name: helper
+description: Use when testing.
+tools: Read, Grep
+---
+
+# Helper
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    frontmatter_parser.clear_cache()
+    yield
+    frontmatter_parser.clear_cache()
+
+
+class TestParseText:
+    """Documents split into frontmatter and body."""
+
+    def test_fields_and_body(self):
+        parsed = frontmatter_parser.parse_text(AGENT)
+        assert parsed.present and parsed.error is None
+        assert parsed.fields == {'name': 'helper', 'description': 'Use when testing.', 'tools': 'Read, Grep'}
+        assert parsed.body == "# Helper\n"
+
+    def test_missing_frontmatter(self):
+        parsed = frontmatter_parser.parse_text("# Just a heading\n")
+        assert not parsed.present
+        assert parsed.body == "# Just a heading\n"
+        assert parsed.fields == {}
+
+    def test_invalid_yaml(self):
+        parsed = frontmatter_parser.parse_text("---\nname: [unclosed\n---\nbody\n")
+        assert parsed.present and parsed.error is not None
+        assert parsed.fields == {}
+
+    def test_non_mapping(self):
+        parsed = frontmatter_parser.parse_text("---\njust a string\n---\nbody\n")
+        assert parsed.data == 'just a string'
+        assert parsed.fields == {}
+
+
+class TestParseFile:
+    """Files are parsed once until they change."""
+
+    def test_memoized_until_modified(self, tmp_path):
+        path = tmp_path / 'agent.md'
+        path.write_text(AGENT)
+        first = frontmatter_parser.parse_file(path)
+        assert frontmatter_parser.parse_file(str(path)) is first
+        assert frontmatter_parser.cache_info() == {'hits': 1, 'misses': 1, 'files': 1}
+
+        path.write_text(AGENT.replace('helper', 'renamed'))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert frontmatter_parser.parse_file(path).fields['name'] == 'renamed'
+        assert frontmatter_parser.cache_info()['misses'] == 2
+
+    def test_read_frontmatter_unreadable(self, tmp_path):
+        assert frontmatter_parser.read_frontmatter(tmp_path / 'missing.md') == {}
+        with pytest.raises(OSError):
+            frontmatter_parser.parse_file(tmp_path / 'missing.md')
+
+
+class TestSharedUse:
+    """Validators, quality-scorer and the test helpers share one parse per file."""
+
+    def test_each_agent_parsed_once(self, all_agent_files):
+        run_tests = load_script('tests/run_tests.py')
+        validate_agent = load_script('agent-builder/skills/building-agents/scripts/validate-agent.py')
+        quality_scorer = load_script('self-improvement/skills/analyzing-component-quality/scripts/quality-scorer.py')
+        # Refreshing the component index for the fixture may have parsed changed files
+        frontmatter_parser.clear_cache()
+        for agent in all_agent_files:
+            run_tests.get_agent_name(agent)
+            run_tests.get_agent_tools(agent)
+            run_tests.extract_frontmatter(agent)
+            validate_agent.validate_agent(str(agent))
+            quality_scorer.analyze_component(agent)
+        assert frontmatter_parser.cache_info()['misses'] == len(all_agent_files)
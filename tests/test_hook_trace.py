@@ -0,0 +1,118 @@
+"""
+Tests for opt-in hook phase tracing (hook_trace.py and trace-spans.sh).
+"""
+import json
+import os
+import subprocess
+
+import pytest
+
+from .conftest import load_script
+
+hook_trace = load_script('self-improvement/hooks/scripts/hook_trace.py')
+
+TRACE_SPANS = 'self-improvement/hooks/scripts/trace-spans.sh'
+
+
+def span(session, hook, name, ms, pid=1):
+    return {'ts': 0, 'session': session, 'hook': hook, 'span': name, 'ms': ms, 'pid': pid}
+
+
+class TestTracer:
+    """Spans are only written when SELF_IMPROVEMENT_TRACE is set."""
+
+    def test_disabled_writes_nothing(self, tmp_path, monkeypatch):
+        monkeypatch.delenv(hook_trace.TRACE_ENV, raising=False)
+        path = tmp_path / 'trace.jsonl'
+        with hook_trace.Tracer('hook', path=path).span('payload_parse'):
+            pass
+        assert not path.exists()
+
+    @pytest.mark.parametrize('value', ['', '0'])
+    def test_off_values(self, monkeypatch, value):
+        monkeypatch.setenv(hook_trace.TRACE_ENV, value)
+        assert not hook_trace.enabled()
+
+    def test_span_is_recorded_when_the_block_exits(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(hook_trace.TRACE_ENV, '1')
+        path = tmp_path / 'trace.jsonl'
+        tracer = hook_trace.Tracer('analyze-before-write', path=path)
+        with pytest.raises(SystemExit):
+            with tracer.span('payload_parse'):
+                tracer.session = 'abc'
+                raise SystemExit(0)
+        [record] = [json.loads(line) for line in path.read_text().splitlines()]
+        assert record['session'] == 'abc'
+        assert record['hook'] == 'analyze-before-write'
+        assert record['span'] == 'payload_parse'
+        assert record['ms'] >= 0 and record['pid'] == os.getpid()
+
+    def test_rotation(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(hook_trace.TRACE_ENV, '1')
+        monkeypatch.setattr(hook_trace, 'TRACE_MAX_BYTES', 10)
+        path = tmp_path / 'trace.jsonl'
+        path.write_text(json.dumps(span('old', 'h', 'db_write', 5.0)) + '\n')
+        hook_trace.Tracer('h', 'new', path).record('db_write', 1.0)
+        assert len(path.read_text().splitlines()) == 1
+        assert [s['session'] for s in hook_trace.load_spans(path)] == ['old', 'new']
+
+
+class TestShellSpans:
+    """trace-spans.sh writes lines hook_trace.py can read."""
+
+    def run(self, repo_root, home, script, trace='1'):
+        env = {**os.environ, 'HOME': str(home), 'SELF_IMPROVEMENT_TRACE': trace}
+        return subprocess.run(
+            ['bash', '-c', f'set -euo pipefail; TRACE_HOOK=test-hook; source "{repo_root / TRACE_SPANS}"; {script}'],
+            env=env, capture_output=True, text=True,
+        )
+
+    def test_spans(self, repo_root, tmp_path):
+        result = self.run(repo_root, tmp_path, (
+            'trace_begin payload_parse; TRACE_SESSION=s1; trace_end payload_parse; '
+            'out=$(trace_span transcript_parse echo parsed); echo "$out"; '
+            'trace_span db_write false || echo "status=$?"'
+        ))
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split() == ['parsed', 'status=1']
+        spans = hook_trace.load_spans(tmp_path / '.claude' / 'self-improvement' / 'trace.jsonl')
+        assert [(s['hook'], s['session'], s['span']) for s in spans] == [
+            ('test-hook', 's1', 'payload_parse'),
+            ('test-hook', 's1', 'transcript_parse'),
+            ('test-hook', 's1', 'db_write'),
+        ]
+        assert all(s['ms'] >= 0 for s in spans)
+
+    def test_disabled(self, repo_root, tmp_path):
+        result = self.run(repo_root, tmp_path, 'trace_span db_write true; trace_begin x; trace_end x', trace='0')
+        assert result.returncode == 0, result.stderr
+        assert not (tmp_path / '.claude').exists()
+
+
+class TestSummary:
+    """The viewer's aggregation ranks the slowest phases across sessions."""
+
+    def test_aggregates_per_hook_and_phase(self):
+        spans = [
+            span('a', 'analyze-conversation', 'code_analysis', 300.0),
+            span('a', 'analyze-conversation', 'db_write', 10.0),
+            span('b', 'analyze-conversation', 'code_analysis', 100.0),
+            span('', 'load-learnings', 'total', 20.0, pid=7),
+        ]
+        summary = hook_trace.summarize(spans)
+        assert summary['sessions'] == 3 and summary['spans'] == 4
+        first = summary['phases'][0]
+        assert (first['hook'], first['span']) == ('analyze-conversation', 'code_analysis')
+        assert first['count'] == 2 and first['total_ms'] == 400.0 and first['mean_ms'] == 200.0
+        assert first['max_ms'] == 300.0 and first['p95_ms'] == 290.0
+        assert [p['span'] for p in summary['phases']] == ['code_analysis', 'total', 'db_write']
+
+    def test_recent_sessions_only(self):
+        spans = [span('a', 'h', 'x', 1.0), span('b', 'h', 'x', 2.0), span('c', 'h', 'x', 4.0)]
+        summary = hook_trace.summarize(spans, sessions=2)
+        assert summary['sessions'] == 2 and summary['phases'][0]['total_ms'] == 6.0
+
+    def test_ignores_malformed_lines(self, tmp_path):
+        path = tmp_path / 'trace.jsonl'
+        path.write_text('not json\n{"span": "x"}\n' + json.dumps(span('a', 'h', 'x', 1.0)) + '\n')
+        assert len(hook_trace.load_spans(path)) == 1
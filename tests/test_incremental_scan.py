@@ -0,0 +1,141 @@
+"""
+Tests for incremental pre-write scanning: changed hunks plus context are
+rescanned and must agree with a full scan of the new content.
+"""
+import random
+
+import pytest
+
+from .conftest import load_script
+
+incremental = load_script('self-improvement/hooks/scripts/incremental_scan.py')
+
+RISKY = [
+    "result = eval(user_input)",
+    "password = 'hunter2hunter2'",
+    "subprocess.run(cmd, shell=True)",
+    "digest = hashlib.md5(data)",
+    "os.system(command)",
+]
+SAFE = [
+    "def handler(request):",
+    "    value = request.get('value')",
+    "    return value * 2",
+    "",
+]
+
+
+def make_file(lines, seed):
+    rng = random.Random(seed)
+    return [rng.choice(RISKY) if rng.random() < 0.1 else rng.choice(SAFE) for _ in range(lines)]
+
+
+def keyed(findings):
+    return sorted((f.rule_id, f.severity, f.line, f.end_line, f.text) for f in findings)
+
+
+def warm_cache(old):
+    cache = incremental.FindingsCache(None, 'pre_write')
+    cache.put(incremental.content_hash(old), incremental.scan_findings('pre_write', old))
+    return cache
+
+
+class TestLineHunks:
+    """Diffing trims common lines and reports changed ranges."""
+
+    def test_identical(self):
+        assert incremental.line_hunks(['a\n', 'b\n'], ['a\n', 'b\n']) == []
+
+    def test_replace_insert_delete(self):
+        old = ['a\n', 'b\n', 'c\n', 'd\n', 'e\n']
+        new = ['a\n', 'B\n', 'c\n', 'x\n', 'd\n']
+        hunks = incremental.line_hunks(old, new)
+        assert hunks == [
+            incremental.Hunk(1, 2, 1, 2),
+            incremental.Hunk(3, 3, 3, 4),
+            incremental.Hunk(4, 5, 5, 5),
+        ]
+
+
+class TestAnalyzeWrite:
+    """Incremental Write findings equal a full scan of the new content."""
+
+    @pytest.mark.parametrize('seed', range(20))
+    def test_random_edits_match_full_scan(self, seed):
+        rng = random.Random(seed)
+        lines = make_file(200, seed)
+        old = "\n".join(lines) + "\n"
+        for _ in range(rng.randint(1, 4)):
+            position = rng.randrange(len(lines))
+            action = rng.choice(['replace', 'insert', 'delete'])
+            if action == 'replace':
+                lines[position] = rng.choice(RISKY + SAFE)
+            elif action == 'insert':
+                lines.insert(position, rng.choice(RISKY + SAFE))
+            else:
+                del lines[position]
+        new = "\n".join(lines) + "\n"
+
+        findings = incremental.analyze_write('pre_write', new, old, warm_cache(old))
+        assert keyed(findings) == keyed(incremental.scan_findings('pre_write', new))
+
+    def test_multiline_match_across_hunk_boundary(self):
+        old = "x = 1\nresult = eval\n(user_input)\n"
+        new = "x = 2\nresult = eval\n(user_input)\n"
+        findings = incremental.analyze_write('pre_write', new, old, warm_cache(old))
+        assert keyed(findings) == keyed(incremental.scan_findings('pre_write', new))
+
+    def test_cold_cache_scans_everything_and_caches(self):
+        cache = incremental.FindingsCache(None, 'pre_write')
+        content = "eval(a)\n"
+        findings = incremental.analyze_write('pre_write', content, None, cache)
+        assert [f.issue for f in findings] == ['eval']
+        assert cache.get(incremental.content_hash(content)) == findings
+
+    def test_cache_round_trip(self, tmp_path):
+        path = tmp_path / 'cache.json'
+        cache = incremental.FindingsCache(path, 'pre_write')
+        incremental.analyze_write('pre_write', "eval(a)\n", None, cache)
+        cache.save()
+        reloaded = incremental.FindingsCache(path, 'pre_write')
+        assert reloaded.get(incremental.content_hash("eval(a)\n"))[0].issue == 'eval'
+
+
+class TestAnalyzeEdit:
+    """Edit findings come from the edited lines, with file line numbers."""
+
+    def test_reports_only_edited_lines(self):
+        current = "eval(old)\n" + "x = 1\n" * 50 + "y = 2\n" + "z = 3\n" * 50
+        findings, file_lines = incremental.analyze_edit(
+            'pre_write', "y = exec(code)", "y = 2", current, incremental.FindingsCache(None, 'pre_write')
+        )
+        assert [(f.issue, f.line) for f in findings] == [('exec', 52)]
+        assert file_lines
+
+    def test_updates_cache_for_edited_content(self):
+        current = "eval(old)\n" + "x = 1\n" * 20
+        cache = warm_cache(current)
+        incremental.analyze_edit('pre_write', "x = exec(code)", "x = 1", current, cache, replace_all=True)
+        edited = current.replace("x = 1", "x = exec(code)")
+        cached = cache.get(incremental.content_hash(edited))
+        assert keyed(cached) == keyed(incremental.scan_findings('pre_write', edited))
+
+    def test_missing_file_scans_new_string(self):
+        findings, file_lines = incremental.analyze_edit(
+            'pre_write', "eval(a)", "b", None, incremental.FindingsCache(None, 'pre_write')
+        )
+        assert [f.issue for f in findings] == ['eval']
+        assert not file_lines
+
+    def test_old_string_not_in_file_scans_new_string(self):
+        current = "x = 1\n" * 20
+        findings, file_lines = incremental.analyze_edit(
+            'pre_write', "y = 2\nz = eval(a)", "missing", current, incremental.FindingsCache(None, 'pre_write')
+        )
+        assert [(f.issue, f.line) for f in findings] == [('eval', 2)]
+        assert not file_lines
+
+    def test_apply_edit_hunks(self):
+        content, hunks = incremental.apply_edit("a\nb\nc\n", "b\n", "x\ny\n")
+        assert content == "a\nx\ny\nc\n"
+        assert hunks == [incremental.Hunk(1, 3, 1, 4)]
@@ -0,0 +1,145 @@
+"""
+Tests for AsyncLogseqClient's concurrent fan-out against a local stand-in Logseq server.
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from .conftest import load_script
+
+logseq_client = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq-client.py')
+logseq_http = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq_http.py')
+
+TOKEN = 'test-token'
+LATENCY = 0.05
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answers page and block reads after LATENCY, counting requests in flight."""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+        time.sleep(LATENCY)
+        with server.lock:
+            server.in_flight -= 1
+            server.methods.append(body['method'])
+
+        method, args = body['method'].rsplit('.', 1)[-1], body['args']
+        if self.headers.get('Authorization') != f'Bearer {TOKEN}':
+            status, payload = 401, {'error': 'unauthorized'}
+        elif method == 'getPage':
+            name = args[0].lower()
+            payload = {'result': None if name.startswith('missing') else
+                       {'name': name, 'uuid': f'page-{name}', 'properties': {'title': args[0]}}}
+            status = 200
+        elif method == 'getPageBlocksTree':
+            status, payload = 200, {'result': [{'uuid': f'block-{args[0].lower()}', 'content': args[0]}]}
+        elif method == 'getBlock':
+            status, payload = 200, {'result': {'uuid': args[0], 'content': 'text'}}
+        else:
+            status, payload = 200, {'error': f'unknown method {method}'}
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.lock = threading.Lock()
+    httpd.in_flight = httpd.peak = 0
+    httpd.methods = []
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    logseq_http.close_all()
+
+
+def async_client(url, token=TOKEN, **kwargs):
+    return logseq_client.AsyncLogseqClient(backend='http', url=url, token=token, **kwargs)
+
+
+class TestFanOut:
+    """Reads overlap, up to the concurrency limit."""
+
+    def test_gather_pages(self, server):
+        client = async_client(server.url, concurrency=8)
+        titles = [f'Page {i}' for i in range(24)]
+        pages = asyncio.run(client.gather_pages(titles))
+
+        assert list(pages) == titles
+        assert pages['Page 3']['blocks'][0]['content'] == 'Page 3'
+        assert 1 < server.peak <= 8
+
+    def test_overlap_beats_sequential(self, server):
+        titles = [f'Page {i}' for i in range(8)]
+
+        def elapsed(concurrency):
+            client = async_client(server.url, concurrency=concurrency)
+            started = time.perf_counter()
+            asyncio.run(client.gather_pages(titles, include_children=False))
+            return time.perf_counter() - started
+
+        # About 8x faster when all eight overlap; only require 2x
+        assert elapsed(8) * 2 < elapsed(1)
+
+    def test_concurrency_bounded(self, server):
+        client = async_client(server.url, concurrency=2)
+        asyncio.run(client.gather_pages([f'P{i}' for i in range(6)], include_children=False))
+        assert server.peak == 2
+        assert server.methods == ['logseq.Editor.getPage'] * 6
+
+    def test_gather_blocks_and_duplicates(self, server):
+        client = async_client(server.url)
+        blocks = asyncio.run(client.gather_blocks(['a', 'b', 'a']))
+        assert {uuid: block['uuid'] for uuid, block in blocks.items()} == {'a': 'a', 'b': 'b'}
+        assert len(server.methods) == 2
+
+    def test_missing_pages_are_none(self, server):
+        client = async_client(server.url)
+        pages = asyncio.run(client.gather_pages(['Home', 'Missing one']))
+        assert pages['Missing one'] is None
+        assert asyncio.run(client.gather_page_properties(['Home'])) == {'Home': {'title': 'Home'}}
+
+    def test_shares_the_read_cache(self, server):
+        client = async_client(server.url, cache=True)
+        asyncio.run(client.gather_pages(['Home', 'Inbox']))
+        asyncio.run(client.gather_pages(['Home', 'Inbox']))
+        assert len(server.methods) == 4
+        assert client.cache_stats()['hits'] == 2
+
+
+class TestErrors:
+    """The synchronous client's exceptions come through unchanged."""
+
+    def test_auth_error(self, server):
+        client = async_client(server.url, token='wrong')
+        with pytest.raises(logseq_client.AuthError):
+            asyncio.run(client.gather_pages(['Home', 'Inbox']))
+
+    def test_query_error(self, server):
+        with pytest.raises(async_client(server.url).QueryError, match='unknown method'):
+            asyncio.run(async_client(server.url).datalog_query('[:find ?p :where [?p :block/title]]'))
+
+    def test_connection_error(self):
+        client = async_client('http://127.0.0.1:9')
+        with pytest.raises(logseq_client.ConnectionError):
+            asyncio.run(client.get_page('Home'))
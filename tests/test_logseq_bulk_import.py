@@ -0,0 +1,243 @@
+"""
+Tests for LogseqWriter's bulk import and the per-page last-block cache.
+"""
+import itertools
+
+import pytest
+
+from .conftest import load_script
+
+write_operations = load_script('logseq-expert/skills/writing-to-logseq/scripts/write-operations.py')
+
+
+class GraphWriter(write_operations.LogseqWriter):
+    """A writer over an in-memory page outline that records every API call."""
+
+    def __init__(self, return_created=True):
+        super().__init__(url='http://127.0.0.1:1', token='token')
+        self.pages = {}          # lowercased title -> page dict with 'children'
+        self.blocks = {}         # uuid -> block dict
+        self.parents = {}        # uuid -> parent page or block dict
+        self.return_created = return_created
+        self.calls = []
+        self._ids = itertools.count()
+
+    def _new_uuid(self):
+        return f'00000000-0000-0000-0000-{next(self._ids):012d}'
+
+    def _build(self, block, parent):
+        node = {'uuid': self._new_uuid(), 'content': block['content'], 'children': []}
+        self.blocks[node['uuid']] = node
+        self.parents[node['uuid']] = parent
+        node['children'] = [self._build(child, node) for child in block.get('children', [])]
+        return node
+
+    def _insert(self, anchor, blocks, sibling):
+        if anchor in self.blocks and sibling:
+            parent = self.parents[anchor]
+            position = parent['children'].index(self.blocks[anchor]) + 1
+        else:
+            parent = self.blocks.get(anchor) or next(
+                (p for p in self.pages.values() if p['uuid'] == anchor), None)
+            if parent is None:
+                raise write_operations.WriteError(f'Block {anchor} not found')
+            position = len(parent['children'])
+        nodes = [self._build(block, parent) for block in blocks]
+        parent['children'][position:position] = nodes
+        return nodes
+
+    def _call(self, method, args=None):
+        args = args or []
+        name = method.rsplit('.', 1)[-1]
+        self.calls.append(name)
+        if name == 'getPage':
+            return self.pages.get(args[0].lower())
+        if name == 'createPage':
+            page = {'uuid': self._new_uuid(), 'name': args[0], 'children': []}
+            self.pages[args[0].lower()] = page
+            return page
+        if name == 'getPageBlocksTree':
+            return list(self.pages[args[0].lower()]['children'])
+        if name == 'getBlock':
+            return self.blocks.get(args[0])
+        if name == 'removeBlock':
+            block = self.blocks.pop(args[0])
+            self.parents.pop(args[0])['children'].remove(block)
+            return None
+        if name == 'insertBlock':
+            return self._insert(args[0], [{'content': args[1]}], args[2]['sibling'])[0]
+        if name == 'insertBatchBlock':
+            created = self._insert(args[0], args[1], args[2]['sibling'])
+            return created if self.return_created else None
+        raise AssertionError(f'unexpected call {method}')
+
+    def add_page(self, title, contents=()):
+        page = {'uuid': self._new_uuid(), 'name': title, 'children': []}
+        self.pages[title.lower()] = page
+        for content in contents:
+            self._insert(page['uuid'], [{'content': content}], False)
+        return page
+
+    def outline(self, title):
+        def walk(nodes):
+            return [[n['content'], walk(n['children'])] if n['children'] else n['content'] for n in nodes]
+        return walk(self.pages[title.lower()]['children'])
+
+
+def numbered_tree(count, children=0):
+    """`count` top-level blocks, each with `children` children."""
+    return [{'content': f'b{i}', 'children': [{'content': f'b{i}.{j}'} for j in range(children)]}
+            for i in range(count)]
+
+
+class TestParseOutline:
+    """Markdown outlines become insertBatchBlock trees."""
+
+    def test_bullets_nest_by_indentation(self):
+        text = '- a\n\t- a1\n\t\t- a1x\n\t- a2\n- b\n  * b1\n'
+        assert write_operations.parse_outline(text) == [
+            {'content': 'a', 'children': [
+                {'content': 'a1', 'children': [{'content': 'a1x'}]},
+                {'content': 'a2'},
+            ]},
+            {'content': 'b', 'children': [{'content': 'b1'}]},
+        ]
+
+    def test_properties_and_continuation_lines(self):
+        text = '- Topic\n  status:: open\n  owner:: me\n  more detail\n  later:: text\n'
+        assert write_operations.parse_outline(text) == [{
+            'content': 'Topic\nmore detail\nlater:: text',
+            'properties': {'status': 'open', 'owner': 'me'},
+        }]
+
+    def test_headings_and_paragraphs_are_top_level(self):
+        text = '# Title\nIntro\nstill intro\n\nNext paragraph\n- item\n'
+        assert write_operations.parse_outline(text) == [
+            {'content': '# Title'},
+            {'content': 'Intro\nstill intro'},
+            {'content': 'Next paragraph'},
+            {'content': 'item'},
+        ]
+
+    def test_fenced_code_stays_in_its_block(self):
+        text = '- code\n  ```\n  - not a bullet\n\n  ```\n- after\n'
+        assert write_operations.parse_outline(text) == [
+            {'content': 'code\n```\n- not a bullet\n\n```'},
+            {'content': 'after'},
+        ]
+
+
+class TestLoadBlocks:
+    """JSON block trees are validated and normalized."""
+
+    def test_json_list_and_wrapper(self):
+        tree = write_operations.load_blocks('{"blocks": ["a", {"content": "b", "children": ["c"], "properties": {}}]}')
+        assert tree == [{'content': 'a'}, {'content': 'b', 'children': [{'content': 'c'}]}]
+
+    def test_markdown_is_the_default(self):
+        assert write_operations.load_blocks('- a\n') == [{'content': 'a'}]
+
+    def test_invalid_blocks_raise(self):
+        with pytest.raises(write_operations.ValidationError):
+            write_operations.load_blocks('[{"children": []}]')
+        with pytest.raises(write_operations.ValidationError):
+            write_operations.load_blocks('[1', 'json')
+
+    def test_chunks_respect_subtree_sizes(self):
+        tree = numbered_tree(5, children=2)
+        chunks = list(write_operations.chunk_blocks(tree, 7))
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        assert list(write_operations.chunk_blocks(tree, 2)) == [[block] for block in tree]
+
+
+class TestImportBlocks:
+    """Large trees go in with a handful of calls, in order."""
+
+    def test_two_thousand_blocks_in_four_calls(self):
+        writer = GraphWriter()
+        writer.add_page('Dump', ['existing'])
+        result = writer.import_blocks('Dump', numbered_tree(400, children=4), batch_size=500)
+
+        assert result['blocks'] == 2000
+        assert result['calls'] == 4
+        assert writer.calls == ['getPage', 'getPageBlocksTree'] + ['insertBatchBlock'] * 4
+        outline = writer.outline('Dump')
+        assert outline[0] == 'existing'
+        assert [entry[0] for entry in outline[1:]] == [f'b{i}' for i in range(400)]
+        assert outline[-1][1] == ['b399.0', 'b399.1', 'b399.2', 'b399.3']
+
+    def test_creates_missing_page(self):
+        writer = GraphWriter()
+        writer.create_page = lambda title: writer.add_page(title)
+        writer.import_blocks('New', ['a', 'b'])
+        assert writer.outline('New') == ['a', 'b']
+
+    def test_oversized_subtree_is_split_under_its_root(self):
+        writer = GraphWriter()
+        writer.add_page('Dump', ['existing'])
+        result = writer.import_blocks('Dump', numbered_tree(1, children=10) + ['tail'], batch_size=4)
+
+        assert result['calls'] == 1 + 3 + 1
+        assert writer.outline('Dump') == ['existing', ['b0', [f'b0.{j}' for j in range(10)]], 'tail']
+
+    def test_falls_back_to_reads_without_created_blocks(self):
+        writer = GraphWriter(return_created=False)
+        writer.add_page('Dump', ['existing'])
+        writer.import_blocks('Dump', numbered_tree(1, children=5) + numbered_tree(3), batch_size=3)
+        outline = writer.outline('Dump')
+        assert outline[1] == ['b0', ['b0.0', 'b0.1', 'b0.2', 'b0.3', 'b0.4']]
+        assert outline[2:] == ['b0', 'b1', 'b2']
+
+    def test_next_append_reuses_the_imported_tail(self):
+        writer = GraphWriter()
+        writer.add_page('Dump', ['existing'])
+        writer.import_blocks('Dump', ['a', 'b'])
+        writer.calls.clear()
+        writer.append_to_page('dump', 'c')
+        assert writer.calls == ['insertBlock']
+        assert writer.outline('Dump') == ['existing', 'a', 'b', 'c']
+
+
+class TestLastBlockCache:
+    """Consecutive appends skip getPage and getPageBlocksTree."""
+
+    def test_second_append_is_one_call(self):
+        writer = GraphWriter()
+        writer.add_page('Notes', ['first'])
+        writer.append_to_page('Notes', 'one')
+        assert writer.calls == ['getPage', 'getPageBlocksTree', 'insertBlock']
+        writer.calls.clear()
+        writer.append_to_page('Notes', 'two')
+        writer.append_to_page('Notes', 'three')
+        assert writer.calls == ['insertBlock', 'insertBlock']
+        assert writer.outline('Notes') == ['first', 'one', 'two', 'three']
+
+    def test_stale_block_rereads_the_page(self):
+        writer = GraphWriter()
+        writer.add_page('Notes', ['first'])
+        block = writer.append_to_page('Notes', 'one')
+        # Removed outside this writer (e.g. in the Logseq app)
+        writer._call('logseq.Editor.removeBlock', [block['uuid']])
+        writer.calls.clear()
+
+        writer.append_to_page('Notes', 'two')
+        assert writer.calls == ['insertBlock', 'getPage', 'getPageBlocksTree', 'insertBlock']
+        assert writer.outline('Notes') == ['first', 'two']
+
+    def test_deleting_the_cached_block_forgets_it(self):
+        writer = GraphWriter()
+        writer.add_page('Notes', ['first'])
+        block = writer.append_to_page('Notes', 'one')
+        writer.delete_block(block['uuid'])
+        writer.calls.clear()
+
+        writer.append_to_page('Notes', 'two')
+        assert writer.calls == ['getPage', 'getPageBlocksTree', 'insertBlock']
+
+    def test_sibling_insert_after_cached_block_forgets_it(self):
+        writer = GraphWriter()
+        writer.add_page('Notes', ['first'])
+        block = writer.append_to_page('Notes', 'one')
+        writer.create_block(block['uuid'], 'inserted', sibling=True)
+        writer.append_to_page('Notes', 'two')
+        assert writer.outline('Notes') == ['first', 'one', 'inserted', 'two']
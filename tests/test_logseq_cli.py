@@ -0,0 +1,167 @@
+"""
+Tests for the Logseq CLI runner and LogseqClient's batched CLI backend.
+"""
+import json
+import shlex
+import sys
+import textwrap
+
+import pytest
+
+from .conftest import load_script
+
+logseq_cli = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq_cli.py')
+logseq_client = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq-client.py')
+
+HOME_UUID = '00000000-0000-4000-8000-0000000000aa'
+BLOCK_UUID = '00000000-0000-4000-8000-000000000001'
+
+# A stand-in CLI answering lookups from a two-page graph and logging each run
+STUB = textwrap.dedent('''\
+    import json, re, sys
+    with open(LOG, "a") as log:
+        log.write(json.dumps(sys.argv[1:]) + "\\n")
+    if sys.argv[1] == "--version":
+        print("0.1.0")
+        sys.exit(0)
+    query = sys.argv[2]
+    if "fail" in query:
+        print("bad query", file=sys.stderr)
+        sys.exit(1)
+    pages = {"home": {"block/name": "home", "block/uuid": HOME_UUID}, "inbox": {"block/name": "inbox"}}
+    blocks = {BLOCK_UUID: {"block/uuid": BLOCK_UUID, "block/title": "First"}}
+    ground = re.search(r"\\(ground \\[(.*?)\\]\\) \\[\\?value", query)
+    if ground:
+        values = re.findall(r'"([^"]*)"', ground.group(1))
+        table = blocks if ":block/uuid ?value" in query else pages
+        print(json.dumps([[v, table[v]] for v in values if v in table]))
+    else:
+        print(json.dumps([[query]]))
+''')
+
+
+@pytest.fixture
+def stub(tmp_path, monkeypatch):
+    """The stub's command, with its invocation log as .calls()."""
+    log = tmp_path / 'cli.log'
+    script = tmp_path / 'logseq-stub.py'
+    script.write_text(STUB.replace('LOG', repr(str(log))).replace('HOME_UUID', repr(HOME_UUID))
+                      .replace('BLOCK_UUID', repr(BLOCK_UUID)))
+    command = [sys.executable, str(script)]
+    monkeypatch.setenv('LOGSEQ_CLI', shlex.join(command))
+
+    class Stub:
+        def calls(self):
+            return [json.loads(line) for line in log.read_text().splitlines()] if log.exists() else []
+
+    Stub.command = command
+    return Stub()
+
+
+class TestBindInputs:
+    """Query inputs are written into the query for a CLI that takes none."""
+
+    def test_scalar_and_collection(self):
+        query = '[:find ?b :in $ ?title [?tag ...] :where [?p :block/title ?title] [?b :block/tags ?tag]]'
+        assert logseq_cli.bind_inputs(query, ['Say "hi"', ['a', 'b']]) == (
+            '[:find ?b :where [(ground "Say \\"hi\\"") ?title] [(ground ["a" "b"]) [?tag ...]]'
+            ' [?p :block/title ?title] [?b :block/tags ?tag]]')
+
+    def test_uuids_become_tagged_literals(self):
+        assert logseq_cli.edn([BLOCK_UUID.upper(), 3, None, True]) == f'[#uuid "{BLOCK_UUID}" 3 nil true]'
+
+    def test_queries_without_inputs_unchanged(self):
+        query = '[:find ?t :where [?p :block/title ?t]]'
+        assert logseq_cli.bind_inputs(query, None) == query
+
+    def test_input_count_checked(self):
+        with pytest.raises(logseq_cli.CliError):
+            logseq_cli.bind_inputs('[:find ?p :in $ ?title :where [?p :block/title ?title]]', [])
+
+
+class TestRunner:
+    """Batches share one invocation or run concurrently."""
+
+    def test_lookup_is_one_invocation(self, stub):
+        runner = logseq_cli.CliRunner(graph_path='/graphs/g', command=stub.command)
+        found = runner.lookup(':block/name', ['home', 'inbox', 'missing', 'home'])
+        assert set(found) == {'home', 'inbox'}
+        (call,) = stub.calls()
+        assert call[0] == 'query' and call[-4:] == ['--graph', '/graphs/g', '--format', 'json']
+
+    def test_query_many_in_order_and_deduplicated(self, stub):
+        runner = logseq_cli.CliRunner(command=stub.command)
+        results = runner.query_many(['[:find a]', ('[:find b]', None), '[:find a]'])
+        assert results == [[['[:find a]']], [['[:find b]']], [['[:find a]']]]
+        assert runner.invocations == 2
+
+    def test_failures_raised(self, stub):
+        runner = logseq_cli.CliRunner(command=stub.command)
+        with pytest.raises(logseq_cli.CliError, match='bad query'):
+            runner.query_many(['[:find ok]', '[:find fail]'])
+        with pytest.raises(logseq_cli.CliNotFound):
+            logseq_cli.CliRunner(command=['/nonexistent/logseq']).query('[:find a]')
+
+    def test_availability_checked_once(self, stub):
+        assert logseq_cli.cli_available(stub.command)
+        assert logseq_cli.cli_available(stub.command)
+        assert stub.calls() == [['--version']]
+        assert not logseq_cli.cli_available(['/nonexistent/logseq'])
+
+    def test_benchmark(self):
+        results = logseq_cli.benchmark(count=3, startup=0, workers=2)
+        assert set(results) == {'sequential', 'query_many', 'lookup'}
+        assert all(r['queries_per_second'] > 0 for r in results.values())
+
+
+class TestClientBatching:
+    """LogseqClient's CLI backend looks up many items per invocation."""
+
+    @pytest.fixture
+    def client(self, stub):
+        return logseq_client.LogseqClient(backend='cli', graph_path='/graphs/g', cache=True)
+
+    def test_get_pages(self, client, stub):
+        pages = client.get_pages(['Home', 'Inbox', 'Missing'])
+        assert pages['Home']['block/uuid'] == HOME_UUID
+        assert pages['Missing'] is None
+        assert len(stub.calls()) == 1
+        # Served from the cache afterwards, missing pages included
+        assert client.get_page('home') == pages['Home']
+        assert client.get_pages(['Missing', 'inbox'])['inbox'] == pages['Inbox']
+        assert len(stub.calls()) == 1
+
+    def test_single_lookups_cached_once(self, client, stub):
+        assert client.get_page('Home')['block/uuid'] == HOME_UUID
+        assert client.get_block(BLOCK_UUID)['block/title'] == 'First'
+        client.get_page('home')
+        stats = client.cache_stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 2)
+        assert len(stub.calls()) == 2
+
+    def test_get_blocks(self, client, stub):
+        assert client.get_blocks([BLOCK_UUID])[BLOCK_UUID]['block/title'] == 'First'
+        assert '#uuid "' + BLOCK_UUID + '"' in stub.calls()[0][1]
+
+    def test_params_reach_the_cli(self, client, stub):
+        client.get_backlinks('Home')
+        assert '[(ground "Home") ?page-title]' in stub.calls()[0][1]
+
+    def test_datalog_queries(self, client, stub):
+        client.datalog_query('[:find a]')
+        results = client.datalog_queries(['[:find a]', '[:find b]', ('[:find b]', None)])
+        assert [r[0][0] for r in results] == ['[:find a]', '[:find b]', '[:find b]']
+        assert len(stub.calls()) == 2
+
+    def test_errors_mapped(self, client, stub):
+        with pytest.raises(logseq_client.QueryError):
+            client.datalog_query('[:find fail]')
+
+    def test_detection_once_per_process(self, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        probes = []
+        monkeypatch.setattr(logseq_client.LogseqClient, '_probe_backends', lambda self: probes.append(1) or 'cli')
+        graph = str(tmp_path / 'graph')
+        assert logseq_client.LogseqClient(graph_path=graph).backend == 'cli'
+        assert logseq_client.LogseqClient(graph_path=graph).backend == 'cli'
+        assert len(probes) == 1
@@ -0,0 +1,122 @@
+"""
+Tests for the shared Logseq config loading and recorded backend detection.
+"""
+import json
+
+import pytest
+
+from .conftest import load_script
+
+logseq_env = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq_env.py')
+logseq_client = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq-client.py')
+write_operations = load_script('logseq-expert/skills/writing-to-logseq/scripts/write-operations.py')
+detect_backend = load_script('logseq-expert/scripts/detect-backend.py')
+
+URL = 'http://127.0.0.1:9'
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """An empty project directory as cwd, with no Logseq environment variables."""
+    for name in ('LOGSEQ_API_URL', 'LOGSEQ_API_TOKEN', 'LOGSEQ_GRAPH_PATH'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def write_config(project, config):
+    path = project / '.claude' / 'logseq-expert' / 'env.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(config))
+    return path
+
+
+class TestConfig:
+    """env.json is parsed once per change and resolved the same way everywhere."""
+
+    def test_parsed_once(self, project, monkeypatch):
+        write_config(project, {'http': {'url': 'http://host:1'}})
+        reads = []
+        read_text = logseq_env.Path.read_text
+        monkeypatch.setattr(logseq_env.Path, 'read_text', lambda self, **kw: reads.append(self) or read_text(self, **kw))
+        logseq_env.load_config()['http']['url'] = 'changed'
+        assert logseq_env.load_config() == {'http': {'url': 'http://host:1'}}
+        assert len(reads) == 1
+
+        write_config(project, {'http': {'url': 'http://other-host:2'}})
+        assert logseq_env.load_config()['http']['url'] == 'http://other-host:2'
+
+    def test_missing_or_invalid(self, project):
+        assert logseq_env.load_config() == {}
+        write_config(project, {}).write_text('{not json')
+        assert logseq_env.load_config() == {}
+
+    def test_precedence(self, project, monkeypatch):
+        write_config(project, {'http': {'url': 'http://config:1', 'token': '${MY_TOKEN}'},
+                               'cli': {'graphPath': '/graphs/config'}})
+        monkeypatch.setenv('MY_TOKEN', 'from-var')
+        assert logseq_env.resolve_settings() == ('http://config:1', 'from-var', '/graphs/config')
+        monkeypatch.setenv('LOGSEQ_API_TOKEN', 'from-env')
+        assert logseq_env.resolve_settings('http://arg:3', graph_path='/g') == ('http://arg:3', 'from-env', '/g')
+
+    def test_writer_reads_config(self, project, monkeypatch):
+        write_config(project, {'http': {'url': 'http://config:1', 'token': '${MY_TOKEN}'}})
+        monkeypatch.setenv('MY_TOKEN', 'secret')
+        writer = write_operations.LogseqWriter()
+        assert (writer.url, writer.token) == ('http://config:1', 'secret')
+
+
+class TestDetectionRecord:
+    """Detections are kept for a few minutes and dropped on failure."""
+
+    def test_record_and_expiry(self, project):
+        logseq_env.record_detection(URL, '', 'file', '/graphs/found')
+        assert logseq_env.recent_detection(URL + '/', '') == ('file', '/graphs/found')
+        assert logseq_env.recent_detection(URL, '/graphs/other') is None
+        assert logseq_env.recent_detection(URL, '', ttl=-1) is None
+        assert json.loads((project / '.claude' / 'logseq-expert' / 'detection.json').read_text())
+
+    def test_forget(self, project):
+        logseq_env.record_detection(URL, '', 'http')
+        logseq_env.record_detection('http://other:1', '', 'cli')
+        assert logseq_env.forget_detection(URL, 'cli') == 0
+        assert logseq_env.forget_detection(URL, 'http') == 1
+        assert logseq_env.recent_detection('http://other:1', '') == ('cli', '')
+        assert logseq_env.forget_detection() == 1
+
+    def test_client_skips_probing(self, project, monkeypatch):
+        logseq_env.record_detection(URL, '/graphs/g', 'cli')
+        # As in a new process: only the file on disk remains
+        logseq_env._detections.clear()
+        monkeypatch.setattr(logseq_client.LogseqClient, '_probe_backends',
+                            lambda self: pytest.fail('probed despite a recent detection'))
+        assert logseq_client.LogseqClient(url=URL, graph_path='/graphs/g').backend == 'cli'
+
+    def test_client_records_detection(self, project, monkeypatch):
+        monkeypatch.setattr(logseq_client.LogseqClient, '_probe_backends', lambda self: 'http')
+        logseq_client.LogseqClient(url=URL)
+        assert logseq_env.recent_detection(URL, '') == ('http', '')
+
+    def test_connection_failure_forgets(self, project):
+        logseq_env.record_detection(URL, '', 'http')
+        client = logseq_client.LogseqClient(url=URL, token='token')
+        assert client.backend == 'http'
+        with pytest.raises(logseq_client.ConnectionError):
+            client.get_graph_info()
+        assert logseq_env.recent_detection(URL, '') is None
+
+
+class TestScripts:
+    """detect-backend.py shares the record and config."""
+
+    def test_detect_backend_records(self, project, monkeypatch):
+        monkeypatch.setattr(detect_backend, 'check_http_api', lambda url, token: {'available': True})
+        monkeypatch.setattr(detect_backend, 'check_cli', lambda: {'available': True})
+        monkeypatch.setattr(detect_backend, 'check_mcp_server', lambda path: {'available': False})
+        assert detect_backend.detect_best_backend()['recommended'] == 'http'
+        cached = detect_backend.cached_backend()
+        assert (cached['recommended'], cached['url']) == ('http', logseq_env.DEFAULT_URL)
+
+    def test_init_environment_imports(self):
+        init_environment = load_script('logseq-expert/scripts/init-environment.py')
+        assert callable(init_environment.check_cli)
@@ -0,0 +1,201 @@
+"""
+Tests for the file-based Logseq graph reader and LogseqClient's "file" backend.
+"""
+import os
+import subprocess
+import textwrap
+
+import pytest
+
+from .conftest import load_script
+
+logseq_client = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq-client.py')
+logseq_files = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq_files.py')
+
+BLOCK_ID = '6650a1b2-0000-4000-8000-000000000001'
+
+GRAPH = {
+    'pages/Project%3A Alpha.md': f"""\
+        title:: Project Alpha
+        alias:: alpha, [[PA]]
+        tags:: project
+
+        - Kickoff with [[Bob]] #meeting
+          id:: {BLOCK_ID}
+          status:: done
+        \t- Notes about #[[Big Idea]]
+        \t  ```
+        \t  - not a block [[Not A Ref]]
+        \t  ```
+        - Budget review
+        """,
+    'pages/Bob.md': """\
+        - type:: person
+        - Works on [[PA]]
+        """,
+    'pages/tools___python.md': """\
+        - Scripting notes
+        """,
+    'journals/2024_01_15.md': """\
+        - Met about [[alpha]]
+        - Worked on [[Project Alpha]] budget
+        """,
+}
+
+
+def write_graph(root, files=GRAPH):
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(textwrap.dedent(text))
+        age(path)
+    return root
+
+
+def age(path, seconds=60):
+    """Backdate a file so its mtime is trusted by the index."""
+    past = path.stat().st_mtime - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def graph(tmp_path):
+    return write_graph(tmp_path / 'graph')
+
+
+@pytest.fixture
+def index(graph, tmp_path):
+    return logseq_files.GraphIndex(graph, tmp_path / 'index.json').refresh_and_save()
+
+
+class TestParsing:
+    """Page files become page records with block trees and refs."""
+
+    def test_blocks_properties_and_refs(self, index):
+        page = index.find_page('Project Alpha')
+        assert page['properties'] == {'title': 'Project Alpha', 'alias': 'alpha, [[PA]]', 'tags': 'project'}
+        assert page['refs'] == ['alpha', 'pa', 'project']
+        kickoff, budget = page['blocks']
+        assert kickoff['uuid'] == BLOCK_ID
+        assert kickoff['properties'] == {'status': 'done'}
+        assert kickoff['refs'] == ['bob', 'meeting']
+        notes = kickoff['children'][0]
+        assert notes['content'] == 'Notes about #[[Big Idea]]\n```\n- not a block [[Not A Ref]]\n```'
+        assert notes['refs'] == ['big idea']
+        assert budget['content'] == 'Budget review'
+
+    def test_properties_bullet_is_the_pre_block(self, index):
+        page = index.find_page('bob')
+        assert page['properties'] == {'type': 'person'}
+        assert [block['content'] for block in page['blocks']] == ['Works on [[PA]]']
+
+    def test_titles_from_files(self, index):
+        assert index.find_page('tools/python')['file'] == 'pages/tools___python.md'
+        journal = index.find_page('2024-01-15')
+        assert journal['title'] == 'Jan 15th, 2024'
+        assert journal['journal_day'] == 20240115
+        assert index.find_page('PA')['title'] == 'Project Alpha'
+
+    def test_journal_titles(self):
+        from datetime import date
+        assert logseq_files.journal_title(date(2024, 3, 1)) == 'Mar 1st, 2024'
+        assert logseq_files.journal_title(date(2024, 3, 12)) == 'Mar 12th, 2024'
+        assert logseq_files.journal_title(date(2024, 3, 23)) == 'Mar 23rd, 2024'
+
+
+class TestIncrementalIndex:
+    """Files are parsed once and again only when they change."""
+
+    def test_reload_parses_nothing(self, graph, index, tmp_path):
+        assert index.parsed == 4
+        reloaded = logseq_files.GraphIndex(graph, tmp_path / 'index.json')
+        assert reloaded.refresh() is False
+        assert reloaded.parsed == 0
+        assert reloaded.get_page('alpha')['title'] == 'Project Alpha'
+
+    def test_changed_and_deleted_files(self, graph, index, tmp_path):
+        path = graph / 'pages' / 'Bob.md'
+        path.write_text('- Moved to [[Project Alpha]] full time\n')
+        age(path, 30)
+        (graph / 'pages' / 'tools___python.md').unlink()
+
+        reloaded = logseq_files.GraphIndex(graph, tmp_path / 'index.json')
+        assert reloaded.refresh() is True
+        assert reloaded.parsed == 1
+        assert reloaded.find_page('tools/python') is None
+        assert 'Moved to [[Project Alpha]] full time' in [b['content'] for b in reloaded.get_backlinks('alpha')]
+
+    def test_recent_mtimes_are_checked_again(self, graph, tmp_path):
+        (graph / 'pages' / 'New.md').write_text('- fresh\n')
+        first = logseq_files.GraphIndex(graph, tmp_path / 'index.json').refresh_and_save()
+        assert first.records['pages/New.md']['stamp'] is None
+        second = logseq_files.GraphIndex(graph, tmp_path / 'index.json')
+        second.refresh()
+        assert second.parsed == 1
+
+
+class TestFileBackend:
+    """LogseqClient reads a file graph without a subprocess or network."""
+
+    @pytest.fixture
+    def client(self, graph, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+
+        def offline(*args, **kwargs):
+            raise AssertionError('file backend must not spawn or connect')
+
+        monkeypatch.setattr(subprocess, 'run', offline)
+        monkeypatch.setattr(logseq_client, 'get_transport', offline)
+        return logseq_client.LogseqClient(backend='file', graph_path=str(graph))
+
+    def test_get_page(self, client):
+        page = client.get_page('project alpha')
+        assert page['originalName'] == 'Project Alpha'
+        assert [block['content'] for block in page['blocks']] == ['Kickoff with [[Bob]] #meeting', 'Budget review']
+        assert 'blocks' not in client.get_page('Project Alpha', include_children=False)
+        assert client.get_page('Missing') is None
+
+    def test_properties(self, client):
+        assert client.get_page_properties('Bob') == {'type': 'person'}
+        assert client.get_block_properties(BLOCK_ID) == {'status': 'done'}
+        assert client.get_block(BLOCK_ID)['page'] == {'title': 'Project Alpha'}
+
+    def test_backlinks_follow_aliases(self, client):
+        backlinks = client.get_backlinks('Project Alpha')
+        assert sorted((b['page']['title'], b['content']) for b in backlinks) == [
+            ('Bob', 'Works on [[PA]]'),
+            ('Jan 15th, 2024', 'Met about [[alpha]]'),
+            ('Jan 15th, 2024', 'Worked on [[Project Alpha]] budget'),
+        ]
+
+    def test_backlink_under_two_names_listed_once(self, client, graph):
+        path = graph / 'journals' / '2024_01_16.md'
+        path.write_text('- Met about [[alpha]] and [[Project Alpha]]\n')
+        age(path)
+        backlinks = client.get_backlinks('Project Alpha')
+        assert [b['content'] for b in backlinks].count('Met about [[alpha]] and [[Project Alpha]]') == 1
+        assert len(backlinks) == 4
+
+    def test_list_pages_and_search(self, client):
+        assert [page['title'] for page in client.list_pages()] == [
+            'Bob', 'Jan 15th, 2024', 'Project Alpha', 'tools/python']
+        assert len(client.list_pages(limit=2)) == 2
+        # Ranked by BM25: the shorter block scores higher
+        assert [r['content'] for r in client.search('BUDGET')] == [
+            'Budget review', 'Worked on [[Project Alpha]] budget']
+        assert len(client.search('budget', limit=1)) == 1
+
+    def test_index_persisted_under_project(self, client, tmp_path):
+        client.get_page('Bob')
+        assert list((tmp_path / '.claude' / 'logseq-expert' / 'graph-index').glob('graph-*.json'))
+
+    def test_datalog_unsupported(self, client):
+        with pytest.raises(logseq_client.QueryError):
+            client.datalog_query('[:find ?p :where [?p :block/title]]')
+
+    def test_detected_after_http_and_cli(self, graph, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(logseq_client.LogseqClient, '_test_http', lambda self: False)
+        monkeypatch.setattr(logseq_client.LogseqClient, '_test_cli', lambda self: False)
+        client = logseq_client.LogseqClient(graph_path=str(graph))
+        assert client.backend == 'file'
@@ -0,0 +1,184 @@
+"""
+Tests for LogseqClient's read-through cache and its invalidation by LogseqWriter.
+"""
+import pytest
+
+from .conftest import load_script
+
+logseq_client = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq-client.py')
+write_operations = load_script('logseq-expert/skills/writing-to-logseq/scripts/write-operations.py')
+logseq_cache = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq_cache.py')
+
+URL = 'http://logseq.test:12315'
+PAGE_UUID = '00000000-0000-0000-0000-0000000000aa'
+BLOCK_UUID = '00000000-0000-0000-0000-000000000001'
+OTHER_UUID = '00000000-0000-0000-0000-0000000000bb'
+
+
+class FakeTransport:
+    """Answers the API methods the client and writer use from a tiny graph."""
+
+    def __init__(self):
+        self.pages = {
+            'home': {'uuid': PAGE_UUID, 'name': 'Home', 'properties': {'status': 'draft'}},
+            'other': {'uuid': OTHER_UUID, 'name': 'Other', 'properties': {}},
+        }
+        # Home's first block holds its page properties
+        self.blocks = {BLOCK_UUID: {'uuid': BLOCK_UUID, 'content': 'First', 'page': 'home', 'preBlock?': True}}
+        self.methods = []
+
+    def post_json(self, path, payload, headers=None, idempotent=False):
+        method, args = payload['method'].rsplit('.', 1)[-1], payload['args']
+        self.methods.append(method)
+        if method == 'getPage':
+            result = self.pages.get(args[0].lower())
+        elif method == 'getPageBlocksTree':
+            result = [b for b in self.blocks.values() if b['page'] == args[0].lower()]
+        elif method == 'getBlock':
+            result = self.blocks.get(args[0])
+        elif method == 'getBlockProperties':
+            result = self.blocks[args[0]].get('properties', {})
+        elif method == 'datascriptQuery':
+            result = [[{'uuid': uuid}] for uuid in self.blocks]
+        elif method == 'updateBlock':
+            self.blocks[args[0]]['content'] = args[1]
+            result = None
+        elif method == 'upsertBlockProperty':
+            block = self.blocks[args[0]]
+            block.setdefault('properties', {})[args[1]] = args[2]
+            if block.get('preBlock?'):
+                self.pages[block['page']]['properties'][args[1]] = args[2]
+            result = None
+        elif method == 'insertBlock':
+            uuid = f'00000000-0000-0000-0000-{len(self.blocks) + 1:012d}'
+            self.blocks[uuid] = {'uuid': uuid, 'content': args[1], 'page': 'home'}
+            result = self.blocks[uuid]
+        else:
+            raise AssertionError(f'unexpected call {method}')
+        return 200, 'OK', {'result': result}
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    fake = FakeTransport()
+    monkeypatch.setattr(logseq_client, 'get_transport', lambda url, timeout=30: fake)
+    monkeypatch.setattr(write_operations, 'get_transport', lambda url, timeout=30: fake)
+    return fake
+
+
+@pytest.fixture
+def client(transport):
+    return logseq_client.LogseqClient(backend='http', url=URL, token='token', cache=True)
+
+
+@pytest.fixture
+def writer(transport):
+    return write_operations.LogseqWriter(url=URL, token='token')
+
+
+class TestReadThrough:
+    """Repeated reads are answered from memory."""
+
+    def test_page_fetched_once(self, client, transport):
+        first = client.get_page('Home')
+        assert client.get_page('home') == first
+        assert transport.methods == ['getPage', 'getPageBlocksTree']
+        stats = client.cache_stats()
+        assert (stats['enabled'], stats['hits'], stats['misses'], stats['hit_rate']) == (True, 1, 1, 0.5)
+
+    def test_properties_reuse_the_cached_page(self, client, transport):
+        client.get_page('Home')
+        assert client.get_page_properties('Home') == {'status': 'draft'}
+        assert 'blocks' not in client.get_page('Home', include_children=False)
+        assert transport.methods == ['getPage', 'getPageBlocksTree']
+
+    def test_properties_alone_skip_children(self, client, transport):
+        client.get_page_properties('Home')
+        client.get_page_properties('Home')
+        assert transport.methods == ['getPage']
+
+    def test_callers_get_copies(self, client, transport):
+        client.get_block(BLOCK_UUID)['content'] = 'changed'
+        assert client.get_block(BLOCK_UUID)['content'] == 'First'
+
+    def test_backlinks_and_queries_cached(self, client, transport):
+        client.get_backlinks('Home')
+        client.get_backlinks('Home')
+        client.get_backlinks('Other')
+        assert transport.methods == ['datascriptQuery', 'datascriptQuery']
+
+    def test_disabled_by_default(self, transport):
+        client = logseq_client.LogseqClient(backend='http', url=URL, token='token')
+        client.get_page('Home')
+        client.get_page('Home')
+        assert transport.methods == ['getPage', 'getPageBlocksTree'] * 2
+        assert client.cache_stats() == {'enabled': False}
+
+
+class TestInvalidation:
+    """Writes drop the cached reads they affect, and only those."""
+
+    def test_block_update_drops_block_and_page(self, client, writer, transport):
+        client.get_page('Home')
+        client.get_page('Other')
+        client.get_block(BLOCK_UUID)
+        writer.update_block(BLOCK_UUID, 'Edited')
+        transport.methods.clear()
+
+        assert client.get_block(BLOCK_UUID)['content'] == 'Edited'
+        assert client.get_page('Home')['blocks'][0]['content'] == 'Edited'
+        client.get_page('Other')
+        assert transport.methods == ['getBlock', 'getPage', 'getPageBlocksTree']
+
+    def test_property_write_drops_block_properties(self, client, writer, transport):
+        assert client.get_block_properties(BLOCK_UUID) == {}
+        writer.set_property(BLOCK_UUID, 'status', 'done')
+        assert client.get_block_properties(BLOCK_UUID) == {'status': 'done'}
+
+    def test_pre_block_write_drops_page_properties(self, client, writer, transport):
+        assert client.get_page_properties('Home') == {'status': 'draft'}
+        writer.set_property(BLOCK_UUID, 'status', 'done')
+        assert client.get_page_properties('Home') == {'status': 'done'}
+
+    def test_append_drops_page_and_queries(self, client, writer, transport):
+        client.get_page('Home')
+        client.get_backlinks('Home')
+        writer.append_to_page('Home', 'Second')
+        assert [b['content'] for b in client.get_page('Home')['blocks']] == ['First', 'Second']
+        assert len(client.get_backlinks('Home')) == 2
+
+    def test_other_graphs_unaffected(self, client, transport):
+        client.get_page('Home')
+        logseq_cache.invalidate('http://elsewhere:12315', ['home'])
+        client.get_page('Home')
+        assert client.cache_stats()['hits'] == 1
+        assert logseq_cache.invalidate(URL + '/', ['HOME']) == 1
+
+
+class TestReadCache:
+    """TTL expiry and LRU eviction."""
+
+    def test_entries_expire(self):
+        now = [0.0]
+        cache = logseq_cache.ReadCache(URL, ttl=10, clock=lambda: now[0])
+        cache.put(('page', 'home', True), {'uuid': 'x'}, ['home'])
+        assert cache.get(('page', 'home', True)) == (True, {'uuid': 'x'})
+        now[0] = 10.5
+        assert cache.get(('page', 'home', True)) == (False, None)
+        assert cache.stats()['expired'] == 1
+
+    def test_least_recently_used_evicted(self):
+        cache = logseq_cache.ReadCache(URL, max_entries=2)
+        cache.put(('a',), 1)
+        cache.put(('b',), 2)
+        cache.get(('a',))
+        cache.put(('c',), 3)
+        assert cache.get(('b',)) == (False, None)
+        assert cache.get(('a',)) == (True, 1)
+        assert cache.stats()['evictions'] == 1
+
+    def test_mutation_detection(self):
+        assert logseq_cache.is_mutation('logseq.Editor.insertBatchBlock')
+        assert logseq_cache.is_mutation('logseq.Editor.removeBlock')
+        assert not logseq_cache.is_mutation('logseq.Editor.getPageBlocksTree')
+        assert not logseq_cache.is_mutation('logseq.DB.datascriptQuery')
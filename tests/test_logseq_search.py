@@ -0,0 +1,134 @@
+"""
+Tests for the full-text search index behind the Logseq file backend.
+"""
+import os
+
+import pytest
+
+from .conftest import load_script
+
+logseq_search = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq_search.py')
+logseq_files = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq_files.py')
+logseq_client = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq-client.py')
+
+
+def indexed(files):
+    index = logseq_search.SearchIndex()
+    for rel, texts in files.items():
+        index.add_file(rel, [logseq_search.block_terms(text) for text in texts])
+    return index
+
+
+@pytest.fixture
+def index():
+    return indexed({
+        'pages/a.md': ['Budget review for the alpha project', 'Unrelated note about lunch'],
+        'pages/b.md': ['Alpha budget', 'budget budget budget and more budget words here'],
+        'journals/2024_01_15.md': ['Met the alpha team'],
+    })
+
+
+def ranked(results):
+    return [(rel, position) for _, rel, position in results]
+
+
+class TestRanking:
+    """BM25 over block terms."""
+
+    def test_all_terms_required(self, index):
+        assert ranked(index.search('alpha budget')) == [('pages/b.md', 0), ('pages/a.md', 0)]
+
+    def test_any_term_ranks_fuller_matches_first(self, index):
+        results = ranked(index.search('alpha budget', require_all=False))
+        assert results[:2] == [('pages/b.md', 0), ('pages/a.md', 0)]
+        assert set(results[2:]) == {('pages/b.md', 1), ('journals/2024_01_15.md', 0)}
+
+    def test_term_frequency_and_length(self, index):
+        # Many repeats win over a short block, saturating rather than growing linearly
+        assert ranked(index.search('budget'))[0] == ('pages/b.md', 1)
+
+    def test_case_and_punctuation_ignored(self, index):
+        assert ranked(index.search('ALPHA, Team!')) == [('journals/2024_01_15.md', 0)]
+
+    def test_limit(self, index):
+        assert len(index.search('budget', limit=2)) == 2
+        assert index.search('budget', limit=0) == []
+
+    def test_unknown_term_short_circuits(self, index):
+        assert index.search('budget zebra') == []
+        assert index.search('') == []
+
+
+class TestIncremental:
+    """Files are replaced and removed without a rebuild."""
+
+    def test_replace_and_remove(self, index):
+        index.add_file('pages/a.md', [logseq_search.block_terms('Lunch plans')])
+        assert ('pages/a.md', 0) not in ranked(index.search('budget'))
+        assert ranked(index.search('lunch')) == [('pages/a.md', 0)]
+
+        index.remove_file('pages/b.md')
+        assert index.search('budget') == []
+        assert len(index.documents) == 2
+        assert 'words' not in index.postings
+
+    def test_matches_a_fresh_build(self, index):
+        index.add_file('pages/a.md', [logseq_search.block_terms('Alpha alpha budget')])
+        index.remove_file('journals/2024_01_15.md')
+        fresh = indexed({
+            'pages/a.md': ['Alpha alpha budget'],
+            'pages/b.md': ['Alpha budget', 'budget budget budget and more budget words here'],
+        })
+        assert index.search('alpha budget', require_all=False) == fresh.search('alpha budget', require_all=False)
+        assert index.total_length == fresh.total_length
+        assert {term: len(docs) for term, docs in index.postings.items()} == {
+            term: len(docs) for term, docs in fresh.postings.items()}
+
+
+class TestGraphSearch:
+    """GraphIndex keeps its search index in step with the files."""
+
+    def write(self, path, text, age=60):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        past = path.stat().st_mtime - age
+        os.utime(path, (past, past))
+
+    def test_search_follows_file_changes(self, tmp_path):
+        graph = tmp_path / 'graph'
+        self.write(graph / 'pages' / 'Alpha.md', '- Budget review\n  owner:: finance\n- Lunch\n')
+        self.write(graph / 'pages' / 'Beta.md', '- Beta budget\n')
+        index = logseq_files.GraphIndex(graph, tmp_path / 'index.json').refresh_and_save()
+
+        results = index.search('budget')
+        assert [(r['page']['title'], r['content']) for r in results] == [
+            ('Beta', 'Beta budget'), ('Alpha', 'Budget review')]
+        assert results[0]['score'] > results[1]['score'] > 0
+        # Property values are searchable
+        assert [r['content'] for r in index.search('finance')] == ['Budget review']
+
+        search = index.search_index()
+        self.write(graph / 'pages' / 'Beta.md', '- Nothing to see\n', age=30)
+        (graph / 'pages' / 'Alpha.md').unlink()
+        index.refresh()
+        assert index.search_index() is search
+        assert index.search('budget') == []
+        assert [r['page']['title'] for r in index.search('nothing')] == ['Beta']
+
+    def test_client_search_on_file_backend(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        graph = tmp_path / 'graph'
+        self.write(graph / 'pages' / 'Alpha.md', '- First budget\n- Second budget item\n')
+        client = logseq_client.LogseqClient(backend='file', graph_path=str(graph))
+        assert [r['content'] for r in client.search('budget', limit=1)] == ['First budget']
+
+
+class TestQueryFallback:
+    """The Datalog search fallback embeds the text safely."""
+
+    def test_text_is_escaped(self, monkeypatch):
+        client = logseq_client.LogseqClient(backend='cli')
+        queries = []
+        monkeypatch.setattr(client, '_cli_query', lambda query, params=None: queries.append(query) or [])
+        client.search('say "hi" \\ [x]')
+        assert '(clojure.string/includes? ?title "say \\"hi\\" \\\\ [x]")' in queries[0]
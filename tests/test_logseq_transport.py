@@ -0,0 +1,163 @@
+"""
+Tests for the keep-alive Logseq HTTP transport shared by the client and writer.
+"""
+import json
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from .conftest import load_script
+
+logseq_client = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq-client.py')
+write_operations = load_script('logseq-expert/skills/writing-to-logseq/scripts/write-operations.py')
+logseq_http = load_script('logseq-expert/skills/reading-logseq-data/scripts/logseq_http.py')
+
+TOKEN = 'test-token'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.connections += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.methods.append(body['method'])
+        if self.server.drop_before_response:
+            # Read the request, then drop the connection without answering
+            self.server.drop_before_response = False
+            self.close_connection = True
+            return
+        if self.headers.get('Authorization') != f'Bearer {TOKEN}':
+            status, payload = 401, {'error': 'unauthorized'}
+        elif body['method'] == 'fail':
+            status, payload = 200, {'error': 'bad query'}
+        else:
+            status, payload = 200, {'result': {'method': body['method'], 'args': body['args']}}
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        # Drop the connection without announcing it, like an idle timeout
+        self.close_connection = self.server.drop_after_response
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    def shutdown_request(self, request):
+        super().shutdown_request(request)
+        self.closed.set()
+
+
+@pytest.fixture
+def server():
+    httpd = Server(('127.0.0.1', 0), Handler)
+    httpd.connections = 0
+    httpd.methods = []
+    httpd.closed = threading.Event()
+    httpd.drop_after_response = False
+    httpd.drop_before_response = False
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    httpd.url = f'http://127.0.0.1:{httpd.server_address[1]}'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    logseq_http.close_all()
+
+
+def client(url):
+    return logseq_client.LogseqClient(backend='http', url=url, token=TOKEN)
+
+
+class TestKeepAlive:
+    """Consecutive calls reuse one connection."""
+
+    def test_calls_share_one_connection(self, server):
+        c = client(server.url)
+        for title in ('A', 'B', 'C'):
+            assert c.get_page(title)['method'] == 'logseq.Editor.getPage'
+        assert server.connections == 1
+
+    def test_reader_and_writer_share_the_transport(self, server):
+        c = client(server.url)
+        writer = write_operations.LogseqWriter(url=server.url, token=TOKEN)
+        c.get_page('A', include_children=False)
+        writer.remove_property('uuid', 'status')
+        c.get_block_properties('uuid')
+        assert server.connections == 1
+        assert logseq_http.get_transport(server.url).connections_opened == 1
+
+    def test_reconnects_after_server_closes(self, server):
+        server.drop_after_response = True
+        c = client(server.url)
+        assert c.get_graph_info()['method'] == 'logseq.App.getCurrentGraph'
+        assert c.get_graph_info()['method'] == 'logseq.App.getCurrentGraph'
+        assert server.connections == 2
+
+    def test_idle_connection_closed_by_server_is_not_reused(self, server):
+        server.drop_after_response = True
+        writer = write_operations.LogseqWriter(url=server.url, token=TOKEN)
+        writer.remove_property('uuid', 'status')
+        assert server.closed.wait(5)
+        writer.remove_property('uuid', 'status')
+        assert server.methods == ['logseq.Editor.removeBlockProperty'] * 2
+        assert server.connections == 2
+
+    def test_reads_are_retried_after_a_dropped_request(self, server):
+        c = client(server.url)
+        c.get_graph_info()
+        server.drop_before_response = True
+        assert c.get_graph_info()['method'] == 'logseq.App.getCurrentGraph'
+        assert server.methods == ['logseq.App.getCurrentGraph'] * 3
+
+    def test_writes_are_not_resent_after_a_dropped_request(self, server):
+        client(server.url).get_graph_info()
+        server.drop_before_response = True
+        writer = write_operations.LogseqWriter(url=server.url, token=TOKEN)
+        with pytest.raises(write_operations.ConnectionError):
+            writer.remove_property('uuid', 'status')
+        assert server.methods == ['logseq.App.getCurrentGraph', 'logseq.Editor.removeBlockProperty']
+
+    def test_thread_safe(self, server):
+        c = client(server.url)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda i: c.get_block_properties(f'uuid-{i}'), range(40)))
+        assert [r['args'][0] for r in results] == [f'uuid-{i}' for i in range(40)]
+        assert server.connections <= 4
+
+
+class TestErrors:
+    """HTTP and transport failures map to each library's exceptions."""
+
+    def test_auth_error(self, server):
+        with pytest.raises(logseq_client.AuthError):
+            logseq_client.LogseqClient(backend='http', url=server.url, token='wrong').get_graph_info()
+        with pytest.raises(write_operations.AuthError):
+            write_operations.LogseqWriter(url=server.url, token='wrong').remove_property('u', 'k')
+
+    def test_api_error(self, server):
+        with pytest.raises(logseq_client.QueryError, match='bad query'):
+            client(server.url)._http_call('fail')
+        with pytest.raises(write_operations.WriteError, match='bad query'):
+            write_operations.LogseqWriter(url=server.url, token=TOKEN)._call('fail')
+
+    def test_connection_refused(self, server):
+        url = server.url
+        server.shutdown()
+        server.server_close()
+        logseq_http.close_all()
+        with pytest.raises(logseq_client.ConnectionError):
+            client(url).get_graph_info()
+        with pytest.raises(write_operations.ConnectionError):
+            write_operations.LogseqWriter(url=url, token=TOKEN).remove_property('u', 'k')
@@ -0,0 +1,124 @@
+"""
+Tests for LogseqWriter's batched write API.
+"""
+import pytest
+
+from .conftest import load_script
+
+write_operations = load_script('logseq-expert/skills/writing-to-logseq/scripts/write-operations.py')
+
+UUID_A = '00000000-0000-0000-0000-00000000000a'
+UUID_B = '00000000-0000-0000-0000-00000000000b'
+
+
+class RecordingWriter(write_operations.LogseqWriter):
+    """A writer over an in-memory set of blocks that records every API call."""
+
+    def __init__(self, blocks):
+        super().__init__(url='http://127.0.0.1:1', token='token')
+        self.blocks = blocks
+        self.calls = []
+
+    def _call(self, method, args=None):
+        args = args or []
+        self.calls.append((method.rsplit('.', 1)[-1], args))
+        if method == 'logseq.Editor.getBlock':
+            block = self.blocks.get(args[0])
+            return dict(block) if block else None
+        if method == 'logseq.Editor.updateBlock':
+            block = self.blocks[args[0]]
+            block['content'] = args[1]
+            if len(args) > 2:
+                block.setdefault('properties', {}).update(args[2].get('properties', {}))
+            return None
+        if method == 'logseq.Editor.upsertBlockProperty':
+            self.blocks[args[0]].setdefault('properties', {})[args[1]] = args[2]
+            return None
+        if method == 'logseq.Editor.insertBatchBlock':
+            return [{'uuid': f'new-{i}', 'content': b['content']} for i, b in enumerate(args[1])]
+        raise AssertionError(f'unexpected call {method}')
+
+    def methods(self):
+        return [method for method, _ in self.calls]
+
+
+@pytest.fixture
+def writer():
+    return RecordingWriter({
+        UUID_A: {'uuid': UUID_A, 'content': 'Alpha #existing'},
+        UUID_B: {'uuid': UUID_B, 'content': 'Beta'},
+    })
+
+
+class TestCoalescing:
+    """Edits to the same block collapse into the fewest calls."""
+
+    def test_add_tags_is_one_read_and_one_write(self, writer):
+        assert writer.add_tags(UUID_A, ['one', 'two', 'existing', 'three', 'four'])
+        assert writer.methods() == ['getBlock', 'updateBlock']
+        assert writer.blocks[UUID_A]['content'] == 'Alpha #existing #one #two #three #four'
+
+    def test_no_write_when_nothing_changes(self, writer):
+        writer.add_tags(UUID_A, ['existing'])
+        assert writer.methods() == ['getBlock']
+
+    def test_properties_ride_along_with_content(self, writer):
+        with writer.batch() as batch:
+            batch.update_block(UUID_B, 'Beta v2')
+            batch.add_tag(UUID_B, 'draft')
+            batch.set_property(UUID_B, 'count', '3', property_type='number')
+            batch.set_properties(UUID_B, {'status': 'Active', 'count': 4})
+        assert writer.methods() == ['updateBlock']
+        assert writer.blocks[UUID_B]['content'] == 'Beta v2 #draft'
+        assert writer.blocks[UUID_B]['properties'] == {'count': 4, 'status': 'Active'}
+
+    def test_properties_alone_use_upserts(self, writer):
+        writer.set_properties(UUID_B, {f'p{i}': i for i in range(5)})
+        assert writer.methods() == ['upsertBlockProperty'] * 5
+        assert writer.blocks[UUID_B]['content'] == 'Beta'
+        assert len(writer.blocks[UUID_B]['properties']) == 5
+
+    def test_remove_after_add(self, writer):
+        with writer.batch() as batch:
+            batch.add_tags(UUID_B, ['x', 'y'])
+            batch.remove_tag(UUID_B, 'x')
+        assert writer.blocks[UUID_B]['content'] == 'Beta #y'
+        assert writer.methods() == ['getBlock', 'updateBlock']
+
+    def test_inserts_under_one_parent_are_one_call(self, writer):
+        batch = writer.batch()
+        first = batch.insert_blocks(UUID_A, ['one', 'two'])
+        second = batch.insert_blocks(UUID_A, [{'content': 'three', 'properties': {'a': 1}}])
+        other = batch.insert_blocks(UUID_B, ['four'])
+        results = batch.flush()
+        assert writer.methods() == ['insertBatchBlock', 'insertBatchBlock']
+        assert writer.calls[0][1][1][2] == {'content': 'three', 'properties': {'a': 1}}
+        assert [b['content'] for b in results[first]['result']] == ['one', 'two']
+        assert [b['content'] for b in results[second]['result']] == ['three']
+        assert results[other]['target'] == UUID_B
+        assert batch.calls == 2 and len(batch) == 0
+
+
+class TestResults:
+    """Each queued operation gets its own result."""
+
+    def test_failures_are_isolated(self, writer):
+        missing = '00000000-0000-0000-0000-0000000000ff'
+        batch = writer.batch()
+        batch.add_tag(missing, 'x')
+        batch.add_tag(UUID_B, 'x')
+        results = batch.flush()
+        assert [r['ok'] for r in results] == [False, True]
+        assert 'not found' in results[0]['error']
+        assert writer.blocks[UUID_B]['content'] == 'Beta #x'
+
+    def test_raise_errors(self, writer):
+        with pytest.raises(write_operations.NotFoundError):
+            writer.add_tags('00000000-0000-0000-0000-0000000000ff', ['x'])
+
+    def test_no_flush_on_exception(self, writer):
+        with pytest.raises(RuntimeError):
+            with writer.batch() as batch:
+                batch.add_tag(UUID_B, 'x')
+                raise RuntimeError
+        assert writer.calls == []
@@ -0,0 +1,122 @@
+"""
+Tests for the self-improvement session metrics time-series store.
+"""
+import json
+from datetime import datetime, timedelta
+
+from .conftest import load_script
+
+metrics_store = load_script('self-improvement/hooks/scripts/metrics_store.py')
+
+
+def make_sessions(count, start=datetime(2026, 1, 5)):
+    return [
+        {
+            'session_id': str(i),
+            'timestamp': (start + timedelta(hours=8 * i)).isoformat(),
+            'quality_score': 50 + (i * 7) % 50,
+            'critical_issues': i % 3,
+            'total_turns': 10 + i,
+        }
+        for i in range(count)
+    ]
+
+
+class TestMetricsStore:
+    """Running sums and rollups agree with recomputing from raw sessions."""
+
+    def test_window_mean_matches_raw_sessions(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(metrics_store, 'MAX_SESSIONS', 50)
+        sessions = make_sessions(120)
+        store = metrics_store.MetricsStore(tmp_path / 'series.json')
+        for session in sessions:
+            store.append(session)
+
+        assert len(store) == 120
+        assert store.retained == 50
+        scores = [s['quality_score'] for s in sessions]
+        for count, skip in ((10, 0), (10, 10), (25, 25), (50, 0)):
+            expected = sum(scores[len(scores) - skip - count:len(scores) - skip]) / count
+            assert store.window_mean('quality_score', count, skip) == expected
+        assert store.window_mean('quality_score', 30, skip=30) is None
+        assert store.mean('quality_score') == sum(scores) / len(scores)
+
+    def test_rollups(self, tmp_path):
+        sessions = make_sessions(30)
+        store = metrics_store.MetricsStore(tmp_path / 'series.json')
+        for session in sessions:
+            store.append(session)
+
+        daily = {row['period']: row for row in store.rollup('daily', 'quality_score')}
+        day = sessions[0]['timestamp'][:10]
+        same_day = [s['quality_score'] for s in sessions if s['timestamp'].startswith(day)]
+        assert daily[day]['sessions'] == len(same_day)
+        assert daily[day]['mean'] == sum(same_day) / len(same_day)
+        assert daily[day]['max'] == max(same_day)
+
+        weekly = store.rollup('weekly', 'quality_score')
+        assert sum(row['sessions'] for row in weekly) == 30
+        assert weekly[0]['period'] == '2026-W02'
+
+    def test_improvement_direction(self, tmp_path):
+        store = metrics_store.MetricsStore(tmp_path / 'series.json')
+        for i in range(20):
+            store.append({'timestamp': '2026-01-05T10:00:00', 'quality_score': 50 if i < 10 else 90,
+                          'critical_issues': 4 if i < 10 else 1})
+        assert store.improvement('quality_score', 10)['trend'] == 'improving'
+        assert store.improvement('critical_issues', 10)['trend'] == 'improving'
+        assert store.improvement('quality_score', 15)['trend'] == 'insufficient_data'
+
+    def test_save_and_backfill_from_metrics_json(self, tmp_path):
+        legacy = tmp_path / 'metrics.json'
+        legacy.write_text(json.dumps({'sessions': make_sessions(12)}))
+        path = tmp_path / 'series.json'
+
+        store = metrics_store.load_store(path, legacy)
+        assert len(store) == 12
+        assert path.exists()
+
+        store.append(make_sessions(1, datetime(2026, 3, 1))[0])
+        store.save()
+        reloaded = metrics_store.load_store(path, legacy)
+        assert len(reloaded) == 13
+        assert reloaded.recent(1)[0]['timestamp'].startswith('2026-03-01')
+
+    def test_missing_fields_are_skipped(self, tmp_path):
+        store = metrics_store.MetricsStore(tmp_path / 'series.json')
+        for i in range(10):
+            session = {'timestamp': '2026-01-05T10:00:00', 'total_turns': 20}
+            if i % 2:
+                session['quality_score'] = 80
+            store.append(session)
+
+        assert store.mean('quality_score') == 80
+        assert store.window_mean('quality_score', 4) == 80
+        assert store.mean('security_issues') is None
+        assert store.window_mean('security_issues', 4) is None
+        week = store.rollup('weekly', 'quality_score')[0]
+        assert week['sessions'] == 10
+        assert (week['mean'], week['min'], week['max']) == (80, 80, 80)
+        assert store.column('quality_score')[:2] == [None, 80]
+
+    def test_upgrades_version_1_store(self, tmp_path, monkeypatch):
+        path = tmp_path / 'series.json'
+        monkeypatch.setattr(metrics_store, 'MAX_SESSIONS', 5)
+        store = metrics_store.MetricsStore(path)
+        for session in make_sessions(8):
+            store.append(session)
+        data = store.data
+        for key in ('seen', 'present'):
+            del data[key]
+        for buckets in data['rollups'].values():
+            for bucket in buckets.values():
+                del bucket['count']
+        data['version'] = 1
+        path.write_text(json.dumps(data))
+
+        upgraded = metrics_store.MetricsStore(path)
+        scores = [s['quality_score'] for s in make_sessions(8)]
+        assert len(upgraded) == 8
+        assert upgraded.window_mean('quality_score', 5) == sum(scores[3:]) / 5
+        assert upgraded.mean('quality_score') == sum(scores) / 8
+        assert upgraded.rollup('weekly', 'quality_score')[0]['mean'] == sum(scores) / 8
@@ -0,0 +1,54 @@
+"""
+Tests for the batch response checker in analyzing-response-quality.
+"""
+import json
+
+from .conftest import load_script
+
+SCRIPTS = 'self-improvement/skills/analyzing-response-quality/scripts'
+response_checks = load_script(f'{SCRIPTS}/response_checks.py')
+
+RESPONSES = [
+    "Here is code:\n```python\nimport os\ndef f(x):\n    os.system(x)\n```\nExample usage: f('ls')",
+    "No code here, just a note about empty inputs and an edge case.",
+    "```js\nvar a = 1;\nif (a == 2) { el.innerHTML = a; }\n```",
+]
+
+
+def jsonl(records):
+    return [json.dumps(record) + "\n" for record in records]
+
+
+class TestCheckResponse:
+    """Shared block extraction gives the same results as the single-response scripts."""
+
+    def test_matches_individual_checkers(self):
+        security = load_script(f'{SCRIPTS}/check-security.py')
+        quality = load_script(f'{SCRIPTS}/check-code-quality.py')
+        completeness = load_script(f'{SCRIPTS}/check-completeness.py')
+        for response in RESPONSES:
+            result = response_checks.check_response(response)
+            assert result['security'] == security.check_security(response)
+            assert result['quality'] == quality.check_quality(response)
+            assert result['completeness'] == completeness.analyze_completeness(response)
+
+
+class TestCheckLines:
+    """JSONL input is checked in order, with per-line errors."""
+
+    def test_order_ids_and_errors(self):
+        lines = jsonl([{'id': 'a', 'response': RESPONSES[0]}, RESPONSES[1]]) + ["\n", "not json\n", "[1]\n"]
+        results = list(response_checks.check_lines(lines))
+        assert [r.get('id') for r in results] == ['a', 2, None, None]
+        assert results[0]['security']['counts']['critical'] == 1
+        assert results[2] == {'line': 4, 'error': results[2]['error']}
+        assert 'Invalid JSON' in results[2]['error']
+        assert results[3]['line'] == 5
+
+    def test_worker_pool_preserves_order(self, monkeypatch):
+        monkeypatch.setattr(response_checks, 'BATCH_SIZE', 7)
+        records = [{'id': i, 'response': RESPONSES[i % 3], 'requirements': 'handle empty inputs'} for i in range(30)]
+        serial = list(response_checks.check_lines(jsonl(records)))
+        pooled = list(response_checks.check_lines(jsonl(records), workers=2))
+        assert [r['id'] for r in pooled] == list(range(30))
+        assert [r['security'] for r in pooled] == [r['security'] for r in serial]
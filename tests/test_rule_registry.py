@@ -0,0 +1,123 @@
+"""
+Tests for the shared security rule registry used by the self-improvement
+pre-write hook, the session-end code analyzer and the response checker.
+"""
+import re
+
+import pytest
+
+from .conftest import load_script
+
+registry = load_script('self-improvement/hooks/scripts/rule_registry.py')
+
+
+class TestRegistry:
+    """The registry itself is well-formed."""
+
+    def test_rule_ids_are_valid_group_names(self):
+        for rule_id in registry.RULES:
+            assert rule_id.isidentifier(), rule_id
+
+    def test_rule_sets_reference_known_rules(self):
+        for rule_set, table in registry.RULE_SETS.items():
+            for severity, rule_ids in table.items():
+                assert severity in registry.SEVERITY_ORDER
+                for rule_id in rule_ids:
+                    assert rule_id in registry.RULES, f"{rule_set}: {rule_id}"
+
+    def test_hints_are_lowercase(self):
+        for rule in registry.RULES.values():
+            assert rule.hints
+            assert all(hint == hint.lower() for hint in rule.hints), rule.id
+
+
+class TestScan:
+    """The combined scanner reports the same hits as one finditer per rule."""
+
+    SAMPLE = "\n".join([
+        "import subprocess, hashlib",
+        "result = eval(user_input)",
+        "password = 'hunter2hunter2'",
+        "subprocess.run(cmd, shell=True)",
+        "digest = hashlib.md5(data)",
+        "cursor.execute(\"SELECT name FROM users WHERE id = '\" + uid)",
+        "token = 'abcdefghijkl'; secret = 'abcdefgh'",
+        "try:",
+        "    pass",
+        "except:",
+        "    pass",
+    ])
+
+    @pytest.mark.parametrize('rule_set', sorted(registry.RULE_SETS))
+    def test_matches_per_rule_finditer(self, rule_set):
+        expected = set()
+        for severity, rule_ids in registry.RULE_SETS[rule_set].items():
+            for rule_id in rule_ids:
+                rule = registry.RULES[rule_id]
+                flags = re.MULTILINE | (re.IGNORECASE if rule.ignore_case else 0)
+                for match in re.finditer(rule.pattern, self.SAMPLE, flags):
+                    line = self.SAMPLE[:match.start()].count('\n') + 1
+                    expected.add((rule_id, severity, line, match.group()))
+
+        hits = registry.scan(rule_set, self.SAMPLE)
+        assert {(h.rule.id, h.severity, h.line, h.text) for h in hits} == expected
+        assert len(hits) == len(expected)
+
+    def test_hits_ordered_by_severity_then_offset(self):
+        hits = registry.scan('response', self.SAMPLE)
+        order = [registry.SEVERITY_ORDER.index(h.severity) for h in hits]
+        assert order == sorted(order)
+        for severity in registry.SEVERITY_ORDER:
+            starts = [h.start for h in hits if h.severity == severity]
+            assert starts == sorted(starts)
+
+    def test_rules_sharing_a_start_offset_are_all_reported(self):
+        # sql_concatenation and sql_fstring can both start on this line
+        text = "q = f\"SELECT a FROM t WHERE x = '{v}'\" + tail"
+        rule_ids = {h.rule.id for h in registry.scan('response', text)}
+        assert {'sql_concatenation', 'sql_fstring'} <= rule_ids
+
+    def test_case_sensitive_rules(self):
+        hits = registry.scan('javascript', "VAR x = 1;\nvar y = 2;")
+        assert [(h.rule.id, h.line) for h in hits] == [('var_declaration', 2)]
+
+    def test_empty_and_clean_text(self):
+        assert registry.scan('response', '') == []
+        assert registry.scan('pre_write', 'def add(a, b):\n    return a + b\n') == []
+
+    def test_first_hits_keeps_one_per_rule(self):
+        hits = registry.scan('pre_write', 'eval(a)\neval(b)\nexec(c)\n')
+        assert [h.rule.id for h in registry.first_hits(hits)] == ['write_eval', 'write_exec']
+
+
+class TestConsumers:
+    """Entry points report registry rule ids."""
+
+    def test_check_security_uses_registry(self):
+        check_security = load_script(
+            'self-improvement/skills/analyzing-response-quality/scripts/check-security.py'
+        )
+        result = check_security.check_security("x = eval(data)\n")
+        assert any(i['type'] == 'eval' and i['severity'] == 'critical' for i in result['issues'])
+
+    def test_analyze_code_quality_javascript(self):
+        analyzer = load_script('self-improvement/hooks/scripts/analyze-code-quality.py')
+        result = analyzer.analyze_code_blocks("```js\nel.innerHTML = html;\nif (a == b) {}\n```\n")
+        types = {i['type'] for i in result.issues}
+        assert {'potential_xss', 'use_strict_equality'} <= types
+
+    def test_pre_write_tracker_types(self):
+        hits = registry.scan('pre_write', "password = 'hunter22'\nsubprocess.run(c, shell=True)\n")
+        assert [(h.rule.issue, h.rule.message) for h in hits] == [
+            ('potential', 'Potential hardcoded password'),
+            ('shell=true', 'shell=True is dangerous - use shell=False'),
+        ]
+
+    def test_each_consumer_keeps_its_patterns(self):
+        text = "password = 'abc'\nel.innerHTML='<b>'\nSELECT a FROM t' + x\n"
+        response = {h.rule.issue for h in registry.scan('response', text)}
+        assert {'hardcoded_password', 'innerhtml'} <= response
+        assert 'sql_string_concatenation' not in response
+        pre_write = {h.rule.id for h in registry.scan('pre_write', text)}
+        assert pre_write == {'write_sql_concatenation'}
+        assert registry.scan('javascript', "EVAL(x)\n") == []
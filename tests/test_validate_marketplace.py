@@ -0,0 +1,147 @@
+"""
+Tests for the marketplace validation driver behind validate-plugins.sh.
+"""
+import json
+
+from .conftest import load_script
+
+validate_marketplace = load_script('scripts/validate-marketplace.py')
+
+GOOD_AGENT = """---
+name: helper
+description: Use when the user needs help with fixtures. Handles fixture questions.
+tools: Read, Grep
+model: sonnet
+---
+
+# Helper
+
+You are a helper agent for fixture questions.
+"""
+
+BAD_AGENT = """---
+name: Bad_Agent
+---
+"""
+
+
+def make_marketplace(root, agent_text):
+    plugin = root / 'fixture-plugin'
+    (plugin / '.claude-plugin').mkdir(parents=True)
+    (plugin / '.claude-plugin' / 'plugin.json').write_text(json.dumps({
+        'name': 'fixture-plugin', 'version': '1.0.0', 'description': 'Fixture plugin',
+        'author': {'name': 'Tests'},
+    }))
+    (plugin / 'README.md').write_text('# Fixture plugin\n')
+    (plugin / 'agents').mkdir()
+    (plugin / 'agents' / 'helper.md').write_text(agent_text)
+    (root / '.claude-plugin').mkdir()
+    (root / '.claude-plugin' / 'marketplace.json').write_text(json.dumps({
+        'plugins': [{'name': 'fixture-plugin', 'source': './fixture-plugin'}, {'name': 'gone', 'source': './gone'}],
+    }))
+    return plugin
+
+
+class TestRepository:
+    """The repository's own plugins validate cleanly."""
+
+    def test_serial_and_pool_agree(self, repo_root):
+        serial = validate_marketplace.validate(workers=1, skip_tests=True)
+        pooled = validate_marketplace.validate(workers=2, skip_tests=True)
+        assert serial == pooled
+        assert serial['summary']['errors'] == 0
+        names = [plugin['name'] for plugin in serial['plugins']]
+        assert names == sorted(p.name for p in repo_root.iterdir() if (p / '.claude-plugin').is_dir())
+        assert serial['summary']['components'] == sum(len(p['components']) for p in serial['plugins'])
+
+
+class TestFixtureMarketplace:
+    """Failures are classified like validate-plugins.sh did."""
+
+    def test_bad_agent_and_missing_source(self, tmp_path):
+        make_marketplace(tmp_path, BAD_AGENT)
+        report = validate_marketplace.validate(workers=1, skip_tests=True, root=tmp_path)
+        components = report['plugins'][0]['components']
+        assert [c['kind'] for c in components] == ['plugin', 'agent']
+        agent = components[1]
+        assert agent['status'] == 'fail' and agent['errors']
+        assert report['marketplace']['errors'] == ['Plugin directory not found: gone']
+        assert report['summary']['errors'] == 2
+
+    def test_good_agent_passes(self, tmp_path):
+        plugin = make_marketplace(tmp_path, GOOD_AGENT)
+        result = validate_marketplace.run_task(('agent', 'fixture-plugin', str(plugin / 'agents' / 'helper.md')))
+        assert result['status'] == 'pass'
+        assert result['errors'] == []
+
+    def test_invalid_manifest_skips_components(self, tmp_path):
+        plugin = make_marketplace(tmp_path, GOOD_AGENT)
+        (plugin / '.claude-plugin' / 'plugin.json').write_text('{not json')
+        report = validate_marketplace.validate(workers=1, skip_tests=True, root=tmp_path)
+        assert report['plugins'][0]['error'] == 'Invalid JSON in plugin.json'
+        assert report['plugins'][0]['components'] == []
+
+
+class TestValidationCache:
+    """Only changed components, and plugins depending on them, are re-validated."""
+
+    def run(self, root, cache, changed=None):
+        return validate_marketplace.validate(
+            workers=1, skip_tests=True, root=root, cache_path=cache, changed=changed
+        )
+
+    def test_reuses_unchanged_results(self, tmp_path):
+        plugin = make_marketplace(tmp_path, GOOD_AGENT)
+        cache = tmp_path / 'cache.json'
+        first = self.run(tmp_path, cache)
+        assert first['summary']['cached'] == 0
+        second = self.run(tmp_path, cache)
+        assert second['summary']['cached'] == 2
+        assert second['plugins'] == first['plugins']
+
+        (plugin / 'agents' / 'helper.md').write_text(BAD_AGENT)
+        third = self.run(tmp_path, cache)
+        assert third['summary']['cached'] == 1
+        assert third['plugins'][0]['components'][1]['status'] == 'fail'
+
+    def test_plugin_revalidated_when_referenced_path_changes(self, tmp_path):
+        plugin = make_marketplace(tmp_path, GOOD_AGENT)
+        manifest = plugin / '.claude-plugin' / 'plugin.json'
+        data = json.loads(manifest.read_text())
+        data['agents'] = ['./agents/helper.md']
+        manifest.write_text(json.dumps(data))
+        cache = tmp_path / 'cache.json'
+        assert self.run(tmp_path, cache)['summary']['errors'] == 1  # missing ./gone source
+
+        (plugin / 'agents' / 'helper.md').rename(plugin / 'agents' / 'renamed.md')
+        report = self.run(tmp_path, cache)
+        manifest_result = report['plugins'][0]['components'][0]
+        assert 'Agent file does not exist: ./agents/helper.md' in manifest_result['errors']
+        assert report['summary']['cached'] == 0
+
+    def test_validator_version_invalidates(self, tmp_path, monkeypatch):
+        make_marketplace(tmp_path, GOOD_AGENT)
+        cache = tmp_path / 'cache.json'
+        self.run(tmp_path, cache)
+        monkeypatch.setattr(validate_marketplace, 'CACHE_VERSION', validate_marketplace.CACHE_VERSION + 1)
+        assert self.run(tmp_path, cache)['summary']['cached'] == 0
+
+
+class TestChangedSince:
+    """Changed files select the components they affect."""
+
+    def test_affected_components(self, tmp_path):
+        plugin = make_marketplace(tmp_path, GOOD_AGENT)
+        agent = plugin / 'agents' / 'helper.md'
+        report = validate_marketplace.validate(workers=1, skip_tests=True, root=tmp_path, changed={agent})
+        kinds = [c['kind'] for p in report['plugins'] for c in p['components']]
+        assert kinds == ['plugin', 'agent']
+
+        report = validate_marketplace.validate(workers=1, skip_tests=True, root=tmp_path, changed={tmp_path / 'other.md'})
+        assert report['plugins'] == []
+        assert report['summary']['components'] == 0
+
+    def test_validator_change_affects_its_kind(self):
+        script = validate_marketplace.VALIDATOR_SCRIPTS / validate_marketplace.VALIDATORS['command'][0]
+        assert validate_marketplace.is_affected(('command', 'p', '/x/commands/a.md'), {script})
+        assert not validate_marketplace.is_affected(('agent', 'p', '/x/agents/a.md'), {script})